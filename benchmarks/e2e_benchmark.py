@@ -0,0 +1,351 @@
+"""End-to-end throughput benchmark against a local fake OpenAI-compatible server.
+
+A ``FakeOpenAIServer`` (see ``fake_openai_server.py``) stands in for the chat and
+embedding APIs with configurable latency, jitter and error rate, so the numbers reflect
+this project's own pipeline and concurrency rather than a provider's mood. Three stages
+are measured on synthetic financial text:
+
+- ingestion: ``DocumentLoader.load_file`` -> ``text_splitter`` -> ``add_documents``
+- retrieval: ``FinancialRAG.retrieve_context`` QPS and latency per concurrency level
+- evaluation: ``HallucinationEvaluator.evaluate_sample`` throughput in overall and claim
+  mode per concurrency level
+
+Usage:
+    python benchmarks/e2e_benchmark.py --latency-ms 50 --concurrency 1,4,8 --output e2e_report.json
+    python benchmarks/e2e_benchmark.py --compare previous_e2e_report.json
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(os.path.join(REPO_ROOT, "src"))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from fake_openai_server import FakeOpenAIServer
+
+COMPANIES = ["招商银行", "贵州茅台", "宁德时代", "中国平安", "比亚迪", "工商银行", "美的集团", "长江电力"]
+METRICS = ["营业收入", "净利润", "经营现金流", "毛利率", "资本充足率", "不良贷款率", "研发投入", "每股分红"]
+PERIODS = ["2023年", "2024年上半年", "2024年第三季度", "2024年"]
+
+
+def generate_sentence(rng: random.Random) -> str:
+    company = rng.choice(COMPANIES)
+    metric = rng.choice(METRICS)
+    period = rng.choice(PERIODS)
+    value = round(rng.uniform(1, 900), 2)
+    change = round(rng.uniform(-30, 30), 1)
+    return f"{company}{period}{metric}为{value}亿元，同比{'增长' if change >= 0 else '下降'}{abs(change)}%。"
+
+
+def write_documents(directory: str, documents: int, paragraphs: int, rng: random.Random):
+    paths = []
+    for index in range(documents):
+        path = os.path.join(directory, f"report_{index:03d}.txt")
+        with open(path, "w", encoding="utf-8") as file:
+            for _ in range(paragraphs):
+                file.write("".join(generate_sentence(rng) for _ in range(4)) + "\n\n")
+        paths.append(path)
+    return paths
+
+
+def build_samples(count: int, rng: random.Random):
+    samples = []
+    for index in range(1, count + 1):
+        answer = "".join(generate_sentence(rng) for _ in range(3))
+        samples.append({
+            "id": index,
+            "question": f"{rng.choice(COMPANIES)}{rng.choice(PERIODS)}的{rng.choice(METRICS)}是多少？",
+            "candidate_answer": answer,
+            "label": "positive" if index % 3 == 0 else "negative"
+        })
+    return samples
+
+
+def latency_summary(latencies_s):
+    latencies_ms = sorted(value * 1000 for value in latencies_s)
+    if not latencies_ms:
+        return {"mean_ms": 0.0, "p50_ms": 0.0, "p95_ms": 0.0, "max_ms": 0.0}
+    return {
+        "mean_ms": statistics.mean(latencies_ms),
+        "p50_ms": latencies_ms[len(latencies_ms) // 2],
+        "p95_ms": latencies_ms[min(len(latencies_ms) - 1, int(0.95 * len(latencies_ms)))],
+        "max_ms": latencies_ms[-1]
+    }
+
+
+def timed_map(function, items, concurrency: int):
+    """Run ``function`` over ``items`` on ``concurrency`` threads; return (outputs, latencies, wall)."""
+    def timed(item):
+        started = time.perf_counter()
+        output = function(item)
+        return output, time.perf_counter() - started
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        timed_outputs = list(executor.map(timed, items))
+    wall = time.perf_counter() - started
+    return [output for output, _ in timed_outputs], [latency for _, latency in timed_outputs], wall
+
+
+def server_stats_delta(server: FakeOpenAIServer, before):
+    return {key: server.stats[key] - before[key] for key in server.stats}
+
+
+def benchmark_ingestion(vector_store, paths, chunk_size: int, chunk_overlap: int):
+    from knowledge_base.document_loader import DocumentLoader
+
+    loader = DocumentLoader()
+    stage_seconds = {"load": 0.0, "split": 0.0, "add": 0.0}
+    chunks = 0
+    characters = 0
+    started = time.perf_counter()
+    for path in paths:
+        stage_started = time.perf_counter()
+        content = loader.load_file(path)
+        stage_seconds["load"] += time.perf_counter() - stage_started
+
+        stage_started = time.perf_counter()
+        documents = vector_store.text_splitter(content, chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+        stage_seconds["split"] += time.perf_counter() - stage_started
+
+        stage_started = time.perf_counter()
+        vector_store.add_documents(documents)
+        stage_seconds["add"] += time.perf_counter() - stage_started
+        chunks += len(documents)
+        characters += len(content)
+    wall = time.perf_counter() - started
+    return {
+        "documents": len(paths),
+        "chunks": chunks,
+        "characters": characters,
+        "wall_s": wall,
+        "documents_per_s": len(paths) / wall if wall else 0.0,
+        "chunks_per_s": chunks / wall if wall else 0.0,
+        "stage_s": stage_seconds
+    }
+
+
+def benchmark_retrieval(rag_engine, queries, concurrency_levels):
+    rows = []
+    for concurrency in concurrency_levels:
+        outputs, latencies, wall = timed_map(rag_engine.retrieve_context, queries, concurrency)
+        rows.append({
+            "concurrency": concurrency,
+            "queries": len(queries),
+            "qps": len(queries) / wall if wall else 0.0,
+            "documents_per_query": statistics.mean(len(docs) for docs in outputs) if outputs else 0.0,
+            **latency_summary(latencies)
+        })
+    return rows
+
+
+def benchmark_evaluation(evaluator, rag_engine, samples, modes, concurrency_levels, server):
+    rows = []
+    for mode in modes:
+        for concurrency in concurrency_levels:
+            before = dict(server.stats)
+            results, latencies, wall = timed_map(
+                lambda sample: evaluator.evaluate_sample(sample, rag_engine, mode=mode),
+                samples,
+                concurrency
+            )
+            llm_calls = sum(result.get("llm_calls", 0) for result in results)
+            rows.append({
+                "mode": mode,
+                "concurrency": concurrency,
+                "samples": len(samples),
+                "samples_per_s": len(samples) / wall if wall else 0.0,
+                "llm_calls": llm_calls,
+                "llm_calls_per_s": llm_calls / wall if wall else 0.0,
+                "uncertain_rate": sum(result.get("predicted_label") == "uncertain" for result in results) / len(results),
+                "server": server_stats_delta(server, before),
+                **latency_summary(latencies)
+            })
+    return rows
+
+
+def flatten_throughput(report):
+    """Higher-is-better throughput figures keyed by a stable name, for cross-commit comparison."""
+    figures = {}
+    if report.get("ingestion"):
+        figures["ingestion.chunks_per_s"] = report["ingestion"]["chunks_per_s"]
+    for row in report.get("retrieval", []):
+        figures[f"retrieval.c{row['concurrency']}.qps"] = row["qps"]
+    for row in report.get("evaluation", []):
+        figures[f"evaluation.{row['mode']}.c{row['concurrency']}.samples_per_s"] = row["samples_per_s"]
+    return figures
+
+
+def compare_reports(current, previous):
+    current_figures = flatten_throughput(current)
+    previous_figures = flatten_throughput(previous)
+    return [
+        {
+            "metric": name,
+            "previous": previous_figures[name],
+            "current": value,
+            "ratio": value / previous_figures[name] if previous_figures[name] else None
+        }
+        for name, value in current_figures.items()
+        if name in previous_figures
+    ]
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=REPO_ROOT,
+            capture_output=True,
+            text=True,
+            check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def run_benchmark(args):
+    from eval_engine.hallucination_evaluator import HallucinationEvaluator
+    from http_pool import get_http_clients
+    from knowledge_base.vector_store_manager import VectorStoreManager
+    from rag_engine.financial_rag import FinancialRAG
+
+    rng = random.Random(args.seed)
+    concurrency_levels = [int(level) for level in args.concurrency.split(",") if level.strip()]
+    modes = [mode for mode in args.modes.split(",") if mode.strip()]
+    stages = set(args.stages.split(","))
+    work_dir = tempfile.mkdtemp(prefix="e2e_benchmark_")
+    report = {
+        "benchmark": "e2e",
+        "commit": git_commit(),
+        "python": sys.version.split()[0],
+        "created_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "server": {
+            "latency_ms": args.latency_ms,
+            "jitter_ms": args.jitter_ms,
+            "error_rate": args.error_rate,
+            "seed": args.seed
+        },
+        "workload": {
+            "documents": args.documents,
+            "paragraphs_per_document": args.paragraphs,
+            "queries": args.queries,
+            "samples": args.samples,
+            "concurrency": concurrency_levels,
+            "modes": modes
+        }
+    }
+
+    try:
+        with FakeOpenAIServer(
+            latency_ms=args.latency_ms,
+            jitter_ms=args.jitter_ms,
+            error_rate=args.error_rate,
+            seed=args.seed
+        ) as server:
+            # One pool for all three components, as in the app and the CLI.
+            http_clients = get_http_clients(
+                server.base_url,
+                max_connections=args.max_connections,
+                max_keepalive_connections=args.max_keepalive,
+                http2=args.http2
+            )
+            vector_store = VectorStoreManager(
+                persist_directory=os.path.join(work_dir, "chroma"),
+                base_url=server.base_url,
+                model_name="fake-embedding",
+                api_key="benchmark",
+                http_clients=http_clients
+            )
+            docs_dir = os.path.join(work_dir, "docs")
+            os.makedirs(docs_dir)
+            paths = write_documents(docs_dir, args.documents, args.paragraphs, rng)
+            # Ingestion also builds the index the later stages search, so it always runs.
+            before = dict(server.stats)
+            report["ingestion"] = benchmark_ingestion(vector_store, paths, args.chunk_size, args.chunk_overlap)
+            report["ingestion"]["server"] = server_stats_delta(server, before)
+
+            rag_engine = FinancialRAG(
+                vector_store,
+                model_name="fake-chat",
+                base_url=server.base_url,
+                api_key="benchmark",
+                retrieval_top_k=args.top_k,
+                http_clients=http_clients
+            )
+            if "retrieval" in stages:
+                queries = [build_samples(1, rng)[0]["question"] for _ in range(args.queries)]
+                report["retrieval"] = benchmark_retrieval(rag_engine, queries, concurrency_levels)
+
+            if "eval" in stages:
+                evaluator = HallucinationEvaluator(
+                    model_name="fake-chat",
+                    base_url=server.base_url,
+                    api_key="benchmark",
+                    retrieval_top_k=args.top_k,
+                    http_clients=http_clients
+                )
+                report["evaluation"] = benchmark_evaluation(
+                    evaluator,
+                    rag_engine,
+                    build_samples(args.samples, rng),
+                    modes,
+                    concurrency_levels,
+                    server
+                )
+            report["http_pool"] = http_clients.stats()
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="Base latency of every fake API request.")
+    parser.add_argument("--jitter-ms", type=float, default=20.0, help="Maximum extra random latency per request.")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests answered with HTTP 500.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--documents", type=int, default=10)
+    parser.add_argument("--paragraphs", type=int, default=20, help="Paragraphs per synthetic document.")
+    parser.add_argument("--chunk-size", type=int, default=500)
+    parser.add_argument("--chunk-overlap", type=int, default=50)
+    parser.add_argument("--top-k", type=int, default=3)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--samples", type=int, default=40)
+    parser.add_argument("--concurrency", default="1,4,8", help="Comma-separated thread counts.")
+    parser.add_argument("--modes", default="overall,claim")
+    parser.add_argument("--stages", default="ingest,retrieval,eval", help="Stages to run; ingest always runs.")
+    parser.add_argument("--max-connections", type=int, default=100, help="HTTP pool size shared by all components.")
+    parser.add_argument("--max-keepalive", type=int, default=20, help="Idle connections kept open in the HTTP pool.")
+    parser.add_argument("--http2", action="store_true", help="Use HTTP/2 when the h2 package is installed.")
+    parser.add_argument("--output", default="", help="Optional path of the JSON report.")
+    parser.add_argument("--compare", default="", help="Previous JSON report to compare throughput against.")
+    args = parser.parse_args()
+
+    report = run_benchmark(args)
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as file:
+            previous = json.load(file)
+        report["comparison"] = {
+            "previous_commit": previous.get("commit", ""),
+            "throughput": compare_reports(report, previous)
+        }
+
+    report_json = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(report_json)
+    print(report_json)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,267 @@
+"""Local stand-in for an OpenAI-compatible chat + embeddings API, for benchmarks.
+
+The server answers ``POST /v1/chat/completions``, ``POST /v1/embeddings`` and
+``GET /v1/models`` with deterministic outputs: embeddings are derived from a hash of
+each input text, and chat replies recognise the judge prompts of this project (overall
+verdict, claim extraction, claim verification) and return well-formed JSON for them.
+Every request waits ``latency_ms`` plus up to ``jitter_ms`` of seeded random jitter, and
+fails with HTTP ``error_status`` (500 by default, 429 to mimic throttling) at
+``error_rate``, so client-side concurrency, retry and failover behaviour can be measured
+without a real provider.
+
+Usage:
+    python benchmarks/fake_openai_server.py --port 8765 --latency-ms 200 --jitter-ms 50
+"""
+import argparse
+import base64
+import hashlib
+import json
+import random
+import re
+import struct
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+OVERALL_VERDICTS = ["supported", "hallucinated", "uncertain"]
+CLAIM_VERDICTS = ["supported", "contradicted", "insufficient_evidence"]
+# Latin commas and full stops only split before whitespace, so decimals such as 7.3% survive.
+_CLAIM_SPLIT_PATTERN = re.compile(r"[，。；！？;!?]+|[,.](?=\s)")
+_ANSWER_PATTERN = re.compile(r"Candidate Answer:\s*(.*?)\s*(?:Retrieved Evidence:|Return JSON:|$)", re.S)
+
+
+def stable_hash(text: str) -> int:
+    return int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "little")
+
+
+def embed_text(text: str, dimensions: int):
+    """Deterministic unit vector for ``text``; identical texts always get identical vectors."""
+    rng = random.Random(stable_hash(text))
+    vector = [rng.gauss(0.0, 1.0) for _ in range(dimensions)]
+    norm = sum(value * value for value in vector) ** 0.5 or 1.0
+    return [value / norm for value in vector]
+
+
+def approximate_tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+
+def build_chat_reply(prompt: str, claims_per_answer: int) -> str:
+    """Reply to a judge prompt with valid JSON, or to any other prompt with a short answer."""
+    digest = stable_hash(prompt)
+    if '"claims"' in prompt:
+        match = _ANSWER_PATTERN.search(prompt)
+        answer = match.group(1) if match else prompt[-200:]
+        claims = [part.strip() for part in _CLAIM_SPLIT_PATTERN.split(answer) if part.strip()]
+        return json.dumps({"claims": claims[:claims_per_answer] or [answer.strip()[:80]]}, ensure_ascii=False)
+    if '"claim":' in prompt:
+        return json.dumps({
+            "verdict": CLAIM_VERDICTS[digest % len(CLAIM_VERDICTS)],
+            "confidence": round(0.5 + (digest % 50) / 100, 2),
+            "reason": "Deterministic benchmark verdict.",
+            "evidence": []
+        })
+    if '"verdict"' in prompt:
+        return json.dumps({
+            "verdict": OVERALL_VERDICTS[digest % len(OVERALL_VERDICTS)],
+            "confidence": round(0.5 + (digest % 50) / 100, 2),
+            "reason": "Deterministic benchmark verdict.",
+            "evidence": [],
+            "unsupported_parts": []
+        })
+    return f"Benchmark answer {digest % 10000}: the retrieved context covers this question."
+
+
+class FakeOpenAIServer:
+    """Threaded fake OpenAI-compatible server; use as a context manager or call start/stop."""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 500,
+        embedding_dimensions: int = 256,
+        claims_per_answer: int = 3,
+        seed: int = 0
+    ):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.embedding_dimensions = embedding_dimensions
+        self.claims_per_answer = claims_per_answer
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.stats = {"chat_requests": 0, "embedding_requests": 0, "embedded_texts": 0, "errors": 0}
+        self._server = ThreadingHTTPServer((host, port), self._build_handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def _draw_delay_and_error(self):
+        with self._lock:
+            jitter = self._rng.uniform(0.0, self.jitter_ms) if self.jitter_ms else 0.0
+            failed = self._rng.random() < self.error_rate
+        return (self.latency_ms + jitter) / 1000, failed
+
+    def _count(self, key: str, amount: int = 1):
+        with self._lock:
+            self.stats[key] += amount
+
+    def _build_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def _send_json(self, status: int, payload):
+                body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                if self.path.rstrip("/").endswith("/models"):
+                    self._send_json(200, {"object": "list", "data": [
+                        {"id": "fake-chat", "object": "model", "owned_by": "benchmark"},
+                        {"id": "fake-embedding", "object": "model", "owned_by": "benchmark"}
+                    ]})
+                else:
+                    self._send_json(404, {"error": {"message": f"Unknown path {self.path}"}})
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                request = json.loads(self.rfile.read(length) or b"{}")
+                delay, failed = server._draw_delay_and_error()
+                if delay:
+                    time.sleep(delay)
+                if failed:
+                    server._count("errors")
+                    error_type = "rate_limit_error" if server.error_status == 429 else "server_error"
+                    self._send_json(
+                        server.error_status,
+                        {"error": {"message": "Injected benchmark failure.", "type": error_type}}
+                    )
+                    return
+
+                if self.path.endswith("/chat/completions"):
+                    self._send_json(200, server._chat_completion(request))
+                elif self.path.endswith("/embeddings"):
+                    self._send_json(200, server._embeddings(request))
+                else:
+                    self._send_json(404, {"error": {"message": f"Unknown path {self.path}"}})
+
+        return Handler
+
+    def _chat_completion(self, request):
+        self._count("chat_requests")
+        prompt = "\n".join(str(message.get("content", "")) for message in request.get("messages", []))
+        reply = build_chat_reply(prompt, self.claims_per_answer)
+        prompt_tokens = approximate_tokens(prompt)
+        completion_tokens = approximate_tokens(reply)
+        return {
+            "id": f"chatcmpl-{stable_hash(prompt) % 10 ** 12}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get("model", "fake-chat"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": reply},
+                "finish_reason": "stop"
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens
+            }
+        }
+
+    def _embeddings(self, request):
+        texts = request.get("input", [])
+        if isinstance(texts, str):
+            texts = [texts]
+        self._count("embedding_requests")
+        self._count("embedded_texts", len(texts))
+        dimensions = int(request.get("dimensions") or self.embedding_dimensions)
+        data = []
+        for index, text in enumerate(texts):
+            # Token-id inputs are hashed through their string form.
+            vector = embed_text(text if isinstance(text, str) else json.dumps(text), dimensions)
+            if request.get("encoding_format") == "base64":
+                # The OpenAI SDK asks for base64 float32 by default and decodes it itself.
+                embedding = base64.b64encode(struct.pack(f"<{dimensions}f", *vector)).decode("ascii")
+            else:
+                embedding = vector
+            data.append({"object": "embedding", "index": index, "embedding": embedding})
+        tokens = sum(approximate_tokens(str(text)) for text in texts)
+        return {
+            "object": "list",
+            "data": data,
+            "model": request.get("model", "fake-embedding"),
+            "usage": {"prompt_tokens": tokens, "total_tokens": tokens}
+        }
+
+    def start(self) -> str:
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fake-openai", daemon=True)
+        self._thread.start()
+        return self.base_url
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-status", type=int, default=500)
+    parser.add_argument("--embedding-dimensions", type=int, default=256)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    server = FakeOpenAIServer(
+        args.host,
+        args.port,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        embedding_dimensions=args.embedding_dimensions,
+        seed=args.seed
+    )
+    print(f"Fake OpenAI-compatible server listening on {server.base_url}")
+    try:
+        server._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server._server.server_close()
+
+
+if __name__ == "__main__":
+    main()
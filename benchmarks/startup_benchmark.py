@@ -0,0 +1,152 @@
+"""Cold-start benchmark and import-time profile for the Streamlit app.
+
+Each run starts a fresh interpreter with ``-X importtime``, executes the first script
+run of ``src/web_ui/app.py`` through Streamlit's ``AppTest`` harness and records how
+long it took until the page was rendered, which heavy dependencies were imported on
+the way, and the slowest top-level imports.
+
+Usage:
+    python benchmarks/startup_benchmark.py --runs 5 --output startup_report.json
+    python benchmarks/startup_benchmark.py --compare previous_startup_report.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+APP_PATH = os.path.join(REPO_ROOT, "src", "web_ui", "app.py")
+HEAVY_MODULES = [
+    "numpy",
+    "pandas",
+    "httpx",
+    "langchain_core",
+    "langchain_openai",
+    "langchain_community",
+    "chromadb",
+    "pdfplumber",
+    "eval_engine.hallucination_evaluator",
+    "knowledge_base.vector_store_manager",
+    "rag_engine.financial_rag"
+]
+
+RUN_SCRIPT = """
+import json
+import sys
+import time
+
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+harness_ready = time.perf_counter()
+modules_before = set(sys.modules)
+
+app = AppTest.from_file({app_path!r}, default_timeout=300)
+app.run()
+first_paint = time.perf_counter()
+
+print(json.dumps({{
+    "harness_import_s": harness_ready - start,
+    "first_paint_s": first_paint - harness_ready,
+    "exceptions": [exception.message for exception in app.exception],
+    "heavy_modules_loaded": [
+        name for name in {heavy_modules!r}
+        if name in sys.modules and name not in modules_before
+    ]
+}}))
+"""
+
+
+def parse_importtime(stderr_text: str):
+    """Return (module, self_us, cumulative_us) rows for top-level imports."""
+    rows = []
+    for line in stderr_text.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3:
+            continue
+        try:
+            self_us = int(parts[0].strip())
+            cumulative_us = int(parts[1].strip())
+        except ValueError:
+            continue
+        name = parts[2].rstrip()
+        if name.startswith(" ") and not name.startswith("  "):
+            rows.append((name.strip(), self_us, cumulative_us))
+    return rows
+
+
+def run_once(top: int):
+    script = RUN_SCRIPT.format(app_path=APP_PATH, heavy_modules=HEAVY_MODULES)
+    started = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", script],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        encoding="utf-8"
+    )
+    wall_time = time.perf_counter() - started
+    if completed.returncode != 0:
+        raise RuntimeError(f"Benchmark run failed:\n{completed.stderr[-2000:]}")
+
+    payload = json.loads(completed.stdout.strip().splitlines()[-1])
+    imports = sorted(parse_importtime(completed.stderr), key=lambda row: row[2], reverse=True)
+    payload["process_wall_s"] = wall_time
+    payload["top_imports"] = [
+        {"module": name, "self_ms": self_us / 1000, "cumulative_ms": cumulative_us / 1000}
+        for name, self_us, cumulative_us in imports[:top]
+    ]
+    return payload
+
+
+def summarize(values):
+    return {
+        "mean": statistics.mean(values),
+        "median": statistics.median(values),
+        "min": min(values),
+        "max": max(values)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--top", type=int, default=15, help="Number of slowest top-level imports to report.")
+    parser.add_argument("--output", default="", help="Optional path of the JSON report.")
+    parser.add_argument("--compare", default="", help="Previous JSON report to compare first paint against.")
+    args = parser.parse_args()
+
+    runs = [run_once(args.top) for _ in range(max(1, args.runs))]
+    report = {
+        "runs": len(runs),
+        "python": sys.version.split()[0],
+        "first_paint_s": summarize([run["first_paint_s"] for run in runs]),
+        "process_wall_s": summarize([run["process_wall_s"] for run in runs]),
+        "heavy_modules_loaded": runs[-1]["heavy_modules_loaded"],
+        "exceptions": runs[-1]["exceptions"],
+        "top_imports": runs[-1]["top_imports"]
+    }
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as file:
+            previous = json.load(file)
+        previous_median = previous["first_paint_s"]["median"]
+        report["comparison"] = {
+            "previous_first_paint_median_s": previous_median,
+            "speedup": previous_median / report["first_paint_s"]["median"]
+            if report["first_paint_s"]["median"] else None
+        }
+
+    report_json = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(report_json)
+    print(report_json)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,795 @@
+"""Headless command-line entry point for knowledge-base ingestion and batch evaluation.
+
+Examples:
+    python src/cli.py ingest ./docs --recursive
+    python src/cli.py eval --dataset ./data/test_set.json --mode claim --workers 4 --output results.json
+    python src/cli.py eval --mode overall --progress json > progress.jsonl
+    python src/cli.py --trace trace.json eval --mode claim
+    python src/cli.py retrieval-bench --top-k 1,3,5,10 --target-recall 0.8
+    python src/cli.py claim-split-bench --limit 200 --output claim_split_report.json
+"""
+import argparse
+import json
+import os
+import queue
+import sys
+import time
+from contextlib import nullcontext
+from typing import Any, Dict, List
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from config_manager import AppConfigManager
+from eval_engine.adaptive_eval import AdaptiveEvaluationPlan
+from eval_engine.claim_evidence import summarize_evidence_pool
+from eval_engine.claim_splitter import llm_extraction_share
+from eval_engine.judge_cascade import (
+    CascadePolicy,
+    build_cascade_model,
+    compare_label_agreement,
+    summarize_cascade
+)
+from eval_engine.numeric_check import DEFAULT_NUMERIC_TOLERANCE, summarize_numeric_precheck
+from eval_engine.prompt_manager import PromptTemplateManager
+from eval_engine.result_exporter import (
+    sanitize_config_snapshot,
+    write_export_json,
+    write_results_csv
+)
+from eval_engine.strategy_defaults import (
+    DEFAULT_HYBRID_MAX_CHARS,
+    DEFAULT_HYBRID_MAX_CLAIMS,
+    DEFAULT_MIN_SIMILARITY,
+    DEFAULT_POOL_SIZE
+)
+from endpoint_router import get_configured_router, router_statistics
+from http_pool import get_http_clients, pool_statistics
+from tracing import current_trace_context, export_trace, record_trace, summarize_spans
+
+# How often the parent checks for shard workers that died without reporting.
+SHARD_POLL_SECONDS = 5.0
+
+class ProgressReporter:
+    """Emit progress as JSON lines on stdout or as plain text on stderr."""
+
+    def __init__(self, mode: str = "text"):
+        self.mode = mode
+
+    def emit(self, event: str, **fields):
+        if self.mode == "none":
+            return
+        if self.mode == "json":
+            payload = {"event": event, "time": time.time()}
+            payload.update(fields)
+            sys.stdout.write(json.dumps(payload, ensure_ascii=False) + "\n")
+            sys.stdout.flush()
+            return
+
+        details = " ".join(f"{key}={value}" for key, value in fields.items())
+        sys.stderr.write(f"[{event}] {details}\n")
+        sys.stderr.flush()
+
+
+def load_runtime_config(config_path: str, require_api_key: bool = True) -> Dict[str, Any]:
+    config_manager = AppConfigManager(config_path)
+    runtime_config = config_manager.get_runtime_config()
+    if require_api_key and not runtime_config["api_key"]:
+        raise SystemExit(f"api_key is empty in {config_path}.")
+    # Pool and routing settings travel with the runtime config so shard processes build the
+    # same pool and router; exports mask the routed endpoints' API keys.
+    runtime_config["http_pool"] = config_manager.get_http_pool_settings()
+    runtime_config["routing"] = {
+        **config_manager.get_routing_settings(),
+        "endpoints": config_manager.get_routing_endpoints()
+    }
+    runtime_config["judge_cascade"] = config_manager.get_judge_cascade_settings()
+    runtime_config["claim_extraction"] = config_manager.get_claim_extraction_settings()
+    runtime_config["claim_evidence"] = config_manager.get_claim_evidence_settings()
+    runtime_config["numeric_precheck"] = config_manager.get_numeric_precheck_settings()
+    return runtime_config
+
+
+def build_http_clients(runtime_config: Dict[str, Any]):
+    return get_http_clients(runtime_config["base_url"] or None, **runtime_config.get("http_pool", {}))
+
+
+def build_chat_router(runtime_config: Dict[str, Any]):
+    routing = runtime_config.get("routing") or {}
+    return get_configured_router(
+        routing.get("endpoints", []),
+        routing,
+        timeout=120,
+        http_pool_settings=runtime_config.get("http_pool", {})
+    )
+
+
+def emit_pool_statistics(reporter):
+    pools = pool_statistics()
+    if pools:
+        reporter.emit("http_pool", pools=pools)
+    endpoints = router_statistics()
+    if endpoints:
+        reporter.emit("endpoints", endpoints=endpoints)
+
+
+def open_trace(args, name: str, **attributes):
+    """Record the command's spans when ``--trace`` is given."""
+    if not args.trace:
+        return nullcontext()
+    return record_trace(name, **attributes)
+
+
+def write_trace(args, recorder, reporter, extra_spans: List[Dict[str, Any]] = ()):
+    if recorder is None:
+        return
+    spans = sorted(recorder.export() + list(extra_spans), key=lambda span: span["start_ns"])
+    export_trace(args.trace, spans, args.trace_format)
+    stages = [
+        {"stage": row["stage"], "count": row["count"], "self_ms": round(row["self_ms"], 1)}
+        for row in summarize_spans(spans)[:5]
+    ]
+    reporter.emit("trace_written", trace=args.trace, format=args.trace_format, spans=len(spans), slowest_stages=stages)
+
+
+def load_prompts(template_name: str, template_dir: str) -> Dict[str, str]:
+    return PromptTemplateManager(template_dir=template_dir).load_template(template_name)
+
+
+def build_vector_store(runtime_config: Dict[str, Any]):
+    from knowledge_base.vector_store_manager import VectorStoreManager
+
+    return VectorStoreManager(
+        persist_directory=runtime_config["vector_store_directory"] or "./data/chroma_db",
+        base_url=runtime_config["base_url"] or None,
+        model_name=runtime_config["embedding_model_name"],
+        api_key=runtime_config["api_key"],
+        http_clients=build_http_clients(runtime_config)
+    )
+
+
+def build_evaluator(runtime_config: Dict[str, Any], prompts: Dict[str, str], cascade: bool = True):
+    """Build the evaluator; ``cascade=False`` judges with the strong model only."""
+    from eval_engine.hallucination_evaluator import HallucinationEvaluator
+
+    cascade_settings = (runtime_config.get("judge_cascade") or {}) if cascade else {}
+    claim_extraction = runtime_config.get("claim_extraction") or {}
+    claim_evidence = runtime_config.get("claim_evidence") or {}
+    numeric_precheck = runtime_config.get("numeric_precheck") or {}
+    return HallucinationEvaluator(
+        model_name=runtime_config["chat_model_name"] or None,
+        base_url=runtime_config["base_url"] or None,
+        timeout=120,
+        api_key=runtime_config["api_key"],
+        retrieval_top_k=runtime_config["retrieval_top_k"],
+        overall_prompt=prompts["overall_prompt"],
+        claim_extraction_prompt=prompts["claim_extraction_prompt"],
+        claim_verification_prompt=prompts["claim_verification_prompt"],
+        http_clients=build_http_clients(runtime_config),
+        judge_model=build_chat_router(runtime_config),
+        cascade_model=build_cascade_model(cascade_settings, timeout=120, http_pool_settings=runtime_config.get("http_pool", {})),
+        cascade_policy=CascadePolicy(
+            cascade_settings.get("min_confidence", 0.75),
+            cascade_settings.get("escalate_verdicts")
+        ),
+        claim_extraction_strategy=claim_extraction.get("strategy", "llm"),
+        hybrid_max_chars=claim_extraction.get("hybrid_max_chars", DEFAULT_HYBRID_MAX_CHARS),
+        hybrid_max_claims=claim_extraction.get("hybrid_max_claims", DEFAULT_HYBRID_MAX_CLAIMS),
+        claim_evidence_strategy=claim_evidence.get("strategy", "per_claim"),
+        evidence_pool_size=claim_evidence.get("pool_size", DEFAULT_POOL_SIZE),
+        evidence_min_similarity=claim_evidence.get("min_similarity", DEFAULT_MIN_SIMILARITY),
+        numeric_precheck=numeric_precheck.get("enabled", False),
+        numeric_tolerance=numeric_precheck.get("tolerance", DEFAULT_NUMERIC_TOLERANCE)
+    )
+
+
+def build_engines(runtime_config: Dict[str, Any], prompts: Dict[str, str], cascade: bool = True):
+    """Build the evaluator and RAG engine; ``cascade=False`` judges with the strong model only."""
+    from rag_engine.financial_rag import FinancialRAG
+
+    rag_engine = FinancialRAG(
+        build_vector_store(runtime_config),
+        model_name=runtime_config["chat_model_name"] or None,
+        base_url=runtime_config["base_url"] or None,
+        timeout=120,
+        api_key=runtime_config["api_key"],
+        retrieval_top_k=runtime_config["retrieval_top_k"],
+        http_clients=build_http_clients(runtime_config),
+        llm=build_chat_router(runtime_config)
+    )
+    return build_evaluator(runtime_config, prompts, cascade=cascade), rag_engine
+
+
+def collect_input_files(paths: List[str], recursive: bool, supported_formats: List[str]) -> List[str]:
+    files = []
+    for path in paths:
+        if os.path.isfile(path):
+            files.append(path)
+            continue
+        if not os.path.isdir(path):
+            raise SystemExit(f"Path not found: {path}")
+        for root, dirs, file_names in os.walk(path):
+            for file_name in sorted(file_names):
+                if os.path.splitext(file_name)[1].lower() in supported_formats:
+                    files.append(os.path.join(root, file_name))
+            if not recursive:
+                dirs.clear()
+    return files
+
+
+def run_ingest(args) -> int:
+    from knowledge_base.document_loader import DocumentLoader
+
+    reporter = ProgressReporter(args.progress)
+    runtime_config = load_runtime_config(args.config)
+    loader = DocumentLoader()
+    files = collect_input_files(args.paths, args.recursive, loader.supported_formats)
+    vector_store = build_vector_store(runtime_config)
+    reporter.emit("ingest_start", files=len(files))
+
+    failures = 0
+    total_chunks = 0
+    with open_trace(args, "cli.ingest", files=len(files)) as recorder:
+        for position, file_path in enumerate(files, start=1):
+            try:
+                content = loader.load_file(file_path)
+                chunks = vector_store.text_splitter(
+                    content,
+                    chunk_size=args.chunk_size,
+                    chunk_overlap=args.chunk_overlap
+                )
+                vector_store.add_documents(chunks)
+                total_chunks += len(chunks)
+                reporter.emit("file_done", file=file_path, chunks=len(chunks), completed=position, total=len(files))
+            except Exception as exc:
+                failures += 1
+                reporter.emit("file_failed", file=file_path, error=str(exc), completed=position, total=len(files))
+
+    write_trace(args, recorder, reporter)
+    emit_pool_statistics(reporter)
+    reporter.emit("ingest_done", files=len(files), chunks=total_chunks, failures=failures)
+    return 1 if failures else 0
+
+
+def shard_samples(samples: List[Dict[str, Any]], workers: int) -> List[List[Any]]:
+    """Split samples into contiguous shards, keeping each sample's original position."""
+    if not samples:
+        return []
+    workers = max(1, min(workers, len(samples)))
+    shard_size = -(-len(samples) // workers)
+    positioned = list(enumerate(samples))
+    return [positioned[start:start + shard_size] for start in range(0, len(positioned), shard_size)]
+
+
+def evaluate_shard(
+    shard_index: int,
+    positioned_samples: List[Any],
+    mode: str,
+    runtime_config: Dict[str, Any],
+    prompts: Dict[str, str],
+    shard_path: str,
+    progress_queue,
+    trace_context: Dict[str, str] = None
+):
+    """Worker entry point: evaluate one shard and append results to ``shard_path`` as JSON lines.
+
+    With a ``trace_context`` the shard records its spans under the parent run's trace and
+    sends them back with the ``shard_done`` event.
+    """
+    try:
+        tracing = record_trace("eval.shard", shard=shard_index, **trace_context) if trace_context else nullcontext()
+        with tracing as recorder:
+            evaluator, rag_engine = build_engines(runtime_config, prompts)
+            with open(shard_path, "w", encoding="utf-8") as shard_file:
+                for position, sample in positioned_samples:
+                    result = evaluator.evaluate_sample(sample, rag_engine, mode=mode)
+                    shard_file.write(json.dumps({"position": position, "result": result}, ensure_ascii=False) + "\n")
+                    shard_file.flush()
+                    progress_queue.put(
+                        {"event": "sample_done", "shard": shard_index, "id": sample.get("id"), "is_correct": result.get("is_correct")}
+                    )
+        progress_queue.put(
+            {
+                "event": "shard_done",
+                "shard": shard_index,
+                "spans": recorder.export() if recorder is not None else [],
+                "http_pool": pool_statistics(),
+                "endpoints": router_statistics()
+            }
+        )
+    except Exception as exc:
+        progress_queue.put({"event": "shard_failed", "shard": shard_index, "error": str(exc)})
+
+
+def merge_shard_results(shard_paths: List[str]) -> List[Dict[str, Any]]:
+    positioned = []
+    for shard_path in shard_paths:
+        if not os.path.exists(shard_path):
+            continue
+        with open(shard_path, "r", encoding="utf-8") as shard_file:
+            for line in shard_file:
+                if line.strip():
+                    positioned.append(json.loads(line))
+    positioned.sort(key=lambda item: item["position"])
+    return [item["result"] for item in positioned]
+
+
+def run_sharded_eval(
+    samples,
+    mode,
+    runtime_config,
+    prompts,
+    workers,
+    shard_prefix,
+    reporter,
+    trace_spans: List[Dict[str, Any]] = None
+) -> List[Dict[str, Any]]:
+    """Evaluate shards in worker processes; their spans are appended to ``trace_spans``."""
+    import multiprocessing
+
+    # spawn avoids inheriting HTTP/gRPC client threads from the parent process.
+    context = multiprocessing.get_context("spawn")
+    progress_queue = context.Queue()
+    shards = shard_samples(samples, workers)
+    shard_paths = [f"{shard_prefix}.shard-{index}.jsonl" for index in range(len(shards))]
+    trace_context = current_trace_context()
+    processes = [
+        context.Process(
+            target=evaluate_shard,
+            args=(index, shard, mode, runtime_config, prompts, shard_paths[index], progress_queue, trace_context)
+        )
+        for index, shard in enumerate(shards)
+    ]
+    for process in processes:
+        process.start()
+    reporter.emit("shards_started", shards=len(shards), sizes=[len(shard) for shard in shards])
+
+    completed = 0
+    reported_shards = set()
+    failed_shards = []
+
+    def handle(event):
+        nonlocal completed
+        if event["event"] == "sample_done":
+            completed += 1
+            reporter.emit("sample_done", completed=completed, total=len(samples), shard=event["shard"], id=event["id"])
+            return
+        reported_shards.add(event["shard"])
+        spans = event.pop("spans", [])
+        if trace_spans is not None:
+            trace_spans.extend(spans)
+        if event["event"] == "shard_failed":
+            failed_shards.append(event)
+        reporter.emit(event.pop("event"), **event)
+
+    while len(reported_shards) < len(shards):
+        try:
+            handle(progress_queue.get(timeout=SHARD_POLL_SECONDS))
+            continue
+        except queue.Empty:
+            pass
+        # A worker killed by the OS (OOM, segfault) or failing at spawn never reports back.
+        dead = [index for index, process in enumerate(processes) if index not in reported_shards and not process.is_alive()]
+        if not dead:
+            continue
+        # A worker that exited normally has flushed its last events; read them before judging it dead.
+        try:
+            while True:
+                handle(progress_queue.get(timeout=0.5))
+        except queue.Empty:
+            pass
+        for index in dead:
+            if index not in reported_shards:
+                handle({
+                    "event": "shard_failed",
+                    "shard": index,
+                    "error": f"worker exited with code {processes[index].exitcode} without reporting"
+                })
+
+    for process in processes:
+        process.join()
+
+    results = merge_shard_results(shard_paths)
+    if failed_shards:
+        raise RuntimeError(
+            f"{len(failed_shards)} shard(s) failed; partial results are kept in {shard_prefix}.shard-*.jsonl"
+        )
+    for shard_path in shard_paths:
+        os.remove(shard_path)
+    return results
+
+
+def run_eval(args) -> int:
+    from data_manager.test_set_manager import TestSetManager
+    from eval_engine.hallucination_evaluator import HallucinationEvaluator
+
+    reporter = ProgressReporter(args.progress)
+    runtime_config = load_runtime_config(args.config, require_api_key=not args.dry_run)
+    if args.claim_extractor:
+        runtime_config["claim_extraction"]["strategy"] = args.claim_extractor
+    if args.claim_evidence:
+        runtime_config["claim_evidence"]["strategy"] = args.claim_evidence
+    if args.numeric_precheck:
+        runtime_config["numeric_precheck"]["enabled"] = True
+    prompts = load_prompts(args.prompt_template, args.template_dir)
+    # An in-memory store reads the JSON file without leaving a SQLite file next to it.
+    dataset = TestSetManager(data_path=args.dataset, store_path=":memory:").get_dataset()
+    samples = dataset.get("samples", [])
+    if args.limit:
+        samples = samples[:args.limit]
+    if not samples:
+        raise SystemExit(f"No samples found in {args.dataset}.")
+
+    if args.dry_run:
+        from eval_engine.run_planner import plan_evaluation_run
+
+        cascade_settings = runtime_config.get("judge_cascade") or {}
+        statistics = {"claims_per_answer": None, "seconds_per_call": None, "escalation_rate": None}
+        if args.history_db and os.path.exists(args.history_db):
+            from eval_engine.run_history import RunHistoryStore
+
+            statistics = RunHistoryStore(args.history_db).get_call_statistics(args.mode)
+        plan = plan_evaluation_run(
+            samples,
+            args.mode,
+            prompts,
+            model_name=runtime_config.get("chat_model_name"),
+            retrieval_top_k=int(runtime_config.get("retrieval_top_k", 3)),
+            claims_per_answer=statistics["claims_per_answer"],
+            seconds_per_call=statistics["seconds_per_call"],
+            concurrency=args.workers,
+            llm_extraction_share=llm_extraction_share(
+                samples,
+                runtime_config["claim_extraction"]["strategy"],
+                runtime_config["claim_extraction"]["hybrid_max_chars"],
+                runtime_config["claim_extraction"]["hybrid_max_claims"]
+            ),
+            cascade=bool(cascade_settings),
+            escalation_rate=statistics["escalation_rate"],
+            input_price_per_1k=cascade_settings.get("strong_price_per_1k", 0.0),
+            output_price_per_1k=cascade_settings.get("strong_price_per_1k", 0.0),
+            cheap_input_price_per_1k=cascade_settings.get("cheap_price_per_1k", 0.0),
+            cheap_output_price_per_1k=cascade_settings.get("cheap_price_per_1k", 0.0)
+        )
+        reporter.emit("plan", **plan)
+        return 0
+
+    reporter.emit("eval_start", dataset=dataset.get("dataset_name", ""), mode=args.mode, samples=len(samples), workers=args.workers)
+    started = time.time()
+    shard_spans = []
+    with open_trace(args, "cli.eval", mode=args.mode, samples=len(samples), workers=args.workers) as recorder:
+        if args.target_ci_width > 0:
+            # Adaptive runs decide batch by batch whether to continue, so they stay in-process.
+            evaluator, rag_engine = build_engines(runtime_config, prompts)
+            plan = AdaptiveEvaluationPlan(
+                samples,
+                target_ci_width=args.target_ci_width,
+                max_samples=args.sample_budget or None,
+                batch_size=args.sampling_batch_size
+            )
+            results = []
+            for sample in plan.iter_samples():
+                result = evaluator.evaluate_sample(sample, rag_engine, mode=args.mode)
+                plan.record(result)
+                results.append(result)
+                reporter.emit("sample_done", completed=len(results), total=plan.max_samples, id=sample.get("id"))
+            sampling = plan.summary()
+            sampling.pop("history")
+            reporter.emit("sampling_done", **sampling)
+        elif args.workers > 1:
+            results = run_sharded_eval(
+                samples,
+                args.mode,
+                runtime_config,
+                prompts,
+                args.workers,
+                os.path.splitext(args.output)[0],
+                reporter,
+                trace_spans=shard_spans
+            )
+        else:
+            evaluator, rag_engine = build_engines(runtime_config, prompts)
+            results = []
+            for sample in samples:
+                results.append(evaluator.evaluate_sample(sample, rag_engine, mode=args.mode))
+                reporter.emit("sample_done", completed=len(results), total=len(samples), id=sample.get("id"))
+    write_trace(args, recorder, reporter, shard_spans)
+    emit_pool_statistics(reporter)
+
+    metrics = HallucinationEvaluator.calculate_classification_metrics(results)
+    evidence_pool = summarize_evidence_pool(results)
+    if evidence_pool["samples"]:
+        reporter.emit("evidence_pool", **evidence_pool)
+    if runtime_config["numeric_precheck"]["enabled"]:
+        reporter.emit("numeric_precheck", **summarize_numeric_precheck(results))
+    cascade_settings = runtime_config.get("judge_cascade") or {}
+    if cascade_settings:
+        reporter.emit(
+            "cascade",
+            **summarize_cascade(
+                results,
+                cascade_settings["cheap_price_per_1k"],
+                cascade_settings["strong_price_per_1k"]
+            )
+        )
+        if args.compare_strong_only:
+            # Re-judge the evaluated samples with the strong model alone, in this process.
+            evaluated_ids = {result.get("id") for result in results}
+            strong_evaluator, rag_engine = build_engines(runtime_config, prompts, cascade=False)
+            strong_results = [
+                strong_evaluator.evaluate_sample(sample, rag_engine, mode=args.mode)
+                for sample in samples
+                if sample.get("id") in evaluated_ids
+            ]
+            reporter.emit(
+                "cascade_comparison",
+                cascade_metrics=metrics,
+                strong_only_metrics=HallucinationEvaluator.calculate_classification_metrics(strong_results),
+                cascade_latency_s=round(sum(result["latency_s"] for result in results), 3),
+                strong_only_latency_s=round(sum(result["latency_s"] for result in strong_results), 3),
+                **compare_label_agreement(results, strong_results)
+            )
+    output_directory = os.path.dirname(os.path.abspath(args.output))
+    os.makedirs(output_directory, exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as file:
+        write_export_json(
+            file,
+            results,
+            metrics,
+            args.mode,
+            dataset.get("dataset_name", ""),
+            sanitize_config_snapshot(runtime_config)
+        )
+
+    if args.csv:
+        with open(args.csv, "w", encoding="utf-8", newline="") as file:
+            write_results_csv(file, results)
+
+    if args.history_db:
+        from eval_engine.run_history import RunHistoryStore
+
+        run_id = RunHistoryStore(args.history_db).save_run(
+            results,
+            metrics,
+            args.mode,
+            dataset_name=dataset.get("dataset_name", ""),
+            config_snapshot=sanitize_config_snapshot(runtime_config),
+            prompts=prompts,
+            label=args.prompt_template
+        )
+        reporter.emit("run_recorded", run_id=run_id, history_db=args.history_db)
+
+    reporter.emit("eval_done", output=args.output, samples=len(results), elapsed_s=round(time.time() - started, 3), metrics=metrics)
+    return 0
+
+
+def run_retrieval_bench(args) -> int:
+    from data_manager.test_set_manager import TestSetManager
+    from eval_engine.retrieval_benchmark import run_retrieval_benchmark
+
+    reporter = ProgressReporter(args.progress)
+    runtime_config = load_runtime_config(args.config)
+    samples = TestSetManager(data_path=args.dataset, store_path=":memory:").get_dataset().get("samples", [])
+    if args.limit:
+        samples = samples[:args.limit]
+    if not samples:
+        raise SystemExit(f"No samples found in {args.dataset}.")
+
+    vector_store = build_vector_store(runtime_config)
+    top_k_values = [int(value) for value in args.top_k.split(",") if value.strip()]
+    modes = [mode.strip() for mode in args.modes.split(",") if mode.strip()]
+    reporter.emit("retrieval_bench_start", samples=len(samples), top_k=top_k_values, modes=modes)
+
+    def report_progress(completed: int, total: int):
+        if completed == total or completed % 50 == 0:
+            reporter.emit("search_done", completed=completed, total=total)
+
+    with open_trace(args, "cli.retrieval_bench", samples=len(samples)) as recorder:
+        report = run_retrieval_benchmark(
+            samples,
+            vector_store,
+            top_k_values=top_k_values,
+            modes=modes,
+            target_recall=args.target_recall,
+            match_threshold=args.match_threshold,
+            progress_callback=report_progress
+        )
+    write_trace(args, recorder, reporter)
+    emit_pool_statistics(reporter)
+    for row in report["rows"]:
+        reporter.emit(
+            "retrieval_result",
+            mode=row["mode"],
+            top_k=row["top_k"],
+            recall=round(row["recall"], 4),
+            mrr=round(row["mrr"], 4),
+            p95_ms=round(row["p95_ms"], 1)
+        )
+
+    if args.output:
+        output_directory = os.path.dirname(os.path.abspath(args.output))
+        os.makedirs(output_directory, exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, ensure_ascii=False, indent=2)
+    reporter.emit(
+        "retrieval_bench_done",
+        evaluated=report["evaluated_samples"],
+        skipped=report["skipped_samples"],
+        output=args.output,
+        recommendation=report["recommendation"]
+    )
+    return 0 if report["evaluated_samples"] else 1
+
+
+def run_claim_split_bench(args) -> int:
+    from data_manager.test_set_manager import TestSetManager
+    from eval_engine.claim_splitter import run_claim_split_benchmark
+
+    reporter = ProgressReporter(args.progress)
+    runtime_config = load_runtime_config(args.config)
+    samples = TestSetManager(data_path=args.dataset, store_path=":memory:").get_dataset().get("samples", [])
+    if args.limit:
+        samples = samples[:args.limit]
+    if not samples:
+        raise SystemExit(f"No samples found in {args.dataset}.")
+
+    evaluator = build_evaluator(runtime_config, load_prompts(args.prompt_template, args.template_dir))
+    settings = runtime_config["claim_extraction"]
+    reporter.emit("claim_split_bench_start", samples=len(samples))
+
+    def report_progress(completed: int, total: int):
+        if completed == total or completed % 20 == 0:
+            reporter.emit("extraction_done", completed=completed, total=total)
+
+    with open_trace(args, "cli.claim_split_bench", samples=len(samples)) as recorder:
+        report = run_claim_split_benchmark(
+            samples,
+            evaluator.extract_claims_with_llm,
+            match_threshold=args.match_threshold,
+            max_chars=settings["hybrid_max_chars"],
+            max_claims=settings["hybrid_max_claims"],
+            progress_callback=report_progress
+        )
+    write_trace(args, recorder, reporter)
+    emit_pool_statistics(reporter)
+
+    if args.output:
+        output_directory = os.path.dirname(os.path.abspath(args.output))
+        os.makedirs(output_directory, exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, ensure_ascii=False, indent=2)
+    reporter.emit(
+        "claim_split_bench_done",
+        output=args.output,
+        rule=report["rule"],
+        hybrid_local=report["hybrid_local"],
+        hybrid_local_share=round(report["hybrid_local_share"], 4),
+        rule_ms_per_sample=round(report["rule_ms_per_sample"], 3),
+        llm_ms_per_sample=round(report["llm_ms_per_sample"], 1)
+    )
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Finance RAG headless ingestion and evaluation.")
+    parser.add_argument("--config", default="./config/app_config.json", help="Path of the app config file.")
+    parser.add_argument(
+        "--progress",
+        choices=["text", "json", "none"],
+        default="text",
+        help="text writes to stderr; json writes one event per line to stdout."
+    )
+    parser.add_argument("--trace", default="", help="Record per-stage tracing spans and write them to this file.")
+    parser.add_argument(
+        "--trace-format",
+        choices=["json", "otlp"],
+        default="json",
+        help="json writes spans plus a stage summary; otlp writes an OTLP/JSON trace export."
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    ingest_parser = subparsers.add_parser("ingest", help="Load documents into the vector store.")
+    ingest_parser.add_argument("paths", nargs="+", help="Files or directories to ingest.")
+    ingest_parser.add_argument("--recursive", action="store_true", help="Walk sub-directories.")
+    ingest_parser.add_argument("--chunk-size", type=int, default=500)
+    ingest_parser.add_argument("--chunk-overlap", type=int, default=50)
+    ingest_parser.set_defaults(handler=run_ingest)
+
+    eval_parser = subparsers.add_parser("eval", help="Run a batch evaluation and export the results.")
+    eval_parser.add_argument("--dataset", default="./data/test_set.json", help="Evaluation dataset (JSON or JSONL).")
+    eval_parser.add_argument("--mode", choices=["overall", "claim"], default="overall")
+    eval_parser.add_argument("--workers", type=int, default=1, help="Number of worker processes to shard across.")
+    eval_parser.add_argument("--output", default="./evaluation_results.json", help="Merged JSON export path.")
+    eval_parser.add_argument("--csv", default="", help="Optional CSV export path.")
+    eval_parser.add_argument("--prompt-template", default=PromptTemplateManager.DEFAULT_TEMPLATE_NAME)
+    eval_parser.add_argument("--template-dir", default="./data/prompt_templates")
+    eval_parser.add_argument("--limit", type=int, default=0, help="Only evaluate the first N samples.")
+    eval_parser.add_argument(
+        "--history-db",
+        default="./data/run_history.sqlite3",
+        help="Run history database the finished run is recorded in; pass an empty string to skip."
+    )
+    eval_parser.add_argument(
+        "--target-ci-width",
+        type=float,
+        default=0.0,
+        help="Enable adaptive stratified sampling that stops once the F1 confidence interval is this narrow."
+    )
+    eval_parser.add_argument("--sample-budget", type=int, default=0, help="Maximum samples for adaptive sampling.")
+    eval_parser.add_argument("--sampling-batch-size", type=int, default=20)
+    eval_parser.add_argument(
+        "--claim-extractor",
+        choices=["llm", "rule", "hybrid"],
+        default="",
+        help="Claim extraction strategy for claim mode; defaults to claim_extraction.strategy in the config."
+    )
+    eval_parser.add_argument(
+        "--claim-evidence",
+        choices=["per_claim", "shared_pool"],
+        default="",
+        help="Claim evidence retrieval for claim mode; defaults to claim_evidence.strategy in the config."
+    )
+    eval_parser.add_argument(
+        "--numeric-precheck",
+        action="store_true",
+        help="Judge answers or claims whose numbers clearly contradict the evidence locally, without a judge call."
+    )
+    eval_parser.add_argument(
+        "--compare-strong-only",
+        action="store_true",
+        help="With judge_cascade enabled, also judge the samples with the strong model alone and compare metrics."
+    )
+    eval_parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Only estimate LLM calls, tokens and duration; nothing is sent to the model."
+    )
+    eval_parser.set_defaults(handler=run_eval)
+
+    bench_parser = subparsers.add_parser(
+        "retrieval-bench",
+        help="Measure retrieval recall@k, MRR and latency against the samples' reference_docs."
+    )
+    bench_parser.add_argument("--dataset", default="./data/test_set.json", help="Evaluation dataset (JSON or JSONL).")
+    bench_parser.add_argument("--top-k", default="1,3,5,10", help="Comma-separated top_k values to sweep.")
+    bench_parser.add_argument("--modes", default="similarity,mmr", help="Comma-separated search types.")
+    bench_parser.add_argument("--target-recall", type=float, default=0.8)
+    bench_parser.add_argument(
+        "--match-threshold",
+        type=float,
+        default=0.7,
+        help="Share of a reference snippet's character shingles a chunk must contain to count as a match."
+    )
+    bench_parser.add_argument("--limit", type=int, default=0, help="Only benchmark the first N samples.")
+    bench_parser.add_argument("--output", default="", help="Optional JSON report path.")
+    bench_parser.set_defaults(handler=run_retrieval_bench)
+
+    split_parser = subparsers.add_parser(
+        "claim-split-bench",
+        help="Compare rule-based claim splitting with the LLM claim extractor."
+    )
+    split_parser.add_argument("--dataset", default="./data/test_set.json", help="Evaluation dataset (JSON or JSONL).")
+    split_parser.add_argument("--prompt-template", default=PromptTemplateManager.DEFAULT_TEMPLATE_NAME)
+    split_parser.add_argument("--template-dir", default="./data/prompt_templates")
+    split_parser.add_argument(
+        "--match-threshold",
+        type=float,
+        default=0.5,
+        help="Character-bigram Dice similarity at which a rule claim matches an LLM claim."
+    )
+    split_parser.add_argument("--limit", type=int, default=0, help="Only benchmark the first N samples.")
+    split_parser.add_argument("--output", default="", help="Optional JSON report path.")
+    split_parser.set_defaults(handler=run_claim_split_bench)
+    return parser
+
+
+def main(argv: List[str] = None) -> int:
+    args = build_parser().parse_args(argv)
+    try:
+        return args.handler(args)
+    except RuntimeError as exc:
+        sys.stderr.write(f"error: {exc}\n")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,12 +1,73 @@
 import json
 import os
+import threading
 from copy import deepcopy
-from typing import Dict
+from typing import Callable, Dict, List
+
+from eval_engine.judge_cascade import DEFAULT_ESCALATE_VERDICTS, DEFAULT_MIN_CONFIDENCE
+from eval_engine.numeric_check import DEFAULT_NUMERIC_TOLERANCE
+from eval_engine.strategy_defaults import (
+    CLAIM_EVIDENCE_STRATEGIES,
+    CLAIM_EXTRACTION_STRATEGIES,
+    DEFAULT_HYBRID_MAX_CHARS,
+    DEFAULT_HYBRID_MAX_CLAIMS,
+    DEFAULT_MIN_SIMILARITY,
+    DEFAULT_POOL_SIZE
+)
+from http_pool import DEFAULT_POOL_SETTINGS, normalize_pool_settings
+
+DEFAULT_ROUTING = {
+    "enabled": False,
+    "strategy": "least_outstanding",
+    "failure_threshold": 3,
+    "ejection_seconds": 30.0,
+    "endpoints": []
+}
+ROUTING_STRATEGIES = ["least_outstanding", "weighted"]
+DEFAULT_CLAIM_EXTRACTION = {
+    "strategy": "llm",
+    "hybrid_max_chars": DEFAULT_HYBRID_MAX_CHARS,
+    "hybrid_max_claims": DEFAULT_HYBRID_MAX_CLAIMS
+}
+DEFAULT_CLAIM_EVIDENCE = {
+    "strategy": "per_claim",
+    "pool_size": DEFAULT_POOL_SIZE,
+    "min_similarity": DEFAULT_MIN_SIMILARITY
+}
+DEFAULT_NUMERIC_PRECHECK = {
+    "enabled": False,
+    "tolerance": DEFAULT_NUMERIC_TOLERANCE
+}
+DEFAULT_JUDGE_CASCADE = {
+    "enabled": False,
+    "provider": "",
+    "chat_model_name": "",
+    "api_key": "",
+    "min_confidence": DEFAULT_MIN_CONFIDENCE,
+    "escalate_verdicts": list(DEFAULT_ESCALATE_VERDICTS),
+    "cheap_price_per_1k": 0.0,
+    "strong_price_per_1k": 0.0
+}
 
 
 class AppConfigManager:
+    """Loads and saves the app config file.
+
+    The normalized config is cached together with the file's mtime and size, so repeated
+    reads only stat the file (or nothing at all while ``start_watching`` is polling it),
+    and the file is only written when its normalized content actually changes.
+    ``version`` increases each time the content changes.
+    """
+
     def __init__(self, config_path: str = "./config/app_config.json"):
         self.config_path = config_path
+        self.version = 0
+        self._lock = threading.RLock()
+        self._cached_config = None
+        self._cached_signature = None
+        self._listeners = {}
+        self._stop_event = threading.Event()
+        self._watch_thread = None
 
     def get_empty_config(self) -> Dict[str, object]:
         return {
@@ -19,7 +80,13 @@ class AppConfigManager:
                 "vector_store_directory": "",
                 "retrieval_top_k": 3
             },
-            "provider_presets": {}
+            "provider_presets": {},
+            "http_pool": dict(DEFAULT_POOL_SETTINGS),
+            "routing": deepcopy(DEFAULT_ROUTING),
+            "judge_cascade": deepcopy(DEFAULT_JUDGE_CASCADE),
+            "claim_extraction": dict(DEFAULT_CLAIM_EXTRACTION),
+            "claim_evidence": dict(DEFAULT_CLAIM_EVIDENCE),
+            "numeric_precheck": dict(DEFAULT_NUMERIC_PRECHECK)
         }
 
     def _normalize_provider_presets(self, provider_presets: object) -> Dict[str, Dict[str, str]]:
@@ -65,6 +132,104 @@ class AppConfigManager:
             "retrieval_top_k": retrieval_top_k
         }
 
+    def _normalize_routing(self, routing: object) -> Dict[str, object]:
+        routing = routing if isinstance(routing, dict) else {}
+        normalized = deepcopy(DEFAULT_ROUTING)
+        normalized["enabled"] = routing.get("enabled", False) is True
+        if routing.get("strategy") in ROUTING_STRATEGIES:
+            normalized["strategy"] = routing["strategy"]
+        try:
+            normalized["failure_threshold"] = max(1, int(routing.get("failure_threshold", 3)))
+        except (TypeError, ValueError):
+            pass
+        try:
+            normalized["ejection_seconds"] = max(1.0, float(routing.get("ejection_seconds", 30.0)))
+        except (TypeError, ValueError):
+            pass
+
+        endpoints = routing.get("endpoints", [])
+        seen = set()
+        for endpoint in endpoints if isinstance(endpoints, list) else []:
+            if not isinstance(endpoint, dict):
+                continue
+            provider = str(endpoint.get("provider", "") or "").strip()
+            if not provider or provider in seen:
+                continue
+            seen.add(provider)
+            try:
+                weight = max(0.01, float(endpoint.get("weight", 1.0)))
+            except (TypeError, ValueError):
+                weight = 1.0
+            normalized["endpoints"].append({
+                "provider": provider,
+                "weight": weight,
+                "chat_model_name": str(endpoint.get("chat_model_name", "") or "").strip(),
+                "api_key": str(endpoint.get("api_key", "") or "").strip()
+            })
+        return normalized
+
+    def _normalize_judge_cascade(self, cascade: object) -> Dict[str, object]:
+        cascade = cascade if isinstance(cascade, dict) else {}
+        normalized = deepcopy(DEFAULT_JUDGE_CASCADE)
+        normalized["enabled"] = cascade.get("enabled", False) is True
+        for key in ("provider", "chat_model_name", "api_key"):
+            normalized[key] = str(cascade.get(key, "") or "").strip()
+        try:
+            normalized["min_confidence"] = min(1.0, max(0.0, float(cascade.get("min_confidence", DEFAULT_MIN_CONFIDENCE))))
+        except (TypeError, ValueError):
+            pass
+        verdicts = cascade.get("escalate_verdicts", DEFAULT_ESCALATE_VERDICTS)
+        if isinstance(verdicts, list):
+            normalized["escalate_verdicts"] = [
+                str(verdict).strip().lower() for verdict in verdicts if str(verdict or "").strip()
+            ]
+        for key in ("cheap_price_per_1k", "strong_price_per_1k"):
+            try:
+                normalized[key] = max(0.0, float(cascade.get(key, 0.0)))
+            except (TypeError, ValueError):
+                pass
+        return normalized
+
+    def _normalize_claim_extraction(self, claim_extraction: object) -> Dict[str, object]:
+        claim_extraction = claim_extraction if isinstance(claim_extraction, dict) else {}
+        normalized = dict(DEFAULT_CLAIM_EXTRACTION)
+        if claim_extraction.get("strategy") in CLAIM_EXTRACTION_STRATEGIES:
+            normalized["strategy"] = claim_extraction["strategy"]
+        for key in ("hybrid_max_chars", "hybrid_max_claims"):
+            try:
+                normalized[key] = max(1, int(claim_extraction.get(key, DEFAULT_CLAIM_EXTRACTION[key])))
+            except (TypeError, ValueError):
+                pass
+        return normalized
+
+    def _normalize_claim_evidence(self, claim_evidence: object) -> Dict[str, object]:
+        claim_evidence = claim_evidence if isinstance(claim_evidence, dict) else {}
+        normalized = dict(DEFAULT_CLAIM_EVIDENCE)
+        if claim_evidence.get("strategy") in CLAIM_EVIDENCE_STRATEGIES:
+            normalized["strategy"] = claim_evidence["strategy"]
+        try:
+            normalized["pool_size"] = max(1, int(claim_evidence.get("pool_size", DEFAULT_POOL_SIZE)))
+        except (TypeError, ValueError):
+            pass
+        try:
+            normalized["min_similarity"] = min(
+                1.0,
+                max(-1.0, float(claim_evidence.get("min_similarity", DEFAULT_MIN_SIMILARITY)))
+            )
+        except (TypeError, ValueError):
+            pass
+        return normalized
+
+    def _normalize_numeric_precheck(self, numeric_precheck: object) -> Dict[str, object]:
+        numeric_precheck = numeric_precheck if isinstance(numeric_precheck, dict) else {}
+        normalized = dict(DEFAULT_NUMERIC_PRECHECK)
+        normalized["enabled"] = numeric_precheck.get("enabled", False) is True
+        try:
+            normalized["tolerance"] = max(0.0, float(numeric_precheck.get("tolerance", DEFAULT_NUMERIC_TOLERANCE)))
+        except (TypeError, ValueError):
+            pass
+        return normalized
+
     def _normalize_config(self, config: object) -> Dict[str, object]:
         empty_config = self.get_empty_config()
         if not isinstance(config, dict):
@@ -74,42 +239,214 @@ class AppConfigManager:
         runtime = self._normalize_runtime(config.get("runtime", {}), provider_presets)
         return {
             "runtime": runtime,
-            "provider_presets": provider_presets
+            "provider_presets": provider_presets,
+            "http_pool": normalize_pool_settings(config.get("http_pool", {})),
+            "routing": self._normalize_routing(config.get("routing", {})),
+            "judge_cascade": self._normalize_judge_cascade(config.get("judge_cascade", {})),
+            "claim_extraction": self._normalize_claim_extraction(config.get("claim_extraction", {})),
+            "claim_evidence": self._normalize_claim_evidence(config.get("claim_evidence", {})),
+            "numeric_precheck": self._normalize_numeric_precheck(config.get("numeric_precheck", {}))
         }
 
-    def load_config(self) -> Dict[str, object]:
-        if not os.path.exists(self.config_path):
-            empty_config = self.get_empty_config()
-            self.save_config(empty_config)
-            return empty_config
+    def _file_signature(self):
+        try:
+            stat = os.stat(self.config_path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _read_config(self) -> Dict[str, object]:
+        signature = self._file_signature()
+        if signature is None:
+            return self._write_config(self.get_empty_config())
 
         try:
             with open(self.config_path, "r", encoding="utf-8") as file:
                 config = json.load(file)
-        except (json.JSONDecodeError, OSError):
-            config = self.get_empty_config()
+        except (json.JSONDecodeError, OSError) as exc:
+            # A half-finished manual edit must not blank the running config or the user's file:
+            # keep the last good config (or an empty one in memory) until the file parses again.
+            print(f"Ignoring unreadable config {self.config_path}: {exc}")
+            if self._cached_config is not None:
+                with self._lock:
+                    self._cached_signature = signature
+                return self._cached_config
+            empty_config = self.get_empty_config()
+            self._update_cache(empty_config, signature)
+            return empty_config
 
         normalized = self._normalize_config(config)
         if normalized != config:
-            self.save_config(normalized)
+            return self._write_config(normalized)
+        self._update_cache(normalized, signature)
         return normalized
 
-    def save_config(self, config: Dict[str, object]) -> Dict[str, object]:
-        normalized = self._normalize_config(config)
-        os.makedirs(os.path.dirname(self.config_path), exist_ok=True)
-        with open(self.config_path, "w", encoding="utf-8") as file:
+    def _write_config(self, normalized: Dict[str, object]) -> Dict[str, object]:
+        directory = os.path.dirname(self.config_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Write to a sibling file and rename it so a watcher never reads a half-written file.
+        temp_path = f"{self.config_path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
             json.dump(normalized, file, ensure_ascii=False, indent=2)
+        os.replace(temp_path, self.config_path)
+        self._update_cache(normalized, self._file_signature())
         return normalized
 
+    def _update_cache(self, normalized: Dict[str, object], signature):
+        with self._lock:
+            changed = self._cached_config is not None and normalized != self._cached_config
+            self._cached_config = normalized
+            self._cached_signature = signature
+            if changed:
+                self.version += 1
+            listeners = list(self._listeners.values()) if changed else []
+        for listener in listeners:
+            try:
+                listener(deepcopy(normalized))
+            except Exception as exc:
+                print(f"Config change listener failed: {exc}")
+
+    def _get_cached_config(self) -> Dict[str, object]:
+        # While the watcher runs it owns change detection, so reads never touch the disk.
+        if self._cached_config is not None and (
+            self.is_watching() or self._file_signature() == self._cached_signature
+        ):
+            return self._cached_config
+        return self._read_config()
+
+    def load_config(self) -> Dict[str, object]:
+        return deepcopy(self._get_cached_config())
+
+    def save_config(self, config: Dict[str, object]) -> Dict[str, object]:
+        normalized = self._normalize_config(config)
+        if normalized == self._cached_config and self._file_signature() == self._cached_signature:
+            return deepcopy(normalized)
+        return deepcopy(self._write_config(normalized))
+
+    def check_for_changes(self) -> bool:
+        """Reload the config if the file changed on disk; return whether its content changed."""
+        if self._file_signature() == self._cached_signature:
+            return False
+        version = self.version
+        self._read_config()
+        return self.version != version
+
+    def add_change_listener(self, callback: Callable[[Dict[str, object]], None], name: str = None):
+        """Call ``callback(config)`` whenever the normalized config content changes.
+
+        Listeners are keyed by ``name`` (default: the callback's qualified name), so
+        registering again on every Streamlit rerun replaces instead of duplicating.
+        """
+        with self._lock:
+            self._listeners[name or callback.__qualname__] = callback
+
+    def is_watching(self) -> bool:
+        return self._watch_thread is not None and self._watch_thread.is_alive()
+
+    def start_watching(self, interval: float = 2.0):
+        """Poll the config file's mtime and size in a daemon thread for hot reload."""
+        if self.is_watching():
+            return
+        self._get_cached_config()
+        self._stop_event.clear()
+
+        def watch():
+            while not self._stop_event.wait(interval):
+                try:
+                    self.check_for_changes()
+                except OSError as exc:
+                    print(f"Config watcher failed to read {self.config_path}: {exc}")
+
+        self._watch_thread = threading.Thread(target=watch, name="config-watcher", daemon=True)
+        self._watch_thread.start()
+
+    def stop_watching(self):
+        self._stop_event.set()
+        if self._watch_thread is not None:
+            self._watch_thread.join()
+            self._watch_thread = None
+
     def save_runtime_config(self, runtime_config: Dict[str, object]) -> Dict[str, object]:
         current_config = self.load_config()
         current_config["runtime"] = runtime_config
         return self.save_config(current_config)
 
     def get_runtime_config(self, config: Dict[str, object] = None) -> Dict[str, object]:
-        config = self.load_config() if config is None else self._normalize_config(config)
+        config = self._get_cached_config() if config is None else self._normalize_config(config)
         return deepcopy(config["runtime"])
 
+    def get_http_pool_settings(self, config: Dict[str, object] = None) -> Dict[str, object]:
+        config = self._get_cached_config() if config is None else self._normalize_config(config)
+        return deepcopy(config["http_pool"])
+
+    def get_routing_endpoints(self, config: Dict[str, object] = None) -> List[Dict[str, object]]:
+        """Endpoints to balance chat calls over, resolved against ``provider_presets``.
+
+        Empty unless routing is enabled. Each endpoint takes its base URL and chat model
+        from its provider preset (or its own ``chat_model_name``), and falls back to the
+        runtime API key when it has none of its own.
+        """
+        config = self._get_cached_config() if config is None else self._normalize_config(config)
+        routing = config["routing"]
+        if not routing["enabled"]:
+            return []
+        endpoints = []
+        for endpoint in routing["endpoints"]:
+            preset = config["provider_presets"].get(endpoint["provider"])
+            if not preset or not preset["base_url"]:
+                continue
+            endpoints.append({
+                "name": endpoint["provider"],
+                "base_url": preset["base_url"],
+                "model_name": endpoint["chat_model_name"] or preset["chat_model_name"],
+                "api_key": endpoint["api_key"] or config["runtime"]["api_key"],
+                "weight": endpoint["weight"]
+            })
+        return endpoints
+
+    def get_routing_settings(self, config: Dict[str, object] = None) -> Dict[str, object]:
+        config = self._get_cached_config() if config is None else self._normalize_config(config)
+        return {key: value for key, value in config["routing"].items() if key != "endpoints"}
+
+    def get_judge_cascade_settings(self, config: Dict[str, object] = None) -> Dict[str, object]:
+        """Cheap first-pass judge model and escalation thresholds; empty unless the cascade is on.
+
+        The cheap model uses its provider preset's base URL (the runtime one when no provider
+        is set) with ``chat_model_name`` or the preset's chat model, and the runtime API key
+        when it has none of its own.
+        """
+        config = self._get_cached_config() if config is None else self._normalize_config(config)
+        cascade = config["judge_cascade"]
+        if not cascade["enabled"]:
+            return {}
+        runtime = config["runtime"]
+        preset = config["provider_presets"].get(cascade["provider"], {}) if cascade["provider"] else {}
+        model_name = cascade["chat_model_name"] or preset.get("chat_model_name", "")
+        if not model_name:
+            return {}
+        return {
+            "base_url": preset.get("base_url", "") or runtime["base_url"],
+            "model_name": model_name,
+            "api_key": cascade["api_key"] or runtime["api_key"],
+            "min_confidence": cascade["min_confidence"],
+            "escalate_verdicts": list(cascade["escalate_verdicts"]),
+            "cheap_price_per_1k": cascade["cheap_price_per_1k"],
+            "strong_price_per_1k": cascade["strong_price_per_1k"]
+        }
+
+    def get_claim_extraction_settings(self, config: Dict[str, object] = None) -> Dict[str, object]:
+        config = self._get_cached_config() if config is None else self._normalize_config(config)
+        return dict(config["claim_extraction"])
+
+    def get_numeric_precheck_settings(self, config: Dict[str, object] = None) -> Dict[str, object]:
+        config = self._get_cached_config() if config is None else self._normalize_config(config)
+        return dict(config["numeric_precheck"])
+
+    def get_claim_evidence_settings(self, config: Dict[str, object] = None) -> Dict[str, object]:
+        config = self._get_cached_config() if config is None else self._normalize_config(config)
+        return dict(config["claim_evidence"])
+
     def get_provider_presets(self, config: Dict[str, object] = None) -> Dict[str, Dict[str, str]]:
-        config = self.load_config() if config is None else self._normalize_config(config)
+        config = self._get_cached_config() if config is None else self._normalize_config(config)
         return deepcopy(config["provider_presets"])
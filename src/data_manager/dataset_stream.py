@@ -0,0 +1,148 @@
+import io
+import json
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Tuple
+
+_DECODER = json.JSONDecoder()
+_WHITESPACE = " \t\r\n"
+
+
+@contextmanager
+def open_text_stream(file_obj):
+    """Yield a UTF-8 text stream over a str, bytes, text stream or binary file-like object."""
+    if isinstance(file_obj, str):
+        yield io.StringIO(file_obj)
+        return
+    if isinstance(file_obj, (bytes, bytearray, memoryview)):
+        yield io.TextIOWrapper(io.BytesIO(file_obj), encoding="utf-8-sig")
+        return
+    if isinstance(file_obj, io.TextIOBase):
+        yield file_obj
+        return
+
+    wrapper = io.TextIOWrapper(file_obj, encoding="utf-8-sig")
+    try:
+        yield wrapper
+    finally:
+        # Detach so the caller's stream stays open.
+        wrapper.detach()
+
+
+class JsonStreamReader:
+    """Incremental reader for one JSON document, decoding one value at a time.
+
+    Only the current value and the unread tail of the last chunk are held in memory,
+    so the elements of a very large array can be consumed one by one.
+    """
+
+    def __init__(self, stream, chunk_size: int = 1 << 20, max_value_chars: int = 64 << 20):
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.max_value_chars = max_value_chars
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self) -> bool:
+        if self.eof:
+            return False
+        chunk = self.stream.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, allowed: str) -> str:
+        char = self.peek()
+        if not char or char not in allowed:
+            found = repr(char) if char else "end of file"
+            raise ValueError(f"Expected one of {list(allowed)} but found {found}.")
+        self.pos += 1
+        return char
+
+    def decode_value(self) -> Any:
+        self.peek()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if len(self.buffer) - self.pos > self.max_value_chars or not self._fill():
+                    raise
+                continue
+            # A number that ends exactly at the chunk boundary may continue in the next chunk.
+            if end == len(self.buffer) and self._fill():
+                continue
+            self.pos = end
+            return value
+
+    def iter_array(self) -> Iterator[Tuple[int, Any]]:
+        """Yield ``(position, value)`` for each element of the array at the cursor, 1-based."""
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        position = 0
+        while True:
+            position += 1
+            try:
+                value = self.decode_value()
+            except json.JSONDecodeError as exc:
+                raise ValueError(f"Sample #{position} is not valid JSON: {exc.msg}.") from exc
+            yield position, value
+            try:
+                closing = self.expect(",]")
+            except ValueError as exc:
+                raise ValueError(f"Invalid JSON after sample #{position}: {exc}") from exc
+            if closing == "]":
+                return
+
+
+def iter_dataset_samples(file_obj, file_name: str, meta: Dict[str, Any]) -> Iterator[Tuple[int, Any]]:
+    """Yield ``(position, raw_sample)`` from a JSON or JSONL dataset without loading it whole.
+
+    Supported shapes are ``{"dataset_name": ..., "samples": [...]}``, a bare JSON array of
+    samples and JSON lines (one sample per line, selected by a ``.jsonl`` file name).
+    Top-level fields other than ``samples`` are stored into ``meta`` as they are read.
+    """
+    with open_text_stream(file_obj) as stream:
+        if (file_name or "").lower().endswith(".jsonl"):
+            for line_number, line in enumerate(stream, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    yield line_number, json.loads(line)
+                except json.JSONDecodeError as exc:
+                    raise ValueError(f"Line {line_number} is not valid JSON: {exc.msg}.") from exc
+            return
+
+        reader = JsonStreamReader(stream)
+        first_char = reader.peek()
+        if first_char == "[":
+            yield from reader.iter_array()
+            return
+        if first_char != "{":
+            raise ValueError("Dataset must be a JSON object, a JSON array of samples or JSON lines.")
+
+        reader.expect("{")
+        if reader.peek() == "}":
+            return
+        while True:
+            key = reader.decode_value()
+            reader.expect(":")
+            if key == "samples" and reader.peek() == "[":
+                yield from reader.iter_array()
+            else:
+                meta[key] = reader.decode_value()
+            if reader.expect(",}") == "}":
+                return
@@ -0,0 +1,164 @@
+import re
+from typing import Any, List, Sequence, Tuple
+
+import numpy as np
+
+_HASH_BASE = np.uint64(1099511628211)
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    return _WHITESPACE_PATTERN.sub(" ", (text or "").lower()).strip()
+
+
+def shingle_hashes(text: str, shingle_size: int = 5) -> np.ndarray:
+    """Return the distinct 32-bit hashes of the character ``shingle_size``-grams of ``text``.
+
+    Character shingles work for Chinese and English alike. The rolling polynomial hash is
+    computed for all windows at once, one vectorized step per character of the window.
+    """
+    codes = np.frombuffer(normalize_text(text).encode("utf-32-le"), dtype="<u4").astype(np.uint64)
+    window = min(shingle_size, len(codes)) or 1
+    if not len(codes):
+        codes = np.zeros(1, dtype=np.uint64)
+    count = len(codes) - window + 1
+    hashes = np.zeros(count, dtype=np.uint64)
+    with np.errstate(over="ignore"):
+        for offset in range(window):
+            hashes = hashes * _HASH_BASE + codes[offset:offset + count]
+    return np.unique((hashes ^ (hashes >> np.uint64(32))) & np.uint64(0xFFFFFFFF))
+
+
+class MinHasher:
+    """MinHash signatures with ``num_perm`` multiply-shift hash functions.
+
+    Shingles of many texts are hashed together in chunks and reduced per text with
+    ``np.minimum.reduceat``, so signing is a handful of numpy calls per chunk.
+    """
+
+    CHUNK_SHINGLES = 1 << 14
+
+    def __init__(self, num_perm: int = 128, shingle_size: int = 5, seed: int = 1):
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self._a = (rng.integers(0, 1 << 63, size=num_perm, dtype=np.uint64) << np.uint64(1)) | np.uint64(1)
+        self._b = rng.integers(0, 1 << 63, size=num_perm, dtype=np.uint64)
+
+    def _sign_chunk(self, shingles: List[np.ndarray]) -> np.ndarray:
+        offsets = np.cumsum([0] + [len(item) for item in shingles[:-1]])
+        values = np.concatenate(shingles)
+        with np.errstate(over="ignore"):
+            hashed = (self._a[:, None] * values[None, :] + self._b[:, None]) >> np.uint64(32)
+        return np.minimum.reduceat(hashed, offsets, axis=1).T.astype(np.uint32)
+
+    def signatures(self, texts: Sequence[str]) -> np.ndarray:
+        """Return an ``(len(texts), num_perm)`` uint32 signature matrix."""
+        blocks = []
+        pending = []
+        pending_size = 0
+        for text in texts:
+            shingles = shingle_hashes(text, self.shingle_size)
+            pending.append(shingles)
+            pending_size += len(shingles)
+            if pending_size >= self.CHUNK_SHINGLES:
+                blocks.append(self._sign_chunk(pending))
+                pending = []
+                pending_size = 0
+        if pending:
+            blocks.append(self._sign_chunk(pending))
+        if not blocks:
+            return np.zeros((0, self.num_perm), dtype=np.uint32)
+        return np.vstack(blocks)
+
+
+def choose_lsh_bands(num_perm: int, threshold: float) -> Tuple[int, int]:
+    """Pick ``(bands, rows)`` whose LSH threshold ``(1 / bands) ** (1 / rows)`` is the
+    highest one not above ``threshold``, so pairs at the threshold are rarely missed."""
+    options = [
+        (num_perm // rows, rows)
+        for rows in range(1, num_perm + 1)
+        if num_perm % rows == 0
+    ]
+    below = [option for option in options if (1 / option[0]) ** (1 / option[1]) <= threshold]
+    if not below:
+        return options[0]
+    return max(below, key=lambda option: (1 / option[0]) ** (1 / option[1]))
+
+
+class _UnionFind:
+    def __init__(self, size: int):
+        self.parent = list(range(size))
+
+    def find(self, item: int) -> int:
+        root = item
+        while self.parent[root] != root:
+            root = self.parent[root]
+        while self.parent[item] != root:
+            self.parent[item], item = root, self.parent[item]
+        return root
+
+    def union(self, left: int, right: int):
+        left_root = self.find(left)
+        right_root = self.find(right)
+        if left_root != right_root:
+            # Keep the earliest position as the root so clusters are led by their first sample.
+            if left_root < right_root:
+                self.parent[right_root] = left_root
+            else:
+                self.parent[left_root] = right_root
+
+
+def find_near_duplicate_clusters(
+    texts: Sequence[str],
+    threshold: float = 0.8,
+    num_perm: int = 128,
+    shingle_size: int = 5,
+    partition_keys: Sequence[Any] = None,
+    seed: int = 1
+) -> List[List[int]]:
+    """Group texts whose estimated Jaccard similarity is at least ``threshold``.
+
+    Signatures are split into LSH bands; texts that share a band bucket are candidates and
+    are compared with the first text of the bucket on their full signatures. Accepted pairs
+    are merged with union-find, so the cost grows with the number of texts rather than the
+    number of pairs. Texts with different ``partition_keys`` are never merged.
+    Returns clusters of at least two positions, each sorted and ordered by first position.
+    """
+    if len(texts) < 2:
+        return []
+
+    signatures = MinHasher(num_perm, shingle_size, seed).signatures(texts)
+    bands, rows = choose_lsh_bands(num_perm, threshold)
+    keys = np.asarray(
+        partition_keys if partition_keys is not None else np.zeros(len(texts), dtype=np.int64)
+    )
+    union_find = _UnionFind(len(texts))
+
+    for band in range(bands):
+        band_values = np.ascontiguousarray(signatures[:, band * rows:(band + 1) * rows])
+        buckets = np.unique(
+            band_values.view(np.dtype((np.void, band_values.dtype.itemsize * rows))).ravel(),
+            return_inverse=True
+        )[1].ravel()
+        order = np.argsort(buckets, kind="stable")
+        sorted_buckets = buckets[order]
+        starts = np.flatnonzero(np.r_[True, sorted_buckets[1:] != sorted_buckets[:-1]])
+        leaders = order[np.repeat(starts, np.diff(np.r_[starts, len(order)]))]
+        candidates = order != leaders
+        members, leaders = order[candidates], leaders[candidates]
+        if not len(members):
+            continue
+
+        similarity = (signatures[members] == signatures[leaders]).mean(axis=1)
+        accepted = (similarity >= threshold) & (keys[members] == keys[leaders])
+        for member, leader in zip(members[accepted].tolist(), leaders[accepted].tolist()):
+            union_find.union(leader, member)
+
+    clusters = {}
+    for position in range(len(texts)):
+        clusters.setdefault(union_find.find(position), []).append(position)
+    return sorted(
+        (cluster for cluster in clusters.values() if len(cluster) > 1),
+        key=lambda cluster: cluster[0]
+    )
@@ -0,0 +1,232 @@
+import json
+import os
+import sqlite3
+import threading
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+
+class SampleStore:
+    """SQLite storage for one evaluation dataset.
+
+    Samples keep their insertion order through an autoincrement sequence. The sample id is
+    stored as text under a unique index, with a separate indexed integer column for numeric
+    ids, so appends, deletes, id lookups and the next free id never scan the dataset. The
+    largest numeric id ever stored is kept in ``id_high_water`` so deleted ids are not handed
+    out again. Deleted ids are kept in ``deleted_samples`` so that merging the JSON file back
+    in does not restore them. Dataset-level fields (name, KB version, retrieval config) live
+    in ``dataset_meta``.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(self.db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._connection = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._connection.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS dataset_meta (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            );
+
+            CREATE TABLE IF NOT EXISTS samples (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                sample_key TEXT NOT NULL UNIQUE,
+                numeric_id INTEGER,
+                label TEXT NOT NULL,
+                source_model TEXT NOT NULL,
+                data TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_samples_numeric_id ON samples (numeric_id);
+            CREATE INDEX IF NOT EXISTS idx_samples_label ON samples (label);
+            CREATE INDEX IF NOT EXISTS idx_samples_source_model ON samples (source_model);
+
+            CREATE TABLE IF NOT EXISTS id_high_water (
+                singleton INTEGER PRIMARY KEY CHECK (singleton = 0),
+                max_id INTEGER NOT NULL
+            );
+            INSERT OR IGNORE INTO id_high_water
+                SELECT 0, COALESCE(MAX(numeric_id), 0) FROM samples;
+
+            CREATE TABLE IF NOT EXISTS deleted_samples (
+                sample_key TEXT PRIMARY KEY
+            );
+            """
+        )
+        self._connection.commit()
+
+    def _raise_high_water(self):
+        self._connection.execute(
+            "UPDATE id_high_water SET max_id = MAX(max_id, (SELECT COALESCE(MAX(numeric_id), 0) FROM samples))"
+        )
+
+    @staticmethod
+    def sample_key(sample_id: Any) -> str:
+        return str(sample_id)
+
+    def _sample_row(self, sample: Dict[str, Any]):
+        sample_id = sample.get("id")
+        numeric_id = sample_id if isinstance(sample_id, int) and not isinstance(sample_id, bool) else None
+        return (
+            self.sample_key(sample_id),
+            numeric_id,
+            sample.get("label", ""),
+            sample.get("source_model", ""),
+            json.dumps(sample, ensure_ascii=False)
+        )
+
+    def get_meta(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            row = self._connection.execute("SELECT value FROM dataset_meta WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row is not None else default
+
+    def set_meta(self, values: Dict[str, Any]):
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO dataset_meta VALUES (?, ?)",
+                [(key, json.dumps(value, ensure_ascii=False)) for key, value in values.items()]
+            )
+
+    def replace_all(self, meta: Dict[str, Any], samples: Iterable[Dict[str, Any]]):
+        """Replace the whole dataset in one transaction.
+
+        ``samples`` may be a generator; rows are inserted as it yields them. ``meta`` is only
+        read after the samples are exhausted, so a streaming importer can fill it in while
+        reading. An exception raised by the generator rolls the whole replacement back.
+        """
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM samples")
+            self._connection.execute("DELETE FROM dataset_meta")
+            self._connection.execute("DELETE FROM deleted_samples")
+            self._connection.executemany(
+                "INSERT INTO samples (sample_key, numeric_id, label, source_model, data) VALUES (?, ?, ?, ?, ?)",
+                (self._sample_row(sample) for sample in samples)
+            )
+            self._raise_high_water()
+            self._connection.executemany(
+                "INSERT INTO dataset_meta VALUES (?, ?)",
+                [(key, json.dumps(value, ensure_ascii=False)) for key, value in meta.items()]
+            )
+
+    def merge(self, meta: Dict[str, Any], samples: Iterable[Dict[str, Any]]):
+        """Insert or update samples by id in one transaction, keeping samples not in ``samples``.
+
+        An updated sample keeps its position and deleted ids are skipped; ``meta`` keys are
+        overwritten, others kept. Like ``replace_all``, ``meta`` is read after the samples and
+        a generator error rolls back.
+        """
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "INSERT INTO samples (sample_key, numeric_id, label, source_model, data) "
+                "SELECT ?, ?, ?, ?, ? WHERE NOT EXISTS (SELECT 1 FROM deleted_samples WHERE sample_key = ?) "
+                "ON CONFLICT (sample_key) DO UPDATE SET numeric_id = excluded.numeric_id, "
+                "label = excluded.label, source_model = excluded.source_model, data = excluded.data",
+                ((*row, row[0]) for row in (self._sample_row(sample) for sample in samples))
+            )
+            self._raise_high_water()
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO dataset_meta VALUES (?, ?)",
+                [(key, json.dumps(value, ensure_ascii=False)) for key, value in meta.items()]
+            )
+
+    def append(self, sample: Dict[str, Any]):
+        """Append one sample; raises ValueError if its id is already taken."""
+        try:
+            with self._lock, self._connection:
+                self._connection.execute(
+                    "INSERT INTO samples (sample_key, numeric_id, label, source_model, data) VALUES (?, ?, ?, ?, ?)",
+                    self._sample_row(sample)
+                )
+                self._connection.execute(
+                    "DELETE FROM deleted_samples WHERE sample_key = ?",
+                    (self.sample_key(sample.get("id")),)
+                )
+                self._raise_high_water()
+        except sqlite3.IntegrityError as exc:
+            raise ValueError(f"Sample id {sample.get('id')} already exists.") from exc
+
+    def delete(self, sample_id: Any) -> bool:
+        sample_key = self.sample_key(sample_id)
+        with self._lock, self._connection:
+            cursor = self._connection.execute("DELETE FROM samples WHERE sample_key = ?", (sample_key,))
+            if cursor.rowcount > 0:
+                self._connection.execute("INSERT OR IGNORE INTO deleted_samples VALUES (?)", (sample_key,))
+        return cursor.rowcount > 0
+
+    def delete_many(self, sample_ids: Iterable[Any]) -> int:
+        keys = [(self.sample_key(sample_id),) for sample_id in sample_ids]
+        with self._lock, self._connection:
+            # Record only keys that exist; the samples table is still intact at this point.
+            self._connection.executemany(
+                "INSERT OR IGNORE INTO deleted_samples SELECT sample_key FROM samples WHERE sample_key = ?",
+                keys
+            )
+            cursor = self._connection.executemany("DELETE FROM samples WHERE sample_key = ?", keys)
+        return cursor.rowcount
+
+    def forget_deleted(self):
+        """Drop the deleted-id records, once the JSON file no longer contains those samples."""
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM deleted_samples")
+
+    def get(self, sample_id: Any) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT data FROM samples WHERE sample_key = ?",
+                (self.sample_key(sample_id),)
+            ).fetchone()
+        return json.loads(row[0]) if row is not None else None
+
+    def find(self, label: str = None, source_model: str = None) -> List[Dict[str, Any]]:
+        clauses = []
+        params = []
+        if label is not None:
+            clauses.append("label = ?")
+            params.append(label)
+        if source_model is not None:
+            clauses.append("source_model = ?")
+            params.append(source_model)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._lock:
+            rows = self._connection.execute(
+                f"SELECT data FROM samples {where} ORDER BY seq",
+                params
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def count(self, label: str = None) -> int:
+        with self._lock:
+            if label is None:
+                return self._connection.execute("SELECT COUNT(*) FROM samples").fetchone()[0]
+            return self._connection.execute(
+                "SELECT COUNT(*) FROM samples WHERE label = ?",
+                (label,)
+            ).fetchone()[0]
+
+    def next_id(self) -> int:
+        """Return one more than the largest numeric id ever stored, so ids are never reused after deletes."""
+        with self._lock:
+            max_id = self._connection.execute("SELECT max_id FROM id_high_water").fetchone()[0]
+        return max_id + 1
+
+    def iter_samples(self, batch_size: int = 1000) -> Iterator[Dict[str, Any]]:
+        """Yield samples in insertion order, reading ``batch_size`` rows at a time."""
+        last_seq = 0
+        while True:
+            with self._lock:
+                rows = self._connection.execute(
+                    "SELECT seq, data FROM samples WHERE seq > ? ORDER BY seq LIMIT ?",
+                    (last_seq, batch_size)
+                ).fetchall()
+            if not rows:
+                return
+            for seq, data in rows:
+                yield json.loads(data)
+            last_seq = rows[-1][0]
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
@@ -3,18 +3,75 @@ import os
 from copy import deepcopy
 from typing import Any, Dict, List
 
+from .dataset_stream import iter_dataset_samples
+from .sample_store import SampleStore
+
 
 class TestSetManager:
+    """Evaluation dataset kept in a SQLite ``SampleStore`` next to the JSON file.
+
+    ``data_path`` stays the JSON import/export location. On first use, and whenever that
+    file changes on disk, it is merged into the store by sample id, so cases added in the
+    app survive a manual edit of the file; after that, adding or deleting a sample is a
+    single indexed write instead of a rewrite of the whole JSON file.
+    """
+
     DEFAULT_DATASET = {
         "dataset_name": "default_eval_set",
         "kb_version": "",
         "retrieval_config": {},
         "samples": []
     }
+    META_FIELDS = ["dataset_name", "kb_version", "retrieval_config"]
+    IMPORT_ERROR_LIMIT = 20
 
-    def __init__(self, data_path: str = "./data/test_set.json"):
+    def __init__(self, data_path: str = "./data/test_set.json", store_path: str = None):
         self.data_path = data_path
-        self.current_dataset = self.load_data()
+        self.store_path = store_path or os.path.splitext(data_path)[0] + ".sqlite3"
+        self.store = SampleStore(self.store_path)
+        self._dataset_cache = None
+        self.sync_json()
+
+    @property
+    def current_dataset(self) -> Dict[str, Any]:
+        if self._dataset_cache is None:
+            dataset = self._empty_dataset()
+            for field in self.META_FIELDS:
+                dataset[field] = self.store.get_meta(field, dataset[field])
+            dataset["samples"] = list(self.store.iter_samples())
+            self._dataset_cache = dataset
+        return self._dataset_cache
+
+    def _json_signature(self):
+        if not os.path.exists(self.data_path):
+            return None
+        stat = os.stat(self.data_path)
+        return [stat.st_mtime_ns, stat.st_size]
+
+    def sync_json(self):
+        """Merge ``data_path`` into the store if the file changed since it was last synced.
+
+        Costs one ``stat`` and one indexed read when nothing changed, so long-lived
+        instances can call it on every use.
+        """
+        signature = self._json_signature()
+        if signature is None or signature == self.store.get_meta("source_json_signature"):
+            return
+
+        try:
+            # Two passes over the file: the first finds the largest id so that duplicate ids
+            # left by older versions (len(samples) + 1 after a delete) can be reassigned
+            # without colliding with the file or with cases that only exist in the store.
+            with open(self.data_path, "rb") as file:
+                max_id = self.store.next_id() - 1
+                for position, raw_sample in iter_dataset_samples(file, self.data_path, {}):
+                    sample_id = raw_sample.get("id", position) if isinstance(raw_sample, dict) else None
+                    if isinstance(sample_id, int) and not isinstance(sample_id, bool):
+                        max_id = max(max_id, sample_id)
+            with open(self.data_path, "rb") as file:
+                self._stream_into_store(file, self.data_path, strict=False, next_free_id=max_id + 1, merge=True)
+        except ValueError as exc:
+            print(f"Skipping migration of {self.data_path}: {exc}")
 
     def _empty_dataset(self) -> Dict[str, Any]:
         return deepcopy(self.DEFAULT_DATASET)
@@ -52,17 +109,25 @@ class TestSetManager:
         ]
         return dataset
 
+    def _sample_errors(self, sample: Dict[str, Any], name: str) -> List[str]:
+        errors = []
+        if not sample.get("question"):
+            errors.append(f"{name} is missing question.")
+        if not sample.get("candidate_answer"):
+            errors.append(f"{name} is missing candidate_answer.")
+        if sample.get("label") not in {"positive", "negative"}:
+            errors.append(f"{name} has invalid label '{sample.get('label')}'.")
+        return errors
+
     def validate_dataset(self, dataset: Dict[str, Any]) -> List[str]:
         errors = []
+        seen_ids = set()
         for sample in dataset.get("samples", []):
-            if not sample.get("question"):
-                errors.append(f"Sample {sample.get('id', '?')} is missing question.")
-            if not sample.get("candidate_answer"):
-                errors.append(f"Sample {sample.get('id', '?')} is missing candidate_answer.")
-            if sample.get("label") not in {"positive", "negative"}:
-                errors.append(
-                    f"Sample {sample.get('id', '?')} has invalid label '{sample.get('label')}'."
-                )
+            sample_key = SampleStore.sample_key(sample.get("id"))
+            if sample_key in seen_ids:
+                errors.append(f"Sample {sample.get('id', '?')} has a duplicate id.")
+            seen_ids.add(sample_key)
+            errors.extend(self._sample_errors(sample, f"Sample {sample.get('id', '?')}"))
         return errors
 
     def load_data(self) -> Dict[str, Any]:
@@ -78,11 +143,24 @@ class TestSetManager:
 
         return self._normalize_dataset(data)
 
+    def _write_store(self, dataset: Dict[str, Any]):
+        meta = {field: dataset.get(field, self.DEFAULT_DATASET[field]) for field in self.META_FIELDS}
+        meta["source_json_signature"] = self._json_signature()
+        self.store.replace_all(meta, dataset.get("samples", []))
+        self._dataset_cache = None
+
     def save_data(self):
-        """Save current dataset to file."""
+        """Export the current dataset to the JSON file in the import format."""
         os.makedirs(os.path.dirname(self.data_path), exist_ok=True)
         with open(self.data_path, "w", encoding="utf-8") as file:
-            json.dump(self.current_dataset, file, ensure_ascii=False, indent=2)
+            file.write(self.export_json_text())
+        # The store already holds this content; do not migrate our own export back in.
+        self.store.set_meta({"source_json_signature": self._json_signature()})
+        # The file no longer contains deleted samples, so an id added back to it by hand is new.
+        self.store.forget_deleted()
+
+    def export_json_text(self) -> str:
+        return json.dumps(self.current_dataset, ensure_ascii=False, indent=2)
 
     def import_dataset(self, dataset: Dict[str, Any]) -> Dict[str, Any]:
         normalized_dataset = self._normalize_dataset(dataset)
@@ -90,17 +168,92 @@ class TestSetManager:
         if errors:
             raise ValueError("Invalid dataset: " + " ".join(errors))
 
-        self.current_dataset = normalized_dataset
-        self.save_data()
+        self._write_store(normalized_dataset)
         return self.current_dataset
 
+    def _stream_into_store(
+        self,
+        file_obj,
+        file_name: str,
+        strict: bool = True,
+        next_free_id: int = None,
+        merge: bool = False
+    ) -> int:
+        """Normalize samples as they are read and write them to the store in one transaction.
+
+        In strict mode every sample is validated, errors name the 1-based sample position
+        and any error rolls the import back. Migration uses ``strict=False`` and reassigns
+        duplicate ids from ``next_free_id`` instead, and ``merge=True`` to update samples by
+        id rather than replace the dataset.
+        """
+        raw_meta = {}
+        meta = {}
+        seen_ids = set()
+        errors = []
+        counts = {"samples": 0, "errors": 0, "next_free_id": next_free_id}
+
+        def normalized_samples():
+            for position, raw_sample in iter_dataset_samples(file_obj, file_name, raw_meta):
+                if not isinstance(raw_sample, dict):
+                    continue
+                sample = self._normalize_sample(raw_sample, default_id=position)
+                sample_key = SampleStore.sample_key(sample["id"])
+                sample_errors = []
+                if sample_key in seen_ids and not strict:
+                    print(f"Sample id {sample['id']} is duplicated in {file_name}; reassigned to {counts['next_free_id']}.")
+                    sample["id"] = counts["next_free_id"]
+                    sample_key = SampleStore.sample_key(sample["id"])
+                    counts["next_free_id"] += 1
+                if strict:
+                    name = f"Sample #{position} (id {sample['id']})"
+                    if sample_key in seen_ids:
+                        sample_errors.append(f"{name} has a duplicate id.")
+                    sample_errors.extend(self._sample_errors(sample, name))
+                seen_ids.add(sample_key)
+
+                if sample_errors:
+                    counts["errors"] += len(sample_errors)
+                    errors.extend(sample_errors[:max(0, self.IMPORT_ERROR_LIMIT - len(errors))])
+                    continue
+                counts["samples"] += 1
+                # Keep validating after the first error so every problem is reported,
+                # but stop writing rows that will be rolled back anyway.
+                if not counts["errors"]:
+                    yield sample
+
+            if counts["errors"]:
+                hidden = counts["errors"] - len(errors)
+                suffix = f" ({hidden} more errors not shown.)" if hidden else ""
+                raise ValueError("Invalid dataset: " + " ".join(errors) + suffix)
+
+            dataset = self._normalize_dataset(raw_meta)
+            meta.update({field: dataset[field] for field in self.META_FIELDS})
+            meta["source_json_signature"] = self._json_signature()
+
+        try:
+            write = self.store.merge if merge else self.store.replace_all
+            write(meta, normalized_samples())
+        finally:
+            self._dataset_cache = None
+        return counts["samples"]
+
+    def import_stream(self, file_obj, file_name: str = "dataset.json") -> int:
+        """Import a JSON or JSONL dataset from text, bytes or a file-like object.
+
+        Samples are normalized, validated and written one at a time, so memory use does not
+        grow with the dataset; the previous dataset is kept if any sample is invalid.
+        Returns the number of imported samples.
+        """
+        return self._stream_into_store(file_obj, file_name)
+
     def import_json_text(self, json_text: str) -> Dict[str, Any]:
-        dataset = json.loads(json_text)
-        return self.import_dataset(dataset)
+        self.import_stream(json_text)
+        return self.current_dataset
 
     def import_json_file(self, file_path: str) -> Dict[str, Any]:
-        with open(file_path, "r", encoding="utf-8") as file:
-            return self.import_json_text(file.read())
+        with open(file_path, "rb") as file:
+            self.import_stream(file, file_path)
+        return self.current_dataset
 
     def get_dataset(self) -> Dict[str, Any]:
         return self.current_dataset
@@ -117,9 +270,10 @@ class TestSetManager:
         notes: str = ""
     ) -> Dict[str, Any]:
         """Add a new evaluation sample."""
+        next_id = self.store.next_id()
         sample = self._normalize_sample(
             {
-                "id": len(self.current_dataset["samples"]) + 1,
+                "id": next_id,
                 "question": question,
                 "candidate_answer": candidate_answer,
                 "label": label,
@@ -129,23 +283,97 @@ class TestSetManager:
                 "reference_docs": reference_docs or [],
                 "notes": notes
             },
-            default_id=len(self.current_dataset["samples"]) + 1
+            default_id=next_id
         )
 
         errors = self.validate_dataset({"samples": [sample]})
         if errors:
             raise ValueError("Invalid sample: " + " ".join(errors))
 
-        self.current_dataset["samples"].append(sample)
-        self.save_data()
+        self.store.append(sample)
+        if self._dataset_cache is not None:
+            self._dataset_cache["samples"].append(sample)
         return sample
 
     def get_all_cases(self) -> List[Dict[str, Any]]:
         return self.current_dataset["samples"]
 
+    def get_case(self, case_id: Any) -> Dict[str, Any]:
+        return self.store.get(case_id)
+
+    def find_cases(self, label: str = None, source_model: str = None) -> List[Dict[str, Any]]:
+        return self.store.find(label=label, source_model=source_model)
+
+    def count_cases(self, label: str = None) -> int:
+        return self.store.count(label=label)
+
     def delete_case(self, case_id: int):
         """Delete a case by ID."""
-        self.current_dataset["samples"] = [
-            case for case in self.current_dataset["samples"] if case["id"] != case_id
+        if self.store.delete(case_id):
+            self._dataset_cache = None
+
+    def find_near_duplicates(
+        self,
+        threshold: float = 0.8,
+        num_perm: int = 128,
+        shingle_size: int = 5
+    ) -> List[Dict[str, Any]]:
+        """Report clusters of samples whose question + candidate answer are near-duplicates.
+
+        Similarity is the MinHash estimate of the Jaccard similarity of character shingles.
+        Samples with different labels are never clustered, since a small edit to a figure is
+        exactly what turns a faithful answer into a hallucinated one. Each cluster keeps its
+        first sample in dataset order and lists the others as duplicates.
+        """
+        # Imported here so the web app does not load numpy at startup.
+        from .near_duplicates import find_near_duplicate_clusters
+
+        samples = self.get_all_cases()
+        clusters = find_near_duplicate_clusters(
+            [f"{sample['question']}\n{sample['candidate_answer']}" for sample in samples],
+            threshold=threshold,
+            num_perm=num_perm,
+            shingle_size=shingle_size,
+            partition_keys=[sample["label"] for sample in samples]
+        )
+        return [
+            {
+                "keep_id": samples[cluster[0]]["id"],
+                "duplicate_ids": [samples[position]["id"] for position in cluster[1:]],
+                "label": samples[cluster[0]]["label"],
+                "question": samples[cluster[0]]["question"],
+                "size": len(cluster)
+            }
+            for cluster in clusters
         ]
-        self.save_data()
+
+    def build_deduplicated_dataset(self, clusters: List[Dict[str, Any]] = None, **kwargs) -> Dict[str, Any]:
+        """Return a copy of the dataset without the duplicates of each near-duplicate cluster."""
+        if clusters is None:
+            clusters = self.find_near_duplicates(**kwargs)
+        duplicate_keys = {
+            SampleStore.sample_key(sample_id)
+            for cluster in clusters
+            for sample_id in cluster["duplicate_ids"]
+        }
+        dataset = {field: deepcopy(self.current_dataset[field]) for field in self.META_FIELDS}
+        dataset["dataset_name"] = f"{dataset['dataset_name'] or 'dataset'}_dedup"
+        dataset["samples"] = [
+            sample
+            for sample in self.get_all_cases()
+            if SampleStore.sample_key(sample["id"]) not in duplicate_keys
+        ]
+        return dataset
+
+    def remove_near_duplicates(self, clusters: List[Dict[str, Any]] = None, **kwargs) -> int:
+        """Delete the duplicates of each cluster from the workspace and return how many were removed."""
+        if clusters is None:
+            clusters = self.find_near_duplicates(**kwargs)
+        removed = self.store.delete_many(
+            sample_id
+            for cluster in clusters
+            for sample_id in cluster["duplicate_ids"]
+        )
+        if removed:
+            self._dataset_cache = None
+        return removed
@@ -0,0 +1,314 @@
+import hashlib
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from langchain_core.runnables import Runnable
+from langchain_openai import ChatOpenAI
+
+from http_pool import get_http_clients
+
+ROUTING_STRATEGIES = ["least_outstanding", "weighted"]
+# Status codes that mean "try another endpoint": throttling, overload and transient server errors.
+THROTTLE_STATUS_CODES = {429, 503}
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+
+# Endpoint names that answered calls made in this context, see ``collect_served_endpoints``.
+_SERVED: ContextVar = ContextVar("finance_rag_served_endpoints", default=None)
+
+_ROUTERS = {}
+_ROUTERS_LOCK = threading.Lock()
+
+
+@contextmanager
+def collect_served_endpoints() -> Iterator[List[str]]:
+    """Collect the names of the endpoints that answer routed calls inside the block.
+
+    Collectors nest: names seen by an inner collector are also added to the outer one.
+    """
+    parent = _SERVED.get()
+    served = []
+    token = _SERVED.set(served)
+    try:
+        yield served
+    finally:
+        _SERVED.reset(token)
+        if parent is not None:
+            parent.extend(served)
+
+
+def served_endpoint(message) -> Optional[str]:
+    """Name of the routed endpoint that produced a chat message, if it came from a router."""
+    metadata = getattr(message, "response_metadata", None)
+    return metadata.get("endpoint") if isinstance(metadata, dict) else None
+
+
+def join_served(served: List[str]) -> str:
+    return ",".join(dict.fromkeys(served))
+
+
+def _status_code(exc: BaseException) -> Optional[int]:
+    status_code = getattr(exc, "status_code", None)
+    if status_code is None:
+        status_code = getattr(getattr(exc, "response", None), "status_code", None)
+    return status_code
+
+
+def _is_retryable(exc: BaseException) -> bool:
+    # Connection errors and timeouts carry no status code and are worth another endpoint.
+    status_code = _status_code(exc)
+    return status_code is None or status_code in RETRYABLE_STATUS_CODES
+
+
+def _retry_after(exc: BaseException) -> Optional[float]:
+    headers = getattr(getattr(exc, "response", None), "headers", None) or {}
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+class Endpoint:
+    """One OpenAI-compatible endpoint with its own chat client and health counters."""
+
+    def __init__(self, name: str, base_url: str, model_name: str, api_key: str, weight: float, chat_model):
+        self.name = name
+        self.base_url = base_url
+        self.model_name = model_name
+        self.api_key = api_key
+        self.weight = weight
+        self.chat_model = chat_model
+        self.outstanding = 0
+        self.requests = 0
+        self.successes = 0
+        self.failures = 0
+        self.throttled = 0
+        self.consecutive_failures = 0
+        self.ejections = 0
+        self.ejected_until = 0.0
+        self.latency_ms = None
+
+
+class EndpointRouter(Runnable):
+    """Chat model that spreads calls over several equivalent endpoints.
+
+    ``least_outstanding`` sends each call to the endpoint with the fewest in-flight calls per
+    unit of weight; ``weighted`` picks endpoints at random in proportion to their weight.
+    A throttled call (HTTP 429/503) ejects its endpoint at once, other retryable failures
+    after ``failure_threshold`` in a row. Ejections last ``ejection_seconds`` times the number
+    of ejections so far, capped at ``max_ejection_seconds``, or the server's ``Retry-After``
+    when that is longer. A failed call is retried on the other endpoints; when every endpoint
+    is ejected, the one that comes back first is still used rather than failing outright.
+    """
+
+    def __init__(
+        self,
+        endpoints: List[Dict[str, Any]],
+        strategy: str = "least_outstanding",
+        failure_threshold: int = 3,
+        ejection_seconds: float = 30.0,
+        max_ejection_seconds: float = 300.0,
+        timeout: int = 60,
+        http_pool_settings: Dict[str, Any] = None,
+        chat_model_factory: Callable[[Dict[str, Any]], Any] = None,
+        clock: Callable[[], float] = time.monotonic,
+        seed: int = None
+    ):
+        if strategy not in ROUTING_STRATEGIES:
+            raise ValueError(f"Unsupported routing strategy '{strategy}'. Supported: {ROUTING_STRATEGIES}")
+        if not endpoints:
+            raise ValueError("EndpointRouter needs at least one endpoint.")
+
+        self.strategy = strategy
+        self.failure_threshold = max(1, int(failure_threshold))
+        self.ejection_seconds = float(ejection_seconds)
+        self.max_ejection_seconds = float(max_ejection_seconds)
+        self._clock = clock
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+        def build_chat_model(config: Dict[str, Any]):
+            return ChatOpenAI(
+                model_name=config["model_name"],
+                temperature=0,
+                base_url=config["base_url"] or None,
+                timeout=timeout,
+                api_key=config["api_key"],
+                # Failover to another endpoint replaces the client's own retries.
+                max_retries=0,
+                **get_http_clients(config["base_url"] or None, **(http_pool_settings or {})).client_kwargs()
+            )
+
+        factory = chat_model_factory or build_chat_model
+        self.endpoints = []
+        for position, config in enumerate(endpoints):
+            config = {
+                "name": str(config.get("name") or f"endpoint-{position + 1}"),
+                "base_url": config.get("base_url", ""),
+                "model_name": config.get("model_name", ""),
+                "api_key": config.get("api_key", ""),
+                "weight": max(0.01, float(config.get("weight", 1.0) or 1.0))
+            }
+            self.endpoints.append(Endpoint(
+                config["name"],
+                config["base_url"],
+                config["model_name"],
+                config["api_key"],
+                config["weight"],
+                factory(config)
+            ))
+
+    @property
+    def model_name(self) -> str:
+        return self.endpoints[0].model_name
+
+    def _available(self, exclude: set) -> List[Endpoint]:
+        now = self._clock()
+        candidates = [endpoint for endpoint in self.endpoints if endpoint.name not in exclude]
+        healthy = [endpoint for endpoint in candidates if endpoint.ejected_until <= now]
+        if healthy or not candidates:
+            return healthy
+        return [min(candidates, key=lambda endpoint: endpoint.ejected_until)]
+
+    def acquire(self, exclude: set = frozenset()) -> Optional[Endpoint]:
+        """Pick an endpoint for the next call and count it as outstanding."""
+        with self._lock:
+            candidates = self._available(exclude)
+            if not candidates:
+                return None
+            if self.strategy == "weighted":
+                endpoint = self._rng.choices(candidates, weights=[item.weight for item in candidates])[0]
+            else:
+                lowest = min((item.outstanding + 1) / item.weight for item in candidates)
+                tied = [item for item in candidates if (item.outstanding + 1) / item.weight == lowest]
+                endpoint = self._rng.choice(tied)
+            endpoint.outstanding += 1
+            endpoint.requests += 1
+            return endpoint
+
+    def _eject(self, endpoint: Endpoint, minimum_seconds: float = None):
+        if endpoint.ejected_until > self._clock():
+            # Calls already in flight when the endpoint was ejected do not extend the ejection.
+            return
+        endpoint.ejections += 1
+        duration = min(self.ejection_seconds * endpoint.ejections, self.max_ejection_seconds)
+        if minimum_seconds:
+            duration = max(duration, minimum_seconds)
+        endpoint.ejected_until = self._clock() + duration
+        endpoint.consecutive_failures = 0
+        print(f"Endpoint '{endpoint.name}' ejected for {duration:.0f}s.")
+
+    def release(self, endpoint: Endpoint, latency_ms: float = None, error: BaseException = None):
+        """Record the outcome of a call started with ``acquire``."""
+        with self._lock:
+            endpoint.outstanding -= 1
+            if error is None:
+                endpoint.successes += 1
+                endpoint.consecutive_failures = 0
+                if latency_ms is not None:
+                    endpoint.latency_ms = latency_ms if endpoint.latency_ms is None else 0.8 * endpoint.latency_ms + 0.2 * latency_ms
+                return
+            if not _is_retryable(error):
+                # The request itself was rejected; that says nothing about the endpoint's health.
+                return
+            endpoint.failures += 1
+            if _status_code(error) in THROTTLE_STATUS_CODES:
+                endpoint.throttled += 1
+                self._eject(endpoint, _retry_after(error))
+                return
+            endpoint.consecutive_failures += 1
+            if endpoint.consecutive_failures >= self.failure_threshold:
+                self._eject(endpoint)
+
+    def invoke(self, input, config=None, **kwargs):
+        tried = set()
+        last_error = None
+        while len(tried) < len(self.endpoints):
+            endpoint = self.acquire(exclude=tried)
+            if endpoint is None:
+                break
+            tried.add(endpoint.name)
+            started = time.perf_counter()
+            try:
+                message = endpoint.chat_model.invoke(input, config, **kwargs)
+            except Exception as exc:
+                self.release(endpoint, error=exc)
+                if not _is_retryable(exc):
+                    raise
+                last_error = exc
+                continue
+            self.release(endpoint, latency_ms=(time.perf_counter() - started) * 1000)
+            if isinstance(getattr(message, "response_metadata", None), dict):
+                message.response_metadata["endpoint"] = endpoint.name
+            served = _SERVED.get()
+            if served is not None:
+                served.append(endpoint.name)
+            return message
+        raise last_error if last_error is not None else RuntimeError("No endpoint available.")
+
+    def stats(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            now = self._clock()
+            return [
+                {
+                    "name": endpoint.name,
+                    "base_url": endpoint.base_url,
+                    "model_name": endpoint.model_name,
+                    "weight": endpoint.weight,
+                    "requests": endpoint.requests,
+                    "successes": endpoint.successes,
+                    "failures": endpoint.failures,
+                    "throttled": endpoint.throttled,
+                    "outstanding": endpoint.outstanding,
+                    "ejections": endpoint.ejections,
+                    "ejected": endpoint.ejected_until > now,
+                    "ejected_for_s": max(0.0, endpoint.ejected_until - now),
+                    "latency_ms": endpoint.latency_ms
+                }
+                for endpoint in self.endpoints
+            ]
+
+
+def get_endpoint_router(endpoints: List[Dict[str, Any]], **options) -> EndpointRouter:
+    """Process-wide router for one endpoint list and set of options, so ejections and
+    outstanding counts are shared by the answer engine and every judge."""
+    key_parts = [
+        (item.get("name"), item.get("base_url"), item.get("model_name"),
+         hashlib.sha256(str(item.get("api_key", "")).encode("utf-8")).hexdigest(), item.get("weight"))
+        for item in endpoints
+    ]
+    key = (tuple(key_parts), repr(sorted(options.items())))
+    with _ROUTERS_LOCK:
+        router = _ROUTERS.get(key)
+        if router is None:
+            router = EndpointRouter(endpoints, **options)
+            _ROUTERS[key] = router
+        return router
+
+
+def router_statistics() -> List[Dict[str, Any]]:
+    with _ROUTERS_LOCK:
+        routers = list(_ROUTERS.values())
+    return [row for router in routers for row in router.stats()]
+
+
+def get_configured_router(
+    endpoints: List[Dict[str, Any]],
+    routing_settings: Dict[str, Any],
+    timeout: int = 60,
+    http_pool_settings: Dict[str, Any] = None
+) -> Optional[EndpointRouter]:
+    """Shared router for ``AppConfigManager.get_routing_endpoints``; ``None`` when routing is off."""
+    if not endpoints:
+        return None
+    return get_endpoint_router(
+        endpoints,
+        strategy=routing_settings.get("strategy", "least_outstanding"),
+        failure_threshold=routing_settings.get("failure_threshold", 3),
+        ejection_seconds=routing_settings.get("ejection_seconds", 30.0),
+        timeout=timeout,
+        http_pool_settings=http_pool_settings or {}
+    )
@@ -0,0 +1,214 @@
+import math
+import random
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+
+SUPPORTED_METRICS = ["f1", "precision", "recall", "accuracy"]
+# Jeffreys prior on the confusion cell probabilities used to smooth bootstrap resamples.
+DIRICHLET_PRIOR = 0.5
+
+
+def confusion_cells(results: List[Dict[str, Any]]) -> np.ndarray:
+    """Count results per confusion cell (tp, fp, fn, tn) with the rules of
+    ``calculate_classification_metrics``: an uncertain prediction counts as not positive."""
+    cells = np.zeros(4)
+    for result in results:
+        expected = result.get("expected_label")
+        predicted = result.get("predicted_label")
+        if expected == "positive":
+            cells[0 if predicted == "positive" else 2] += 1
+        elif expected == "negative":
+            cells[3 if predicted == "negative" else 1] += 1
+    return cells
+
+
+def metric_from_cells(cells: np.ndarray, metric: str) -> np.ndarray:
+    """Compute a metric for one (shape ``(4,)``) or many (shape ``(n, 4)``) cell count rows."""
+    cells = np.atleast_2d(cells).astype(float)
+    tp, fp, fn, tn = cells[:, 0], cells[:, 1], cells[:, 2], cells[:, 3]
+
+    def safe_ratio(numerator, denominator):
+        return np.divide(numerator, denominator, out=np.zeros_like(numerator), where=denominator > 0)
+
+    if metric == "f1":
+        return safe_ratio(2 * tp, 2 * tp + fp + fn)
+    if metric == "precision":
+        return safe_ratio(tp, tp + fp)
+    if metric == "recall":
+        return safe_ratio(tp, tp + fn)
+    if metric == "accuracy":
+        return safe_ratio(tp + tn, tp + fp + fn + tn)
+    raise ValueError(f"Unsupported metric '{metric}'. Supported: {SUPPORTED_METRICS}")
+
+
+def bootstrap_metric_interval(
+    results: List[Dict[str, Any]],
+    metric: str = "f1",
+    confidence: float = 0.95,
+    resamples: int = 2000,
+    seed: Optional[int] = None
+) -> Tuple[float, float]:
+    """Percentile bootstrap interval for a classification metric.
+
+    Resampling results with replacement is the same as drawing multinomial counts over the
+    four confusion cells, so all resamples are computed in one vectorized step. The cell
+    probabilities of each resample are drawn from Dirichlet(cells + 0.5) rather than fixed
+    at the observed rates, so a cell that has not been seen yet (no false positives after a
+    perfect first batch) still widens the interval instead of collapsing it to one point.
+    """
+    return bootstrap_interval_from_cells(confusion_cells(results), metric, confidence, resamples, seed)
+
+
+def bootstrap_interval_from_cells(
+    cells: np.ndarray,
+    metric: str = "f1",
+    confidence: float = 0.95,
+    resamples: int = 2000,
+    seed: Optional[int] = None
+) -> Tuple[float, float]:
+    total = int(cells.sum())
+    if total == 0:
+        return 0.0, 1.0
+
+    rng = np.random.default_rng(seed)
+    probabilities = rng.dirichlet(np.asarray(cells, dtype=float) + DIRICHLET_PRIOR, size=resamples)
+    values = metric_from_cells(rng.multinomial(total, probabilities), metric)
+    alpha = (1 - confidence) / 2
+    low, high = np.quantile(values, [alpha, 1 - alpha])
+    return float(low), float(high)
+
+
+class StratifiedSampler:
+    """Draw samples without replacement so every batch keeps the dataset's mix of
+    (label, source_model) strata, using largest-remainder allocation per batch."""
+
+    def __init__(self, samples: List[Dict[str, Any]], seed: Optional[int] = None):
+        self.samples = samples
+        rng = random.Random(seed)
+        self._strata = {}
+        for position, sample in enumerate(samples):
+            key = (sample.get("label", ""), sample.get("source_model", ""))
+            self._strata.setdefault(key, []).append(position)
+        for positions in self._strata.values():
+            rng.shuffle(positions)
+
+    @property
+    def remaining(self) -> int:
+        return sum(len(positions) for positions in self._strata.values())
+
+    def next_batch(self, size: int) -> List[Dict[str, Any]]:
+        remaining = self.remaining
+        size = min(size, remaining)
+        if size <= 0:
+            return []
+
+        quotas = {
+            key: size * len(positions) / remaining
+            for key, positions in self._strata.items()
+            if positions
+        }
+        allocation = {key: math.floor(quota) for key, quota in quotas.items()}
+        leftover = size - sum(allocation.values())
+        for key in sorted(quotas, key=lambda key: quotas[key] - allocation[key], reverse=True)[:leftover]:
+            allocation[key] += 1
+
+        batch = []
+        for key, count in allocation.items():
+            positions = self._strata[key]
+            batch.extend(self.samples[positions.pop()] for _ in range(min(count, len(positions))))
+        return batch
+
+
+class AdaptiveEvaluationPlan:
+    """Sequential evaluation that stops once the metric's confidence interval is narrow enough.
+
+    Iterate ``iter_samples()``, evaluate each sample and pass the result to ``record``.
+    After every batch the plan recomputes the metric and its bootstrap interval and stops
+    when the interval width reaches ``target_ci_width``, the sample budget is spent or the
+    dataset is exhausted.
+    """
+
+    STOP_CONVERGED = "converged"
+    STOP_BUDGET = "budget"
+    STOP_EXHAUSTED = "exhausted"
+
+    def __init__(
+        self,
+        samples: List[Dict[str, Any]],
+        target_ci_width: float = 0.04,
+        max_samples: int = None,
+        batch_size: int = 20,
+        min_samples: int = 30,
+        metric: str = "f1",
+        confidence: float = 0.95,
+        seed: Optional[int] = None
+    ):
+        self.total_samples = len(samples)
+        self.target_ci_width = float(target_ci_width)
+        self.max_samples = min(int(max_samples or self.total_samples), self.total_samples)
+        self.batch_size = max(1, int(batch_size))
+        self.min_samples = max(1, int(min_samples))
+        if metric not in SUPPORTED_METRICS:
+            raise ValueError(f"Unsupported metric '{metric}'. Supported: {SUPPORTED_METRICS}")
+        self.metric = metric
+        self.confidence = confidence
+        self.seed = seed
+        self.sampler = StratifiedSampler(samples, seed=seed)
+        self.results = []
+        self._cells = np.zeros(4)
+        self.history = []
+        self.stopped_reason = ""
+        self.interval = (0.0, 1.0)
+
+    def _check_stop(self) -> bool:
+        if self.results:
+            estimate = float(metric_from_cells(self._cells, self.metric)[0])
+            self.interval = bootstrap_interval_from_cells(
+                self._cells,
+                metric=self.metric,
+                confidence=self.confidence,
+                seed=self.seed
+            )
+            self.history.append({
+                "samples_used": len(self.results),
+                "estimate": estimate,
+                "ci_low": self.interval[0],
+                "ci_high": self.interval[1]
+            })
+
+        if len(self.results) >= self.min_samples and self.interval[1] - self.interval[0] <= self.target_ci_width:
+            self.stopped_reason = self.STOP_CONVERGED
+        elif len(self.results) >= self.max_samples:
+            self.stopped_reason = self.STOP_EXHAUSTED if self.max_samples == self.total_samples else self.STOP_BUDGET
+        return bool(self.stopped_reason)
+
+    def iter_samples(self) -> Iterator[Dict[str, Any]]:
+        while not self._check_stop():
+            batch = self.sampler.next_batch(min(self.batch_size, self.max_samples - len(self.results)))
+            if not batch:
+                self.stopped_reason = self.STOP_EXHAUSTED
+                return
+            for sample in batch:
+                yield sample
+
+    def record(self, result: Dict[str, Any]):
+        self.results.append(result)
+        self._cells += confusion_cells([result])
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "metric": self.metric,
+            "confidence": self.confidence,
+            "target_ci_width": self.target_ci_width,
+            "samples_used": len(self.results),
+            "total_samples": self.total_samples,
+            "max_samples": self.max_samples,
+            "estimate": self.history[-1]["estimate"] if self.history else 0.0,
+            "ci_low": self.interval[0],
+            "ci_high": self.interval[1],
+            "ci_width": self.interval[1] - self.interval[0],
+            "stopped_reason": self.stopped_reason,
+            "history": list(self.history)
+        }
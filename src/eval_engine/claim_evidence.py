@@ -0,0 +1,126 @@
+"""Per-claim evidence from one shared candidate pool instead of one vector search per claim."""
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from eval_engine.strategy_defaults import DEFAULT_MIN_SIMILARITY, DEFAULT_POOL_SIZE
+from tracing import span
+
+
+def _unit_rows(vectors: Sequence[Sequence[float]]) -> np.ndarray:
+    matrix = np.asarray(vectors, dtype=np.float32)
+    if matrix.ndim != 2:
+        matrix = matrix.reshape(len(matrix), -1)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.where(norms > 0, norms, 1.0)
+
+
+def rank_pool(
+    claim_embeddings: Sequence[Sequence[float]],
+    pool_embeddings: Sequence[Sequence[float]],
+    top_k: int,
+    min_similarity: float = DEFAULT_MIN_SIMILARITY
+) -> List[Optional[List[int]]]:
+    """Indices of the ``top_k`` pool chunks most similar to each claim, best first.
+
+    Cosine similarities of all claims against the whole pool come from one matrix product.
+    A claim whose best chunk scores below ``min_similarity`` gets ``None``, meaning the pool
+    does not cover it and it needs its own search over the full corpus.
+    """
+    if not len(claim_embeddings):
+        return []
+    if not len(pool_embeddings):
+        return [None] * len(claim_embeddings)
+
+    similarities = _unit_rows(claim_embeddings) @ _unit_rows(pool_embeddings).T
+    top_k = max(1, min(top_k, similarities.shape[1]))
+    # argpartition finds each row's top_k in linear time; only those few are then sorted.
+    candidates = np.argpartition(-similarities, top_k - 1, axis=1)[:, :top_k]
+    candidate_scores = np.take_along_axis(similarities, candidates, axis=1)
+    order = np.argsort(-candidate_scores, axis=1)
+    ranked = np.take_along_axis(candidates, order, axis=1)
+    best = np.take_along_axis(candidate_scores, order[:, :1], axis=1)[:, 0]
+    return [
+        ranked[row].tolist() if best[row] >= min_similarity else None
+        for row in range(len(ranked))
+    ]
+
+
+def supports_shared_pool(vector_store) -> bool:
+    return all(
+        hasattr(vector_store, name)
+        for name in ("search_with_embeddings", "embed_documents", "search_by_vector")
+    )
+
+
+def retrieve_claim_evidence(
+    vector_store,
+    question: str,
+    candidate_answer: str,
+    claims: List[str],
+    top_k: int = 3,
+    pool_size: int = DEFAULT_POOL_SIZE,
+    min_similarity: float = DEFAULT_MIN_SIMILARITY
+) -> Tuple[List[List[Any]], Dict[str, Any]]:
+    """Evidence chunks for every claim of one answer from a single shared retrieval.
+
+    The ``pool_size`` chunks nearest to the question and answer are fetched once with their
+    stored embeddings, all claim queries are embedded in one batch, and each claim keeps the
+    ``top_k`` pool chunks closest to it. Claims the pool does not cover fall back to a vector
+    search with their already computed embedding. Returns the documents per claim, in claim
+    order, and counts of pool hits and fallback searches.
+    """
+    if not claims:
+        return [], {"pool_size": 0, "claims": 0, "pool_hits": 0, "fallbacks": 0, "sources": []}
+
+    with span("evidence.pool", claims=len(claims), pool_size=pool_size) as pool_span:
+        pool_docs, pool_embeddings = vector_store.search_with_embeddings(
+            f"{question}\n{candidate_answer}",
+            top_k=pool_size
+        )
+        # Same query text as a per-claim search, so fallbacks retrieve what they used to.
+        claim_embeddings = vector_store.embed_documents([f"{question}\n{claim}" for claim in claims])
+        if len(pool_embeddings) != len(pool_docs):
+            pool_embeddings = []
+        ranked = rank_pool(claim_embeddings, pool_embeddings, top_k, min_similarity)
+
+        evidence = []
+        for indices, embedding in zip(ranked, claim_embeddings):
+            if indices is None:
+                evidence.append(vector_store.search_by_vector(embedding, top_k=top_k))
+            else:
+                evidence.append([pool_docs[index] for index in indices])
+        fallbacks = sum(1 for indices in ranked if indices is None)
+        pool_span.set_attributes(pool_documents=len(pool_docs), fallbacks=fallbacks)
+
+    return evidence, {
+        "pool_size": len(pool_docs),
+        "claims": len(claims),
+        "pool_hits": len(claims) - fallbacks,
+        "fallbacks": fallbacks,
+        "sources": ["search" if indices is None else "pool" for indices in ranked]
+    }
+
+
+def summarize_evidence_pool(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Retrieval work of shared-pool samples against searching once per claim.
+
+    Per claim, the per-claim strategy embeds one query and runs one vector search. The pool
+    embeds and searches once per sample, embeds the claims in one batch and searches
+    again only for fallback claims.
+    """
+    records = [result["evidence_pool"] for result in results if isinstance(result.get("evidence_pool"), dict)]
+    claims = sum(record["claims"] for record in records)
+    fallbacks = sum(record["fallbacks"] for record in records)
+    pooled = [record for record in records if record["claims"]]
+    return {
+        "samples": len(records),
+        "claims": claims,
+        "pool_hits": claims - fallbacks,
+        "fallbacks": fallbacks,
+        "fallback_rate": fallbacks / claims if claims else 0.0,
+        "per_claim_searches": claims,
+        "pool_searches": len(pooled) + fallbacks,
+        "per_claim_embedding_requests": claims,
+        "pool_embedding_requests": 2 * len(pooled)
+    }
@@ -0,0 +1,235 @@
+"""Local, rule-based claim extraction and its agreement benchmark against the LLM extractor."""
+import re
+import time
+from typing import Any, Callable, Dict, List
+
+import numpy as np
+
+from data_manager.near_duplicates import shingle_hashes
+from eval_engine.strategy_defaults import DEFAULT_HYBRID_MAX_CHARS, DEFAULT_HYBRID_MAX_CLAIMS
+
+MIN_CLAIM_CHARS = 4
+
+# Sentence ends: CJK and ASCII terminators, and a period followed by whitespace (not a decimal point).
+_SENTENCE_BREAK = re.compile(r"(?<=[。！？；!?;])\s*|(?<=\.)\s+|\n+")
+# Clause boundaries inside a sentence; captured so merged clauses keep their original joiner.
+_CLAUSE_BREAK = re.compile(
+    r"([，,]\s*(?:(?:并且|而且|同时|此外|另外|但是|然而|其中|and|but|while|whereas)\s*)?"
+    r"|(?:并且|而且|同时|此外|但是)"
+    r"|\s+(?:and|but|while|whereas)\s+)",
+    re.IGNORECASE
+)
+_LEADING_CONJUNCTION = re.compile(
+    r"^(?:并且|而且|同时|此外|另外|但是|然而|其中|and|but|while|whereas)\s*[，,]?\s*",
+    re.IGNORECASE
+)
+_NUMERIC_FACT = re.compile(r"\d|[一二三四五六七八九十百千两]+(?:万|亿|个百分点|成)|百分之")
+# Dates and reporting periods qualify a fact rather than state one.
+_PERIOD = re.compile(
+    r"\d{4}\s*年(?:\s*\d{1,2}\s*月)?(?:\s*\d{1,2}\s*日)?|\d{4}[-/]\d{1,2}(?:[-/]\d{1,2})?"
+    r"|\b(?:FY|Q[1-4]\s*)?(?:19|20)\d{2}\b|\bQ[1-4]\b|第[一二三四1-4]季度|[上下]半年",
+    re.IGNORECASE
+)
+# Clauses that open with a predicate ("同比增长10%") continue the previous clause's subject.
+_PREDICATES = "同比|环比|增长|下降|上涨|下跌|增加|减少|占|达到?|约为?|为|是|录得|实现"
+_ENGLISH_PREDICATES = "rose|fell|grew|increased|decreased|was|were|is|reached"
+_PREDICATE_START = re.compile(rf"^(?:较|比|{_PREDICATES}|{_ENGLISH_PREDICATES})", re.IGNORECASE)
+_SUBJECT_END = re.compile(rf"(?:较上年|{_PREDICATES}|\s(?:{_ENGLISH_PREDICATES})\b)", re.IGNORECASE)
+# Conditionals and causal chains are left to the LLM in hybrid mode.
+_COMPLEX_MARKERS = re.compile(
+    r"如果|假如|若|除非|假设|因为|由于|因此|所以|导致|取决于|\b(?:if|unless|because|due to|therefore|depending)\b",
+    re.IGNORECASE
+)
+_TRIM_CHARS = " \t\r\n。！？；!?;，,、：:."
+
+
+def _has_numeric_fact(clause: str) -> bool:
+    return bool(_NUMERIC_FACT.search(_PERIOD.sub("", clause)))
+
+
+def _split_sentences(text: str) -> List[str]:
+    sentences = (sentence.strip(_TRIM_CHARS) for sentence in _SENTENCE_BREAK.split(text or "") if sentence)
+    return [sentence for sentence in sentences if sentence]
+
+
+def _leading_subject(clause: str) -> str:
+    match = _SUBJECT_END.search(clause)
+    return clause[:match.start()].strip() if match and match.start() > 0 else ""
+
+
+def _split_sentence(sentence: str) -> List[str]:
+    """Split a sentence into one claim per numeric fact.
+
+    Clauses without a number stay attached to their neighbour, so "2024年，GDP增长5%" is a
+    single claim while "营收增长10%，净利润下降5%" becomes two.
+    """
+    parts = _CLAUSE_BREAK.split(sentence)
+    claims = []
+    current = parts[0]
+    has_number = _has_numeric_fact(current)
+    for position in range(1, len(parts), 2):
+        joiner, clause = parts[position], parts[position + 1]
+        if not clause.strip(_TRIM_CHARS):
+            current += joiner
+            continue
+        clause_has_number = _has_numeric_fact(clause)
+        if has_number and clause_has_number:
+            claims.append(current)
+            clause = _LEADING_CONJUNCTION.sub("", clause.strip())
+            if _PREDICATE_START.match(clause):
+                clause = _leading_subject(claims[0]) + clause
+            current = clause
+        else:
+            current += joiner + clause
+            has_number = has_number or clause_has_number
+    claims.append(current)
+    return claims
+
+
+def split_claims(candidate_answer: str) -> List[str]:
+    """Split an answer into verifiable claims by sentence, then by separate numeric facts."""
+    claims = []
+    for sentence in _split_sentences(candidate_answer):
+        for claim in _split_sentence(sentence):
+            claim = claim.strip(_TRIM_CHARS)
+            if len(claim) < MIN_CLAIM_CHARS and claims:
+                # Fragments such as a dangling "等" belong to the previous claim.
+                claims[-1] = f"{claims[-1]}{claim}"
+            elif claim:
+                claims.append(claim)
+    return claims
+
+
+def needs_llm_extraction(
+    candidate_answer: str,
+    claims: List[str],
+    max_chars: int = DEFAULT_HYBRID_MAX_CHARS,
+    max_claims: int = DEFAULT_HYBRID_MAX_CLAIMS
+) -> bool:
+    """Whether hybrid extraction should call the LLM: long or conditional/causal answers, or
+    answers the rules split into no claims or more than ``max_claims``."""
+    return (
+        len(candidate_answer or "") > max_chars
+        or not claims
+        or len(claims) > max_claims
+        or bool(_COMPLEX_MARKERS.search(candidate_answer or ""))
+    )
+
+
+def llm_extraction_share(
+    samples: List[Dict[str, Any]],
+    strategy: str,
+    max_chars: int = DEFAULT_HYBRID_MAX_CHARS,
+    max_claims: int = DEFAULT_HYBRID_MAX_CLAIMS
+) -> float:
+    """Share of samples whose claims ``strategy`` extracts with an LLM call."""
+    if strategy == "llm":
+        return 1.0
+    if strategy == "rule" or not samples:
+        return 0.0
+    remote = sum(
+        1 for sample in samples
+        if needs_llm_extraction(
+            sample.get("candidate_answer", ""),
+            split_claims(sample.get("candidate_answer", "")),
+            max_chars,
+            max_claims
+        )
+    )
+    return remote / len(samples)
+
+
+def claim_similarity(first: str, second: str) -> float:
+    """Dice coefficient of the two claims' character bigrams."""
+    first_hashes, second_hashes = shingle_hashes(first, 2), shingle_hashes(second, 2)
+    shared = len(np.intersect1d(first_hashes, second_hashes, assume_unique=True))
+    return 2 * shared / (len(first_hashes) + len(second_hashes))
+
+
+def match_claims(rule_claims: List[str], llm_claims: List[str], match_threshold: float = 0.5) -> int:
+    """Greedily pair rule and LLM claims by similarity; returns the number of pairs above the threshold."""
+    candidates = sorted(
+        (
+            (claim_similarity(rule_claim, llm_claim), rule_index, llm_index)
+            for rule_index, rule_claim in enumerate(rule_claims)
+            for llm_index, llm_claim in enumerate(llm_claims)
+        ),
+        reverse=True
+    )
+    used_rule, used_llm = set(), set()
+    matched = 0
+    for similarity, rule_index, llm_index in candidates:
+        if similarity < match_threshold:
+            break
+        if rule_index in used_rule or llm_index in used_llm:
+            continue
+        used_rule.add(rule_index)
+        used_llm.add(llm_index)
+        matched += 1
+    return matched
+
+
+def run_claim_split_benchmark(
+    samples: List[Dict[str, Any]],
+    llm_extract: Callable[[str, str], List[str]],
+    match_threshold: float = 0.5,
+    max_chars: int = DEFAULT_HYBRID_MAX_CHARS,
+    max_claims: int = DEFAULT_HYBRID_MAX_CLAIMS,
+    progress_callback: Callable[[int, int], None] = None
+) -> Dict[str, Any]:
+    """Compare rule-based claims with ``llm_extract(question, answer)`` on the same samples.
+
+    Claim precision is the share of rule claims that match an LLM claim, recall the share of
+    LLM claims matched by a rule claim. The hybrid rows restrict the comparison to answers
+    hybrid mode would split locally, which is where the rules must agree with the LLM.
+    """
+    rows = []
+    rule_seconds = llm_seconds = 0.0
+    for position, sample in enumerate(samples, start=1):
+        answer = sample.get("candidate_answer", "")
+        started = time.perf_counter()
+        rule_claims = split_claims(answer)
+        rule_seconds += time.perf_counter() - started
+        started = time.perf_counter()
+        llm_claims = llm_extract(sample.get("question", ""), answer)
+        llm_seconds += time.perf_counter() - started
+        rows.append({
+            "id": sample.get("id"),
+            "rule_claims": rule_claims,
+            "llm_claims": llm_claims,
+            "matched": match_claims(rule_claims, llm_claims, match_threshold),
+            "local": not needs_llm_extraction(answer, rule_claims, max_chars, max_claims)
+        })
+        if progress_callback is not None:
+            progress_callback(position, len(samples))
+
+    def agreement(selected: List[Dict[str, Any]]) -> Dict[str, Any]:
+        rule_total = sum(len(row["rule_claims"]) for row in selected)
+        llm_total = sum(len(row["llm_claims"]) for row in selected)
+        matched = sum(row["matched"] for row in selected)
+        precision = matched / rule_total if rule_total else 0.0
+        recall = matched / llm_total if llm_total else 0.0
+        return {
+            "samples": len(selected),
+            "rule_claims": rule_total,
+            "llm_claims": llm_total,
+            "precision": precision,
+            "recall": recall,
+            "f1": 2 * precision * recall / (precision + recall) if precision + recall else 0.0,
+            "count_agreement": (
+                sum(1 for row in selected if len(row["rule_claims"]) == len(row["llm_claims"])) / len(selected)
+                if selected else 0.0
+            )
+        }
+
+    local_rows = [row for row in rows if row["local"]]
+    return {
+        "samples": len(rows),
+        "match_threshold": match_threshold,
+        "rule": agreement(rows),
+        "hybrid_local": agreement(local_rows),
+        "hybrid_local_share": len(local_rows) / len(rows) if rows else 0.0,
+        "rule_ms_per_sample": rule_seconds * 1000 / len(rows) if rows else 0.0,
+        "llm_ms_per_sample": llm_seconds * 1000 / len(rows) if rows else 0.0,
+        "rows": rows
+    }
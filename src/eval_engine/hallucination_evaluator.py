@@ -1,89 +1,51 @@
+import copy
 import json
+import time
 from typing import Any, Dict, List
 
 from langchain_core.output_parsers import StrOutputParser
 from langchain_core.prompts import PromptTemplate
 from langchain_openai import ChatOpenAI
 
+from endpoint_router import collect_served_endpoints, join_served, served_endpoint
+from eval_engine.adaptive_eval import AdaptiveEvaluationPlan
+from eval_engine.claim_evidence import retrieve_claim_evidence, supports_shared_pool
+from eval_engine.claim_splitter import llm_extraction_share, needs_llm_extraction, split_claims
+from eval_engine.judge_cascade import (
+    CascadePolicy,
+    compare_label_agreement,
+    merge_cascade_records,
+    summarize_cascade
+)
+from eval_engine.numeric_check import (
+    DEFAULT_NUMERIC_TOLERANCE,
+    SHORTCUT_CONFIDENCE,
+    describe_mismatches,
+    find_numeric_mismatches
+)
+from eval_engine.prompt_defaults import (
+    DEFAULT_CLAIM_EXTRACTION_PROMPT,
+    DEFAULT_CLAIM_VERIFICATION_PROMPT,
+    DEFAULT_OVERALL_PROMPT
+)
+from eval_engine.prompt_manager import compile_prompt, fingerprint_prompts
+from eval_engine.run_planner import plan_evaluation_run
+from eval_engine.strategy_defaults import (
+    CLAIM_EVIDENCE_STRATEGIES,
+    CLAIM_EXTRACTION_STRATEGIES,
+    DEFAULT_HYBRID_MAX_CHARS,
+    DEFAULT_HYBRID_MAX_CLAIMS,
+    DEFAULT_MIN_SIMILARITY,
+    DEFAULT_POOL_SIZE
+)
+from http_pool import get_http_clients
+from tracing import record_token_usage, span
+
 
 class HallucinationEvaluator:
-    DEFAULT_OVERALL_PROMPT = """
-    You are a financial fact-checking assistant. Judge whether the candidate answer is supported by the retrieved evidence.
-
-    Rules:
-    1. Only use the retrieved evidence. Do not rely on outside knowledge.
-    2. If the key facts in the answer are clearly supported by the evidence, verdict must be "supported".
-    3. If the key facts in the answer conflict with the evidence, verdict must be "hallucinated".
-    4. If the evidence is insufficient to confirm or reject the answer, verdict must be "uncertain".
-    5. Return strict JSON only.
-
-    Question:
-    {question}
-
-    Candidate Answer:
-    {candidate_answer}
-
-    Retrieved Evidence:
-    {context}
-
-    Return JSON:
-    {{
-      "verdict": "supported | hallucinated | uncertain",
-      "confidence": 0.0,
-      "reason": "short explanation",
-      "evidence": ["evidence snippet 1", "evidence snippet 2"],
-      "unsupported_parts": ["part that is unsupported or contradicted"]
-    }}
-    """
-
-    DEFAULT_CLAIM_EXTRACTION_PROMPT = """
-    You are a financial text analysis assistant. Break the candidate answer into minimal verifiable factual claims.
-
-    Rules:
-    1. Extract only factual claims that can be checked against evidence.
-    2. Keep each claim atomic whenever possible.
-    3. Return strict JSON only.
-
-    Question:
-    {question}
-
-    Candidate Answer:
-    {candidate_answer}
-
-    Return JSON:
-    {{
-      "claims": ["claim 1", "claim 2"]
-    }}
-    """
-
-    DEFAULT_CLAIM_VERIFICATION_PROMPT = """
-    You are a financial fact-checking assistant. Verify the claim using only the retrieved evidence.
-
-    Rules:
-    1. Only use the retrieved evidence. Do not rely on outside knowledge.
-    2. If the claim is clearly supported by the evidence, verdict must be "supported".
-    3. If the claim conflicts with the evidence, verdict must be "contradicted".
-    4. If the evidence is insufficient, verdict must be "insufficient_evidence".
-    5. Return strict JSON only.
-
-    Question:
-    {question}
-
-    Claim:
-    {claim}
-
-    Retrieved Evidence:
-    {context}
-
-    Return JSON:
-    {{
-      "claim": "{claim}",
-      "verdict": "supported | contradicted | insufficient_evidence",
-      "confidence": 0.0,
-      "reason": "short explanation",
-      "evidence": ["evidence snippet 1", "evidence snippet 2"]
-    }}
-    """
+    DEFAULT_OVERALL_PROMPT = DEFAULT_OVERALL_PROMPT
+    DEFAULT_CLAIM_EXTRACTION_PROMPT = DEFAULT_CLAIM_EXTRACTION_PROMPT
+    DEFAULT_CLAIM_VERIFICATION_PROMPT = DEFAULT_CLAIM_VERIFICATION_PROMPT
 
     def __init__(
         self,
@@ -94,33 +56,137 @@ class HallucinationEvaluator:
         overall_prompt: str = None,
         claim_extraction_prompt: str = None,
         claim_verification_prompt: str = None,
-        retrieval_top_k: int = 3
+        retrieval_top_k: int = 3,
+        http_clients=None,
+        judge_model=None,
+        cascade_model=None,
+        cascade_policy: CascadePolicy = None,
+        claim_extraction_strategy: str = "llm",
+        hybrid_max_chars: int = DEFAULT_HYBRID_MAX_CHARS,
+        hybrid_max_claims: int = DEFAULT_HYBRID_MAX_CLAIMS,
+        claim_evidence_strategy: str = "per_claim",
+        evidence_pool_size: int = DEFAULT_POOL_SIZE,
+        evidence_min_similarity: float = DEFAULT_MIN_SIMILARITY,
+        numeric_precheck: bool = False,
+        numeric_tolerance: float = DEFAULT_NUMERIC_TOLERANCE
     ):
-        self.judge_model = ChatOpenAI(
+        if claim_extraction_strategy not in CLAIM_EXTRACTION_STRATEGIES:
+            raise ValueError(
+                f"Unsupported claim extraction strategy '{claim_extraction_strategy}'. "
+                f"Supported: {CLAIM_EXTRACTION_STRATEGIES}"
+            )
+        if claim_evidence_strategy not in CLAIM_EVIDENCE_STRATEGIES:
+            raise ValueError(
+                f"Unsupported claim evidence strategy '{claim_evidence_strategy}'. "
+                f"Supported: {CLAIM_EVIDENCE_STRATEGIES}"
+            )
+        # Evaluators rebuilt per run still reuse the process-wide connection pool.
+        self.http_clients = http_clients or get_http_clients(base_url)
+        # An EndpointRouter may be passed to spread judge calls over several endpoints.
+        self.judge_model = judge_model if judge_model is not None else ChatOpenAI(
             model_name=model_name,
             temperature=0,
             base_url=base_url,
             timeout=timeout,
-            api_key=api_key
+            api_key=api_key,
+            **self.http_clients.client_kwargs()
         )
+        # With a cascade model, every judgment is made by it first and only escalated to
+        # judge_model when cascade_policy finds it doubtful.
+        self.cascade_model = cascade_model
+        self.cascade_policy = cascade_policy or CascadePolicy()
+        # "rule" splits answers locally without an LLM call; "hybrid" does so unless the
+        # answer is longer than hybrid_max_chars, conditional/causal, or splits into more
+        # than hybrid_max_claims claims.
+        self.claim_extraction_strategy = claim_extraction_strategy
+        self.hybrid_max_chars = hybrid_max_chars
+        self.hybrid_max_claims = hybrid_max_claims
+        # "shared_pool" retrieves evidence_pool_size chunks once per sample and re-ranks them
+        # per claim; claims whose best chunk is below evidence_min_similarity search the corpus.
+        self.claim_evidence_strategy = claim_evidence_strategy
+        self.evidence_pool_size = evidence_pool_size
+        self.evidence_min_similarity = evidence_min_similarity
+        # With numeric_precheck, answers or claims whose numbers clearly contradict the
+        # evidence are judged hallucinated locally and never reach the judge.
+        self.numeric_precheck = numeric_precheck
+        self.numeric_tolerance = numeric_tolerance
         self.retrieval_top_k = retrieval_top_k
-        self.overall_prompt = PromptTemplate.from_template(
-            overall_prompt or self.DEFAULT_OVERALL_PROMPT
-        )
-        self.claim_extraction_prompt = PromptTemplate.from_template(
-            claim_extraction_prompt or self.DEFAULT_CLAIM_EXTRACTION_PROMPT
-        )
-        self.claim_verification_prompt = PromptTemplate.from_template(
-            claim_verification_prompt or self.DEFAULT_CLAIM_VERIFICATION_PROMPT
-        )
+        prompt_texts = {
+            "overall_prompt": overall_prompt or self.DEFAULT_OVERALL_PROMPT,
+            "claim_extraction_prompt": claim_extraction_prompt or self.DEFAULT_CLAIM_EXTRACTION_PROMPT,
+            "claim_verification_prompt": claim_verification_prompt or self.DEFAULT_CLAIM_VERIFICATION_PROMPT
+        }
+        self.prompt_fingerprints = fingerprint_prompts(prompt_texts)
+        self.prompt_fingerprint = self.prompt_fingerprints["combined"]
+        self.overall_prompt = compile_prompt(prompt_texts["overall_prompt"])
+        self.claim_extraction_prompt = compile_prompt(prompt_texts["claim_extraction_prompt"])
+        self.claim_verification_prompt = compile_prompt(prompt_texts["claim_verification_prompt"])
 
-    def _invoke_json(self, prompt: PromptTemplate, variables: Dict[str, Any], fallback: Dict[str, Any]):
-        chain = prompt | self.judge_model | StrOutputParser()
-        try:
-            raw_output = chain.invoke(variables).strip()
-            return json.loads(raw_output)
-        except Exception:
-            return fallback
+    def _invoke_json(
+        self,
+        prompt: PromptTemplate,
+        variables: Dict[str, Any],
+        fallback: Dict[str, Any],
+        model=None,
+        usage: Dict[str, Any] = None
+    ):
+        """Judge with ``model`` (default: the strong judge model), returning ``fallback`` when
+        the call fails or its output is not JSON. ``usage`` receives latency and token counts."""
+        with span("llm.judge", prompt=self._prompt_stage(prompt)) as judge_span:
+            started = time.perf_counter()
+            try:
+                message = (prompt | (model or self.judge_model)).invoke(variables)
+                record_token_usage(judge_span, message)
+                if usage is not None:
+                    token_usage = getattr(message, "usage_metadata", None) or {}
+                    usage["input_tokens"] = token_usage.get("input_tokens", 0)
+                    usage["output_tokens"] = token_usage.get("output_tokens", 0)
+                endpoint = served_endpoint(message)
+                if endpoint:
+                    judge_span.set_attribute("endpoint", endpoint)
+                raw_output = StrOutputParser().invoke(message).strip()
+            except Exception:
+                judge_span.set_attribute("fallback", True)
+                return fallback
+            finally:
+                if usage is not None:
+                    usage["latency_ms"] = (time.perf_counter() - started) * 1000
+        with span("judge.parse", chars=len(raw_output)) as parse_span:
+            try:
+                return json.loads(raw_output)
+            except Exception:
+                parse_span.set_attribute("fallback", True)
+                return fallback
+
+    def _judge(self, prompt: PromptTemplate, variables: Dict[str, Any], fallback: Dict[str, Any]):
+        """Return the judgment and, in cascade mode, a record of the tiers that made it."""
+        if self.cascade_model is None:
+            return self._invoke_json(prompt, variables, fallback), None
+
+        stage = self._prompt_stage(prompt)
+        cheap_call = {"stage": stage, "tier": "cheap"}
+        judgment = self._invoke_json(prompt, variables, fallback, model=self.cascade_model, usage=cheap_call)
+        reason = self.cascade_policy.escalation_reason(judgment, judgment is not fallback, stage)
+        cheap_call["kept"] = reason is None
+        record = {"tier": "cheap", "escalated": reason is not None, "escalation_reason": reason, "calls": [cheap_call]}
+        if reason is None:
+            return judgment, record
+
+        strong_call = {"stage": stage, "tier": "strong", "kept": True}
+        record["tier"] = "strong"
+        if judgment is not fallback and "verdict" in judgment:
+            record["cheap_verdict"] = str(judgment.get("verdict", "")).strip().lower()
+        with span("judge.escalate", prompt=stage, reason=reason):
+            judgment = self._invoke_json(prompt, variables, fallback, usage=strong_call)
+        record["calls"].append(strong_call)
+        return judgment, record
+
+    def _prompt_stage(self, prompt: PromptTemplate) -> str:
+        if prompt is self.claim_extraction_prompt:
+            return "claim_extraction"
+        if prompt is self.claim_verification_prompt:
+            return "claim_verification"
+        return "overall"
 
     def _docs_to_strings(self, docs: List[Any]) -> List[str]:
         snippets = []
@@ -149,9 +215,18 @@ class HallucinationEvaluator:
 
         raise AttributeError("The provided engine does not expose a retrieval interface.")
 
+    def _numeric_mismatches(self, statement: str, evidence_docs: List[str], question: str) -> List[Dict[str, Any]]:
+        if not self.numeric_precheck:
+            return []
+        with span("numeric.precheck") as check_span:
+            mismatches = find_numeric_mismatches(statement, evidence_docs, question, self.numeric_tolerance)
+            check_span.set_attribute("mismatches", len(mismatches))
+        return mismatches
+
     def evaluate_sample_overall(self, sample: Dict[str, Any], rag_engine) -> Dict[str, Any]:
         evidence_docs = self._retrieve_evidence(rag_engine, sample["question"])
         context = "\n\n".join(evidence_docs) if evidence_docs else "No evidence retrieved."
+        mismatches = self._numeric_mismatches(sample["candidate_answer"], evidence_docs, sample["question"])
 
         fallback = {
             "verdict": "uncertain",
@@ -160,19 +235,28 @@ class HallucinationEvaluator:
             "evidence": [],
             "unsupported_parts": []
         }
-        judgment = self._invoke_json(
-            self.overall_prompt,
-            {
-                "question": sample["question"],
-                "candidate_answer": sample["candidate_answer"],
-                "context": context
-            },
-            fallback
-        )
+        if mismatches:
+            judgment, cascade = {
+                "verdict": "hallucinated",
+                "confidence": SHORTCUT_CONFIDENCE,
+                "reason": describe_mismatches(mismatches),
+                "evidence": list(dict.fromkeys(item["evidence_sentence"] for item in mismatches)),
+                "unsupported_parts": [item["stated"] for item in mismatches]
+            }, None
+        else:
+            judgment, cascade = self._judge(
+                self.overall_prompt,
+                {
+                    "question": sample["question"],
+                    "candidate_answer": sample["candidate_answer"],
+                    "context": context
+                },
+                fallback
+            )
 
         verdict = str(judgment.get("verdict", "uncertain")).strip().lower()
         predicted_label = self._predict_label_from_verdict(verdict)
-        return {
+        result = {
             "id": sample.get("id"),
             "mode": "overall",
             "question": sample.get("question", ""),
@@ -188,23 +272,80 @@ class HallucinationEvaluator:
             "source_type": sample.get("source_type", ""),
             "reference_docs": sample.get("reference_docs", []),
             "ground_truth": sample.get("ground_truth", ""),
-            "is_correct": predicted_label == sample.get("label", "")
+            "is_correct": predicted_label == sample.get("label", ""),
+            "prompt_fingerprint": self.prompt_fingerprint
         }
+        if cascade is not None:
+            result["cascade"] = merge_cascade_records([cascade])
+            result["judge_tier"] = cascade["tier"]
+            result["escalation_reason"] = cascade["escalation_reason"]
+        if self.numeric_precheck:
+            result["numeric_precheck"] = {"judgments": 1, "shortcuts": 1 if mismatches else 0}
+        if mismatches:
+            result["judged_by"] = "numeric_precheck"
+            result["numeric_mismatches"] = mismatches
+        return result
 
-    def extract_claims(self, question: str, candidate_answer: str) -> List[str]:
+    def _extract_claims(self, question: str, candidate_answer: str):
+        """Return the claims, the cascade record of an LLM extraction and the extractor used."""
+        if self.claim_extraction_strategy != "llm":
+            with span("claims.split", strategy=self.claim_extraction_strategy) as split_span:
+                claims = split_claims(candidate_answer)
+                local = self.claim_extraction_strategy == "rule" or not needs_llm_extraction(
+                    candidate_answer,
+                    claims,
+                    self.hybrid_max_chars,
+                    self.hybrid_max_claims
+                )
+                split_span.set_attributes(claims=len(claims), local=local)
+            if local:
+                return claims, None, "rule"
+        claims, cascade = self._extract_claims_with_llm(question, candidate_answer)
+        return claims, cascade, "llm"
+
+    def _extract_claims_with_llm(self, question: str, candidate_answer: str):
         fallback = {"claims": []}
-        result = self._invoke_json(
+        result, cascade = self._judge(
             self.claim_extraction_prompt,
             {"question": question, "candidate_answer": candidate_answer},
             fallback
         )
         claims = result.get("claims", [])
-        return [claim.strip() for claim in claims if isinstance(claim, str) and claim.strip()]
+        return [claim.strip() for claim in claims if isinstance(claim, str) and claim.strip()], cascade
 
-    def evaluate_claim(self, question: str, claim: str, rag_engine) -> Dict[str, Any]:
-        evidence_docs = self._retrieve_evidence(rag_engine, f"{question}\n{claim}")
+    def extract_claims(self, question: str, candidate_answer: str) -> List[str]:
+        return self._extract_claims(question, candidate_answer)[0]
+
+    def extract_claims_with_llm(self, question: str, candidate_answer: str) -> List[str]:
+        """LLM claim extraction regardless of the configured strategy, e.g. for benchmarks."""
+        return self._extract_claims_with_llm(question, candidate_answer)[0]
+
+    def _evidence_pool_store(self, rag_engine):
+        """The engine's vector store when claim evidence should come from a shared pool."""
+        if self.claim_evidence_strategy != "shared_pool":
+            return None
+        vector_store = getattr(rag_engine, "vector_store", None)
+        return vector_store if supports_shared_pool(vector_store) else None
+
+    def evaluate_claim(self, question: str, claim: str, rag_engine, evidence_docs: List[Any] = None) -> Dict[str, Any]:
+        if evidence_docs is None:
+            evidence_docs = self._retrieve_evidence(rag_engine, f"{question}\n{claim}")
+        else:
+            evidence_docs = self._docs_to_strings(evidence_docs)
         context = "\n\n".join(evidence_docs) if evidence_docs else "No evidence retrieved."
 
+        mismatches = self._numeric_mismatches(claim, evidence_docs, question)
+        if mismatches:
+            return {
+                "claim": claim,
+                "verdict": "contradicted",
+                "confidence": SHORTCUT_CONFIDENCE,
+                "reason": describe_mismatches(mismatches),
+                "evidence": list(dict.fromkeys(item["evidence_sentence"] for item in mismatches)),
+                "judged_by": "numeric_precheck",
+                "numeric_mismatches": mismatches
+            }
+
         fallback = {
             "claim": claim,
             "verdict": "insufficient_evidence",
@@ -212,15 +353,22 @@ class HallucinationEvaluator:
             "reason": "Failed to parse judge output.",
             "evidence": []
         }
-        result = self._invoke_json(
-            self.claim_verification_prompt,
-            {
-                "question": question,
-                "claim": claim,
-                "context": context
-            },
-            fallback
-        )
+        with collect_served_endpoints() as served:
+            result, cascade = self._judge(
+                self.claim_verification_prompt,
+                {
+                    "question": question,
+                    "claim": claim,
+                    "context": context
+                },
+                fallback
+            )
+        if served:
+            result["served_by"] = join_served(served)
+        if cascade is not None:
+            result["cascade"] = cascade
+            result["judge_tier"] = cascade["tier"]
+            result["escalation_reason"] = cascade["escalation_reason"]
         result["claim"] = result.get("claim", claim)
         result["verdict"] = str(result.get("verdict", "insufficient_evidence")).strip().lower()
         result["confidence"] = float(result.get("confidence", 0.0) or 0.0)
@@ -269,17 +417,36 @@ class HallucinationEvaluator:
         }
 
     def evaluate_sample_claim_level(self, sample: Dict[str, Any], rag_engine) -> Dict[str, Any]:
-        claims = self.extract_claims(sample["question"], sample["candidate_answer"])
-        claim_results = [
-            self.evaluate_claim(sample["question"], claim, rag_engine)
-            for claim in claims
-        ]
+        claims, extraction_cascade, extractor = self._extract_claims(sample["question"], sample["candidate_answer"])
+        pool_store = self._evidence_pool_store(rag_engine)
+        evidence_pool = None
+        if pool_store is None:
+            claim_results = [
+                self.evaluate_claim(sample["question"], claim, rag_engine)
+                for claim in claims
+            ]
+        else:
+            claim_evidence, evidence_pool = retrieve_claim_evidence(
+                pool_store,
+                sample["question"],
+                sample["candidate_answer"],
+                claims,
+                top_k=self.retrieval_top_k,
+                pool_size=self.evidence_pool_size,
+                min_similarity=self.evidence_min_similarity
+            )
+            claim_results = [
+                self.evaluate_claim(sample["question"], claim, rag_engine, evidence_docs=docs)
+                for claim, docs in zip(claims, claim_evidence)
+            ]
+            for item, source in zip(claim_results, evidence_pool.pop("sources")):
+                item["evidence_source"] = source
         aggregate = self.aggregate_claim_results(claim_results)
         contradicted_claims = [
             item for item in claim_results if item["verdict"] == "contradicted"
         ]
 
-        return {
+        result = {
             "id": sample.get("id"),
             "mode": "claim",
             "question": sample.get("question", ""),
@@ -292,25 +459,158 @@ class HallucinationEvaluator:
             "claim_results": claim_results,
             "claim_counts": aggregate["claim_counts"],
             "hallucinated_claims": contradicted_claims,
+            "claim_extractor": extractor,
+            "evidence_strategy": "per_claim" if evidence_pool is None else "shared_pool",
             "source_model": sample.get("source_model", ""),
             "source_type": sample.get("source_type", ""),
             "reference_docs": sample.get("reference_docs", []),
             "ground_truth": sample.get("ground_truth", ""),
-            "is_correct": aggregate["predicted_label"] == sample.get("label", "")
+            "is_correct": aggregate["predicted_label"] == sample.get("label", ""),
+            "prompt_fingerprint": self.prompt_fingerprint
         }
+        if evidence_pool is not None:
+            result["evidence_pool"] = evidence_pool
+        if self.numeric_precheck:
+            result["numeric_precheck"] = {
+                "judgments": len(claim_results),
+                "shortcuts": sum(1 for item in claim_results if item.get("judged_by") == "numeric_precheck")
+            }
+        if self.cascade_model is not None:
+            records = [extraction_cascade] if extraction_cascade is not None else []
+            # Claims settled by the numeric pre-check made no judge call.
+            records += [item.pop("cascade") for item in claim_results if "cascade" in item]
+            if records:
+                result["cascade"] = merge_cascade_records(records)
+                result["judge_tier"] = result["cascade"]["tier"]
+        return result
+
+    def evaluate_sample(self, sample: Dict[str, Any], rag_engine, mode: str = "overall") -> Dict[str, Any]:
+        started = time.perf_counter()
+        with span("eval.sample", sample_id=str(sample.get("id", "")), mode=mode) as sample_span:
+            with collect_served_endpoints() as served:
+                if mode == "claim":
+                    result = self.evaluate_sample_claim_level(sample, rag_engine)
+                    extraction_calls = 0 if result.get("claim_extractor") == "rule" else 1
+                    result["llm_calls"] = extraction_calls + len(result["claim_results"])
+                else:
+                    result = self.evaluate_sample_overall(sample, rag_engine)
+                    result["llm_calls"] = 1
+                if "numeric_precheck" in result:
+                    result["llm_calls"] -= result["numeric_precheck"]["shortcuts"]
+            if served:
+                # Endpoints that answered this sample's judge calls, in first-use order.
+                result["served_by"] = join_served(served)
+            if "cascade" in result:
+                # Escalated judgments cost a cheap and a strong call.
+                result["llm_calls"] = len(result["cascade"]["calls"])
+            sample_span.set_attributes(llm_calls=result["llm_calls"], verdict=result.get("verdict", ""))
+        # Recorded so the run planner can project durations from past runs.
+        result["latency_s"] = round(time.perf_counter() - started, 3)
+        return result
 
     def run_batch_eval(self, dataset: Any, rag_engine, mode: str = "overall") -> List[Dict[str, Any]]:
         """Run evaluation on a dataset using the provided retrieval-enabled engine."""
         samples = dataset.get("samples", []) if isinstance(dataset, dict) else dataset
-        results = []
-        for sample in samples:
-            if mode == "claim":
-                results.append(self.evaluate_sample_claim_level(sample, rag_engine))
-            else:
-                results.append(self.evaluate_sample_overall(sample, rag_engine))
-        return results
-
-    def calculate_classification_metrics(self, results: List[Dict[str, Any]]) -> Dict[str, float]:
+        return [self.evaluate_sample(sample, rag_engine, mode=mode) for sample in samples]
+
+    def run_adaptive_eval(
+        self,
+        dataset: Any,
+        rag_engine,
+        mode: str = "overall",
+        target_ci_width: float = 0.04,
+        max_samples: int = None,
+        batch_size: int = 20,
+        min_samples: int = 30,
+        metric: str = "f1",
+        confidence: float = 0.95,
+        seed: int = None
+    ) -> Dict[str, Any]:
+        """Evaluate stratified random batches until the metric's confidence interval is
+        at most ``target_ci_width`` wide or ``max_samples`` samples have been judged."""
+        samples = dataset.get("samples", []) if isinstance(dataset, dict) else dataset
+        plan = AdaptiveEvaluationPlan(
+            samples,
+            target_ci_width=target_ci_width,
+            max_samples=max_samples,
+            batch_size=batch_size,
+            min_samples=min_samples,
+            metric=metric,
+            confidence=confidence,
+            seed=seed
+        )
+        for sample in plan.iter_samples():
+            plan.record(self.evaluate_sample(sample, rag_engine, mode=mode))
+        return {
+            "results": plan.results,
+            "metrics": self.calculate_classification_metrics(plan.results),
+            "sampling": plan.summary()
+        }
+
+    def run_cascade_comparison(
+        self,
+        dataset: Any,
+        rag_engine,
+        mode: str = "overall",
+        cheap_price_per_1k: float = 0.0,
+        strong_price_per_1k: float = 0.0
+    ) -> Dict[str, Any]:
+        """Evaluate the same samples with the cascade and with the strong judge alone.
+
+        Returns both result lists with their metrics, the cascade's escalation and savings
+        summary, and how often the two runs agree on the predicted label.
+        """
+        if self.cascade_model is None:
+            raise ValueError("run_cascade_comparison needs an evaluator with a cascade_model.")
+        samples = dataset.get("samples", []) if isinstance(dataset, dict) else dataset
+        strong_only = copy.copy(self)
+        strong_only.cascade_model = None
+        cascade_results = self.run_batch_eval(samples, rag_engine, mode=mode)
+        strong_results = strong_only.run_batch_eval(samples, rag_engine, mode=mode)
+        return {
+            "cascade": {
+                "results": cascade_results,
+                "metrics": self.calculate_classification_metrics(cascade_results),
+                "latency_s": round(sum(result["latency_s"] for result in cascade_results), 3)
+            },
+            "strong_only": {
+                "results": strong_results,
+                "metrics": self.calculate_classification_metrics(strong_results),
+                "latency_s": round(sum(result["latency_s"] for result in strong_results), 3)
+            },
+            "summary": summarize_cascade(cascade_results, cheap_price_per_1k, strong_price_per_1k),
+            "agreement": compare_label_agreement(cascade_results, strong_results)
+        }
+
+    def plan_run(self, dataset: Any, mode: str = "overall", rag_engine=None, **options) -> Dict[str, Any]:
+        """Dry-run estimate of LLM calls, tokens, duration and cost with this evaluator's prompts.
+
+        ``options`` are passed to ``plan_evaluation_run`` (e.g. ``claims_per_answer``,
+        ``seconds_per_call``, ``concurrency``, ``escalation_rate``); nothing is sent to the
+        judge model. With a cascade model the plan counts cheap calls and escalations.
+        """
+        samples = dataset.get("samples", []) if isinstance(dataset, dict) else dataset
+        options.setdefault("retrieval_top_k", self.retrieval_top_k)
+        options.setdefault("model_name", getattr(self.judge_model, "model_name", None))
+        options.setdefault("cascade", self.cascade_model is not None)
+        options.setdefault(
+            "llm_extraction_share",
+            llm_extraction_share(samples, self.claim_extraction_strategy, self.hybrid_max_chars, self.hybrid_max_claims)
+        )
+        return plan_evaluation_run(
+            samples,
+            mode,
+            {
+                "overall_prompt": self.overall_prompt.template,
+                "claim_extraction_prompt": self.claim_extraction_prompt.template,
+                "claim_verification_prompt": self.claim_verification_prompt.template
+            },
+            rag_engine=rag_engine,
+            **options
+        )
+
+    @staticmethod
+    def calculate_classification_metrics(results: List[Dict[str, Any]]) -> Dict[str, float]:
         if not results:
             return {
                 "accuracy": 0.0,
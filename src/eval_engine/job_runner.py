@@ -0,0 +1,308 @@
+import json
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from copy import deepcopy
+from typing import Any, Callable, Dict, List, Optional
+
+from eval_engine.result_exporter import sanitize_config_snapshot
+from tracing import export_trace, load_trace, record_trace, summarize_spans
+
+
+class EvaluationJobRunner:
+    """Run evaluation jobs on a bounded worker pool, outside the Streamlit script run.
+
+    Each job is persisted under ``<job_dir>/<job_id>/``: ``job.json`` holds the status,
+    progress and running metrics, ``dataset.json`` the dataset snapshot and
+    ``results.jsonl`` the per-sample results appended as they complete. Traced jobs also
+    write their spans to ``trace.json``.
+    """
+
+    STATUS_QUEUED = "queued"
+    STATUS_RUNNING = "running"
+    STATUS_COMPLETED = "completed"
+    STATUS_FAILED = "failed"
+    STATUS_CANCELLED = "cancelled"
+    STATUS_INTERRUPTED = "interrupted"
+    ACTIVE_STATUSES = {STATUS_QUEUED, STATUS_RUNNING}
+
+    def __init__(
+        self,
+        engine_factory: Callable[[Dict[str, Any], Dict[str, str]], Any],
+        job_dir: str = "./data/eval_jobs",
+        max_concurrent_jobs: int = 2,
+        flush_interval: float = 1.0,
+        run_history=None
+    ):
+        """``engine_factory(runtime_config, prompts)`` must return ``(evaluator, rag_engine)``.
+
+        When ``run_history`` (a ``RunHistoryStore``) is given, every completed job is recorded
+        in it under its job id.
+        """
+        self.engine_factory = engine_factory
+        self.run_history = run_history
+        self.job_dir = job_dir
+        self.max_concurrent_jobs = max(1, int(max_concurrent_jobs))
+        self.flush_interval = flush_interval
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_concurrent_jobs,
+            thread_name_prefix="eval-job"
+        )
+        self._lock = threading.Lock()
+        self._jobs = {}
+        self._cancel_events = {}
+        os.makedirs(self.job_dir, exist_ok=True)
+        self._load_existing_jobs()
+
+    def _job_path(self, job_id: str, file_name: str) -> str:
+        return os.path.join(self.job_dir, job_id, file_name)
+
+    def _load_existing_jobs(self):
+        for job_id in os.listdir(self.job_dir):
+            job_path = self._job_path(job_id, "job.json")
+            if not os.path.exists(job_path):
+                continue
+            try:
+                with open(job_path, "r", encoding="utf-8") as file:
+                    job = json.load(file)
+            except (json.JSONDecodeError, OSError):
+                continue
+
+            # Jobs that were still active when the previous process exited cannot be resumed,
+            # because API keys are never written to disk.
+            if job.get("status") in self.ACTIVE_STATUSES:
+                job["status"] = self.STATUS_INTERRUPTED
+                job["error"] = "The server stopped before this job finished."
+                self._jobs[job_id] = job
+                self._write_job(job_id)
+            else:
+                self._jobs[job_id] = job
+
+    def _write_job(self, job_id: str):
+        job = deepcopy(self._jobs[job_id])
+        job_path = self._job_path(job_id, "job.json")
+        temp_path = job_path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            json.dump(job, file, ensure_ascii=False, indent=2)
+        os.replace(temp_path, job_path)
+
+    def _update_job(self, job_id: str, **fields):
+        with self._lock:
+            self._jobs[job_id].update(fields)
+            self._write_job(job_id)
+
+    def submit(
+        self,
+        dataset: Dict[str, Any],
+        mode: str,
+        prompts: Dict[str, str],
+        runtime_config: Dict[str, Any],
+        sampling: Dict[str, Any] = None,
+        trace: bool = False
+    ) -> str:
+        """Queue an evaluation job and return its id.
+
+        ``sampling`` switches the job to adaptive sequential evaluation; its keys are the
+        keyword arguments of ``AdaptiveEvaluationPlan`` (e.g. ``target_ci_width``, ``max_samples``).
+        ``trace`` records per-stage spans and stores their latency breakdown in ``trace_summary``.
+        """
+        job_id = f"{time.strftime('%Y%m%d%H%M%S')}_{uuid.uuid4().hex[:6]}"
+        snapshot = deepcopy(dataset)
+        os.makedirs(os.path.join(self.job_dir, job_id), exist_ok=True)
+        with open(self._job_path(job_id, "dataset.json"), "w", encoding="utf-8") as file:
+            json.dump(snapshot, file, ensure_ascii=False)
+
+        job = {
+            "job_id": job_id,
+            "status": self.STATUS_QUEUED,
+            "mode": mode,
+            "dataset_name": snapshot.get("dataset_name", ""),
+            "total": len(snapshot.get("samples", [])),
+            "completed": 0,
+            "metrics": {},
+            "sampling_options": dict(sampling) if sampling else None,
+            "sampling": None,
+            "trace": bool(trace),
+            "trace_summary": None,
+            "config": sanitize_config_snapshot(runtime_config),
+            "prompts": dict(prompts),
+            "error": "",
+            "created_at": time.time(),
+            "started_at": None,
+            "finished_at": None
+        }
+        with self._lock:
+            self._jobs[job_id] = job
+            self._cancel_events[job_id] = threading.Event()
+            self._write_job(job_id)
+
+        self._executor.submit(
+            self._run_job,
+            job_id,
+            snapshot,
+            mode,
+            dict(prompts),
+            dict(runtime_config),
+            dict(sampling) if sampling else None,
+            bool(trace)
+        )
+        return job_id
+
+    def _run_job(
+        self,
+        job_id: str,
+        dataset: Dict[str, Any],
+        mode: str,
+        prompts: Dict[str, str],
+        runtime_config: Dict[str, Any],
+        sampling: Dict[str, Any] = None,
+        trace: bool = False
+    ):
+        cancel_event = self._cancel_events[job_id]
+        if cancel_event.is_set():
+            self._update_job(job_id, status=self.STATUS_CANCELLED, finished_at=time.time())
+            return
+
+        with record_trace("eval.job", job_id=job_id, mode=mode) if trace else nullcontext() as recorder:
+            self._evaluate_job(job_id, dataset, mode, prompts, runtime_config, sampling, cancel_event)
+        if recorder is not None:
+            spans = recorder.export()
+            export_trace(self._job_path(job_id, "trace.json"), spans)
+            self._update_job(job_id, trace_summary=summarize_spans(spans))
+
+    def _evaluate_job(
+        self,
+        job_id: str,
+        dataset: Dict[str, Any],
+        mode: str,
+        prompts: Dict[str, str],
+        runtime_config: Dict[str, Any],
+        sampling: Optional[Dict[str, Any]],
+        cancel_event: threading.Event
+    ):
+        self._update_job(job_id, status=self.STATUS_RUNNING, started_at=time.time())
+        results = []
+        try:
+            evaluator, rag_engine = self.engine_factory(runtime_config, prompts)
+            plan = None
+            samples = dataset.get("samples", [])
+            if sampling:
+                # Imported here so the web app does not load numpy at startup.
+                from eval_engine.adaptive_eval import AdaptiveEvaluationPlan
+
+                plan = AdaptiveEvaluationPlan(samples, **sampling)
+                samples = plan.iter_samples()
+                self._update_job(job_id, total=plan.max_samples, sampling=plan.summary())
+
+            last_flush = time.time()
+            with open(self._job_path(job_id, "results.jsonl"), "w", encoding="utf-8") as results_file:
+                for sample in samples:
+                    if cancel_event.is_set():
+                        break
+
+                    result = evaluator.evaluate_sample(sample, rag_engine, mode=mode)
+                    results.append(result)
+                    if plan is not None:
+                        plan.record(result)
+                    results_file.write(json.dumps(result, ensure_ascii=False) + "\n")
+                    results_file.flush()
+
+                    if time.time() - last_flush >= self.flush_interval:
+                        self._update_job(
+                            job_id,
+                            completed=len(results),
+                            metrics=evaluator.calculate_classification_metrics(results),
+                            sampling=plan.summary() if plan is not None else None
+                        )
+                        last_flush = time.time()
+
+            status = self.STATUS_CANCELLED if cancel_event.is_set() else self.STATUS_COMPLETED
+            metrics = evaluator.calculate_classification_metrics(results)
+            self._update_job(
+                job_id,
+                status=status,
+                completed=len(results),
+                metrics=metrics,
+                sampling=plan.summary() if plan is not None else None,
+                finished_at=time.time()
+            )
+            if status == self.STATUS_COMPLETED and self.run_history is not None:
+                self._record_run(job_id, results, metrics)
+        except Exception as exc:
+            self._update_job(
+                job_id,
+                status=self.STATUS_FAILED,
+                completed=len(results),
+                error=str(exc),
+                finished_at=time.time()
+            )
+
+    def _record_run(self, job_id: str, results: List[Dict[str, Any]], metrics: Dict[str, Any]):
+        job = self.get_job(job_id)
+        try:
+            self.run_history.save_run(
+                results,
+                metrics,
+                job["mode"],
+                dataset_name=job["dataset_name"],
+                config_snapshot=job["config"],
+                prompts=job["prompts"],
+                run_id=job_id
+            )
+        except Exception as exc:
+            # The results are already on disk; a history failure must not fail the job.
+            self._update_job(job_id, error=f"Run history could not be saved: {exc}")
+
+    def cancel(self, job_id: str):
+        with self._lock:
+            cancel_event = self._cancel_events.get(job_id)
+        if cancel_event is not None:
+            cancel_event.set()
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return deepcopy(job) if job is not None else None
+
+    def list_jobs(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            jobs = [deepcopy(job) for job in self._jobs.values()]
+        return sorted(jobs, key=lambda job: job.get("created_at", 0), reverse=True)
+
+    def has_active_jobs(self) -> bool:
+        with self._lock:
+            return any(job["status"] in self.ACTIVE_STATUSES for job in self._jobs.values())
+
+    def load_results(self, job_id: str) -> List[Dict[str, Any]]:
+        """Load the results written so far; works for running and finished jobs."""
+        results_path = self._job_path(job_id, "results.jsonl")
+        if not os.path.exists(results_path):
+            return []
+
+        results = []
+        with open(results_path, "r", encoding="utf-8") as file:
+            for line in file:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    results.append(json.loads(line))
+                except json.JSONDecodeError:
+                    # The last line may still be in the middle of being written.
+                    break
+        return results
+
+    def load_trace(self, job_id: str) -> List[Dict[str, Any]]:
+        """Spans recorded for a traced job, or an empty list."""
+        trace_path = self._job_path(job_id, "trace.json")
+        if not os.path.exists(trace_path):
+            return []
+        return load_trace(trace_path)
+
+    def shutdown(self, wait: bool = False):
+        for cancel_event in self._cancel_events.values():
+            cancel_event.set()
+        self._executor.shutdown(wait=wait)
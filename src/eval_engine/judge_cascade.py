@@ -0,0 +1,156 @@
+"""Cheap-model-first judging: a small judge answers first and only doubtful judgments are
+escalated to the strong judge model."""
+from typing import Any, Dict, List, Optional
+
+DEFAULT_MIN_CONFIDENCE = 0.75
+DEFAULT_ESCALATE_VERDICTS = ["uncertain", "insufficient_evidence"]
+
+
+class CascadePolicy:
+    """Decide whether a cheap judgment is good enough to keep.
+
+    A judgment is escalated when it could not be parsed, when its verdict is one of
+    ``escalate_verdicts``, or when its confidence is below ``min_confidence``. Claim
+    extraction has no confidence, so it is only escalated when it fails to parse or
+    yields no claims.
+    """
+
+    def __init__(self, min_confidence: float = DEFAULT_MIN_CONFIDENCE, escalate_verdicts: List[str] = None):
+        self.min_confidence = float(min_confidence)
+        self.escalate_verdicts = {
+            str(verdict).strip().lower()
+            for verdict in (DEFAULT_ESCALATE_VERDICTS if escalate_verdicts is None else escalate_verdicts)
+        }
+
+    def escalation_reason(self, judgment: Dict[str, Any], parsed: bool, stage: str) -> Optional[str]:
+        if not parsed:
+            return "parse_failure"
+        if stage == "claim_extraction":
+            claims = judgment.get("claims")
+            return None if isinstance(claims, list) and claims else "no_claims"
+        if str(judgment.get("verdict", "")).strip().lower() in self.escalate_verdicts:
+            return "verdict"
+        try:
+            confidence = float(judgment.get("confidence", 0.0) or 0.0)
+        except (TypeError, ValueError):
+            return "low_confidence"
+        return "low_confidence" if confidence < self.min_confidence else None
+
+
+def build_cascade_model(settings: Dict[str, Any], timeout: int = 60, http_pool_settings: Dict[str, Any] = None):
+    """Chat model for ``AppConfigManager.get_judge_cascade_settings``; ``None`` when the cascade is off."""
+    if not settings:
+        return None
+    from langchain_openai import ChatOpenAI
+
+    from http_pool import get_http_clients
+
+    base_url = settings["base_url"] or None
+    return ChatOpenAI(
+        model_name=settings["model_name"],
+        temperature=0,
+        base_url=base_url,
+        timeout=timeout,
+        api_key=settings["api_key"],
+        **get_http_clients(base_url, **(http_pool_settings or {})).client_kwargs()
+    )
+
+
+def merge_cascade_records(records: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Sample-level cascade record for the judgments made while evaluating one sample."""
+    escalated = [record for record in records if record["escalated"]]
+    if not escalated:
+        tier = "cheap"
+    elif len(escalated) == len(records):
+        tier = "strong"
+    else:
+        tier = "mixed"
+    return {
+        "tier": tier,
+        "escalated": bool(escalated),
+        "judgments": len(records),
+        "escalated_judgments": len(escalated),
+        "escalation_reasons": [record["escalation_reason"] for record in escalated],
+        "calls": [call for record in records for call in record["calls"]]
+    }
+
+
+def summarize_cascade(
+    results: List[Dict[str, Any]],
+    cheap_price_per_1k: float = 0.0,
+    strong_price_per_1k: float = 0.0
+) -> Dict[str, Any]:
+    """Escalation share and the judge time, tokens and cost saved against a strong-only run.
+
+    A strong-only run makes one strong call per judgment. For judgments the cheap model
+    settled, its tokens stand in for the strong call's (the prompts are the same) and the
+    mean latency of the strong calls that did happen stands in for its latency, so latency
+    savings are ``None`` until at least one judgment has been escalated. Latencies are summed
+    call times, i.e. what a sequential run would spend waiting on the judge.
+    """
+    records = [result["cascade"] for result in results if isinstance(result.get("cascade"), dict)]
+    totals = {
+        tier: {"calls": 0, "tokens": 0, "latency_ms": 0.0}
+        for tier in ("cheap", "strong")
+    }
+    settled_tokens = 0
+    for record in records:
+        for call in record["calls"]:
+            tier = totals[call["tier"]]
+            tokens = call.get("input_tokens", 0) + call.get("output_tokens", 0)
+            tier["calls"] += 1
+            tier["tokens"] += tokens
+            tier["latency_ms"] += call.get("latency_ms", 0.0)
+            if call["tier"] == "cheap" and call.get("kept"):
+                settled_tokens += tokens
+
+    reasons = {}
+    for record in records:
+        for reason in record["escalation_reasons"]:
+            reasons[reason] = reasons.get(reason, 0) + 1
+    judgments = sum(record["judgments"] for record in records)
+    escalated_judgments = sum(record["escalated_judgments"] for record in records)
+    cheap, strong = totals["cheap"], totals["strong"]
+    cascade_latency_ms = cheap["latency_ms"] + strong["latency_ms"]
+    strong_only_latency_ms = None
+    if strong["calls"]:
+        strong_only_latency_ms = judgments * strong["latency_ms"] / strong["calls"]
+    strong_only_tokens = strong["tokens"] + settled_tokens
+    cascade_cost = (cheap["tokens"] * cheap_price_per_1k + strong["tokens"] * strong_price_per_1k) / 1000
+    strong_only_cost = strong_only_tokens * strong_price_per_1k / 1000
+    priced = bool(cheap_price_per_1k or strong_price_per_1k)
+
+    return {
+        "samples": len(records),
+        "escalated_samples": sum(1 for record in records if record["escalated"]),
+        "escalated_sample_rate": sum(1 for record in records if record["escalated"]) / len(records) if records else 0.0,
+        "judgments": judgments,
+        "escalated_judgments": escalated_judgments,
+        "escalation_rate": escalated_judgments / judgments if judgments else 0.0,
+        "escalation_reasons": reasons,
+        "cheap": cheap,
+        "strong": strong,
+        "cascade_latency_ms": cascade_latency_ms,
+        "strong_only_latency_ms": strong_only_latency_ms,
+        "latency_saved_ms": None if strong_only_latency_ms is None else strong_only_latency_ms - cascade_latency_ms,
+        "strong_tokens_saved": strong_only_tokens - strong["tokens"],
+        "cascade_cost": cascade_cost if priced else None,
+        "strong_only_cost": strong_only_cost if priced else None,
+        "cost_saved": strong_only_cost - cascade_cost if priced else None
+    }
+
+
+def compare_label_agreement(cascade_results: List[Dict[str, Any]], strong_results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """How often the cascade reaches the same predicted label as the strong-only run, per sample id."""
+    strong_labels = {result.get("id"): result.get("predicted_label") for result in strong_results}
+    paired = [
+        (result.get("predicted_label"), strong_labels[result.get("id")])
+        for result in cascade_results
+        if result.get("id") in strong_labels
+    ]
+    agreed = sum(1 for cascade_label, strong_label in paired if cascade_label == strong_label)
+    return {
+        "paired_samples": len(paired),
+        "agreement": agreed / len(paired) if paired else 0.0,
+        "disagreements": len(paired) - agreed
+    }
@@ -0,0 +1,278 @@
+"""Local numeric consistency pre-check that settles clear number mismatches without a judge call."""
+import re
+from typing import Any, Dict, List, Optional
+
+DEFAULT_NUMERIC_TOLERANCE = 0.01
+SHORTCUT_CONFIDENCE = 0.95
+
+# Reporting periods: years with an optional quarter, half or month, and bare quarters/halves.
+_PERIOD = re.compile(
+    r"(?:(?:FY|fiscal\s+year)\s*(?P<fy>(?:19|20)\d{2})\b"
+    r"|(?P<year>(?:19|20)\d{2})\s*(?:财年|年度|年)"
+    r"|(?<=\bin\s)(?P<en_year>(?:19|20)\d{2})\b)"
+    r"(?:\s*(?:第?(?P<cn_q>[一二三四1-4])季度|(?P<cn_h>[上下])半年|Q(?P<q>[1-4])|H(?P<h>[12])"
+    r"|(?P<month>\d{1,2})\s*月(?:\s*\d{1,2}\s*日)?))?"
+    r"(?:\s*(?:年末|年底|全年|末|底))?"
+    r"|第?(?P<lone_cn_q>[一二三四])季度|(?P<lone_cn_h>[上下])半年"
+    r"|\b(?P<lone_q>Q[1-4])\b(?:\s*(?P<q_year>(?:19|20)\d{2})\b)?|\b(?P<lone_h>H[12])\b"
+    r"|(?<!\d)(?P<lone_month>\d{1,2})\s*月(?:\s*\d{1,2}\s*日)?",
+    re.IGNORECASE
+)
+_QUANTITY = re.compile(
+    r"(?P<prefix>US\$|HK\$|\$|¥|￥|RMB|USD|CNY|HKD)?\s*"
+    r"(?<![A-Za-z\d.,])(?P<number>\d+(?:,\d{3})*(?:\.\d+)?)(?![\d.]*\d)"
+    r"\s*(?P<scale>万亿|千亿|百亿|十亿|亿|千万|百万|十万|万|千|trillion|billion|million|thousand|bn|mn)?"
+    r"\s*(?P<unit>%|％|个百分点|百分点|percentage\s+points?|percent|美元|港元|港币|人民币元|人民币|元|倍|dollars?|yuan)?",
+    re.IGNORECASE
+)
+# Numbers that count time, rank or list position are not compared.
+_NON_QUANTITY_SUFFIX = re.compile(r"\s*(?:年|个月|月|日|号|天|周|季度|期|名|位)")
+_SENTENCE_BREAK = re.compile(r"[。！？!?；;\n]+|\.(?=\s|$)")
+_CLAUSE_BREAK = re.compile(r"[，,：:、（）()]")
+_PREDICATE_TAIL = re.compile(
+    r"(?:(?:较上年同期|较去年同期|较上年|较去年|比上年|比去年|同比|环比|升至|降至|增至|减至|增长|增加|上升|上涨|提升|提高"
+    r"|下降|下跌|减少|回落|降低|下滑|达到|约为|共计|合计|录得|实现|为|是|达|约|共|至|到|较|了|报)"
+    r"|(?<![A-Za-z])(?:was|were|is|are|of|at|to|by|rose|fell|grew|increased|decreased|declined|dropped"
+    r"|reached|totaled|totalled|up|down|about|approximately|around))\s*$",
+    re.IGNORECASE
+)
+_LEADING_FILLER = re.compile(r"^(?:其中|并且|而且|同时|此外|以及|和|及|与|而|其|and|while|but|with)\s*", re.IGNORECASE)
+# Verbs and particles that do not change which metric a label names.
+_LABEL_FILLER = re.compile(r"实现|录得|累计|的|\s+")
+_LEVEL_MARKERS = {"至", "到", "升至", "降至", "增至", "减至", "to"}
+_CHANGE_MARKERS = {
+    "同比", "环比", "较上年同期", "较去年同期", "较上年", "较去年", "比上年", "比去年", "较",
+    "增长", "增加", "上升", "上涨", "提升", "提高", "下降", "下跌", "减少", "回落", "降低", "下滑",
+    "rose", "fell", "grew", "increased", "decreased", "declined", "dropped", "up", "down", "by"
+}
+_DECLINE_MARKERS = {"下降", "下跌", "减少", "回落", "降低", "下滑", "fell", "decreased", "declined", "dropped", "down"}
+_SCALES = {
+    "千": 1e3, "thousand": 1e3, "万": 1e4, "十万": 1e5, "百万": 1e6, "million": 1e6, "mn": 1e6,
+    "千万": 1e7, "亿": 1e8, "十亿": 1e9, "billion": 1e9, "bn": 1e9, "百亿": 1e10, "千亿": 1e11,
+    "万亿": 1e12, "trillion": 1e12
+}
+_UNITS = {
+    "%": "percent", "％": "percent", "percent": "percent",
+    "个百分点": "percentage_point", "百分点": "percentage_point",
+    "美元": "USD", "$": "USD", "us$": "USD", "usd": "USD", "dollar": "USD", "dollars": "USD",
+    "港元": "HKD", "港币": "HKD", "hk$": "HKD", "hkd": "HKD",
+    "元": "CNY", "人民币": "CNY", "人民币元": "CNY", "yuan": "CNY", "¥": "CNY", "￥": "CNY", "rmb": "CNY", "cny": "CNY",
+    "倍": "times"
+}
+_CURRENCIES = {"CNY", "USD", "HKD"}
+_CN_DIGITS = {"一": "1", "二": "2", "三": "3", "四": "4"}
+
+
+def _period_key(match) -> Optional[str]:
+    year = match.group("fy") or match.group("year") or match.group("en_year") or match.group("q_year") or ""
+    quarter = match.group("cn_q") or match.group("q") or match.group("lone_cn_q") or match.group("lone_q")
+    half = match.group("cn_h") or match.group("h") or match.group("lone_cn_h") or match.group("lone_h")
+    if quarter:
+        part = "Q" + _CN_DIGITS.get(quarter[-1], quarter[-1])
+    elif half:
+        part = "H1" if half[-1] in "上1" else "H2"
+    elif match.group("month") or match.group("lone_month"):
+        part = f"M{int(match.group('month') or match.group('lone_month'))}"
+    else:
+        part = ""
+    return f"{year}{part}" or None
+
+
+def _sentence_periods(sentence: str) -> List[tuple]:
+    """Period keys with their positions; a month or quarter without a year takes the year of
+    the previous period in the sentence."""
+    periods = []
+    year = ""
+    for match in _PERIOD.finditer(sentence):
+        key = _period_key(match)
+        if not key:
+            continue
+        if key[:1].isdigit():
+            year = key[:4]
+        elif year:
+            key = year + key
+        periods.append((match.start(), key))
+    return periods
+
+
+def _normalize_label(label: str) -> str:
+    label = _LEADING_FILLER.sub("", label.strip())
+    return _LABEL_FILLER.sub("", label).lower()
+
+
+def _split_predicates(segment: str):
+    """Strip predicate words from the end of the text before a number; returns the label and
+    the stripped words, nearest to the number first."""
+    predicates = []
+    while True:
+        match = _PREDICATE_TAIL.search(segment)
+        if not match or match.start() == match.end():
+            break
+        predicates.append(match.group(0).strip().lower())
+        segment = segment[:match.start()]
+    return segment, predicates
+
+
+def _rounding(number: str, multiplier: float) -> float:
+    decimals = len(number.split(".")[1]) if "." in number else 0
+    return 0.5 * 10 ** -decimals * multiplier
+
+
+def extract_quantities(text: str, default_period: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Numeric facts in ``text`` with their normalized value, unit, metric and period.
+
+    Values are scaled by Chinese and English magnitude words (万/亿, million/billion). A change
+    ("同比增长7.3%", "fell 3%") is kept apart from a level ("增长至7.3%") and declines are negative.
+    The metric is the clause text before the number; a number without one (", 同比增长7.3%")
+    inherits the previous metric in its sentence. The period is the nearest reporting period
+    before the number in its sentence, else the sentence's first, else ``default_period``.
+    """
+    quantities = []
+    for sentence in _SENTENCE_BREAK.split(text or ""):
+        periods = _sentence_periods(sentence)
+        # Periods are blanked out so their digits are neither quantities nor part of metric labels.
+        masked = _PERIOD.sub(lambda match: " " * len(match.group(0)), sentence)
+        previous_end = 0
+        previous_metric = ""
+        for match in _QUANTITY.finditer(masked):
+            number = match.group("number")
+            scale, unit = match.group("scale"), match.group("unit")
+            if (
+                not (scale or unit or match.group("prefix"))
+                and _NON_QUANTITY_SUFFIX.match(masked, match.end("number"))
+            ) or masked[:match.start("number")].rstrip().endswith("第"):
+                continue
+            clause_start = max(
+                [previous_end] + [position.end() for position in _CLAUSE_BREAK.finditer(masked, 0, match.start())]
+            )
+            label, predicates = _split_predicates(masked[clause_start:match.start()])
+            metric = _normalize_label(label) or previous_metric
+            previous_end = match.end()
+            if not metric:
+                continue
+            previous_metric = metric
+
+            is_change = bool(predicates) and predicates[0] not in _LEVEL_MARKERS and any(
+                predicate in _CHANGE_MARKERS for predicate in predicates
+            )
+            multiplier = _SCALES.get((scale or "").lower(), 1.0)
+            value = float(number.replace(",", "")) * multiplier
+            if is_change and any(predicate in _DECLINE_MARKERS for predicate in predicates):
+                value = -value
+            unit_key = re.sub(r"\s+", " ", (unit or match.group("prefix") or "").lower())
+            if unit_key.startswith("percentage point"):
+                unit_key = "个百分点"
+            preceding = [key for position, key in periods if position < match.start()]
+            period = preceding[-1] if preceding else (periods[0][1] if periods else default_period)
+            quantities.append({
+                "value": value,
+                "unit": _UNITS.get(unit_key, "number"),
+                "kind": "change" if is_change else "level",
+                "metric": metric,
+                "period": period,
+                "rounding": _rounding(number, multiplier),
+                # Changes carry their direction so "增长5%" and "下降5%" read differently in reasons.
+                "text": (("-" if value < 0 else "+") if is_change else "") + match.group(0).strip(),
+                "sentence": sentence.strip()
+            })
+    return quantities
+
+
+def first_period(text: str) -> Optional[str]:
+    for match in _PERIOD.finditer(text or ""):
+        key = _period_key(match)
+        if key:
+            return key
+    return None
+
+
+def _aligned(stated: Dict[str, Any], evidence: Dict[str, Any]) -> bool:
+    units = {stated["unit"], evidence["unit"]}
+    # A bare magnitude ("91.4亿") can stand for an amount in any currency.
+    if len(units) > 1 and not ("number" in units and units - {"number"} <= _CURRENCIES):
+        return False
+    # Metrics must match exactly: "净利润" and "扣非净利润" or "营收" and "海外营收" are different
+    # figures, and a wrong alignment would become a confident verdict without a judge call.
+    return (
+        stated["kind"] == evidence["kind"]
+        and stated["period"] == evidence["period"]
+        and len(stated["metric"]) >= 2
+        and stated["metric"] == evidence["metric"]
+    )
+
+
+def _consistent(stated: Dict[str, Any], evidence: Dict[str, Any], tolerance: float) -> bool:
+    allowed = max(stated["rounding"], evidence["rounding"]) + tolerance * max(abs(stated["value"]), abs(evidence["value"]))
+    return abs(stated["value"] - evidence["value"]) <= allowed
+
+
+def find_numeric_mismatches(
+    statement: str,
+    evidence_docs: List[str],
+    context: str = "",
+    tolerance: float = DEFAULT_NUMERIC_TOLERANCE
+) -> List[Dict[str, Any]]:
+    """Numbers in ``statement`` that the evidence clearly contradicts.
+
+    A stated number is compared with the evidence numbers for the same metric, unit, kind and
+    period (``context``, e.g. the question, supplies the period when the statement has none).
+    It is a mismatch only when at least one such number exists and none of them agrees within
+    rounding of the less precise figure plus ``tolerance`` (relative). Numbers the evidence does
+    not mention are left to the judge.
+    """
+    evidence = [
+        quantity
+        for doc in evidence_docs
+        for quantity in extract_quantities(doc, first_period(doc))
+    ]
+    if not evidence:
+        return []
+    mismatches = []
+    for stated in extract_quantities(statement, first_period(context)):
+        candidates = [quantity for quantity in evidence if _aligned(stated, quantity)]
+        if not candidates or any(_consistent(stated, quantity, tolerance) for quantity in candidates):
+            continue
+        closest = min(candidates, key=lambda quantity: abs(quantity["value"] - stated["value"]))
+        mismatches.append({
+            "metric": stated["metric"],
+            "period": stated["period"],
+            "stated": stated["text"],
+            "evidence": closest["text"],
+            "evidence_sentence": closest["sentence"]
+        })
+    return mismatches
+
+
+def describe_mismatches(mismatches: List[Dict[str, Any]]) -> str:
+    return "Numeric mismatch: " + "; ".join(
+        f"{item['metric']} is {item['stated']} in the answer but {item['evidence']} in the evidence"
+        for item in mismatches
+    ) + "."
+
+
+def summarize_numeric_precheck(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Share of judgments settled by the numeric pre-check and how often those calls were right.
+
+    Every shortcut predicts a hallucination, so its precision is the share of shortcut samples
+    labelled ``positive`` among those with a label.
+    """
+    judgments = shortcuts = 0
+    shortcut_samples = []
+    for result in results:
+        precheck = result.get("numeric_precheck")
+        if not isinstance(precheck, dict):
+            continue
+        judgments += precheck["judgments"]
+        shortcuts += precheck["shortcuts"]
+        if precheck["shortcuts"]:
+            shortcut_samples.append(result)
+    labelled = [result for result in shortcut_samples if result.get("expected_label") in ("positive", "negative")]
+    correct = sum(1 for result in labelled if result["expected_label"] == "positive")
+    return {
+        "judgments": judgments,
+        "shortcuts": shortcuts,
+        "skip_rate": shortcuts / judgments if judgments else 0.0,
+        "shortcut_samples": len(shortcut_samples),
+        "labelled_shortcut_samples": len(labelled),
+        "shortcut_precision": correct / len(labelled) if labelled else None
+    }
@@ -0,0 +1,79 @@
+"""Default judge prompts, kept free of heavy imports so the UI can load them cheaply."""
+
+DEFAULT_OVERALL_PROMPT = """
+    You are a financial fact-checking assistant. Judge whether the candidate answer is supported by the retrieved evidence.
+
+    Rules:
+    1. Only use the retrieved evidence. Do not rely on outside knowledge.
+    2. If the key facts in the answer are clearly supported by the evidence, verdict must be "supported".
+    3. If the key facts in the answer conflict with the evidence, verdict must be "hallucinated".
+    4. If the evidence is insufficient to confirm or reject the answer, verdict must be "uncertain".
+    5. Return strict JSON only.
+
+    Question:
+    {question}
+
+    Candidate Answer:
+    {candidate_answer}
+
+    Retrieved Evidence:
+    {context}
+
+    Return JSON:
+    {{
+      "verdict": "supported | hallucinated | uncertain",
+      "confidence": 0.0,
+      "reason": "short explanation",
+      "evidence": ["evidence snippet 1", "evidence snippet 2"],
+      "unsupported_parts": ["part that is unsupported or contradicted"]
+    }}
+    """
+
+DEFAULT_CLAIM_EXTRACTION_PROMPT = """
+    You are a financial text analysis assistant. Break the candidate answer into minimal verifiable factual claims.
+
+    Rules:
+    1. Extract only factual claims that can be checked against evidence.
+    2. Keep each claim atomic whenever possible.
+    3. Return strict JSON only.
+
+    Question:
+    {question}
+
+    Candidate Answer:
+    {candidate_answer}
+
+    Return JSON:
+    {{
+      "claims": ["claim 1", "claim 2"]
+    }}
+    """
+
+DEFAULT_CLAIM_VERIFICATION_PROMPT = """
+    You are a financial fact-checking assistant. Verify the claim using only the retrieved evidence.
+
+    Rules:
+    1. Only use the retrieved evidence. Do not rely on outside knowledge.
+    2. If the claim is clearly supported by the evidence, verdict must be "supported".
+    3. If the claim conflicts with the evidence, verdict must be "contradicted".
+    4. If the evidence is insufficient, verdict must be "insufficient_evidence".
+    5. Return strict JSON only.
+
+    Question:
+    {question}
+
+    Claim:
+    {claim}
+
+    Retrieved Evidence:
+    {context}
+
+    Return JSON:
+    {{
+      "claim": "{claim}",
+      "verdict": "supported | contradicted | insufficient_evidence",
+      "confidence": 0.0,
+      "reason": "short explanation",
+      "evidence": ["evidence snippet 1", "evidence snippet 2"]
+    }}
+    """
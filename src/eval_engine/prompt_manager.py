@@ -1,9 +1,61 @@
+import hashlib
 import json
 import os
 import re
+import threading
+from collections import OrderedDict
 from typing import Dict, List
 
-from eval_engine.hallucination_evaluator import HallucinationEvaluator
+from eval_engine.prompt_defaults import (
+    DEFAULT_CLAIM_EXTRACTION_PROMPT,
+    DEFAULT_CLAIM_VERIFICATION_PROMPT,
+    DEFAULT_OVERALL_PROMPT
+)
+
+PROMPT_NAMES = ["overall_prompt", "claim_extraction_prompt", "claim_verification_prompt"]
+FINGERPRINT_LENGTH = 12
+COMPILED_CACHE_SIZE = 256
+
+_compiled_templates = OrderedDict()
+_compiled_lock = threading.Lock()
+
+
+def fingerprint_prompt(text: str) -> str:
+    """Content fingerprint of one prompt: a short SHA-256 of its exact text."""
+    return hashlib.sha256((text or "").encode("utf-8")).hexdigest()[:FINGERPRINT_LENGTH]
+
+
+def fingerprint_prompts(prompts: Dict[str, str]) -> Dict[str, str]:
+    """Fingerprint each prompt of a set plus the set as a whole under ``"combined"``.
+
+    Two runs used the same prompts exactly when their combined fingerprints are equal.
+    """
+    fingerprints = {
+        name: fingerprint_prompt(text)
+        for name, text in sorted((prompts or {}).items())
+    }
+    fingerprints["combined"] = fingerprint_prompt(json.dumps(fingerprints, sort_keys=True))
+    return fingerprints
+
+
+def compile_prompt(text: str) -> "PromptTemplate":
+    """Return the ``PromptTemplate`` for ``text`` from a process-wide cache keyed by fingerprint."""
+    # Imported here so fingerprinting, which the app needs at first paint, does not load LangChain.
+    from langchain_core.prompts import PromptTemplate
+
+    fingerprint = fingerprint_prompt(text)
+    with _compiled_lock:
+        template = _compiled_templates.get(fingerprint)
+        if template is not None:
+            _compiled_templates.move_to_end(fingerprint)
+            return template
+
+    template = PromptTemplate.from_template(text)
+    with _compiled_lock:
+        _compiled_templates[fingerprint] = template
+        while len(_compiled_templates) > COMPILED_CACHE_SIZE:
+            _compiled_templates.popitem(last=False)
+    return template
 
 
 class PromptTemplateManager:
@@ -22,9 +74,9 @@ class PromptTemplateManager:
 
     def get_default_prompts(self) -> Dict[str, str]:
         return {
-            "overall_prompt": HallucinationEvaluator.DEFAULT_OVERALL_PROMPT.strip(),
-            "claim_extraction_prompt": HallucinationEvaluator.DEFAULT_CLAIM_EXTRACTION_PROMPT.strip(),
-            "claim_verification_prompt": HallucinationEvaluator.DEFAULT_CLAIM_VERIFICATION_PROMPT.strip()
+            "overall_prompt": DEFAULT_OVERALL_PROMPT.strip(),
+            "claim_extraction_prompt": DEFAULT_CLAIM_EXTRACTION_PROMPT.strip(),
+            "claim_verification_prompt": DEFAULT_CLAIM_VERIFICATION_PROMPT.strip()
         }
 
     def list_templates(self) -> List[str]:
@@ -66,3 +118,6 @@ class PromptTemplateManager:
             "claim_extraction_prompt": data.get("claim_extraction_prompt", "").strip(),
             "claim_verification_prompt": data.get("claim_verification_prompt", "").strip()
         }
+
+    def fingerprint_template(self, name: str) -> Dict[str, str]:
+        return fingerprint_prompts(self.load_template(name))
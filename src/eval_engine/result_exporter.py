@@ -1,40 +1,99 @@
+import csv
 import json
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterator, List, TextIO
+
+CSV_COLUMNS = [
+    "id",
+    "mode",
+    "question",
+    "candidate_answer",
+    "expected_label",
+    "predicted_label",
+    "verdict",
+    "confidence",
+    "reason",
+    "source_model",
+    "source_type",
+    "ground_truth",
+    "is_correct",
+    "evidence",
+    "unsupported_parts",
+    "claim_supported_count",
+    "claim_contradicted_count",
+    "claim_insufficient_evidence_count",
+    "claim_results_json",
+    "prompt_fingerprint",
+    "served_by",
+    "judge_tier"
+]
 
 
 def _serialize_claim_results(claim_results: List[Dict[str, Any]]) -> str:
     return json.dumps(claim_results, ensure_ascii=False)
 
 
-def flatten_results_for_csv(results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    flattened = []
+def _flatten_result(result: Dict[str, Any]) -> Dict[str, Any]:
+    row = {
+        "id": result.get("id"),
+        "mode": result.get("mode", ""),
+        "question": result.get("question", ""),
+        "candidate_answer": result.get("candidate_answer", ""),
+        "expected_label": result.get("expected_label", ""),
+        "predicted_label": result.get("predicted_label", ""),
+        "verdict": result.get("verdict", ""),
+        "confidence": result.get("confidence", 0.0),
+        "reason": result.get("reason", ""),
+        "source_model": result.get("source_model", ""),
+        "source_type": result.get("source_type", ""),
+        "ground_truth": result.get("ground_truth", ""),
+        "is_correct": result.get("is_correct", False),
+        "evidence": " | ".join(result.get("evidence", [])),
+        "unsupported_parts": " | ".join(result.get("unsupported_parts", []))
+    }
+
+    claim_counts = result.get("claim_counts", {})
+    row["claim_supported_count"] = claim_counts.get("supported", 0)
+    row["claim_contradicted_count"] = claim_counts.get("contradicted", 0)
+    row["claim_insufficient_evidence_count"] = claim_counts.get("insufficient_evidence", 0)
+    row["claim_results_json"] = _serialize_claim_results(result.get("claim_results", []))
+    row["prompt_fingerprint"] = result.get("prompt_fingerprint", "")
+    row["served_by"] = result.get("served_by", "")
+    row["judge_tier"] = result.get("judge_tier", "")
+    return row
+
+
+def iter_flattened_results(results: List[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
     for result in results:
-        row = {
-            "id": result.get("id"),
-            "mode": result.get("mode", ""),
-            "question": result.get("question", ""),
-            "candidate_answer": result.get("candidate_answer", ""),
-            "expected_label": result.get("expected_label", ""),
-            "predicted_label": result.get("predicted_label", ""),
-            "verdict": result.get("verdict", ""),
-            "confidence": result.get("confidence", 0.0),
-            "reason": result.get("reason", ""),
-            "source_model": result.get("source_model", ""),
-            "source_type": result.get("source_type", ""),
-            "ground_truth": result.get("ground_truth", ""),
-            "is_correct": result.get("is_correct", False),
-            "evidence": " | ".join(result.get("evidence", [])),
-            "unsupported_parts": " | ".join(result.get("unsupported_parts", []))
-        }
-
-        claim_counts = result.get("claim_counts", {})
-        row["claim_supported_count"] = claim_counts.get("supported", 0)
-        row["claim_contradicted_count"] = claim_counts.get("contradicted", 0)
-        row["claim_insufficient_evidence_count"] = claim_counts.get("insufficient_evidence", 0)
-        row["claim_results_json"] = _serialize_claim_results(result.get("claim_results", []))
-        flattened.append(row)
-
-    return flattened
+        yield _flatten_result(result)
+
+
+def flatten_results_for_csv(results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return list(iter_flattened_results(results))
+
+
+def collect_prompt_fingerprints(results: List[Dict[str, Any]]) -> List[str]:
+    """Distinct prompt fingerprints stamped on the results, in first-seen order."""
+    return list(dict.fromkeys(
+        result["prompt_fingerprint"]
+        for result in results
+        if result.get("prompt_fingerprint")
+    ))
+
+
+def sanitize_config_snapshot(config: Dict[str, Any]) -> Dict[str, Any]:
+    sanitized = dict(config or {})
+    if "api_key" in sanitized:
+        sanitized["api_key"] = "***"
+    if isinstance(sanitized.get("judge_cascade"), dict) and "api_key" in sanitized["judge_cascade"]:
+        sanitized["judge_cascade"] = {**sanitized["judge_cascade"], "api_key": "***"}
+    routing = sanitized.get("routing")
+    if isinstance(routing, dict) and isinstance(routing.get("endpoints"), list):
+        sanitized["routing"] = dict(routing)
+        sanitized["routing"]["endpoints"] = [
+            {**endpoint, "api_key": "***"} if isinstance(endpoint, dict) else endpoint
+            for endpoint in routing["endpoints"]
+        ]
+    return sanitized
 
 
 def build_export_payload(
@@ -49,10 +108,90 @@ def build_export_payload(
         "mode": mode,
         "metrics": metrics,
         "config": config_snapshot or {},
+        "prompt_fingerprints": collect_prompt_fingerprints(results),
         "results": results
     }
 
 
+def write_export_json(
+    file: TextIO,
+    results: List[Dict[str, Any]],
+    metrics: Dict[str, Any],
+    mode: str,
+    dataset_name: str = "",
+    config_snapshot: Dict[str, Any] = None
+):
+    """Write the same document as ``build_export_payload`` one result at a time."""
+    header = build_export_payload([], metrics, mode, dataset_name, config_snapshot)
+    header["prompt_fingerprints"] = collect_prompt_fingerprints(results)
+    header.pop("results")
+    file.write("{\n")
+    for key, value in header.items():
+        file.write(f"  {json.dumps(key)}: {json.dumps(value, ensure_ascii=False)},\n")
+    file.write('  "results": [')
+    for position, result in enumerate(results):
+        file.write(",\n    " if position else "\n    ")
+        file.write(json.dumps(result, ensure_ascii=False))
+    file.write("\n  ]\n}\n" if results else "]\n}\n")
+
+
+def write_results_csv(file: TextIO, results: List[Dict[str, Any]]):
+    """Stream flattened rows to an open text file; writes nothing for an empty result set."""
+    if not results:
+        return
+    writer = csv.DictWriter(file, fieldnames=CSV_COLUMNS)
+    writer.writeheader()
+    for row in iter_flattened_results(results):
+        writer.writerow(row)
+
+
+def write_results_parquet(file, results: List[Dict[str, Any]], batch_size: int = 5000):
+    """Write flattened rows to a path or binary file as Parquet, one row group per batch."""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as exc:
+        raise RuntimeError(
+            "Parquet export requires the 'pyarrow' package to be installed."
+        ) from exc
+
+    # Fix every column type up front so later batches cannot disagree with the first one.
+    # Datasets use integer or string ids, sometimes both, so ids are always written as strings.
+    column_types = {column: pa.string() for column in CSV_COLUMNS}
+    column_types["confidence"] = pa.float64()
+    column_types["is_correct"] = pa.bool_()
+    for column in ["claim_supported_count", "claim_contradicted_count", "claim_insufficient_evidence_count"]:
+        column_types[column] = pa.int64()
+
+    schema = pa.schema([(column, column_types[column]) for column in CSV_COLUMNS])
+    writer = None
+    batch = []
+
+    def flush():
+        nonlocal writer
+        if writer is None:
+            writer = pq.ParquetWriter(file, schema)
+        writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+
+    try:
+        for row in iter_flattened_results(results):
+            row["id"] = None if row["id"] is None else str(row["id"])
+            try:
+                row["confidence"] = float(row["confidence"])
+            except (TypeError, ValueError):
+                # Judges occasionally answer with words such as "high"; keep the row, drop the value.
+                row["confidence"] = None
+            batch.append(row)
+            if len(batch) >= batch_size:
+                flush()
+                batch = []
+        if batch or writer is None:
+            flush()
+    finally:
+        if writer is not None:
+            writer.close()
+
+
 def summarize_error_buckets(results: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
     return {
         "incorrect": [result for result in results if not result.get("is_correct", False)],
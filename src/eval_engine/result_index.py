@@ -0,0 +1,79 @@
+import math
+from typing import Any, Dict, List, Sequence, Tuple
+
+
+class ResultIndex:
+    """Precomputed search text and error buckets for one evaluation result set.
+
+    Built once per result set so that filtering and paging on every Streamlit rerun
+    only touches integer positions instead of re-scanning every result.
+    """
+
+    BUCKETS = ["all", "incorrect", "uncertain", "false_positive", "false_negative", "misclassified"]
+
+    def __init__(self, results: List[Dict[str, Any]]):
+        self.results = results
+        self._search_text = [self._build_search_text(result) for result in results]
+        self.buckets = {bucket: [] for bucket in self.BUCKETS}
+
+        for position, result in enumerate(results):
+            expected = result.get("expected_label")
+            predicted = result.get("predicted_label")
+            self.buckets["all"].append(position)
+            if not result.get("is_correct", False):
+                self.buckets["incorrect"].append(position)
+            if predicted == "uncertain":
+                self.buckets["uncertain"].append(position)
+            if expected == "negative" and predicted == "positive":
+                self.buckets["false_positive"].append(position)
+            if expected == "positive" and predicted != "positive":
+                self.buckets["false_negative"].append(position)
+
+        self.buckets["misclassified"] = self.buckets["false_positive"] + self.buckets["false_negative"]
+
+    def _build_search_text(self, result: Dict[str, Any]) -> str:
+        parts = [
+            str(result.get("id", "")),
+            result.get("question", ""),
+            result.get("candidate_answer", ""),
+            result.get("reason", ""),
+            result.get("verdict", ""),
+            result.get("source_model", "")
+        ]
+        parts.extend(
+            claim_result.get("claim", "")
+            for claim_result in result.get("claim_results", [])
+        )
+        return "\n".join(str(part) for part in parts if part).lower()
+
+    def bucket_counts(self) -> Dict[str, int]:
+        return {bucket: len(positions) for bucket, positions in self.buckets.items()}
+
+    def get_bucket(self, bucket: str) -> List[int]:
+        if bucket not in self.buckets:
+            raise ValueError(f"Unknown result bucket '{bucket}'. Supported: {self.BUCKETS}")
+        return self.buckets[bucket]
+
+    def search(self, query: str, positions: Sequence[int] = None) -> List[int]:
+        """Return the positions whose search text contains every whitespace-separated term."""
+        positions = self.buckets["all"] if positions is None else positions
+        terms = [term for term in (query or "").lower().split() if term]
+        if not terms:
+            return list(positions)
+        return [
+            position
+            for position in positions
+            if all(term in self._search_text[position] for term in terms)
+        ]
+
+    @staticmethod
+    def paginate(positions: Sequence[int], page: int, page_size: int) -> Tuple[List[int], int]:
+        """Return the positions on a 1-based page together with the total page count."""
+        page_size = max(1, int(page_size))
+        total_pages = max(1, math.ceil(len(positions) / page_size))
+        page = min(max(1, int(page)), total_pages)
+        start = (page - 1) * page_size
+        return list(positions[start:start + page_size]), total_pages
+
+    def get_results(self, positions: Sequence[int]) -> List[Dict[str, Any]]:
+        return [self.results[position] for position in positions]
@@ -0,0 +1,160 @@
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from data_manager.near_duplicates import shingle_hashes
+
+DEFAULT_TOP_K_VALUES = [1, 3, 5, 10]
+SEARCH_MODES = ["similarity", "mmr"]
+
+
+def reference_coverage(reference_hashes: np.ndarray, chunk_hashes: np.ndarray) -> float:
+    """Share of a reference snippet's character shingles that also occur in a chunk."""
+    if not len(reference_hashes):
+        return 0.0
+    return float(np.isin(reference_hashes, chunk_hashes, assume_unique=True).mean())
+
+
+def match_ranks(
+    reference_hashes: List[np.ndarray],
+    chunk_hashes: List[np.ndarray],
+    match_threshold: float
+) -> List[Optional[int]]:
+    """1-based rank of the first retrieved chunk covering each reference, or ``None``.
+
+    A chunk covers a reference when at least ``match_threshold`` of the reference's
+    shingles appear in it, which tolerates chunk boundaries and light re-wording.
+    """
+    ranks = []
+    for reference in reference_hashes:
+        rank = None
+        for position, chunk in enumerate(chunk_hashes, start=1):
+            if reference_coverage(reference, chunk) >= match_threshold:
+                rank = position
+                break
+        ranks.append(rank)
+    return ranks
+
+
+def _percentile(values: Sequence[float], quantile: float) -> float:
+    return float(np.percentile(values, quantile)) if len(values) else 0.0
+
+
+def recommend_top_k(rows: List[Dict[str, Any]], target_recall: float) -> Optional[Dict[str, Any]]:
+    """Smallest top_k (then lowest p95 latency) whose recall meets ``target_recall``;
+    falls back to the highest-recall row when none does."""
+    if not rows:
+        return None
+    meeting = [row for row in rows if row["recall"] >= target_recall]
+    if meeting:
+        best = min(meeting, key=lambda row: (row["top_k"], row["p95_ms"]))
+    else:
+        best = max(rows, key=lambda row: (row["recall"], -row["top_k"], -row["p95_ms"]))
+    return {
+        "mode": best["mode"],
+        "top_k": best["top_k"],
+        "recall": best["recall"],
+        "mrr": best["mrr"],
+        "p95_ms": best["p95_ms"],
+        "target_recall": target_recall,
+        "met_target": bool(meeting)
+    }
+
+
+def run_retrieval_benchmark(
+    samples: List[Dict[str, Any]],
+    vector_store,
+    top_k_values: Sequence[int] = None,
+    modes: Sequence[str] = None,
+    target_recall: float = 0.8,
+    match_threshold: float = 0.7,
+    progress_callback: Callable[[int, int], None] = None
+) -> Dict[str, Any]:
+    """Measure recall@k, hit rate, MRR and latency of retrieval against ``reference_docs``.
+
+    Every sample with reference docs is embedded once; each (mode, top_k) pair then runs a
+    vector search for it, so latency is query embedding plus index lookup. Returns one row
+    per pair and the recommended top_k for ``target_recall``.
+    """
+    top_k_values = sorted({int(value) for value in (top_k_values or DEFAULT_TOP_K_VALUES) if int(value) > 0})
+    modes = list(modes or SEARCH_MODES)
+    for mode in modes:
+        if mode not in SEARCH_MODES:
+            raise ValueError(f"Unsupported search type '{mode}'. Supported: {SEARCH_MODES}")
+
+    eligible = [
+        sample for sample in samples
+        if any(str(doc).strip() for doc in sample.get("reference_docs", []) or [])
+    ]
+    total_steps = len(eligible) * (1 + len(modes) * len(top_k_values))
+    completed_steps = 0
+
+    def advance():
+        nonlocal completed_steps
+        completed_steps += 1
+        if progress_callback is not None:
+            progress_callback(completed_steps, total_steps)
+
+    queries = []
+    for sample in eligible:
+        started = time.perf_counter()
+        embedding = vector_store.embed_query(sample["question"])
+        queries.append({
+            "sample": sample,
+            "embedding": embedding,
+            "embed_ms": (time.perf_counter() - started) * 1000,
+            "references": [shingle_hashes(str(doc)) for doc in sample["reference_docs"] if str(doc).strip()]
+        })
+        advance()
+
+    chunk_hash_cache = {}
+    rows = []
+    for mode in modes:
+        for top_k in top_k_values:
+            recalls, hits, reciprocal_ranks, latencies, search_latencies, context_chars = [], [], [], [], [], []
+            for query in queries:
+                started = time.perf_counter()
+                docs = vector_store.search_by_vector(query["embedding"], top_k=top_k, search_type=mode)
+                search_ms = (time.perf_counter() - started) * 1000
+                contents = [getattr(doc, "page_content", str(doc)) for doc in docs]
+                chunk_hashes = []
+                for content in contents:
+                    if content not in chunk_hash_cache:
+                        chunk_hash_cache[content] = shingle_hashes(content)
+                    chunk_hashes.append(chunk_hash_cache[content])
+
+                ranks = match_ranks(query["references"], chunk_hashes, match_threshold)
+                found = [rank for rank in ranks if rank is not None]
+                recalls.append(len(found) / len(ranks))
+                hits.append(1.0 if found else 0.0)
+                reciprocal_ranks.append(1.0 / min(found) if found else 0.0)
+                search_latencies.append(search_ms)
+                latencies.append(query["embed_ms"] + search_ms)
+                context_chars.append(sum(len(content) for content in contents))
+                advance()
+
+            rows.append({
+                "mode": mode,
+                "top_k": top_k,
+                "recall": float(np.mean(recalls)) if recalls else 0.0,
+                "hit_rate": float(np.mean(hits)) if hits else 0.0,
+                "mrr": float(np.mean(reciprocal_ranks)) if reciprocal_ranks else 0.0,
+                "mean_ms": float(np.mean(latencies)) if latencies else 0.0,
+                "p50_ms": _percentile(latencies, 50),
+                "p95_ms": _percentile(latencies, 95),
+                "search_p95_ms": _percentile(search_latencies, 95),
+                "avg_context_chars": float(np.mean(context_chars)) if context_chars else 0.0
+            })
+
+    return {
+        "samples": len(samples),
+        "evaluated_samples": len(eligible),
+        "skipped_samples": len(samples) - len(eligible),
+        "top_k_values": top_k_values,
+        "modes": modes,
+        "match_threshold": match_threshold,
+        "embed_p95_ms": _percentile([query["embed_ms"] for query in queries], 95),
+        "rows": rows,
+        "recommendation": recommend_top_k(rows, target_recall)
+    }
@@ -0,0 +1,292 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+from eval_engine.prompt_manager import fingerprint_prompts
+
+
+class RunHistoryStore:
+    """Persistent store of evaluation runs backed by a local SQLite file.
+
+    ``runs`` holds one row per run (config snapshot, prompt hashes, metrics) and
+    ``run_results`` one row per evaluated sample. The per-sample columns that are
+    compared across runs are stored next to the full result JSON and indexed, so
+    listing runs and diffing two of them never has to decode the stored results.
+    """
+
+    def __init__(self, db_path: str = "./data/run_history.sqlite3"):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(self.db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._connection = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._connection.row_factory = sqlite3.Row
+        self._connection.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS runs (
+                run_id TEXT PRIMARY KEY,
+                created_at REAL NOT NULL,
+                dataset_name TEXT NOT NULL,
+                mode TEXT NOT NULL,
+                label TEXT NOT NULL,
+                sample_count INTEGER NOT NULL,
+                config TEXT NOT NULL,
+                prompt_hashes TEXT NOT NULL,
+                metrics TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_runs_created_at ON runs (created_at);
+
+            CREATE TABLE IF NOT EXISTS run_results (
+                run_id TEXT NOT NULL,
+                position INTEGER NOT NULL,
+                sample_id TEXT NOT NULL,
+                question TEXT NOT NULL,
+                expected_label TEXT NOT NULL,
+                predicted_label TEXT NOT NULL,
+                verdict TEXT NOT NULL,
+                is_correct INTEGER NOT NULL,
+                confidence REAL NOT NULL,
+                result TEXT NOT NULL,
+                PRIMARY KEY (run_id, position)
+            );
+            CREATE INDEX IF NOT EXISTS idx_run_results_run_sample ON run_results (run_id, sample_id);
+            CREATE INDEX IF NOT EXISTS idx_run_results_sample ON run_results (sample_id);
+            CREATE INDEX IF NOT EXISTS idx_run_results_run_verdict ON run_results (run_id, verdict);
+            """
+        )
+        self._connection.commit()
+
+    @staticmethod
+    def hash_prompts(prompts: Dict[str, str]) -> Dict[str, str]:
+        """Per-prompt fingerprints plus the ``"combined"`` fingerprint of the whole set."""
+        return fingerprint_prompts(prompts)
+
+    def save_run(
+        self,
+        results: List[Dict[str, Any]],
+        metrics: Dict[str, Any],
+        mode: str,
+        dataset_name: str = "",
+        config_snapshot: Dict[str, Any] = None,
+        prompts: Dict[str, str] = None,
+        run_id: str = None,
+        label: str = ""
+    ) -> str:
+        """Record a finished run and return its id; saving an existing id replaces that run."""
+        run_id = run_id or f"{time.strftime('%Y%m%d%H%M%S')}_{uuid.uuid4().hex[:6]}"
+        rows = [
+            (
+                run_id,
+                position,
+                str(result.get("id", position)),
+                result.get("question", ""),
+                result.get("expected_label", ""),
+                result.get("predicted_label", ""),
+                result.get("verdict", ""),
+                1 if result.get("is_correct", False) else 0,
+                float(result.get("confidence", 0.0) or 0.0),
+                json.dumps(result, ensure_ascii=False)
+            )
+            for position, result in enumerate(results)
+        ]
+
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM run_results WHERE run_id = ?", (run_id,))
+            self._connection.execute(
+                "INSERT OR REPLACE INTO runs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    run_id,
+                    time.time(),
+                    dataset_name or "",
+                    mode,
+                    label or "",
+                    len(rows),
+                    json.dumps(config_snapshot or {}, ensure_ascii=False),
+                    json.dumps(self.hash_prompts(prompts), ensure_ascii=False),
+                    json.dumps(metrics or {}, ensure_ascii=False)
+                )
+            )
+            self._connection.executemany(
+                "INSERT INTO run_results VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+        return run_id
+
+    def _run_from_row(self, row: sqlite3.Row) -> Dict[str, Any]:
+        return {
+            "run_id": row["run_id"],
+            "created_at": row["created_at"],
+            "dataset_name": row["dataset_name"],
+            "mode": row["mode"],
+            "label": row["label"],
+            "sample_count": row["sample_count"],
+            "config": json.loads(row["config"]),
+            "prompt_hashes": json.loads(row["prompt_hashes"]),
+            "metrics": json.loads(row["metrics"])
+        }
+
+    def list_runs(self, limit: int = 200) -> List[Dict[str, Any]]:
+        """Return run summaries, newest first, without their per-sample results."""
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT * FROM runs ORDER BY created_at DESC LIMIT ?",
+                (int(limit),)
+            ).fetchall()
+        return [self._run_from_row(row) for row in rows]
+
+    def get_run(self, run_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._connection.execute("SELECT * FROM runs WHERE run_id = ?", (run_id,)).fetchone()
+        return self._run_from_row(row) if row is not None else None
+
+    def load_run(self, run_id: str) -> Optional[Dict[str, Any]]:
+        """Return the run summary together with its results in their original order."""
+        run = self.get_run(run_id)
+        if run is None:
+            return None
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT result FROM run_results WHERE run_id = ? ORDER BY position",
+                (run_id,)
+            ).fetchall()
+        run["results"] = [json.loads(row["result"]) for row in rows]
+        return run
+
+    def delete_run(self, run_id: str):
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM run_results WHERE run_id = ?", (run_id,))
+            self._connection.execute("DELETE FROM runs WHERE run_id = ?", (run_id,))
+
+    def get_call_statistics(self, mode: str, recent_runs: int = 20) -> Dict[str, Any]:
+        """Average LLM calls, claims and latency per sample over the latest runs of ``mode``.
+
+        Only results that recorded ``llm_calls`` and ``latency_s`` are counted; returns
+        ``None`` values when no such results exist yet. ``escalation_rate`` is the share of
+        cascade judgments escalated to the strong model, as in ``summarize_cascade``, and
+        ``None`` when no counted result was judged by a cascade.
+        """
+        with self._lock:
+            row = self._connection.execute(
+                """
+                SELECT
+                    COUNT(*) AS samples,
+                    SUM(json_extract(result, '$.llm_calls')) AS llm_calls,
+                    SUM(json_extract(result, '$.latency_s')) AS latency_s,
+                    SUM(COALESCE(json_array_length(result, '$.claim_results'), 0)) AS claims,
+                    SUM(json_extract(result, '$.cascade.judgments')) AS cascade_judgments,
+                    SUM(json_extract(result, '$.cascade.escalated_judgments')) AS escalated_judgments
+                FROM run_results
+                WHERE run_id IN (
+                    SELECT run_id FROM runs WHERE mode = ? ORDER BY created_at DESC LIMIT ?
+                )
+                    AND json_extract(result, '$.llm_calls') IS NOT NULL
+                    AND json_extract(result, '$.latency_s') IS NOT NULL
+                """,
+                (mode, int(recent_runs))
+            ).fetchone()
+
+        samples = row["samples"] or 0
+        return {
+            "samples": samples,
+            "claims_per_answer": row["claims"] / samples if samples and mode == "claim" else None,
+            "seconds_per_call": row["latency_s"] / row["llm_calls"] if samples and row["llm_calls"] else None,
+            "escalation_rate": (
+                (row["escalated_judgments"] or 0) / row["cascade_judgments"]
+                if samples and row["cascade_judgments"] else None
+            )
+        }
+
+    def compare_runs(self, base_run_id: str, target_run_id: str) -> Dict[str, Any]:
+        """Diff two runs by sample id: metric deltas plus every sample whose verdict flipped."""
+        base_run = self.get_run(base_run_id)
+        target_run = self.get_run(target_run_id)
+        if base_run is None or target_run is None:
+            missing = base_run_id if base_run is None else target_run_id
+            raise ValueError(f"Evaluation run '{missing}' does not exist.")
+
+        with self._lock:
+            flipped_rows = self._connection.execute(
+                """
+                SELECT
+                    base.sample_id,
+                    base.question,
+                    base.expected_label,
+                    base.predicted_label AS base_predicted_label,
+                    target.predicted_label AS target_predicted_label,
+                    base.verdict AS base_verdict,
+                    target.verdict AS target_verdict,
+                    base.is_correct AS base_is_correct,
+                    target.is_correct AS target_is_correct
+                FROM run_results AS base
+                JOIN run_results AS target
+                    ON target.run_id = ? AND target.sample_id = base.sample_id
+                WHERE base.run_id = ?
+                    AND (base.predicted_label != target.predicted_label OR base.verdict != target.verdict)
+                ORDER BY base.position
+                """,
+                (target_run_id, base_run_id)
+            ).fetchall()
+            shared_count = self._connection.execute(
+                """
+                SELECT COUNT(*)
+                FROM run_results AS base
+                JOIN run_results AS target
+                    ON target.run_id = ? AND target.sample_id = base.sample_id
+                WHERE base.run_id = ?
+                """,
+                (target_run_id, base_run_id)
+            ).fetchone()[0]
+            only_in_base, only_in_target = [
+                [
+                    row[0]
+                    for row in self._connection.execute(
+                        """
+                        SELECT sample_id FROM run_results AS left_side
+                        WHERE run_id = ? AND NOT EXISTS (
+                            SELECT 1 FROM run_results AS right_side
+                            WHERE right_side.run_id = ? AND right_side.sample_id = left_side.sample_id
+                        )
+                        ORDER BY position
+                        """,
+                        (left_run_id, right_run_id)
+                    ).fetchall()
+                ]
+                for left_run_id, right_run_id in [
+                    (base_run_id, target_run_id),
+                    (target_run_id, base_run_id)
+                ]
+            ]
+
+        flipped = []
+        for row in flipped_rows:
+            item = dict(row)
+            item["base_is_correct"] = bool(item["base_is_correct"])
+            item["target_is_correct"] = bool(item["target_is_correct"])
+            flipped.append(item)
+
+        metric_deltas = {
+            name: target_run["metrics"][name] - value
+            for name, value in base_run["metrics"].items()
+            if isinstance(value, (int, float)) and isinstance(target_run["metrics"].get(name), (int, float))
+        }
+        return {
+            "base": base_run,
+            "target": target_run,
+            "metric_deltas": metric_deltas,
+            "same_prompts": (
+                bool(base_run["prompt_hashes"].get("combined"))
+                and base_run["prompt_hashes"].get("combined") == target_run["prompt_hashes"].get("combined")
+            ),
+            "shared_samples": shared_count,
+            "flipped": flipped,
+            "fixed": sum(1 for item in flipped if item["target_is_correct"] and not item["base_is_correct"]),
+            "regressed": sum(1 for item in flipped if item["base_is_correct"] and not item["target_is_correct"]),
+            "only_in_base": only_in_base,
+            "only_in_target": only_in_target
+        }
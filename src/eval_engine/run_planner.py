@@ -0,0 +1,202 @@
+import re
+from functools import lru_cache
+from typing import Any, Dict, List, Sequence
+
+from eval_engine.prompt_manager import compile_prompt
+
+DEFAULT_CLAIMS_PER_ANSWER = 3.0
+DEFAULT_SECONDS_PER_CALL = 3.0
+DEFAULT_CHUNK_CHARS = 500
+# Share of cascade judgments escalated to the strong model when no run has recorded one yet.
+DEFAULT_ESCALATION_RATE = 0.3
+# Typical judge output sizes; the prompts ask for short JSON objects.
+DEFAULT_OUTPUT_TOKENS = {
+    "overall_prompt": 150,
+    "claim_extraction_prompt": 80,
+    "claim_verification_prompt": 100
+}
+_CJK_PATTERN = re.compile(r"[\u3000-\u303f\u3400-\u9fff\uff00-\uffef]")
+
+
+@lru_cache(maxsize=8)
+def _load_encoding(model_name: str):
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    try:
+        try:
+            return tiktoken.encoding_for_model(model_name)
+        except KeyError:
+            return tiktoken.get_encoding("cl100k_base")
+    except Exception as exc:
+        # tiktoken downloads its BPE files on first use; offline hosts fall back to an estimate.
+        print(f"tiktoken encoding unavailable, using approximate token counts: {exc}")
+        return None
+
+
+class TokenCounter:
+    """Count tokens with tiktoken, or approximate them when tiktoken cannot be loaded.
+
+    The approximation counts one token per CJK character and one per four other characters.
+    """
+
+    def __init__(self, model_name: str = None):
+        self.encoding = _load_encoding(model_name or "gpt-4o-mini")
+        self.tokenizer = f"tiktoken:{self.encoding.name}" if self.encoding is not None else "approximate"
+
+    def count_many(self, texts: Sequence[str]) -> List[int]:
+        texts = [text or "" for text in texts]
+        if self.encoding is not None:
+            return [len(tokens) for tokens in self.encoding.encode_batch(texts, disallowed_special=())]
+        counts = []
+        for text in texts:
+            cjk = len(_CJK_PATTERN.findall(text))
+            counts.append(cjk + round((len(text) - cjk) / 4))
+        return counts
+
+    def count(self, text: str) -> int:
+        return self.count_many([text])[0]
+
+
+def template_tokens(counter: TokenCounter, template: str) -> int:
+    """Tokens of a prompt template rendered with every variable left empty."""
+    prompt = compile_prompt(template)
+    return counter.count(prompt.format(**{name: "" for name in prompt.input_variables}))
+
+
+def plan_evaluation_run(
+    samples: List[Dict[str, Any]],
+    mode: str,
+    prompts: Dict[str, str],
+    model_name: str = None,
+    rag_engine=None,
+    retrieval_sample_size: int = 20,
+    retrieval_top_k: int = 3,
+    evidence_chars: int = None,
+    claims_per_answer: float = None,
+    seconds_per_call: float = None,
+    concurrency: int = 1,
+    input_price_per_1k: float = 0.0,
+    output_price_per_1k: float = 0.0,
+    llm_extraction_share: float = 1.0,
+    cascade: bool = False,
+    escalation_rate: float = None,
+    cheap_input_price_per_1k: float = 0.0,
+    cheap_output_price_per_1k: float = 0.0
+) -> Dict[str, Any]:
+    """Estimate LLM calls, tokens, wall-clock time and cost of an evaluation without running it.
+
+    A rendered prompt's tokens are counted as the template's own tokens plus the tokens of
+    each variable, so only questions and answers are tokenized per sample. Evidence length
+    comes from real retrieval on the first ``retrieval_sample_size`` questions when
+    ``rag_engine`` is given, else from ``retrieval_top_k`` chunks of ``evidence_chars``
+    characters. Claim mode assumes ``claims_per_answer`` verification calls per sample and an
+    LLM claim-extraction call for ``llm_extraction_share`` of the samples (the rest are split
+    locally).
+
+    With ``cascade``, every judgment is first sent to the cheap model, priced with the
+    ``cheap_*`` prices, and ``escalation_rate`` of them are sent again to the strong model,
+    priced with ``input_price_per_1k`` / ``output_price_per_1k``. Both calls use the same
+    prompt, so the strong tier's tokens are the escalated share of the cheap tier's.
+    """
+    counter = TokenCounter(model_name)
+    sample_count = len(samples)
+    question_tokens = counter.count_many([sample.get("question", "") for sample in samples])
+    answer_tokens = counter.count_many([sample.get("candidate_answer", "") for sample in samples])
+    total_question_tokens = sum(question_tokens)
+    total_answer_tokens = sum(answer_tokens)
+
+    evidence_source = "estimate"
+    if rag_engine is not None and samples:
+        contexts = []
+        for sample in samples[:max(1, retrieval_sample_size)]:
+            docs = rag_engine.retrieve_context(sample.get("question", ""))
+            contexts.append("\n\n".join(getattr(doc, "page_content", str(doc)) for doc in docs))
+        evidence_tokens = sum(counter.count_many(contexts)) / len(contexts)
+        evidence_source = "retrieval"
+    else:
+        # Scale the chunk size by the tokens-per-character ratio of the dataset's own text,
+        # which tracks the language mix of the knowledge base far better than a constant.
+        sample_chars = sum(
+            len(sample.get("question", "")) + len(sample.get("candidate_answer", ""))
+            for sample in samples
+        )
+        sample_tokens = total_question_tokens + total_answer_tokens
+        tokens_per_char = sample_tokens / sample_chars if sample_chars and sample_tokens else 0.5
+        evidence_tokens = retrieval_top_k * (evidence_chars or DEFAULT_CHUNK_CHARS) * tokens_per_char
+
+    if mode == "claim":
+        claims = claims_per_answer if claims_per_answer is not None else DEFAULT_CLAIMS_PER_ANSWER
+        calls_per_sample = llm_extraction_share + claims
+        extraction_template = template_tokens(counter, prompts["claim_extraction_prompt"])
+        verification_template = template_tokens(counter, prompts["claim_verification_prompt"])
+        input_tokens = (
+            llm_extraction_share * (sample_count * extraction_template + total_question_tokens + total_answer_tokens)
+            + claims * (sample_count * (verification_template + evidence_tokens) + total_question_tokens)
+            # Claims together restate the answer once.
+            + total_answer_tokens
+        )
+        output_tokens = sample_count * (
+            llm_extraction_share * DEFAULT_OUTPUT_TOKENS["claim_extraction_prompt"]
+            + claims * DEFAULT_OUTPUT_TOKENS["claim_verification_prompt"]
+        )
+    else:
+        claims = None
+        calls_per_sample = 1
+        input_tokens = (
+            sample_count * (template_tokens(counter, prompts["overall_prompt"]) + evidence_tokens)
+            + total_question_tokens
+            + total_answer_tokens
+        )
+        output_tokens = sample_count * DEFAULT_OUTPUT_TOKENS["overall_prompt"]
+
+    judgments = sample_count * calls_per_sample
+    cascade_plan = None
+    if cascade:
+        rate = escalation_rate if escalation_rate is not None else DEFAULT_ESCALATION_RATE
+        cheap_cost = input_tokens * cheap_input_price_per_1k + output_tokens * cheap_output_price_per_1k
+        strong_cost = rate * (input_tokens * input_price_per_1k + output_tokens * output_price_per_1k)
+        priced = bool(cheap_input_price_per_1k or cheap_output_price_per_1k or input_price_per_1k or output_price_per_1k)
+        cascade_plan = {
+            "escalation_rate": rate,
+            "cheap_calls": int(round(judgments)),
+            "strong_calls": int(round(judgments * rate)),
+            "cheap_tokens": int(round(input_tokens + output_tokens)),
+            "strong_tokens": int(round(rate * (input_tokens + output_tokens))),
+            "cheap_cost": cheap_cost / 1000 if priced else None,
+            "strong_cost": strong_cost / 1000 if priced else None
+        }
+        calls_per_sample *= 1 + rate
+        input_tokens *= 1 + rate
+        output_tokens *= 1 + rate
+        estimated_cost = (cheap_cost + strong_cost) / 1000 if priced else None
+    else:
+        estimated_cost = None
+        if input_price_per_1k or output_price_per_1k:
+            estimated_cost = (input_tokens * input_price_per_1k + output_tokens * output_price_per_1k) / 1000
+
+    llm_calls = sample_count * calls_per_sample
+    seconds = seconds_per_call if seconds_per_call is not None else DEFAULT_SECONDS_PER_CALL
+    concurrency = max(1, int(concurrency))
+
+    return {
+        "mode": mode,
+        "samples": sample_count,
+        "llm_calls": int(round(llm_calls)),
+        "calls_per_sample": calls_per_sample,
+        "claims_per_answer": claims,
+        "llm_extraction_share": llm_extraction_share if mode == "claim" else None,
+        "input_tokens": int(round(input_tokens)),
+        "output_tokens": int(round(output_tokens)),
+        "total_tokens": int(round(input_tokens + output_tokens)),
+        "avg_input_tokens_per_call": input_tokens / llm_calls if llm_calls else 0.0,
+        "evidence_tokens": evidence_tokens,
+        "evidence_source": evidence_source,
+        "seconds_per_call": seconds,
+        "concurrency": concurrency,
+        "estimated_seconds": llm_calls * seconds / concurrency,
+        "estimated_cost": estimated_cost,
+        "cascade": cascade_plan,
+        "tokenizer": counter.tokenizer
+    }
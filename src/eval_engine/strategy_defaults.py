@@ -0,0 +1,9 @@
+"""Claim strategy names and defaults, kept free of heavy imports so the config layer can load them cheaply."""
+
+CLAIM_EXTRACTION_STRATEGIES = ["llm", "rule", "hybrid"]
+DEFAULT_HYBRID_MAX_CHARS = 200
+DEFAULT_HYBRID_MAX_CLAIMS = 6
+
+CLAIM_EVIDENCE_STRATEGIES = ["per_claim", "shared_pool"]
+DEFAULT_POOL_SIZE = 20
+DEFAULT_MIN_SIMILARITY = 0.35
@@ -0,0 +1,219 @@
+import threading
+import weakref
+from functools import lru_cache
+from typing import Any, Dict, List
+
+DEFAULT_POOL_SETTINGS = {
+    "max_connections": 100,
+    "max_keepalive_connections": 20,
+    "keepalive_expiry": 30.0,
+    "http2": False
+}
+# The OpenAI SDK passes its own timeout with every request; this only covers direct use.
+DEFAULT_TIMEOUT_SECONDS = 120.0
+DEFAULT_CONNECT_TIMEOUT_SECONDS = 10.0
+
+_CLIENTS = {}
+_CLIENTS_LOCK = threading.Lock()
+
+
+def http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def normalize_pool_settings(settings: object) -> Dict[str, Any]:
+    """Fill in defaults and clamp pool settings read from the config file."""
+    settings = settings if isinstance(settings, dict) else {}
+    normalized = dict(DEFAULT_POOL_SETTINGS)
+    for key in ("max_connections", "max_keepalive_connections"):
+        try:
+            normalized[key] = max(1, int(settings.get(key, normalized[key])))
+        except (TypeError, ValueError):
+            pass
+    try:
+        normalized["keepalive_expiry"] = max(0.0, float(settings.get("keepalive_expiry", normalized["keepalive_expiry"])))
+    except (TypeError, ValueError):
+        pass
+    normalized["max_keepalive_connections"] = min(normalized["max_keepalive_connections"], normalized["max_connections"])
+    normalized["http2"] = settings.get("http2", False) is True
+    return normalized
+
+
+class _PoolCounters:
+    """Request and connection counters shared by the sync and async client of one pool."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.failed_requests = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.connections_opened = 0
+        self.http2_responses = 0
+        self._seen_connections = weakref.WeakSet()
+
+    def started(self):
+        with self._lock:
+            self.requests += 1
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+
+    def finished(self, client, response=None):
+        connections = _pool_connections(client)
+        with self._lock:
+            self.in_flight -= 1
+            if response is None:
+                self.failed_requests += 1
+            elif response.http_version == "HTTP/2":
+                self.http2_responses += 1
+            # A connection not seen after any earlier request was opened for this one.
+            for connection in connections:
+                if connection not in self._seen_connections:
+                    self._seen_connections.add(connection)
+                    self.connections_opened += 1
+
+
+def _pool_connections(client) -> List[Any]:
+    # httpx does not expose pool state publicly; read the httpcore pools behind each transport.
+    transports = [client._transport] + list(client._mounts.values())
+    connections = []
+    for transport in transports:
+        pool = getattr(transport, "_pool", None)
+        if pool is not None:
+            connections.extend(pool.connections)
+    return connections
+
+
+@lru_cache(maxsize=1)
+def _client_classes():
+    # httpx is imported on first use so reading the config does not pay for it at startup.
+    import httpx
+
+    class CountingClient(httpx.Client):
+        def __init__(self, counters: _PoolCounters, **kwargs):
+            super().__init__(**kwargs)
+            self._pool_counters = counters
+
+        def send(self, request, **kwargs):
+            self._pool_counters.started()
+            try:
+                response = super().send(request, **kwargs)
+            except BaseException:
+                self._pool_counters.finished(self)
+                raise
+            self._pool_counters.finished(self, response)
+            return response
+
+    class CountingAsyncClient(httpx.AsyncClient):
+        def __init__(self, counters: _PoolCounters, **kwargs):
+            super().__init__(**kwargs)
+            self._pool_counters = counters
+
+        async def send(self, request, **kwargs):
+            self._pool_counters.started()
+            try:
+                response = await super().send(request, **kwargs)
+            except BaseException:
+                self._pool_counters.finished(self)
+                raise
+            self._pool_counters.finished(self, response)
+            return response
+
+    return httpx, CountingClient, CountingAsyncClient
+
+
+class PooledHTTPClients:
+    """A sync and an async httpx client with one set of pool limits, shared by OpenAI clients.
+
+    Pass ``client_kwargs()`` to ``ChatOpenAI`` or ``OpenAIEmbeddings`` so chat, judge and
+    embedding calls reuse the same keep-alive connections instead of each opening their own.
+    """
+
+    def __init__(self, base_url: str = None, **settings):
+        self.base_url = base_url or ""
+        self.settings = normalize_pool_settings(settings)
+        self.http2 = self.settings["http2"] and http2_available()
+        if self.settings["http2"] and not self.http2:
+            print("HTTP/2 requested but the 'h2' package is not installed; using HTTP/1.1.")
+
+        httpx, client_class, async_client_class = _client_classes()
+        limits = httpx.Limits(
+            max_connections=self.settings["max_connections"],
+            max_keepalive_connections=self.settings["max_keepalive_connections"],
+            keepalive_expiry=self.settings["keepalive_expiry"]
+        )
+        self._counters = _PoolCounters()
+        client_options = {
+            "limits": limits,
+            "http2": self.http2,
+            "timeout": httpx.Timeout(DEFAULT_TIMEOUT_SECONDS, connect=DEFAULT_CONNECT_TIMEOUT_SECONDS),
+            "follow_redirects": True
+        }
+        self.sync_client = client_class(self._counters, **client_options)
+        self.async_client = async_client_class(self._counters, **client_options)
+
+    @property
+    def is_closed(self) -> bool:
+        return self.sync_client.is_closed
+
+    def client_kwargs(self) -> Dict[str, Any]:
+        return {"http_client": self.sync_client, "http_async_client": self.async_client}
+
+    def stats(self) -> Dict[str, Any]:
+        counters = self._counters
+        connections = _pool_connections(self.sync_client) + _pool_connections(self.async_client)
+        with counters._lock:
+            completed = counters.requests - counters.in_flight
+            return {
+                "base_url": self.base_url,
+                **self.settings,
+                "http2": self.http2,
+                "requests": counters.requests,
+                "failed_requests": counters.failed_requests,
+                "in_flight": counters.in_flight,
+                "peak_in_flight": counters.peak_in_flight,
+                "connections_opened": counters.connections_opened,
+                "open_connections": len(connections),
+                "idle_connections": sum(1 for connection in connections if connection.is_idle()),
+                "http2_responses": counters.http2_responses,
+                # Share of completed requests that went over an already open connection.
+                "reuse_ratio": max(0.0, 1 - counters.connections_opened / completed) if completed else 0.0
+            }
+
+    def close(self):
+        self.sync_client.close()
+
+
+def get_http_clients(base_url: str = None, **settings) -> PooledHTTPClients:
+    """Process-wide pooled clients for ``base_url``, one instance per distinct pool setting."""
+    normalized = normalize_pool_settings(settings)
+    key = (base_url or "", tuple(sorted(normalized.items())))
+    with _CLIENTS_LOCK:
+        clients = _CLIENTS.get(key)
+        if clients is None or clients.is_closed:
+            clients = PooledHTTPClients(base_url, **normalized)
+            _CLIENTS[key] = clients
+        return clients
+
+
+def pool_statistics() -> List[Dict[str, Any]]:
+    with _CLIENTS_LOCK:
+        pools = list(_CLIENTS.values())
+    return [clients.stats() for clients in pools]
+
+
+def close_http_clients():
+    """Close and forget every shared pool.
+
+    Async clients are only dropped: closing them needs the event loop that opened their
+    connections, and those connections close with it.
+    """
+    with _CLIENTS_LOCK:
+        pools = list(_CLIENTS.values())
+        _CLIENTS.clear()
+    for clients in pools:
+        clients.close()
@@ -1,40 +1,104 @@
-import pdfplumber
+import io
 import re
 import os
+import shutil
 import tempfile
-from typing import List
+from contextlib import contextmanager
+from typing import BinaryIO, List, Union
+
+from tracing import span
 
 class DocumentLoader:
+    # Non-seekable streams are buffered in memory up to this size before spilling to a temp file.
+    SPOOL_MAX_BYTES = 32 * 1024 * 1024
+
     def __init__(self):
         self.supported_formats = ['.pdf', '.txt', '.doc', '.docx']
 
+    def _get_extension(self, file_name: str) -> str:
+        ext = os.path.splitext(file_name)[1].lower()
+        if ext not in self.supported_formats:
+            raise ValueError(f"Unsupported format: {ext}. Supported: {self.supported_formats}")
+        return ext
+
     def load_file(self, file_path: str) -> str:
         """Load content from a file."""
         if not os.path.exists(file_path):
             raise FileNotFoundError(f"File not found: {file_path}")
         
-        ext = os.path.splitext(file_path)[1].lower()
-        if ext not in self.supported_formats:
-            raise ValueError(f"Unsupported format: {ext}. Supported: {self.supported_formats}")
+        ext = self._get_extension(file_path)
 
-        content = ""
+        with span("document.load", format=ext) as load_span:
+            content = ""
+            try:
+                if ext == '.pdf':
+                    content = self._load_pdf(file_path)
+                elif ext == '.txt':
+                    content = self._load_txt(file_path)
+                elif ext == '.docx':
+                    content = self._load_docx(file_path)
+                elif ext == '.doc':
+                    content = self._load_doc(file_path)
+            except Exception as e:
+                raise RuntimeError(f"Error loading file {file_path}: {str(e)}")
+
+            content = self.clean_text(content)
+            load_span.set_attribute("chars", len(content))
+            return content
+
+    def load_stream(self, file_obj: Union[bytes, bytearray, memoryview, BinaryIO], file_name: str) -> str:
+        """Load content from in-memory bytes or a binary file-like object, e.g. an uploaded file.
+
+        ``file_name`` only selects the parser. PDF, TXT and DOCX are parsed straight from the
+        stream; DOC still needs a path for Word automation and goes through a private temp dir.
+        """
+        ext = self._get_extension(file_name)
+
+        with span("document.load", format=ext) as load_span:
+            content = ""
+            try:
+                with self._open_stream(file_obj) as stream:
+                    if ext == '.pdf':
+                        content = self._load_pdf(stream)
+                    elif ext == '.txt':
+                        content = self._load_txt_stream(stream)
+                    elif ext == '.docx':
+                        content = self._load_docx(stream)
+                    elif ext == '.doc':
+                        content = self._load_doc_stream(stream, file_name)
+            except Exception as e:
+                raise RuntimeError(f"Error loading file {file_name}: {str(e)}")
+
+            content = self.clean_text(content)
+            load_span.set_attribute("chars", len(content))
+            return content
+
+    @contextmanager
+    def _open_stream(self, file_obj):
+        """Yield a seekable binary stream positioned at the start, without copying when possible."""
+        if isinstance(file_obj, (bytes, bytearray, memoryview)):
+            # BytesIO shares the buffer of an immutable bytes object until it is written to.
+            yield io.BytesIO(file_obj)
+            return
+
+        if file_obj.seekable():
+            file_obj.seek(0)
+            yield file_obj
+            return
+
+        spooled = tempfile.SpooledTemporaryFile(max_size=self.SPOOL_MAX_BYTES)
         try:
-            if ext == '.pdf':
-                content = self._load_pdf(file_path)
-            elif ext == '.txt':
-                content = self._load_txt(file_path)
-            elif ext == '.docx':
-                content = self._load_docx(file_path)
-            elif ext == '.doc':
-                content = self._load_doc(file_path)
-        except Exception as e:
-            raise RuntimeError(f"Error loading file {file_path}: {str(e)}")
-        
-        return self.clean_text(content)
+            shutil.copyfileobj(file_obj, spooled)
+            spooled.seek(0)
+            yield spooled
+        finally:
+            spooled.close()
+
+    def _load_pdf(self, source) -> str:
+        import pdfplumber
 
-    def _load_pdf(self, file_path: str) -> str:
         content = ""
-        with pdfplumber.open(file_path) as pdf:
+        with pdfplumber.open(source) as pdf:
             for page in pdf.pages:
                 text = page.extract_text()
                 if text:
@@ -45,7 +109,15 @@ class DocumentLoader:
         with open(file_path, 'r', encoding='utf-8') as file:
             return file.read()
 
-    def _load_docx(self, file_path: str) -> str:
+    def _load_txt_stream(self, stream: BinaryIO) -> str:
+        wrapper = io.TextIOWrapper(stream, encoding='utf-8')
+        try:
+            return wrapper.read()
+        finally:
+            # Detach so closing the wrapper does not close the caller's stream.
+            wrapper.detach()
+
+    def _load_docx(self, source) -> str:
         try:
             from docx import Document
         except ImportError as exc:
@@ -53,7 +125,7 @@ class DocumentLoader:
                 "DOCX support requires the 'python-docx' package to be installed."
             ) from exc
 
-        document = Document(file_path)
+        document = Document(source)
         parts = []
 
         for paragraph in document.paragraphs:
@@ -71,6 +143,18 @@ class DocumentLoader:
 
         return "\n".join(parts)
 
+    def _load_doc_stream(self, stream: BinaryIO, file_name: str) -> str:
+        if os.name != "nt":
+            raise RuntimeError("DOC support currently requires Windows with Microsoft Word installed.")
+
+        # mkdtemp creates the directory readable by the current user only, so concurrent
+        # uploads with the same file name never share a path.
+        with tempfile.TemporaryDirectory(prefix="doc_upload_") as temp_dir:
+            temp_path = os.path.join(temp_dir, os.path.basename(file_name))
+            with open(temp_path, "wb") as file:
+                shutil.copyfileobj(stream, file)
+            return self._load_doc(temp_path)
+
     def _load_doc(self, file_path: str) -> str:
         if os.name != "nt":
             raise RuntimeError("DOC support currently requires Windows with Microsoft Word installed.")
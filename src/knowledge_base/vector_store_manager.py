@@ -1,30 +1,58 @@
 import os
-from typing import List, Optional
+import threading
+from typing import List, Optional, Tuple
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 from langchain_community.vectorstores import Chroma
 from langchain_openai import OpenAIEmbeddings
 from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+from http_pool import get_http_clients
+from tracing import span
+
+
+class TracedEmbeddings(Embeddings):
+    """Wrap an embedding model so query and document embedding show up as tracing spans."""
+
+    def __init__(self, embedding_model):
+        self.embedding_model = embedding_model
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        with span("embedding.documents", texts=len(texts), chars=sum(len(text) for text in texts)):
+            return self.embedding_model.embed_documents(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        with span("embedding.query", chars=len(text)):
+            return self.embedding_model.embed_query(text)
+
 
 class VectorStoreManager:
-    def __init__(self, persist_directory: str = "./data/chroma_db", embedding_model=None, base_url: str = None, model_name: str = None, api_key: str = None):
+    def __init__(self, persist_directory: str = "./data/chroma_db", embedding_model=None, base_url: str = None, model_name: str = None, api_key: str = None, http_clients=None):
         self.persist_directory = persist_directory
         # Ensure the directory exists
         os.makedirs(persist_directory, exist_ok=True)
         
         # Use provided embedding model or default to OpenAIEmbeddings
         # Note: OpenAIEmbeddings requires OPENAI_API_KEY environment variable or api_key param
+        self.http_clients = None
         if embedding_model:
             self.embedding_model = embedding_model
         else:
+            self.http_clients = http_clients or get_http_clients(base_url)
             # If base_url is provided, pass it to OpenAIEmbeddings
             self.embedding_model = OpenAIEmbeddings(
                 openai_api_base=base_url if base_url else None,
                 model=model_name,
                 check_embedding_ctx_length=False,  # Disable token counting for compatible APIs
                 openai_api_key=api_key,
-                chunk_size=10  # Limit batch size for DashScope compatibility (max 25)
+                chunk_size=10,  # Limit batch size for DashScope compatibility (max 25)
+                **self.http_clients.client_kwargs()
             )
+        # Chroma embeds through the wrapper, so embedding time is separated from the index lookup.
+        self._traced_embeddings = TracedEmbeddings(self.embedding_model)
         self.collection = None
+        # Instances are shared across Streamlit sessions, so guard lazy loading and writes
+        self._lock = threading.RLock()
 
     def text_splitter(self, text: str, chunk_size: int = 500, chunk_overlap: int = 50) -> List[Document]:
         """Split text into chunks."""
@@ -48,20 +76,26 @@ class VectorStoreManager:
             return
 
         # Initialize or update Chroma collection
-        self.collection = Chroma.from_documents(
-            documents=valid_docs,
-            embedding=self.embedding_model,
-            persist_directory=self.persist_directory
-        )
+        with self._lock, span("vector_store.add", documents=len(valid_docs)):
+            if self.collection is None:
+                self.collection = Chroma.from_documents(
+                    documents=valid_docs,
+                    embedding=self._traced_embeddings,
+                    persist_directory=self.persist_directory
+                )
+            else:
+                self.collection.add_documents(valid_docs)
         print(f"Added {len(valid_docs)} documents to vector store.")
 
     def get_vector_store(self):
         """Get the vector store instance, loading from disk if necessary."""
         if self.collection is None:
-            self.collection = Chroma(
-                persist_directory=self.persist_directory,
-                embedding_function=self.embedding_model
-            )
+            with self._lock:
+                if self.collection is None:
+                    self.collection = Chroma(
+                        persist_directory=self.persist_directory,
+                        embedding_function=self._traced_embeddings
+                    )
         return self.collection
 
     def similarity_search(self, query: str, top_k: int = 3) -> List[Document]:
@@ -69,12 +103,73 @@ class VectorStoreManager:
         if not query:
             return []
         try:
-            store = self.get_vector_store()
-            return store.similarity_search(query, k=top_k)
+            with span("vector_store.search", top_k=top_k) as search_span:
+                store = self.get_vector_store()
+                docs = store.similarity_search(query, k=top_k)
+                search_span.set_attribute("documents", len(docs))
+                return docs
         except Exception as e:
             print(f"Error in similarity_search with query '{query}': {e}")
             raise e
 
+    def embed_query(self, query: str) -> List[float]:
+        return self._traced_embeddings.embed_query(query)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self._traced_embeddings.embed_documents(texts) if texts else []
+
+    def search_with_embeddings(self, query: str, top_k: int = 20) -> Tuple[List[Document], List[List[float]]]:
+        """Retrieve chunks together with their stored embeddings, so callers can re-score
+        them locally without embedding the chunk texts again."""
+        if not query:
+            return [], []
+        embedding = self.embed_query(query)
+        store = self.get_vector_store()
+        with span("vector_store.search", top_k=top_k, with_embeddings=True) as search_span:
+            # The LangChain wrapper does not return stored vectors, so query the Chroma collection directly.
+            result = store._collection.query(
+                query_embeddings=[embedding],
+                n_results=top_k,
+                include=["documents", "metadatas", "embeddings"]
+            )
+            texts = (result.get("documents") or [[]])[0] or []
+            metadatas = (result.get("metadatas") or [[]])[0] or [None] * len(texts)
+            embeddings = result.get("embeddings")
+            embeddings = list(embeddings[0]) if embeddings is not None and len(embeddings) else []
+            docs = [
+                Document(page_content=text, metadata=metadata or {})
+                for text, metadata in zip(texts, metadatas)
+            ]
+            search_span.set_attribute("documents", len(docs))
+            return docs, [list(vector) for vector in embeddings]
+
+    def search_by_vector(
+        self,
+        embedding: List[float],
+        top_k: int = 3,
+        search_type: str = "similarity",
+        fetch_k: int = None
+    ) -> List[Document]:
+        """Retrieve chunks for a precomputed query embedding.
+
+        ``search_type`` is ``similarity`` or ``mmr`` (maximal marginal relevance over the
+        ``fetch_k`` nearest chunks, by default at least 20 and four times ``top_k``).
+        """
+        store = self.get_vector_store()
+        with span("vector_store.search", top_k=top_k, search_type=search_type) as search_span:
+            if search_type == "mmr":
+                docs = store.max_marginal_relevance_search_by_vector(
+                    embedding,
+                    k=top_k,
+                    fetch_k=fetch_k or max(20, top_k * 4)
+                )
+            elif search_type == "similarity":
+                docs = store.similarity_search_by_vector(embedding, k=top_k)
+            else:
+                raise ValueError(f"Unsupported search type '{search_type}'. Supported: ['similarity', 'mmr']")
+            search_span.set_attribute("documents", len(docs))
+            return docs
+
     def as_retriever(self, search_type="similarity", search_kwargs: dict = None):
         """Expose retriever interface for LangChain integration."""
         store = self.get_vector_store()
@@ -0,0 +1,242 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+
+class AnswerCache:
+    """Bounded LRU cache for generated answers, backed by a local SQLite file.
+
+    Entries are keyed by the normalized question, the fingerprints of the retrieved
+    chunks, the prompt template's fingerprint and the model, so an answer is only
+    reused when the evidence it was generated from is identical.
+
+    Hits only record their access time in memory; the times are written in one batch
+    every ``access_flush_size`` hits, before an eviction and on ``flush``/``close``.
+    """
+
+    def __init__(
+        self,
+        db_path: str = "./data/answer_cache.sqlite3",
+        max_entries: int = 5000,
+        memory_entries: int = 256,
+        access_flush_size: int = 64
+    ):
+        self.db_path = db_path
+        self.max_entries = max(1, int(max_entries))
+        self.memory_entries = max(1, int(memory_entries))
+        self.access_flush_size = max(1, int(access_flush_size))
+        self._memory = OrderedDict()
+        self._pending_access = {}
+        self._lock = threading.Lock()
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "writes": 0,
+            "evictions": 0
+        }
+
+        directory = os.path.dirname(self.db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._connection = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS answers (
+                cache_key TEXT PRIMARY KEY,
+                query TEXT NOT NULL,
+                model_name TEXT NOT NULL,
+                answer TEXT NOT NULL,
+                source_documents TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_accessed REAL NOT NULL
+            )
+            """
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS idx_answers_last_accessed ON answers (last_accessed)"
+        )
+        self._connection.commit()
+        self._entry_count = self._connection.execute("SELECT COUNT(*) FROM answers").fetchone()[0]
+
+    @staticmethod
+    def normalize_query(query: str) -> str:
+        normalized = unicodedata.normalize("NFKC", query or "").strip().lower()
+        normalized = re.sub(r"\s+", " ", normalized)
+        return normalized.rstrip("?？。.!！ ")
+
+    @staticmethod
+    def fingerprint_document(doc: Any) -> str:
+        if hasattr(doc, "page_content"):
+            content = doc.page_content
+            metadata = getattr(doc, "metadata", None) or {}
+            doc_id = getattr(doc, "id", None) or ""
+        else:
+            content = str(doc)
+            metadata = {}
+            doc_id = ""
+        payload = json.dumps(
+            {"id": doc_id, "content": content, "metadata": metadata},
+            ensure_ascii=False,
+            sort_keys=True,
+            default=str
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def build_key(self, query: str, docs: List[Any], prompt_fingerprint: str, model_name: str) -> str:
+        """Build the cache key; ``prompt_fingerprint`` identifies the prompt template's content."""
+        payload = json.dumps(
+            {
+                "query": self.normalize_query(query),
+                "evidence": [self.fingerprint_document(doc) for doc in docs],
+                "prompt": prompt_fingerprint or "",
+                "model": model_name or ""
+            },
+            ensure_ascii=False,
+            sort_keys=True
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _remember(self, cache_key: str, entry: Dict[str, Any]):
+        self._memory[cache_key] = entry
+        self._memory.move_to_end(cache_key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            now = time.time()
+            entry = self._memory.get(cache_key)
+            if entry is not None:
+                self._memory.move_to_end(cache_key)
+                self.stats["hits"] += 1
+                self.stats["memory_hits"] += 1
+            else:
+                row = self._connection.execute(
+                    "SELECT answer, source_documents FROM answers WHERE cache_key = ?",
+                    (cache_key,)
+                ).fetchone()
+                if row is None:
+                    self.stats["misses"] += 1
+                    return None
+                entry = {"answer": row[0], "source_documents": json.loads(row[1])}
+                self._remember(cache_key, entry)
+                self.stats["hits"] += 1
+                self.stats["disk_hits"] += 1
+
+            self._pending_access[cache_key] = now
+            if len(self._pending_access) >= self.access_flush_size:
+                self._write_access_times()
+                self._connection.commit()
+            return dict(entry)
+
+    def _write_access_times(self):
+        if not self._pending_access:
+            return
+        self._connection.executemany(
+            "UPDATE answers SET last_accessed = ? WHERE cache_key = ?",
+            [(accessed, key) for key, accessed in self._pending_access.items()]
+        )
+        self._pending_access.clear()
+
+    def flush(self):
+        """Write access times recorded since the last flush."""
+        with self._lock:
+            self._write_access_times()
+            self._connection.commit()
+
+    def put(
+        self,
+        cache_key: str,
+        query: str,
+        model_name: str,
+        answer: str,
+        source_documents: List[str]
+    ):
+        entry = {"answer": answer, "source_documents": list(source_documents)}
+        with self._lock:
+            now = time.time()
+            exists = self._connection.execute(
+                "SELECT 1 FROM answers WHERE cache_key = ?",
+                (cache_key,)
+            ).fetchone()
+            self._connection.execute(
+                """
+                INSERT OR REPLACE INTO answers
+                    (cache_key, query, model_name, answer, source_documents, created_at, last_accessed)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    cache_key,
+                    query,
+                    model_name or "",
+                    answer,
+                    json.dumps(entry["source_documents"], ensure_ascii=False),
+                    now,
+                    now
+                )
+            )
+            if exists is None:
+                self._entry_count += 1
+            self._pending_access.pop(cache_key, None)
+            self._remember(cache_key, entry)
+            self.stats["writes"] += 1
+            self._evict_overflow()
+            self._connection.commit()
+
+    def _evict_overflow(self):
+        overflow = self._entry_count - self.max_entries
+        if overflow <= 0:
+            return
+
+        # Eviction order depends on recency, so pending access times go in first.
+        self._write_access_times()
+        evicted_keys = [
+            row[0]
+            for row in self._connection.execute(
+                "SELECT cache_key FROM answers ORDER BY last_accessed ASC LIMIT ?",
+                (overflow,)
+            ).fetchall()
+        ]
+        self._connection.executemany(
+            "DELETE FROM answers WHERE cache_key = ?",
+            [(key,) for key in evicted_keys]
+        )
+        for key in evicted_keys:
+            self._memory.pop(key, None)
+        self._entry_count -= len(evicted_keys)
+        self.stats["evictions"] += len(evicted_keys)
+
+    def clear(self):
+        with self._lock:
+            self._connection.execute("DELETE FROM answers")
+            self._connection.commit()
+            self._memory.clear()
+            self._pending_access.clear()
+            self._entry_count = 0
+
+    def close(self):
+        self.flush()
+        with self._lock:
+            self._connection.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._entry_count
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self.stats)
+        lookups = stats["hits"] + stats["misses"]
+        stats["lookups"] = lookups
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        stats["entries"] = len(self)
+        return stats
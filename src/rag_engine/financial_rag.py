@@ -4,6 +4,11 @@ from langchain_core.prompts import PromptTemplate
 from langchain_core.output_parsers import StrOutputParser
 from langchain_core.runnables import RunnablePassthrough
 
+from endpoint_router import served_endpoint
+from eval_engine.prompt_manager import fingerprint_prompt
+from http_pool import get_http_clients
+from tracing import record_token_usage, span
+
 class FinancialRAG:
     def __init__(
         self,
@@ -12,16 +17,26 @@ class FinancialRAG:
         base_url: str = None,
         timeout: int = 60,
         api_key: str = None,
-        retrieval_top_k: int = 3
+        retrieval_top_k: int = 3,
+        answer_cache=None,
+        http_clients=None,
+        llm=None
     ):
         self.vector_store = vector_store
-        # Initialize LLM (requires OPENAI_API_KEY or api_key param)
-        self.llm = ChatOpenAI(
+        self.model_name = model_name or ""
+        # Optional AnswerCache shared across sessions; answers are reused only for identical evidence
+        self.answer_cache = answer_cache
+        # Pooled HTTP clients shared with the judge and embeddings of the same base_url
+        self.http_clients = http_clients or get_http_clients(base_url)
+        # Initialize LLM (requires OPENAI_API_KEY or api_key param), unless a chat model
+        # such as an EndpointRouter spreading calls over several endpoints is passed in
+        self.llm = llm if llm is not None else ChatOpenAI(
             model_name=model_name, 
             temperature=0,
             base_url=base_url,
             timeout=timeout,
-            api_key=api_key
+            api_key=api_key,
+            **self.http_clients.client_kwargs()
         )
         
         # Financial expert prompt
@@ -40,6 +55,9 @@ class FinancialRAG:
             Answer:"""
         )
         
+        self.prompt_fingerprint = fingerprint_prompt(self.prompt_template.template)
+
+        self.retrieval_top_k = retrieval_top_k
         self.retriever = self.vector_store.as_retriever(search_kwargs={"k": retrieval_top_k})
         
         # Build the chain
@@ -55,32 +73,66 @@ class FinancialRAG:
 
     def retrieve_context(self, query: str) -> List[Any]:
         """Retrieve raw documents for inspection."""
-        return self.retriever.invoke(query)
+        with span("rag.retrieve", top_k=self.retrieval_top_k) as retrieve_span:
+            docs = self.retriever.invoke(query)
+            retrieve_span.set_attribute("documents", len(docs))
+            return docs
 
     def generate_answer(self, query: str) -> Dict[str, Any]:
         """
         Generate answer for the query.
-        Returns a dictionary with 'answer' and 'source_documents'.
+        Returns a dictionary with 'answer', 'source_documents' and 'cached'.
         """
+        with span("rag.answer") as answer_span:
+            result = self._generate_answer(query)
+            answer_span.set_attribute("cache_hit", result["cached"])
+            return result
+
+    def _generate_answer(self, query: str) -> Dict[str, Any]:
         # We need to manually run retrieval if we want to return source docs with the answer
         # or use a chain that returns sources.
         # For simplicity, let's do it in two steps to expose sources clearly.
         
         docs = self.retrieve_context(query)
+        source_documents = [doc.page_content for doc in docs] # In real app, include metadata
+
+        cache_key = None
+        if self.answer_cache is not None:
+            cache_key = self.answer_cache.build_key(
+                query,
+                docs,
+                self.prompt_fingerprint,
+                self.model_name
+            )
+            cached = self.answer_cache.get(cache_key)
+            if cached is not None:
+                return {
+                    "query": query,
+                    "answer": cached["answer"],
+                    "source_documents": source_documents,
+                    "cached": True,
+                    "served_by": ""
+                }
+
         context_str = self._format_docs(docs)
         
         chain_input = {"context": context_str, "question": query}
-        # We can invoke the prompt+llm part directly
-        answer_chain = (
-            self.prompt_template 
-            | self.llm 
-            | StrOutputParser()
-        )
-        
-        answer = answer_chain.invoke(chain_input)
-        
+        # We can invoke the prompt+llm part directly; the message is kept for its token usage
+        with span("llm.generate", model=self.model_name) as llm_span:
+            message = (self.prompt_template | self.llm).invoke(chain_input)
+            record_token_usage(llm_span, message)
+            endpoint = served_endpoint(message)
+            if endpoint:
+                llm_span.set_attribute("endpoint", endpoint)
+        answer = StrOutputParser().invoke(message)
+
+        if cache_key is not None:
+            self.answer_cache.put(cache_key, query, self.model_name, answer, source_documents)
+
         return {
             "query": query,
             "answer": answer,
-            "source_documents": [doc.page_content for doc in docs] # In real app, include metadata
+            "source_documents": source_documents,
+            "cached": False,
+            "served_by": endpoint or ""
         }
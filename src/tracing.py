@@ -0,0 +1,258 @@
+import json
+import secrets
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional
+
+# (recorder, current span) of the trace being recorded in this context, if any.
+_ACTIVE: ContextVar = ContextVar("finance_rag_trace", default=None)
+
+OTLP_SCOPE_NAME = "finance_rag.tracing"
+_OTLP_STATUS_CODES = {"ok": 1, "error": 2}
+
+
+class Span:
+    """One timed stage. Attributes hold small scalar details such as ``top_k`` or token counts."""
+
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "start_ns", "end_ns", "attributes", "status")
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str], attributes: Dict[str, Any]):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+        self.attributes = attributes
+        self.status = "ok"
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+    def set_attributes(self, **attributes):
+        self.attributes.update(attributes)
+
+    def to_dict(self) -> Dict[str, Any]:
+        end_ns = self.end_ns if self.end_ns is not None else time.time_ns()
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_ns": self.start_ns,
+            "end_ns": end_ns,
+            "duration_ms": (end_ns - self.start_ns) / 1e6,
+            "status": self.status,
+            "attributes": dict(self.attributes)
+        }
+
+
+class _NoopSpan:
+    __slots__ = ()
+    span_id = None
+    trace_id = None
+
+    def set_attribute(self, key: str, value: Any):
+        pass
+
+    def set_attributes(self, **attributes):
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class TraceRecorder:
+    """Collects the finished spans of one trace. Spans from several threads may be added."""
+
+    def __init__(self, trace_id: str = None, parent_id: str = None):
+        self.trace_id = trace_id or secrets.token_hex(16)
+        self.parent_id = parent_id
+        self._spans = []
+        self._lock = threading.Lock()
+
+    def add(self, span: Span):
+        with self._lock:
+            self._spans.append(span)
+
+    def export(self) -> List[Dict[str, Any]]:
+        """Finished spans as plain dicts, ordered by start time."""
+        with self._lock:
+            spans = [span.to_dict() for span in self._spans]
+        return sorted(spans, key=lambda span: span["start_ns"])
+
+    def summary(self) -> List[Dict[str, Any]]:
+        return summarize_spans(self.export())
+
+
+@contextmanager
+def span(name: str, **attributes) -> Iterator[Any]:
+    """Time the enclosed block as a child of the current span.
+
+    Outside ``record_trace`` this yields a shared no-op span after a single context variable
+    lookup, so instrumented code paths cost next to nothing when tracing is off.
+    """
+    active = _ACTIVE.get()
+    if active is None:
+        yield _NOOP_SPAN
+        return
+
+    recorder, parent = active
+    item = Span(name, recorder.trace_id, parent.span_id if parent is not None else recorder.parent_id, attributes)
+    token = _ACTIVE.set((recorder, item))
+    try:
+        yield item
+    except BaseException as exc:
+        item.status = "error"
+        item.attributes["error"] = type(exc).__name__
+        raise
+    finally:
+        item.end_ns = time.time_ns()
+        _ACTIVE.reset(token)
+        recorder.add(item)
+
+
+@contextmanager
+def record_trace(name: str, trace_id: str = None, parent_id: str = None, **attributes) -> Iterator[TraceRecorder]:
+    """Record every span opened in this context under a root span called ``name``.
+
+    Pass ``trace_id`` and ``parent_id`` (see ``current_trace_context``) to continue a trace
+    started in another process, e.g. one shard of a CLI evaluation.
+    """
+    recorder = TraceRecorder(trace_id, parent_id)
+    token = _ACTIVE.set((recorder, None))
+    try:
+        with span(name, **attributes):
+            yield recorder
+    finally:
+        _ACTIVE.reset(token)
+
+
+def is_tracing() -> bool:
+    return _ACTIVE.get() is not None
+
+
+def current_trace_context() -> Optional[Dict[str, str]]:
+    """``{"trace_id", "parent_id"}`` of the current span, for continuing the trace elsewhere."""
+    active = _ACTIVE.get()
+    if active is None:
+        return None
+    recorder, parent = active
+    return {
+        "trace_id": recorder.trace_id,
+        "parent_id": parent.span_id if parent is not None else recorder.parent_id
+    }
+
+
+def record_token_usage(target, message):
+    """Copy ``usage_metadata`` of a LangChain chat message onto a span, when the API reports it."""
+    usage = getattr(message, "usage_metadata", None)
+    if isinstance(usage, dict):
+        target.set_attributes(
+            input_tokens=usage.get("input_tokens", 0),
+            output_tokens=usage.get("output_tokens", 0)
+        )
+
+
+def summarize_spans(spans: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Latency breakdown per span name, slowest stage first.
+
+    ``self_ms`` excludes time spent in child spans, so the self times of all stages add up to
+    the duration of the root spans and show where the time actually goes.
+    """
+    child_time = {}
+    span_ids = {span["span_id"] for span in spans}
+    root_ms = 0.0
+    for item in spans:
+        parent_id = item.get("parent_id")
+        if parent_id in span_ids:
+            child_time[parent_id] = child_time.get(parent_id, 0.0) + item["duration_ms"]
+        else:
+            root_ms += item["duration_ms"]
+
+    stages = {}
+    for item in spans:
+        stage = stages.setdefault(item["name"], {"durations": [], "self_ms": 0.0, "errors": 0})
+        stage["durations"].append(item["duration_ms"])
+        stage["self_ms"] += max(0.0, item["duration_ms"] - child_time.get(item["span_id"], 0.0))
+        stage["errors"] += item.get("status") == "error"
+
+    rows = []
+    for name, stage in stages.items():
+        durations = sorted(stage["durations"])
+        total_ms = sum(durations)
+        rows.append({
+            "stage": name,
+            "count": len(durations),
+            "total_ms": total_ms,
+            "self_ms": stage["self_ms"],
+            "mean_ms": total_ms / len(durations),
+            "p95_ms": durations[min(len(durations) - 1, int(0.95 * len(durations)))],
+            "share": stage["self_ms"] / root_ms if root_ms else 0.0,
+            "errors": stage["errors"]
+        })
+    return sorted(rows, key=lambda row: row["self_ms"], reverse=True)
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        # proto3 JSON encodes 64-bit integers as strings.
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def spans_to_otlp(spans: List[Dict[str, Any]], service_name: str = "finance-rag") -> Dict[str, Any]:
+    """Convert exported spans to an OTLP/JSON ``ExportTraceServiceRequest`` payload."""
+    otlp_spans = []
+    for item in spans:
+        otlp_span = {
+            "traceId": item["trace_id"],
+            "spanId": item["span_id"],
+            "name": item["name"],
+            "kind": 1,
+            "startTimeUnixNano": str(item["start_ns"]),
+            "endTimeUnixNano": str(item["end_ns"]),
+            "attributes": [
+                {"key": key, "value": _otlp_value(value)}
+                for key, value in item.get("attributes", {}).items()
+            ],
+            "status": {"code": _OTLP_STATUS_CODES.get(item.get("status"), 0)}
+        }
+        if item.get("parent_id"):
+            otlp_span["parentSpanId"] = item["parent_id"]
+        otlp_spans.append(otlp_span)
+
+    return {
+        "resourceSpans": [{
+            "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": service_name}}]},
+            "scopeSpans": [{"scope": {"name": OTLP_SCOPE_NAME}, "spans": otlp_spans}]
+        }]
+    }
+
+
+def dump_trace(spans: List[Dict[str, Any]], trace_format: str = "json") -> str:
+    """Serialize spans as ``json`` (spans plus stage summary) or ``otlp`` (OTLP/JSON)."""
+    if trace_format == "otlp":
+        payload = spans_to_otlp(spans)
+    elif trace_format == "json":
+        payload = {"spans": spans, "summary": summarize_spans(spans)}
+    else:
+        raise ValueError(f"Unsupported trace format '{trace_format}'. Supported: ['json', 'otlp']")
+    return json.dumps(payload, ensure_ascii=False, indent=2)
+
+
+def export_trace(path: str, spans: List[Dict[str, Any]], trace_format: str = "json"):
+    with open(path, "w", encoding="utf-8") as file:
+        file.write(dump_trace(spans, trace_format))
+
+
+def load_trace(path: str) -> List[Dict[str, Any]]:
+    """Load spans written by ``export_trace`` in the ``json`` format."""
+    with open(path, "r", encoding="utf-8") as file:
+        return json.load(file).get("spans", [])
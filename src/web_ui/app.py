@@ -1,25 +1,38 @@
+import io
 import os
 import sys
 import json
 import html
+import importlib.util
 
-import pandas as pd
 import streamlit as st
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 from config_manager import AppConfigManager
 from data_manager.test_set_manager import TestSetManager
-from eval_engine.hallucination_evaluator import HallucinationEvaluator
-from eval_engine.prompt_manager import PromptTemplateManager
+from eval_engine.job_runner import EvaluationJobRunner
+from eval_engine.judge_cascade import summarize_cascade
+from eval_engine.numeric_check import summarize_numeric_precheck
+from eval_engine.prompt_defaults import (
+    DEFAULT_CLAIM_EXTRACTION_PROMPT,
+    DEFAULT_CLAIM_VERIFICATION_PROMPT,
+    DEFAULT_OVERALL_PROMPT
+)
+from eval_engine.prompt_manager import PromptTemplateManager, fingerprint_prompts
 from eval_engine.result_exporter import (
-    build_export_payload,
-    flatten_results_for_csv,
-    summarize_error_buckets
+    sanitize_config_snapshot,
+    write_export_json,
+    write_results_csv,
+    write_results_parquet
 )
-from knowledge_base.document_loader import DocumentLoader
-from knowledge_base.vector_store_manager import VectorStoreManager
-from rag_engine.financial_rag import FinancialRAG
+from eval_engine.result_index import ResultIndex
+from eval_engine.run_history import RunHistoryStore
+from http_pool import get_http_clients, pool_statistics
+from rag_engine.answer_cache import AnswerCache
+
+# pandas, LangChain, Chroma, pdfplumber and the evaluator are imported inside the functions
+# that need them, so the first page paints without paying for those imports.
 
 
 st.set_page_config(page_title="金融幻觉评测系统", layout="wide")
@@ -39,6 +52,8 @@ RESULT_COLUMN_LABELS = {
     "verdict": "判定结果",
     "reason": "判定原因",
     "source_model": "来源模型",
+    "served_by": "服务端点",
+    "judge_tier": "判定模型",
     "is_correct": "是否判对"
 }
 
@@ -55,18 +70,66 @@ VERDICT_DISPLAY_MAP = {
     "insufficient_evidence": "证据不足"
 }
 
+TRACE_STAGE_LABELS = {
+    "eval.job": "评测任务",
+    "eval.sample": "样本调度",
+    "rag.retrieve": "向量库检索（Chroma）",
+    "vector_store.search": "向量库检索（Chroma）",
+    "embedding.query": "查询向量化",
+    "embedding.documents": "文档向量化",
+    "llm.judge": "评审模型调用",
+    "judge.parse": "JSON 解析",
+    "rag.answer": "问答生成",
+    "llm.generate": "问答模型调用",
+    "document.load": "文档解析",
+    "vector_store.add": "向量入库"
+}
+
 BOOL_DISPLAY_MAP = {
     True: "是",
     False: "否"
 }
 
+JOB_STATUS_DISPLAY_MAP = {
+    "queued": "排队中",
+    "running": "运行中",
+    "completed": "已完成",
+    "failed": "失败",
+    "cancelled": "已取消",
+    "interrupted": "已中断"
+}
+
 SAMPLE_DATASET_PATH = os.path.abspath(
     os.path.join(os.path.dirname(__file__), "..", "..", "data", "sample_eval_dataset.json")
 )
 CONFIG_FILE_PATH = os.path.abspath(
     os.path.join(os.path.dirname(__file__), "..", "..", "config", "app_config.json")
 )
-APP_CONFIG_MANAGER = AppConfigManager(CONFIG_FILE_PATH)
+ANSWER_CACHE_PATH = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), "..", "..", "data", "answer_cache.sqlite3")
+)
+EVAL_JOB_DIR = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), "..", "..", "data", "eval_jobs")
+)
+EVAL_JOB_CONCURRENCY = 2
+RUN_HISTORY_PATH = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), "..", "..", "data", "run_history.sqlite3")
+)
+RESULT_PAGE_SIZES = [10, 20, 50]
+STYLED_TABLE_ROW_LIMIT = 1000
+CONFIG_WATCH_INTERVAL = 2.0
+
+
+# The manager lives for the whole server process: reruns read its cached config, and its
+# watcher thread picks up edits to the config file without restarting the server.
+@st.cache_resource(show_spinner=False)
+def get_app_config_manager():
+    manager = AppConfigManager(CONFIG_FILE_PATH)
+    manager.start_watching(CONFIG_WATCH_INTERVAL)
+    return manager
+
+
+APP_CONFIG_MANAGER = get_app_config_manager()
 DEFAULT_APP_CONFIG = APP_CONFIG_MANAGER.load_config()
 DEFAULT_RUNTIME_CONFIG = APP_CONFIG_MANAGER.get_runtime_config(DEFAULT_APP_CONFIG)
 
@@ -501,7 +564,7 @@ def semantic_cell_style(value):
     return "color: #e2e8f0;"
 
 
-def build_semantic_styler(df: pd.DataFrame):
+def build_semantic_styler(df):
     return (
         df.style
         .set_properties(**{
@@ -523,10 +586,18 @@ if "eval_results" not in st.session_state:
     st.session_state["eval_results"] = []
 if "eval_metrics" not in st.session_state:
     st.session_state["eval_metrics"] = {}
+if "eval_sampling" not in st.session_state:
+    st.session_state["eval_sampling"] = None
 if "last_eval_mode" not in st.session_state:
     st.session_state["last_eval_mode"] = "overall"
 if "last_eval_dataset_name" not in st.session_state:
     st.session_state["last_eval_dataset_name"] = ""
+if "eval_results_version" not in st.session_state:
+    st.session_state["eval_results_version"] = 0
+if "active_eval_job" not in st.session_state:
+    st.session_state["active_eval_job"] = ""
+if "attached_eval_job" not in st.session_state:
+    st.session_state["attached_eval_job"] = ""
 if "provider" not in st.session_state:
     st.session_state["provider"] = DEFAULT_RUNTIME_CONFIG["provider"]
 if "base_url" not in st.session_state:
@@ -542,14 +613,14 @@ if "retrieval_top_k" not in st.session_state:
 if "api_key" not in st.session_state:
     st.session_state["api_key"] = DEFAULT_RUNTIME_CONFIG["api_key"]
 if "overall_prompt" not in st.session_state:
-    st.session_state["overall_prompt"] = HallucinationEvaluator.DEFAULT_OVERALL_PROMPT.strip()
+    st.session_state["overall_prompt"] = DEFAULT_OVERALL_PROMPT.strip()
 if "claim_extraction_prompt" not in st.session_state:
     st.session_state["claim_extraction_prompt"] = (
-        HallucinationEvaluator.DEFAULT_CLAIM_EXTRACTION_PROMPT.strip()
+        DEFAULT_CLAIM_EXTRACTION_PROMPT.strip()
     )
 if "claim_verification_prompt" not in st.session_state:
     st.session_state["claim_verification_prompt"] = (
-        HallucinationEvaluator.DEFAULT_CLAIM_VERIFICATION_PROMPT.strip()
+        DEFAULT_CLAIM_VERIFICATION_PROMPT.strip()
     )
 if "active_prompt_template" not in st.session_state:
     st.session_state["active_prompt_template"] = PromptTemplateManager.DEFAULT_TEMPLATE_NAME
@@ -559,6 +630,16 @@ if "data_status_message" not in st.session_state:
     st.session_state["data_status_message"] = ""
 if "_pending_runtime_config" not in st.session_state:
     st.session_state["_pending_runtime_config"] = None
+if "_config_version" not in st.session_state:
+    st.session_state["_config_version"] = APP_CONFIG_MANAGER.version
+
+
+if st.session_state["_config_version"] != APP_CONFIG_MANAGER.version:
+    st.session_state["_config_version"] = APP_CONFIG_MANAGER.version
+    st.session_state["_pending_runtime_config"] = APP_CONFIG_MANAGER.get_runtime_config()
+    st.session_state["vector_store"] = None
+    st.session_state["rag_engine"] = None
+    st.session_state["config_status_message"] = "检测到配置文件变更，已自动重新加载运行配置。"
 
 
 pending_runtime_config = st.session_state.get("_pending_runtime_config")
@@ -621,7 +702,24 @@ def format_provider(provider):
     return PROVIDER_LABELS.get(provider, provider)
 
 
+def format_job_status(status):
+    return JOB_STATUS_DISPLAY_MAP.get(status, status)
+
+
+def job_status_tone(status):
+    return {
+        "queued": "neutral",
+        "running": "primary",
+        "completed": "success",
+        "failed": "danger",
+        "cancelled": "warning",
+        "interrupted": "warning"
+    }.get(status, "neutral")
+
+
 def localize_results_dataframe(df_results):
+    import pandas as pd
+
     localized = df_results.copy()
     for column in ["expected_label", "predicted_label"]:
         if column in localized.columns:
@@ -640,6 +738,8 @@ def localize_results_dataframe(df_results):
 
 
 def localize_samples_dataframe(df_samples):
+    import pandas as pd
+
     localized = df_samples.copy()
     if "label" in localized.columns:
         localized["label"] = localized["label"].map(
@@ -680,35 +780,247 @@ def render_detail_card(title: str, body: str):
     )
 
 
-def export_results_as_json(results, metrics, mode: str, dataset_name: str, runtime_config):
-    sanitized_config = dict(runtime_config)
-    if "api_key" in sanitized_config:
-        sanitized_config["api_key"] = "***"
-    payload = build_export_payload(
-        results=results,
-        metrics=metrics,
-        mode=mode,
-        dataset_name=dataset_name,
-        config_snapshot=sanitized_config
+def build_export_bytes(result_view, cache_key, write_export, text: bool = True) -> bytes:
+    """Serialize an export at most once per result-set version and reuse the bytes afterwards."""
+    exports = result_view["exports"]
+    if cache_key not in exports:
+        buffer = io.BytesIO()
+        if text:
+            writer = io.TextIOWrapper(buffer, encoding="utf-8", newline="")
+            write_export(writer)
+            writer.flush()
+            writer.detach()
+        else:
+            write_export(buffer)
+        exports[cache_key] = buffer.getvalue()
+    return exports[cache_key]
+
+
+def export_results_as_json(result_view, metrics, mode: str, dataset_name: str, runtime_config) -> bytes:
+    config_snapshot = sanitize_config_snapshot(runtime_config)
+    return build_export_bytes(
+        result_view,
+        ("json", json.dumps(config_snapshot, sort_keys=True)),
+        lambda file: write_export_json(
+            file,
+            result_view["index"].results,
+            metrics,
+            mode,
+            dataset_name,
+            config_snapshot
+        )
+    )
+
+
+def export_results_as_csv(result_view) -> bytes:
+    return build_export_bytes(
+        result_view,
+        "csv",
+        lambda file: write_results_csv(file, result_view["index"].results)
     )
-    return json.dumps(payload, ensure_ascii=False, indent=2)
 
 
-def export_results_as_csv(results):
-    flattened = flatten_results_for_csv(results)
-    if not flattened:
-        return ""
-    return pd.DataFrame(flattened).to_csv(index=False)
+def export_results_as_parquet(result_view) -> bytes:
+    return build_export_bytes(
+        result_view,
+        "parquet",
+        lambda file: write_results_parquet(file, result_view["index"].results),
+        text=False
+    )
+
+
+@st.cache_resource
+def get_answer_cache():
+    return AnswerCache(ANSWER_CACHE_PATH)
+
+
+def get_shared_http_clients(base_url: str):
+    return get_http_clients(base_url or None, **APP_CONFIG_MANAGER.get_http_pool_settings())
+
+
+def get_shared_chat_router():
+    """Router over the config's ``routing`` endpoints, or ``None`` to use the runtime model."""
+    endpoints = APP_CONFIG_MANAGER.get_routing_endpoints()
+    if not endpoints:
+        return None
+    from endpoint_router import get_configured_router
+
+    return get_configured_router(
+        endpoints,
+        APP_CONFIG_MANAGER.get_routing_settings(),
+        timeout=120,
+        http_pool_settings=APP_CONFIG_MANAGER.get_http_pool_settings()
+    )
+
+
+def get_shared_cascade_options():
+    """Cheap-first judge cascade keyword arguments for ``HallucinationEvaluator``, if enabled."""
+    settings = APP_CONFIG_MANAGER.get_judge_cascade_settings()
+    if not settings:
+        return {}
+    from eval_engine.judge_cascade import CascadePolicy, build_cascade_model
+
+    return {
+        "cascade_model": build_cascade_model(
+            settings,
+            timeout=120,
+            http_pool_settings=APP_CONFIG_MANAGER.get_http_pool_settings()
+        ),
+        "cascade_policy": CascadePolicy(settings["min_confidence"], settings["escalate_verdicts"])
+    }
+
+
+def get_claim_extraction_options():
+    settings = APP_CONFIG_MANAGER.get_claim_extraction_settings()
+    return {
+        "claim_extraction_strategy": settings["strategy"],
+        "hybrid_max_chars": settings["hybrid_max_chars"],
+        "hybrid_max_claims": settings["hybrid_max_claims"]
+    }
+
+
+def get_numeric_precheck_options():
+    settings = APP_CONFIG_MANAGER.get_numeric_precheck_settings()
+    return {"numeric_precheck": settings["enabled"], "numeric_tolerance": settings["tolerance"]}
+
+
+def get_claim_evidence_options():
+    settings = APP_CONFIG_MANAGER.get_claim_evidence_settings()
+    return {
+        "claim_evidence_strategy": settings["strategy"],
+        "evidence_pool_size": settings["pool_size"],
+        "evidence_min_similarity": settings["min_similarity"]
+    }
+
+
+# Engines are cached per process and keyed on the runtime config fields they depend on,
+# so all sessions share one Chroma client, and chat, judge and embedding calls to the same
+# base_url share one HTTP connection pool.
+@st.cache_resource(show_spinner=False, max_entries=8)
+def get_shared_vector_store(base_url: str, embed_model_name: str, api_key: str, persist_directory: str):
+    from knowledge_base.vector_store_manager import VectorStoreManager
+
+    return VectorStoreManager(
+        persist_directory=persist_directory,
+        base_url=base_url or None,
+        model_name=embed_model_name,
+        api_key=api_key,
+        http_clients=get_shared_http_clients(base_url)
+    )
+
+
+@st.cache_resource(show_spinner=False, max_entries=8)
+def get_shared_rag_engine(
+    base_url: str,
+    chat_model_name: str,
+    embed_model_name: str,
+    api_key: str,
+    persist_directory: str,
+    retrieval_top_k: int
+):
+    from rag_engine.financial_rag import FinancialRAG
+
+    vector_store = get_shared_vector_store(base_url, embed_model_name, api_key, persist_directory)
+    return FinancialRAG(
+        vector_store,
+        model_name=chat_model_name or None,
+        base_url=base_url or None,
+        timeout=120,
+        api_key=api_key,
+        retrieval_top_k=retrieval_top_k,
+        answer_cache=get_answer_cache(),
+        http_clients=get_shared_http_clients(base_url),
+        llm=get_shared_chat_router()
+    )
+
+
+@st.cache_resource(show_spinner=False, max_entries=8)
+def get_shared_evaluator(
+    base_url: str,
+    chat_model_name: str,
+    api_key: str,
+    retrieval_top_k: int,
+    overall_prompt: str,
+    claim_extraction_prompt: str,
+    claim_verification_prompt: str
+):
+    from eval_engine.hallucination_evaluator import HallucinationEvaluator
+
+    return HallucinationEvaluator(
+        model_name=chat_model_name or None,
+        base_url=base_url or None,
+        timeout=120,
+        api_key=api_key,
+        retrieval_top_k=retrieval_top_k,
+        overall_prompt=overall_prompt,
+        claim_extraction_prompt=claim_extraction_prompt,
+        claim_verification_prompt=claim_verification_prompt,
+        http_clients=get_shared_http_clients(base_url),
+        judge_model=get_shared_chat_router(),
+        **get_shared_cascade_options(),
+        **get_claim_extraction_options(),
+        **get_claim_evidence_options(),
+        **get_numeric_precheck_options()
+    )
+
+
+def clear_shared_engines(config):
+    get_shared_evaluator.clear()
+    get_shared_rag_engine.clear()
+    get_shared_vector_store.clear()
+
+
+APP_CONFIG_MANAGER.add_change_listener(clear_shared_engines)
+
+
+def build_job_engines(runtime_config, prompts):
+    rag_engine = get_shared_rag_engine(
+        runtime_config["base_url"],
+        runtime_config["chat_model_name"],
+        runtime_config["embedding_model_name"],
+        runtime_config["api_key"],
+        runtime_config["vector_store_directory"],
+        int(runtime_config["retrieval_top_k"])
+    )
+    evaluator = get_shared_evaluator(
+        runtime_config["base_url"],
+        runtime_config["chat_model_name"],
+        runtime_config["api_key"],
+        int(runtime_config["retrieval_top_k"]),
+        prompts["overall_prompt"],
+        prompts["claim_extraction_prompt"],
+        prompts["claim_verification_prompt"]
+    )
+    return evaluator, rag_engine
+
+
+@st.cache_resource(show_spinner=False)
+def get_test_set_manager():
+    return TestSetManager()
+
+
+@st.cache_resource(show_spinner=False)
+def get_run_history():
+    return RunHistoryStore(RUN_HISTORY_PATH)
+
+
+@st.cache_resource(show_spinner=False)
+def get_job_runner():
+    return EvaluationJobRunner(
+        build_job_engines,
+        job_dir=EVAL_JOB_DIR,
+        max_concurrent_jobs=EVAL_JOB_CONCURRENCY,
+        run_history=get_run_history()
+    )
 
 
 def ensure_vector_store(base_url: str, embed_model_name: str, api_key: str, persist_directory: str):
-    if st.session_state["vector_store"] is None:
-        st.session_state["vector_store"] = VectorStoreManager(
-            persist_directory=persist_directory,
-            base_url=base_url or None,
-            model_name=embed_model_name,
-            api_key=api_key
-        )
+    st.session_state["vector_store"] = get_shared_vector_store(
+        base_url,
+        embed_model_name,
+        api_key,
+        persist_directory
+    )
     return st.session_state["vector_store"]
 
 
@@ -720,16 +1032,20 @@ def ensure_rag_engine(
     persist_directory: str,
     retrieval_top_k: int
 ):
-    vector_store = ensure_vector_store(base_url, embed_model_name, api_key, persist_directory)
-    if st.session_state["rag_engine"] is None:
-        st.session_state["rag_engine"] = FinancialRAG(
-            vector_store,
-            model_name=chat_model_name or None,
-            base_url=base_url or None,
-            timeout=120,
-            api_key=api_key,
-            retrieval_top_k=retrieval_top_k
-        )
+    st.session_state["vector_store"] = get_shared_vector_store(
+        base_url,
+        embed_model_name,
+        api_key,
+        persist_directory
+    )
+    st.session_state["rag_engine"] = get_shared_rag_engine(
+        base_url,
+        chat_model_name,
+        embed_model_name,
+        api_key,
+        persist_directory,
+        retrieval_top_k
+    )
     return st.session_state["rag_engine"]
 
 
@@ -747,6 +1063,113 @@ def render_eval_metrics(metrics):
         {"label": "F1", "value": f"{metrics['f1']:.2f}", "hint": "精确率与召回率的综合平衡指标。", "tone": "primary"},
         {"label": "不确定占比", "value": f"{metrics['uncertain_rate']:.2f}", "hint": "证据不足或判定保持谨慎的比例。", "tone": "warning"},
     ])
+    if st.session_state.get("eval_sampling"):
+        st.caption(format_sampling_summary(st.session_state["eval_sampling"]))
+    results = st.session_state.get("eval_results") or []
+    if any("cascade" in result for result in results[:1]):
+        settings = APP_CONFIG_MANAGER.get_judge_cascade_settings()
+        st.caption(format_cascade_summary(summarize_cascade(
+            results,
+            settings.get("cheap_price_per_1k", 0.0),
+            settings.get("strong_price_per_1k", 0.0)
+        )))
+    if any("numeric_precheck" in result for result in results[:1]):
+        st.caption(format_numeric_precheck_summary(summarize_numeric_precheck(results)))
+
+
+def get_result_view(results):
+    """Return the cached index and styled tables for the current result set."""
+    version = st.session_state["eval_results_version"]
+    cached_view = st.session_state.get("_result_view_cache")
+    if cached_view is None or cached_view["version"] != version:
+        cached_view = {"version": version, "index": ResultIndex(results), "tables": {}, "exports": {}}
+        st.session_state["_result_view_cache"] = cached_view
+    return cached_view
+
+
+def get_cached_results_table(result_view, table_name: str, build_dataframe):
+    tables = result_view["tables"]
+    if table_name not in tables:
+        localized = localize_results_dataframe(build_dataframe())
+        # Cell styling is computed server-side for every cell; skip it for very large tables.
+        tables[table_name] = (
+            build_semantic_styler(localized)
+            if len(localized) <= STYLED_TABLE_ROW_LIMIT
+            else localized
+        )
+    return tables[table_name]
+
+
+def render_paginated_results(result_view, positions, key: str, render_item):
+    result_index = result_view["index"]
+    widget_key = f"{key}_{result_view['version']}"
+    control_col1, control_col2, control_col3 = st.columns([2.2, 0.9, 0.9])
+    query = control_col1.text_input(
+        "搜索样本（编号 / 问题 / 回答 / 判定原因 / Claim）",
+        key=f"{widget_key}_query"
+    )
+    page_size = control_col2.selectbox("每页条数", RESULT_PAGE_SIZES, key=f"{widget_key}_page_size")
+    matched_positions = result_index.search(query, positions)
+    total_pages = max(1, -(-len(matched_positions) // page_size))
+    if st.session_state.get(f"{widget_key}_page", 1) > total_pages:
+        st.session_state[f"{widget_key}_page"] = 1
+    page = control_col3.number_input(
+        "页码",
+        min_value=1,
+        max_value=total_pages,
+        step=1,
+        key=f"{widget_key}_page"
+    )
+    page_positions, total_pages = ResultIndex.paginate(matched_positions, page, page_size)
+    st.caption(f"共匹配 {len(matched_positions)} 条样本，当前第 {page} / {total_pages} 页。")
+    if not page_positions:
+        render_empty_state("没有匹配的样本", "请调整搜索关键词后重试。")
+        return
+    for result in result_index.get_results(page_positions):
+        render_item(result)
+
+
+def render_claim_cards(result, show_reason: bool = False):
+    for claim_result in result.get("claim_results", []):
+        st.markdown(
+            "".join([
+                semantic_badge(format_verdict(claim_result["verdict"]), verdict_tone(claim_result["verdict"])),
+                semantic_badge(f"置信度：{claim_result['confidence']:.2f}", "neutral")
+            ]),
+            unsafe_allow_html=True
+        )
+        render_detail_card("Claim", claim_result["claim"])
+        if show_reason and claim_result.get("reason"):
+            render_detail_card("核验说明", claim_result["reason"])
+        if claim_result.get("evidence"):
+            render_detail_card("对应证据", " | ".join(claim_result["evidence"]))
+
+
+def render_claim_result_detail(result):
+    with st.expander(f"样本 {result['id']} - {format_verdict(result['verdict'])}", expanded=False):
+        render_result_badges(result)
+        render_detail_card("问题", result["question"])
+        render_detail_card("候选回答", result["candidate_answer"])
+        render_detail_card("判定原因", result["reason"])
+        claim_counts = result.get("claim_counts", {})
+        render_micro_cards([
+            {"label": "支持 Claim", "value": str(claim_counts.get("supported", 0)), "hint": "被知识库证据明确支持。", "tone": "success"},
+            {"label": "矛盾 Claim", "value": str(claim_counts.get("contradicted", 0)), "hint": "与检索证据存在直接冲突。", "tone": "danger"},
+            {"label": "证据不足 Claim", "value": str(claim_counts.get("insufficient_evidence", 0)), "hint": "证据无法完成支持或反驳。", "tone": "warning"},
+        ])
+        render_claim_cards(result, show_reason=True)
+
+
+def render_overall_result_detail(result):
+    with st.expander(f"样本 {result['id']} - {format_verdict(result['verdict'])}", expanded=False):
+        render_result_badges(result)
+        render_detail_card("问题", result["question"])
+        render_detail_card("候选回答", result["candidate_answer"])
+        render_detail_card("判定原因", result["reason"])
+        if result.get("evidence"):
+            render_detail_card("命中证据", " | ".join(result["evidence"]))
+        if result.get("unsupported_parts"):
+            render_detail_card("缺乏支持的部分", " | ".join(result["unsupported_parts"]))
 
 
 def render_eval_results(results, mode: str):
@@ -756,7 +1179,7 @@ def render_eval_results(results, mode: str):
         "样本级评测结果",
         "这里展示真实标签、预测标签、判定结果与理由，便于快速核查系统是否把错误样本抓出来。"
     )
-    df_results = pd.DataFrame(results)
+    result_view = get_result_view(results)
     visible_columns = [
         "id",
         "question",
@@ -766,166 +1189,668 @@ def render_eval_results(results, mode: str):
         "verdict",
         "reason",
         "source_model",
+        "served_by",
+        "judge_tier",
         "is_correct"
     ]
-    visible_columns = [column for column in visible_columns if column in df_results.columns]
-    localized_results = localize_results_dataframe(df_results[visible_columns])
-    st.dataframe(build_semantic_styler(localized_results), width="stretch", hide_index=True)
+
+    def build_results_dataframe():
+        import pandas as pd
+
+        df_results = pd.DataFrame(results)
+        return df_results[[column for column in visible_columns if column in df_results.columns]]
+
+    st.dataframe(
+        get_cached_results_table(result_view, "results", build_results_dataframe),
+        width="stretch",
+        hide_index=True
+    )
 
     if mode == "claim":
         render_section_intro(
             "Claim 级核验明细",
             "逐条查看回答中的事实断言被判为支持、矛盾还是证据不足，从而定位具体错误位点。"
         )
-        for result in results:
-            with st.expander(f"样本 {result['id']} - {format_verdict(result['verdict'])}", expanded=False):
-                render_result_badges(result)
-                render_detail_card("问题", result["question"])
-                render_detail_card("候选回答", result["candidate_answer"])
-                render_detail_card("判定原因", result["reason"])
-                claim_counts = result.get("claim_counts", {})
-                render_micro_cards([
-                    {"label": "支持 Claim", "value": str(claim_counts.get("supported", 0)), "hint": "被知识库证据明确支持。", "tone": "success"},
-                    {"label": "矛盾 Claim", "value": str(claim_counts.get("contradicted", 0)), "hint": "与检索证据存在直接冲突。", "tone": "danger"},
-                    {"label": "证据不足 Claim", "value": str(claim_counts.get("insufficient_evidence", 0)), "hint": "证据无法完成支持或反驳。", "tone": "warning"},
-                ])
-                for claim_result in result.get("claim_results", []):
-                    st.markdown(
-                        "".join([
-                            semantic_badge(format_verdict(claim_result["verdict"]), verdict_tone(claim_result["verdict"])),
-                            semantic_badge(f"置信度：{claim_result['confidence']:.2f}", "neutral")
-                        ]),
-                        unsafe_allow_html=True
-                    )
-                    render_detail_card("Claim", claim_result["claim"])
-                    if claim_result.get("reason"):
-                        render_detail_card("核验说明", claim_result["reason"])
-                    if claim_result.get("evidence"):
-                        render_detail_card("对应证据", " | ".join(claim_result["evidence"]))
+        render_paginated_results(
+            result_view,
+            result_view["index"].get_bucket("all"),
+            "eval_detail",
+            render_claim_result_detail
+        )
     else:
         render_section_intro(
             "证据摘要与判定理由",
             "聚焦整体判定模式下每条回答的结论、证据片段以及缺乏支持的部分。"
         )
-        for result in results:
-            with st.expander(f"样本 {result['id']} - {format_verdict(result['verdict'])}", expanded=False):
-                render_result_badges(result)
-                render_detail_card("问题", result["question"])
-                render_detail_card("候选回答", result["candidate_answer"])
-                render_detail_card("判定原因", result["reason"])
-                if result.get("evidence"):
-                    render_detail_card("命中证据", " | ".join(result["evidence"]))
-                if result.get("unsupported_parts"):
-                    render_detail_card("缺乏支持的部分", " | ".join(result["unsupported_parts"]))
+        render_paginated_results(
+            result_view,
+            result_view["index"].get_bucket("all"),
+            "eval_detail",
+            render_overall_result_detail
+        )
 
 
 def render_error_analysis(results, mode: str):
     if not results:
         return
 
-    buckets = summarize_error_buckets(results)
+    result_view = get_result_view(results)
+    result_index = result_view["index"]
+    bucket_counts = result_index.bucket_counts()
     render_section_intro(
         "错误分析与可解释诊断",
         "把错误样本、不确定样本和误分类样本拆开看，帮助我们快速发现提示词、知识库或模型能力的薄弱环节。"
     )
 
     render_micro_cards([
-        {"label": "错误样本数", "value": str(len(buckets["incorrect"])), "hint": "预测结果与真实标签不一致的样本。", "tone": "danger"},
-        {"label": "不确定样本数", "value": str(len(buckets["uncertain"])), "hint": "证据不足或需要继续人工复核。", "tone": "warning"},
-        {"label": "假阳性", "value": str(len(buckets["false_positive"])), "hint": "把正常回答误判为有幻觉。", "tone": "danger"},
-        {"label": "假阴性", "value": str(len(buckets["false_negative"])), "hint": "把有幻觉回答漏判为正常。", "tone": "warning"},
+        {"label": "错误样本数", "value": str(bucket_counts["incorrect"]), "hint": "预测结果与真实标签不一致的样本。", "tone": "danger"},
+        {"label": "不确定样本数", "value": str(bucket_counts["uncertain"]), "hint": "证据不足或需要继续人工复核。", "tone": "warning"},
+        {"label": "假阳性", "value": str(bucket_counts["false_positive"]), "hint": "把正常回答误判为有幻觉。", "tone": "danger"},
+        {"label": "假阴性", "value": str(bucket_counts["false_negative"]), "hint": "把有幻觉回答漏判为正常。", "tone": "warning"},
     ])
 
+    def render_incorrect_item(result):
+        with st.expander(
+            f"样本 {result['id']} | 真实标签 {format_label(result['expected_label'])} | "
+            f"预测标签 {format_label(result['predicted_label'])}"
+        ):
+            render_result_badges(result)
+            render_detail_card("问题", result["question"])
+            render_detail_card("候选回答", result["candidate_answer"])
+            render_detail_card("判定原因", result["reason"])
+            if mode == "claim":
+                render_claim_cards(result)
+            else:
+                if result.get("unsupported_parts"):
+                    render_detail_card("缺乏支持的部分", " | ".join(result["unsupported_parts"]))
+                if result.get("evidence"):
+                    render_detail_card("命中证据", " | ".join(result["evidence"]))
+
+    def render_uncertain_item(result):
+        with st.expander(f"样本 {result['id']} | 证据不足"):
+            render_result_badges(result)
+            render_detail_card("问题", result["question"])
+            render_detail_card("候选回答", result["candidate_answer"])
+            render_detail_card("判定原因", result["reason"])
+            if mode == "claim":
+                claim_counts = result.get("claim_counts", {})
+                render_micro_cards([
+                    {"label": "支持 Claim", "value": str(claim_counts.get("supported", 0)), "hint": "被证据支持。", "tone": "success"},
+                    {"label": "矛盾 Claim", "value": str(claim_counts.get("contradicted", 0)), "hint": "与证据冲突。", "tone": "danger"},
+                    {"label": "证据不足 Claim", "value": str(claim_counts.get("insufficient_evidence", 0)), "hint": "仍需补充证据。", "tone": "warning"},
+                ])
+                render_claim_cards(result)
+            else:
+                if result.get("evidence"):
+                    render_detail_card("命中证据", " | ".join(result["evidence"]))
+
     analysis_tab1, analysis_tab2, analysis_tab3 = st.tabs(
         ["错误样本", "不确定样本", "误分类样本"]
     )
 
     with analysis_tab1:
-        if not buckets["incorrect"]:
+        if not bucket_counts["incorrect"]:
             render_empty_state("当前没有错误样本", "这批评测结果里，系统没有出现真实标签与预测标签冲突的情况。")
         else:
-            for result in buckets["incorrect"]:
-                with st.expander(
-                    f"样本 {result['id']} | 真实标签 {format_label(result['expected_label'])} | "
-                    f"预测标签 {format_label(result['predicted_label'])}"
-                ):
-                    render_result_badges(result)
-                    render_detail_card("问题", result["question"])
-                    render_detail_card("候选回答", result["candidate_answer"])
-                    render_detail_card("判定原因", result["reason"])
-                    if mode == "claim":
-                        for claim_result in result.get("claim_results", []):
-                            st.markdown(
-                                "".join([
-                                    semantic_badge(format_verdict(claim_result["verdict"]), verdict_tone(claim_result["verdict"])),
-                                    semantic_badge(f"置信度：{claim_result['confidence']:.2f}", "neutral")
-                                ]),
-                                unsafe_allow_html=True
-                            )
-                            render_detail_card("Claim", claim_result["claim"])
-                            if claim_result.get("evidence"):
-                                render_detail_card("对应证据", " | ".join(claim_result["evidence"]))
-                    else:
-                        if result.get("unsupported_parts"):
-                            render_detail_card("缺乏支持的部分", " | ".join(result["unsupported_parts"]))
-                        if result.get("evidence"):
-                            render_detail_card("命中证据", " | ".join(result["evidence"]))
+            render_paginated_results(
+                result_view,
+                result_index.get_bucket("incorrect"),
+                "error_incorrect",
+                render_incorrect_item
+            )
 
     with analysis_tab2:
-        if not buckets["uncertain"]:
+        if not bucket_counts["uncertain"]:
             render_empty_state("当前没有不确定样本", "这批结果里没有进入“证据不足/无法稳定判定”的样本。")
         else:
-            for result in buckets["uncertain"]:
-                with st.expander(f"样本 {result['id']} | 证据不足"):
-                    render_result_badges(result)
-                    render_detail_card("问题", result["question"])
-                    render_detail_card("候选回答", result["candidate_answer"])
-                    render_detail_card("判定原因", result["reason"])
-                    if mode == "claim":
-                        claim_counts = result.get("claim_counts", {})
-                        render_micro_cards([
-                            {"label": "支持 Claim", "value": str(claim_counts.get("supported", 0)), "hint": "被证据支持。", "tone": "success"},
-                            {"label": "矛盾 Claim", "value": str(claim_counts.get("contradicted", 0)), "hint": "与证据冲突。", "tone": "danger"},
-                            {"label": "证据不足 Claim", "value": str(claim_counts.get("insufficient_evidence", 0)), "hint": "仍需补充证据。", "tone": "warning"},
-                        ])
-                        for claim_result in result.get("claim_results", []):
-                            st.markdown(
-                                "".join([
-                                    semantic_badge(format_verdict(claim_result["verdict"]), verdict_tone(claim_result["verdict"])),
-                                    semantic_badge(f"置信度：{claim_result['confidence']:.2f}", "neutral")
-                                ]),
-                                unsafe_allow_html=True
-                            )
-                            render_detail_card("Claim", claim_result["claim"])
-                            if claim_result.get("evidence"):
-                                render_detail_card("对应证据", " | ".join(claim_result["evidence"]))
-                    else:
-                        if result.get("evidence"):
-                            render_detail_card("命中证据", " | ".join(result["evidence"]))
+            render_paginated_results(
+                result_view,
+                result_index.get_bucket("uncertain"),
+                "error_uncertain",
+                render_uncertain_item
+            )
 
     with analysis_tab3:
-        misclassified = buckets["false_positive"] + buckets["false_negative"]
-        if not misclassified:
+        if not bucket_counts["misclassified"]:
             render_empty_state("当前没有误分类样本", "系统暂时没有出现假阳性或假阴性，可继续扩大样本规模做稳定性验证。")
         else:
-            rows = [
+            def build_misclassified_dataframe():
+                import pandas as pd
+
+                rows = [
+                    {
+                        "id": result["id"],
+                        "expected_label": result["expected_label"],
+                        "predicted_label": result["predicted_label"],
+                        "verdict": result["verdict"],
+                        "reason": result["reason"]
+                    }
+                    for result in result_index.get_results(result_index.get_bucket("misclassified"))
+                ]
+                return pd.DataFrame(rows)
+
+            st.dataframe(
+                get_cached_results_table(result_view, "misclassified", build_misclassified_dataframe),
+                width="stretch",
+                hide_index=True
+            )
+
+
+def set_eval_results(results, metrics, mode: str, dataset_name: str, sampling=None):
+    st.session_state["eval_results"] = results
+    st.session_state["eval_metrics"] = metrics
+    st.session_state["eval_sampling"] = sampling
+    st.session_state["last_eval_mode"] = mode
+    st.session_state["last_eval_dataset_name"] = dataset_name
+    st.session_state["eval_results_version"] += 1
+
+
+def attach_eval_job(job):
+    set_eval_results(
+        get_job_runner().load_results(job["job_id"]),
+        job.get("metrics", {}),
+        job["mode"],
+        job["dataset_name"],
+        job.get("sampling")
+    )
+    st.session_state["attached_eval_job"] = job["job_id"]
+
+
+def format_sampling_summary(sampling) -> str:
+    stop_reasons = {"converged": "区间已收敛", "budget": "达到样本预算", "exhausted": "样本已全部评测"}
+    summary = (
+        f"自适应抽样：已评测 {sampling['samples_used']} / {sampling['total_samples']} 条，"
+        f"{sampling['metric'].upper()} = {sampling['estimate']:.3f} ± {sampling['ci_width'] / 2:.3f}"
+        f"（{sampling['confidence']:.0%} 置信区间 [{sampling['ci_low']:.3f}, {sampling['ci_high']:.3f}]，"
+        f"目标宽度 {sampling['target_ci_width']:.3f}）"
+    )
+    if sampling.get("stopped_reason"):
+        summary += f"，停止原因：{stop_reasons.get(sampling['stopped_reason'], sampling['stopped_reason'])}"
+    return summary
+
+
+def format_cascade_summary(summary) -> str:
+    text = (
+        f"分级判定：{summary['escalated_judgments']} / {summary['judgments']} 次判定"
+        f"（{summary['escalation_rate']:.0%}）升级到强模型，涉及 {summary['escalated_samples']} 条样本；"
+        f"节省强模型 Token {summary['strong_tokens_saved']}"
+    )
+    if summary["latency_saved_ms"] is not None:
+        text += f"，判定耗时约节省 {summary['latency_saved_ms'] / 1000:.1f} 秒"
+    if summary["cost_saved"] is not None:
+        text += f"，费用约节省 {summary['cost_saved']:.4f}"
+    return text
+
+
+def format_numeric_precheck_summary(summary) -> str:
+    text = (
+        f"数值预检：{summary['shortcuts']} / {summary['judgments']} 次判定"
+        f"（{summary['skip_rate']:.0%}）因数值与证据明显不符直接判为幻觉，未调用评测模型"
+    )
+    if summary["shortcut_precision"] is not None:
+        text += (
+            f"；其中有标注的 {summary['labelled_shortcut_samples']} 条样本精确率 "
+            f"{summary['shortcut_precision']:.0%}"
+        )
+    return text
+
+
+def render_eval_job_progress(job_id: str):
+    job = get_job_runner().get_job(job_id)
+    if job is None:
+        return
+
+    st.progress(
+        job["completed"] / job["total"] if job["total"] else 0.0,
+        text=f"{format_job_status(job['status'])}：已完成 {job['completed']} / {job['total']} 条样本"
+    )
+    badges = [
+        semantic_badge(f"任务状态：{format_job_status(job['status'])}", job_status_tone(job["status"])),
+        semantic_badge(f"模式：{'整体判定' if job['mode'] == 'overall' else 'Claim 级核验'}", "primary"),
+        semantic_badge(f"数据集：{job['dataset_name'] or '未命名数据集'}", "neutral")
+    ]
+    if job.get("metrics"):
+        badges.append(semantic_badge(f"当前准确率：{job['metrics'].get('accuracy', 0.0):.2f}", "neutral"))
+    st.markdown("".join(badges), unsafe_allow_html=True)
+    if job.get("sampling"):
+        st.caption(format_sampling_summary(job["sampling"]))
+    if job.get("error"):
+        st.error(f"评测任务出错：{job['error']}")
+
+    if (
+        job["status"] not in EvaluationJobRunner.ACTIVE_STATUSES
+        and st.session_state.get("active_eval_job") == job_id
+    ):
+        st.session_state["active_eval_job"] = ""
+        if job["status"] == EvaluationJobRunner.STATUS_COMPLETED:
+            attach_eval_job(job)
+        st.rerun()
+
+
+def render_eval_job_panel():
+    job_runner = get_job_runner()
+    jobs = job_runner.list_jobs()
+    if not jobs:
+        return
+
+    with st.container(border=True):
+        render_section_intro(
+            "后台评测任务",
+            "评测在后台工作线程中执行，离开页面或浏览器重连都不会中断；可以随时回来查看进度，并加载运行中或已完成任务的结果。"
+        )
+        jobs_by_id = {job["job_id"]: job for job in jobs}
+        job_ids = list(jobs_by_id)
+        preferred_job_id = st.session_state["active_eval_job"] or st.session_state["attached_eval_job"]
+        selected_job_id = st.selectbox(
+            "评测任务",
+            job_ids,
+            index=job_ids.index(preferred_job_id) if preferred_job_id in job_ids else 0,
+            format_func=lambda job_id: (
+                f"{job_id} | {jobs_by_id[job_id]['dataset_name'] or '未命名数据集'} | "
+                f"{format_job_status(jobs_by_id[job_id]['status'])} | "
+                f"{jobs_by_id[job_id]['completed']}/{jobs_by_id[job_id]['total']}"
+            )
+        )
+        selected_job = jobs_by_id[selected_job_id]
+        is_active = selected_job["status"] in EvaluationJobRunner.ACTIVE_STATUSES
+        st.fragment(render_eval_job_progress, run_every=2 if is_active else None)(selected_job_id)
+
+        job_col1, job_col2 = st.columns(2)
+        if job_col1.button("加载任务结果", width="stretch", disabled=selected_job["completed"] == 0):
+            attach_eval_job(job_runner.get_job(selected_job_id))
+            st.rerun()
+        if job_col2.button("取消任务", width="stretch", disabled=not is_active):
+            job_runner.cancel(selected_job_id)
+            st.rerun()
+        if selected_job.get("trace_summary"):
+            render_trace_summary(selected_job)
+
+
+def render_trace_summary(job):
+    import pandas as pd
+    from tracing import dump_trace
+
+    summary = job["trace_summary"]
+    st.markdown("**阶段耗时分解**")
+    st.dataframe(
+        pd.DataFrame([
+            {
+                "阶段": f"{TRACE_STAGE_LABELS.get(row['stage'], row['stage'])}（{row['stage']}）",
+                "次数": row["count"],
+                "自身耗时 (ms)": round(row["self_ms"], 1),
+                "平均耗时 (ms)": round(row["mean_ms"], 1),
+                "P95 (ms)": round(row["p95_ms"], 1),
+                "占比": f"{row['share']:.1%}",
+                "出错次数": row["errors"]
+            }
+            for row in summary
+        ]),
+        width="stretch",
+        hide_index=True
+    )
+    st.caption("自身耗时不含嵌套子阶段，例如检索的自身耗时即 Chroma 查询本身，不含查询向量化。")
+    job_runner = get_job_runner()
+    trace_col1, trace_col2 = st.columns(2)
+    trace_col1.download_button(
+        "下载追踪 JSON",
+        data=lambda: dump_trace(job_runner.load_trace(job["job_id"]), "json"),
+        file_name=f"trace_{job['job_id']}.json",
+        mime="application/json",
+        width="stretch"
+    )
+    trace_col2.download_button(
+        "下载 OTLP 追踪",
+        data=lambda: dump_trace(job_runner.load_trace(job["job_id"]), "otlp"),
+        file_name=f"trace_{job['job_id']}.otlp.json",
+        mime="application/json",
+        width="stretch"
+    )
+
+
+def format_duration(seconds: float) -> str:
+    seconds = int(round(seconds))
+    if seconds < 60:
+        return f"{seconds} 秒"
+    minutes, seconds = divmod(seconds, 60)
+    if minutes < 60:
+        return f"{minutes} 分 {seconds} 秒"
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours} 小时 {minutes} 分"
+
+
+def estimate_eval_run(samples, mode: str, runtime_config, prompts, use_retrieval: bool, input_price: float, output_price: float):
+    from eval_engine.claim_splitter import llm_extraction_share
+    from eval_engine.run_planner import plan_evaluation_run
+
+    claim_extraction = APP_CONFIG_MANAGER.get_claim_extraction_settings()
+    cascade = APP_CONFIG_MANAGER.get_judge_cascade_settings()
+    # Claims per answer, seconds per call and the cascade's escalation rate come from the
+    # latest recorded runs of this mode.
+    statistics = get_run_history().get_call_statistics(mode)
+    rag_engine = None
+    if use_retrieval:
+        rag_engine = ensure_rag_engine(
+            runtime_config["base_url"],
+            runtime_config["chat_model_name"],
+            runtime_config["embedding_model_name"],
+            runtime_config["api_key"],
+            runtime_config["vector_store_directory"],
+            int(runtime_config["retrieval_top_k"])
+        )
+    plan = plan_evaluation_run(
+        samples,
+        mode,
+        prompts,
+        model_name=runtime_config["chat_model_name"],
+        rag_engine=rag_engine,
+        retrieval_top_k=int(runtime_config["retrieval_top_k"]),
+        claims_per_answer=statistics["claims_per_answer"],
+        seconds_per_call=statistics["seconds_per_call"],
+        # A background job evaluates its samples one after another.
+        concurrency=1,
+        # With the cascade on, the entered prices are the strong model's; without them the
+        # configured cascade prices are used for both input and output tokens.
+        input_price_per_1k=input_price or cascade.get("strong_price_per_1k", 0.0),
+        output_price_per_1k=output_price or cascade.get("strong_price_per_1k", 0.0),
+        llm_extraction_share=llm_extraction_share(
+            samples,
+            claim_extraction["strategy"],
+            claim_extraction["hybrid_max_chars"],
+            claim_extraction["hybrid_max_claims"]
+        ),
+        cascade=bool(cascade),
+        escalation_rate=statistics["escalation_rate"],
+        cheap_input_price_per_1k=cascade.get("cheap_price_per_1k", 0.0),
+        cheap_output_price_per_1k=cascade.get("cheap_price_per_1k", 0.0)
+    )
+    plan["history_samples"] = statistics["samples"]
+    plan["escalation_from_history"] = statistics["escalation_rate"] is not None
+    return plan
+
+
+def render_run_plan(plan):
+    render_micro_cards([
+        {"label": "LLM 调用", "value": f"{plan['llm_calls']:,}", "hint": f"{plan['samples']} 条样本，每条约 {plan['calls_per_sample']:.1f} 次。", "tone": "primary"},
+        {"label": "输入 / 输出 Token", "value": f"{plan['input_tokens']:,} / {plan['output_tokens']:,}", "hint": f"平均每次调用输入约 {plan['avg_input_tokens_per_call']:.0f} Token。", "tone": "success"},
+        {"label": "预计耗时", "value": format_duration(plan["estimated_seconds"]), "hint": f"按每次调用 {plan['seconds_per_call']:.2f} 秒、并发 {plan['concurrency']} 估算。", "tone": "warning"},
+        {"label": "预计费用", "value": f"{plan['estimated_cost']:.2f}" if plan["estimated_cost"] is not None else "未设置单价", "hint": "按输入、输出单价（每千 Token）计算。", "tone": "danger"},
+    ])
+    notes = [
+        f"分词：{'tiktoken' if plan['tokenizer'].startswith('tiktoken') else '近似估计（tiktoken 不可用）'}",
+        f"证据长度：{'抽样真实检索' if plan['evidence_source'] == 'retrieval' else '按 Top K 切片长度估计'}，约 {plan['evidence_tokens']:.0f} Token",
+        f"调用耗时与 Claim 数：{'来自最近 ' + str(plan['history_samples']) + ' 条历史结果' if plan['history_samples'] else '暂无历史记录，使用默认值'}"
+    ]
+    if plan["claims_per_answer"] is not None:
+        notes.append(f"每条回答约 {plan['claims_per_answer']:.1f} 个 Claim")
+    if plan.get("llm_extraction_share") is not None and plan["llm_extraction_share"] < 1:
+        notes.append(f"{plan['llm_extraction_share']:.0%} 的回答需调用模型拆解 Claim，其余在本地按规则拆分")
+    if plan.get("cascade"):
+        cascade = plan["cascade"]
+        notes.append(
+            f"分级判定：轻量模型 {cascade['cheap_calls']:,} 次、升级到主模型 {cascade['strong_calls']:,} 次"
+            f"（升级率 {cascade['escalation_rate']:.0%}，"
+            f"{'来自历史结果' if plan.get('escalation_from_history') else '暂无历史记录，使用默认值'}）"
+        )
+        if cascade["cheap_cost"] is not None:
+            notes.append(f"轻量模型费用 {cascade['cheap_cost']:.2f}，主模型费用 {cascade['strong_cost']:.2f}")
+    st.caption("；".join(notes) + "。")
+
+
+def format_history_run(run) -> str:
+    accuracy = run["metrics"].get("accuracy")
+    accuracy_text = f"准确率 {accuracy:.2f}" if isinstance(accuracy, (int, float)) else "无指标"
+    prompt_hash = run["prompt_hashes"].get("combined") or ",".join(run["prompt_hashes"].values())[:20] or "-"
+    return (
+        f"{run['run_id']} | {run['dataset_name'] or '未命名数据集'} | "
+        f"{'整体判定' if run['mode'] == 'overall' else 'Claim 级核验'} | "
+        f"{run['sample_count']} 条 | {accuracy_text} | Prompt {prompt_hash}"
+    )
+
+
+def render_run_history_panel():
+    run_history = get_run_history()
+    runs = run_history.list_runs()
+    if not runs:
+        return
+
+    with st.container(border=True):
+        render_section_intro(
+            "历史评测与对比",
+            "每次完成的评测都会连同配置快照、Prompt 哈希、指标和逐条结果保存到本地，可随时加载历史结果，或按样本编号对比两次评测的判定变化。"
+        )
+        runs_by_id = {run["run_id"]: run for run in runs}
+        run_ids = list(runs_by_id)
+        history_col1, history_col2 = st.columns(2)
+        base_run_id = history_col1.selectbox(
+            "基准评测",
+            run_ids,
+            index=min(1, len(run_ids) - 1),
+            format_func=lambda run_id: format_history_run(runs_by_id[run_id]),
+            key="history_base_run"
+        )
+        target_run_id = history_col2.selectbox(
+            "对比评测",
+            run_ids,
+            index=0,
+            format_func=lambda run_id: format_history_run(runs_by_id[run_id]),
+            key="history_target_run"
+        )
+
+        action_col1, action_col2 = st.columns(2)
+        if action_col1.button("加载对比评测结果", width="stretch"):
+            run = run_history.load_run(target_run_id)
+            set_eval_results(run["results"], run["metrics"], run["mode"], run["dataset_name"])
+            st.session_state["attached_eval_job"] = ""
+            st.rerun()
+        if action_col2.button("删除对比评测记录", width="stretch"):
+            run_history.delete_run(target_run_id)
+            st.rerun()
+
+        if base_run_id == target_run_id:
+            st.caption("选择两次不同的评测即可查看指标变化与判定翻转的样本。")
+            return
+
+        comparison = run_history.compare_runs(base_run_id, target_run_id)
+        deltas = comparison["metric_deltas"]
+        render_micro_cards([
+            {"label": "准确率变化", "value": f"{deltas.get('accuracy', 0.0):+.2f}", "hint": "对比评测减去基准评测。", "tone": "primary"},
+            {"label": "F1 变化", "value": f"{deltas.get('f1', 0.0):+.2f}", "hint": "综合精确率与召回率的变化。", "tone": "primary"},
+            {"label": "判定翻转", "value": str(len(comparison["flipped"])), "hint": f"共同样本 {comparison['shared_samples']} 条。", "tone": "warning"},
+            {"label": "修正 / 退化", "value": f"{comparison['fixed']} / {comparison['regressed']}", "hint": "由错变对 / 由对变错的样本数。", "tone": "success" if comparison["fixed"] >= comparison["regressed"] else "danger"},
+        ])
+        if comparison["same_prompts"]:
+            st.caption(f"两次评测使用相同的 Prompt（指纹 {comparison['base']['prompt_hashes']['combined']}）。")
+        else:
+            changed_prompts = [
+                name
+                for name, fingerprint in comparison["base"]["prompt_hashes"].items()
+                if name != "combined" and comparison["target"]["prompt_hashes"].get(name) != fingerprint
+            ]
+            st.caption(f"两次评测的 Prompt 不同，变化的模板：{', '.join(changed_prompts) or '-'}。")
+        if comparison["only_in_base"] or comparison["only_in_target"]:
+            st.caption(
+                f"仅出现在基准评测中的样本 {len(comparison['only_in_base'])} 条，"
+                f"仅出现在对比评测中的样本 {len(comparison['only_in_target'])} 条，未参与对比。"
+            )
+        if comparison["flipped"]:
+            import pandas as pd
+
+            flipped_df = pd.DataFrame(comparison["flipped"]).rename(columns={
+                "sample_id": "编号",
+                "question": "问题",
+                "expected_label": "真实标签",
+                "base_predicted_label": "基准预测",
+                "target_predicted_label": "对比预测",
+                "base_verdict": "基准判定",
+                "target_verdict": "对比判定",
+                "base_is_correct": "基准是否正确",
+                "target_is_correct": "对比是否正确"
+            })
+            st.dataframe(flipped_df, width="stretch", hide_index=True)
+
+
+def render_retrieval_benchmark_panel(samples, runtime_config, api_key: str):
+    with st.container(border=True):
+        render_section_intro(
+            "检索质量与延迟基准",
+            "用样本的参考证据衡量检索是否找回了正确片段：对不同 Top K 与检索方式计算召回率、MRR 与延迟分位数，并推荐满足目标召回率的最小 Top K，避免盲目调大 Top K 带来更长的 Prompt 与更高的延迟。"
+        )
+        reference_samples = sum(1 for sample in samples if sample.get("reference_docs"))
+        bench_col1, bench_col2, bench_col3 = st.columns(3)
+        top_k_values = bench_col1.multiselect("Top K 取值", [1, 2, 3, 5, 8, 10, 15, 20], default=[1, 3, 5, 10])
+        modes = bench_col2.multiselect(
+            "检索方式",
+            ["similarity", "mmr"],
+            default=["similarity", "mmr"],
+            format_func=lambda mode: "相似度" if mode == "similarity" else "MMR（多样性）"
+        )
+        target_recall = bench_col3.slider("目标召回率", min_value=0.5, max_value=1.0, value=0.8, step=0.05)
+        st.caption(f"当前评测集中有 {reference_samples} 条样本带参考证据；每条问题只向量化一次，再对每组参数执行一次向量检索。")
+        if st.button(
+            "运行检索基准",
+            width="stretch",
+            disabled=not reference_samples or not top_k_values or not modes
+        ):
+            if not api_key:
+                st.error("请先在左侧边栏填写 API Key。")
+            else:
+                from eval_engine.retrieval_benchmark import run_retrieval_benchmark
+
+                progress = st.progress(0.0, text="正在检索...")
+                try:
+                    vector_store = ensure_vector_store(
+                        runtime_config["base_url"],
+                        runtime_config["embedding_model_name"],
+                        api_key,
+                        runtime_config["vector_store_directory"]
+                    )
+                    st.session_state["retrieval_benchmark"] = run_retrieval_benchmark(
+                        samples,
+                        vector_store,
+                        top_k_values=top_k_values,
+                        modes=modes,
+                        target_recall=target_recall,
+                        progress_callback=lambda completed, total: progress.progress(
+                            completed / total, text=f"正在检索：{completed} / {total}"
+                        )
+                    )
+                except Exception as exc:
+                    st.error(f"检索基准运行失败：{exc}")
+                progress.empty()
+
+        report = st.session_state.get("retrieval_benchmark")
+        if report:
+            import pandas as pd
+
+            recommendation = report["recommendation"]
+            if recommendation and recommendation["met_target"]:
+                st.success(
+                    f"推荐 Top K = {recommendation['top_k']}（{'相似度' if recommendation['mode'] == 'similarity' else 'MMR'}）："
+                    f"召回率 {recommendation['recall']:.2f} ≥ 目标 {recommendation['target_recall']:.2f}，"
+                    f"P95 延迟 {recommendation['p95_ms']:.0f} ms；当前配置为 {runtime_config['retrieval_top_k']}。"
+                )
+            elif recommendation:
+                st.warning(
+                    f"所有组合均未达到目标召回率 {recommendation['target_recall']:.2f}，最高召回率为 "
+                    f"{recommendation['recall']:.2f}（Top K = {recommendation['top_k']}），可检查切片大小或参考证据是否已入库。"
+                )
+            st.dataframe(
+                pd.DataFrame([
+                    {
+                        "检索方式": "相似度" if row["mode"] == "similarity" else "MMR",
+                        "Top K": row["top_k"],
+                        "召回率": round(row["recall"], 3),
+                        "命中率": round(row["hit_rate"], 3),
+                        "MRR": round(row["mrr"], 3),
+                        "P50 延迟 (ms)": round(row["p50_ms"], 1),
+                        "P95 延迟 (ms)": round(row["p95_ms"], 1),
+                        "平均证据字数": round(row["avg_context_chars"])
+                    }
+                    for row in report["rows"]
+                ]),
+                width="stretch",
+                hide_index=True
+            )
+            st.caption(
+                f"已评估 {report['evaluated_samples']} 条样本，跳过 {report['skipped_samples']} 条无参考证据的样本；"
+                f"延迟含查询向量化（P95 {report['embed_p95_ms']:.0f} ms）与向量检索。"
+            )
+
+
+def render_http_pool_status():
+    import pandas as pd
+
+    pools = pool_statistics()
+    with st.expander("HTTP 连接池", expanded=False):
+        if not pools:
+            st.caption("尚未发起模型或向量化请求，连接池会在首次调用时创建。")
+            return
+        st.dataframe(
+            pd.DataFrame([
                 {
-                    "id": result["id"],
-                    "expected_label": result["expected_label"],
-                    "predicted_label": result["predicted_label"],
-                    "verdict": result["verdict"],
-                    "reason": result["reason"]
+                    "接口地址": pool["base_url"] or "默认",
+                    "请求数": pool["requests"],
+                    "新建连接": pool["connections_opened"],
+                    "连接复用率": f"{pool['reuse_ratio']:.0%}",
+                    "空闲/打开": f"{pool['idle_connections']}/{pool['open_connections']}",
+                    "峰值并发": pool["peak_in_flight"],
+                    "失败请求": pool["failed_requests"]
                 }
-                for result in misclassified
-            ]
-            localized_misclassified = localize_results_dataframe(pd.DataFrame(rows))
-            st.dataframe(build_semantic_styler(localized_misclassified), width="stretch", hide_index=True)
+                for pool in pools
+            ]),
+            width="stretch",
+            hide_index=True
+        )
+        settings = APP_CONFIG_MANAGER.get_http_pool_settings()
+        st.caption(
+            f"对话、评测与向量化请求共用连接池：最大连接 {settings['max_connections']}，"
+            f"保活连接 {settings['max_keepalive_connections']}，保活 {settings['keepalive_expiry']:.0f} 秒，"
+            f"HTTP/2 {'开启' if settings['http2'] else '关闭'}；可在配置文件的 http_pool 中调整。"
+        )
+
+
+def render_endpoint_router_status():
+    if not APP_CONFIG_MANAGER.get_routing_endpoints():
+        return
+    import pandas as pd
+    from endpoint_router import router_statistics
+
+    settings = APP_CONFIG_MANAGER.get_routing_settings()
+    with st.expander("多端点路由", expanded=False):
+        endpoints = router_statistics()
+        if endpoints:
+            st.dataframe(
+                pd.DataFrame([
+                    {
+                        "端点": endpoint["name"],
+                        "模型": endpoint["model_name"],
+                        "权重": endpoint["weight"],
+                        "请求数": endpoint["requests"],
+                        "失败": endpoint["failures"],
+                        "限流": endpoint["throttled"],
+                        "进行中": endpoint["outstanding"],
+                        "状态": f"摘除中（{endpoint['ejected_for_s']:.0f} 秒）" if endpoint["ejected"] else "正常",
+                        "平均延迟 (ms)": round(endpoint["latency_ms"]) if endpoint["latency_ms"] is not None else None
+                    }
+                    for endpoint in endpoints
+                ]),
+                width="stretch",
+                hide_index=True
+            )
+        else:
+            st.caption("路由已启用，首次问答或评测时创建。")
+        strategy = "最少进行中请求" if settings["strategy"] == "least_outstanding" else "按权重随机"
+        st.caption(
+            f"对话与评测调用按“{strategy}”分配到各端点；连续失败 {settings['failure_threshold']} 次或被限流的端点"
+            f"暂时摘除 {settings['ejection_seconds']:.0f} 秒起。向量化仍使用运行配置中的接口，以保证向量空间一致。"
+        )
 
 
 def main():
     inject_theme()
     prompt_manager = PromptTemplateManager()
-    test_set_manager = TestSetManager()
+    test_set_manager = get_test_set_manager()
+    test_set_manager.sync_json()
     app_config = APP_CONFIG_MANAGER.load_config()
     provider_presets = APP_CONFIG_MANAGER.get_provider_presets(app_config)
 
@@ -973,13 +1898,16 @@ def main():
             config_col1, config_col2 = st.columns(2)
             if config_col1.button("保存配置", type="primary", width="stretch"):
                 saved_config = APP_CONFIG_MANAGER.save_runtime_config(get_runtime_config())
+                st.session_state["_config_version"] = APP_CONFIG_MANAGER.version
                 st.session_state["vector_store"] = None
                 st.session_state["rag_engine"] = None
                 st.session_state["config_status_message"] = "运行配置已保存。"
                 st.session_state["_pending_runtime_config"] = APP_CONFIG_MANAGER.get_runtime_config(saved_config)
                 st.rerun()
             if config_col2.button("重新加载", width="stretch"):
+                APP_CONFIG_MANAGER.check_for_changes()
                 reloaded_config = APP_CONFIG_MANAGER.load_config()
+                st.session_state["_config_version"] = APP_CONFIG_MANAGER.version
                 st.session_state["vector_store"] = None
                 st.session_state["rag_engine"] = None
                 st.session_state["config_status_message"] = "已从配置文件重新加载运行配置。"
@@ -1032,6 +1960,15 @@ def main():
                 value=st.session_state["claim_verification_prompt"],
                 height=220
             )
+            prompt_fingerprints = fingerprint_prompts({
+                name: st.session_state[name]
+                for name in ["overall_prompt", "claim_extraction_prompt", "claim_verification_prompt"]
+            })
+            st.caption(
+                f"Prompt 指纹：{prompt_fingerprints['combined']}（整体判定 {prompt_fingerprints['overall_prompt']} / "
+                f"Claim 拆解 {prompt_fingerprints['claim_extraction_prompt']} / "
+                f"Claim 核验 {prompt_fingerprints['claim_verification_prompt']}），会写入每条评测结果与导出文件。"
+            )
 
             if st.button("保存 Prompt 模板", width="stretch"):
                 saved_name = prompt_manager.save_template(
@@ -1059,15 +1996,16 @@ def main():
                     semantic_badge("需要先上传知识文档", "neutral"),
                     unsafe_allow_html=True
                 )
+            render_http_pool_status()
+            render_endpoint_router_status()
 
             if st.button("重置运行状态", width="stretch"):
                 st.session_state["vector_store"] = None
                 st.session_state["rag_engine"] = None
                 st.session_state["messages"] = []
-                st.session_state["eval_results"] = []
-                st.session_state["eval_metrics"] = {}
-                st.session_state["last_eval_mode"] = "overall"
-                st.session_state["last_eval_dataset_name"] = ""
+                set_eval_results([], {}, "overall", "")
+                st.session_state["active_eval_job"] = ""
+                st.session_state["attached_eval_job"] = ""
                 apply_prompt_template(prompt_manager.get_default_prompts())
                 st.session_state["active_prompt_template"] = PromptTemplateManager.DEFAULT_TEMPLATE_NAME
                 st.rerun()
@@ -1090,21 +2028,19 @@ def main():
         if not api_key:
             render_empty_state("尚未配置 API Key", "请先在左侧边栏完成模型配置，随后即可开始问答与评测。")
         else:
-            rag_engine = ensure_rag_engine(
-                base_url,
-                chat_model_name,
-                embed_model_name,
-                api_key,
-                vector_store_directory,
-                retrieval_top_k
-            )
-
             render_micro_cards([
                 {"label": "模型服务商", "value": format_provider(st.session_state['provider']), "hint": "当前用于生成回答与评测的模型服务入口。", "tone": "primary"},
                 {"label": "对话模型", "value": chat_model_name or "未配置", "hint": "问答与评测主模型名称。", "tone": "primary"},
                 {"label": "检索 Top K", "value": str(retrieval_top_k), "hint": "每次检索召回的候选证据数。", "tone": "warning"},
             ])
 
+            cache_stats = get_answer_cache().get_stats()
+            render_micro_cards([
+                {"label": "答案缓存命中率", "value": f"{cache_stats['hit_rate']:.0%}", "hint": f"命中 {cache_stats['hits']} 次 / 查询 {cache_stats['lookups']} 次，仅在检索证据完全一致时复用答案。", "tone": "success"},
+                {"label": "缓存条目数", "value": str(cache_stats["entries"]), "hint": f"LRU 上限 {get_answer_cache().max_entries} 条，已淘汰 {cache_stats['evictions']} 条。", "tone": "primary"},
+                {"label": "命中来源", "value": f"{cache_stats['memory_hits']} / {cache_stats['disk_hits']}", "hint": "内存命中 / 持久化存储命中。", "tone": "warning"},
+            ])
+
             if not st.session_state["messages"]:
                 render_empty_state(
                     "可以开始提问了",
@@ -1122,11 +2058,23 @@ def main():
                 with st.chat_message("assistant"):
                     with st.spinner("正在生成回答..."):
                         try:
+                            rag_engine = ensure_rag_engine(
+                                base_url,
+                                chat_model_name,
+                                embed_model_name,
+                                api_key,
+                                vector_store_directory,
+                                retrieval_top_k
+                            )
                             response = rag_engine.generate_answer(prompt)
                             answer = response["answer"]
                             sources = response["source_documents"]
 
                             st.markdown(answer)
+                            if response.get("cached"):
+                                st.markdown(semantic_badge("答案缓存命中", "success"), unsafe_allow_html=True)
+                            elif response.get("served_by"):
+                                st.markdown(semantic_badge(f"服务端点：{response['served_by']}", "primary"), unsafe_allow_html=True)
                             with st.expander("参考证据"):
                                 for index, doc in enumerate(sources, start=1):
                                     st.write(f"证据 {index}：{doc[:300]}...")
@@ -1145,8 +2093,8 @@ def main():
         manager = test_set_manager
         dataset = manager.get_dataset()
         samples = manager.get_all_cases()
-        positive_count = len([sample for sample in samples if sample.get("label") == "positive"])
-        negative_count = len([sample for sample in samples if sample.get("label") == "negative"])
+        positive_count = manager.count_cases(label="positive")
+        negative_count = manager.count_cases(label="negative")
 
         if st.session_state["data_status_message"]:
             st.success(st.session_state["data_status_message"])
@@ -1198,12 +2146,10 @@ def main():
                         st.error("向量化需要先提供 API Key。")
                     else:
                         with st.spinner("正在处理文档..."):
-                            temp_path = os.path.join("data", kb_file.name)
                             try:
-                                with open(temp_path, "wb") as file:
-                                    file.write(kb_file.getbuffer())
+                                from knowledge_base.document_loader import DocumentLoader
 
-                                content = DocumentLoader().load_file(temp_path)
+                                content = DocumentLoader().load_stream(kb_file, kb_file.name)
                                 vector_store = ensure_vector_store(
                                     base_url,
                                     embed_model_name,
@@ -1215,24 +2161,22 @@ def main():
                                 st.success(f"已向知识库添加 {len(chunks)} 个文本切片。")
                             except Exception as exc:
                                 st.error(f"文档处理失败：{exc}")
-                            finally:
-                                if os.path.exists(temp_path):
-                                    os.remove(temp_path)
 
             with st.container(border=True):
                 render_section_intro(
                     "导入评测数据集",
-                    "导入结构化 JSON 评测集后，就可以直接切到评测页执行整体判定或 Claim 级核验。"
+                    "导入结构化 JSON 或 JSONL（每行一条样本）评测集后，就可以直接切到评测页执行整体判定或 Claim 级核验。"
                 )
                 dataset_file = st.file_uploader(
-                    "上传评测数据集 JSON",
-                    type=["json"],
+                    "上传评测数据集 JSON / JSONL",
+                    type=["json", "jsonl"],
                     key="dataset_file"
                 )
-                if dataset_file and st.button("导入数据集 JSON", type="primary", width="stretch"):
+                if dataset_file and st.button("导入数据集", type="primary", width="stretch"):
                     try:
-                        manager.import_json_text(dataset_file.getvalue().decode("utf-8"))
-                        st.session_state["data_status_message"] = "评测数据集导入成功。"
+                        with st.spinner("正在逐条校验并写入样本..."):
+                            imported_count = manager.import_stream(dataset_file, dataset_file.name)
+                        st.session_state["data_status_message"] = f"评测数据集导入成功，共 {imported_count} 条样本。"
                         st.rerun()
                     except Exception as exc:
                         st.error(f"评测数据集导入失败：{exc}")
@@ -1308,6 +2252,8 @@ def main():
                 "表格聚合展示当前工作区样本，适合在导入后检查字段是否齐全、标签是否平衡。"
             )
             if samples:
+                import pandas as pd
+
                 df_cases = pd.DataFrame(samples)
                 visible_case_columns = [
                     "id",
@@ -1323,9 +2269,86 @@ def main():
                 visible_case_columns = [column for column in visible_case_columns if column in df_cases.columns]
                 localized_cases = localize_samples_dataframe(df_cases[visible_case_columns])
                 st.dataframe(build_semantic_styler(localized_cases), width="stretch", hide_index=True)
+                st.download_button(
+                    "导出当前数据集 JSON",
+                    data=manager.export_json_text,
+                    file_name="test_set.json",
+                    mime="application/json"
+                )
             else:
                 render_empty_state("当前还没有评测样本", "请先导入 JSON 数据集，或在右侧快速新增样本后再继续评测。")
 
+        if len(samples) > 1:
+            with st.container(border=True):
+                render_section_intro(
+                    "近重复样本检测",
+                    "基于 MinHash / LSH 比较问题与候选回答的字符片段相似度，找出仅做了轻微改写的样本，避免为同一内容重复付费评测；标签不同的样本不会被归为一组。"
+                )
+                dedup_col1, dedup_col2 = st.columns([0.65, 0.35], gap="large")
+                dedup_threshold = dedup_col1.slider(
+                    "相似度阈值",
+                    min_value=0.5,
+                    max_value=1.0,
+                    value=0.8,
+                    step=0.05
+                )
+                if dedup_col2.button("检测近重复样本", width="stretch"):
+                    with st.spinner("正在计算样本签名..."):
+                        st.session_state["near_duplicate_report"] = {
+                            "sample_count": len(samples),
+                            "threshold": dedup_threshold,
+                            "clusters": manager.find_near_duplicates(threshold=dedup_threshold)
+                        }
+
+                report = st.session_state.get("near_duplicate_report")
+                if report and report["sample_count"] == len(samples):
+                    clusters = report["clusters"]
+                    duplicate_count = sum(len(cluster["duplicate_ids"]) for cluster in clusters)
+                    st.markdown(
+                        "".join([
+                            semantic_badge(f"阈值：{report['threshold']:.2f}", "neutral"),
+                            semantic_badge(f"重复组：{len(clusters)} 组", "primary"),
+                            semantic_badge(f"可去除样本：{duplicate_count} 条", "warning" if duplicate_count else "success"),
+                        ]),
+                        unsafe_allow_html=True
+                    )
+                    if clusters:
+                        import pandas as pd
+
+                        st.dataframe(
+                            pd.DataFrame([
+                                {
+                                    "保留样本": cluster["keep_id"],
+                                    "重复样本": ", ".join(str(sample_id) for sample_id in cluster["duplicate_ids"]),
+                                    "组大小": cluster["size"],
+                                    "标签": format_label(cluster["label"]),
+                                    "问题": cluster["question"]
+                                }
+                                for cluster in clusters
+                            ]),
+                            width="stretch",
+                            hide_index=True
+                        )
+                        action_col1, action_col2 = st.columns(2)
+                        action_col1.download_button(
+                            "导出去重后的数据集 JSON",
+                            data=lambda: json.dumps(
+                                manager.build_deduplicated_dataset(clusters),
+                                ensure_ascii=False,
+                                indent=2
+                            ),
+                            file_name="test_set_dedup.json",
+                            mime="application/json",
+                            width="stretch"
+                        )
+                        if action_col2.button("删除重复样本（每组保留首条）", width="stretch"):
+                            removed_count = manager.remove_near_duplicates(clusters)
+                            st.session_state["near_duplicate_report"] = None
+                            st.session_state["data_status_message"] = f"已删除 {removed_count} 条近重复样本。"
+                            st.rerun()
+                    else:
+                        st.caption("未发现近重复样本。")
+
     with tab3:
         render_section_intro(
             "评测面板",
@@ -1382,6 +2405,61 @@ def main():
                     "<p class='block-note'>整体判定更适合快速跑通流程，Claim 级核验更适合展示系统的可解释性与错误定位能力。</p>",
                     unsafe_allow_html=True
                 )
+                adaptive_sampling = st.toggle(
+                    "自适应抽样评测",
+                    help="按标签与来源模型分层抽样，分批评测并计算 F1 的 bootstrap 置信区间，区间宽度达到目标或用完样本预算后提前停止。"
+                )
+                if adaptive_sampling:
+                    sampling_col1, sampling_col2, sampling_col3 = st.columns(3)
+                    target_ci_width = sampling_col1.number_input(
+                        "目标区间宽度", min_value=0.005, max_value=0.5, value=0.04, step=0.005, format="%.3f"
+                    )
+                    max_samples = sampling_col2.number_input(
+                        "样本预算", min_value=1, max_value=max(len(samples), 1), value=max(len(samples), 1), step=1
+                    )
+                    sampling_batch_size = sampling_col3.number_input(
+                        "每批样本数", min_value=1, max_value=500, value=20, step=1
+                    )
+                trace_eval = st.toggle(
+                    "记录阶段耗时追踪",
+                    help="记录检索、向量化、评审模型调用与 JSON 解析等阶段的耗时，任务完成后在后台任务区域显示阶段耗时分解，并可导出 JSON / OTLP 追踪文件。"
+                )
+
+                with st.expander("运行前预估：调用次数、Token 与耗时"):
+                    estimate_col1, estimate_col2 = st.columns(2)
+                    input_price = estimate_col1.number_input(
+                        "输入单价（每千 Token）", min_value=0.0, value=0.0, step=0.001, format="%.4f"
+                    )
+                    output_price = estimate_col2.number_input(
+                        "输出单价（每千 Token）", min_value=0.0, value=0.0, step=0.001, format="%.4f"
+                    )
+                    use_retrieval = st.checkbox(
+                        "抽样真实检索估计证据长度",
+                        help="对前 20 条问题执行真实检索，需要 API Key 与已初始化的向量库；不勾选时按 Top K 切片长度估计。"
+                    )
+                    if st.button("预估本次评测", width="stretch", disabled=not samples):
+                        try:
+                            with st.spinner("正在统计 Token..."):
+                                st.session_state["run_plan"] = estimate_eval_run(
+                                    samples[:int(max_samples)] if adaptive_sampling else samples,
+                                    eval_mode,
+                                    runtime_config,
+                                    {
+                                        "overall_prompt": st.session_state["overall_prompt"],
+                                        "claim_extraction_prompt": st.session_state["claim_extraction_prompt"],
+                                        "claim_verification_prompt": st.session_state["claim_verification_prompt"]
+                                    },
+                                    use_retrieval and bool(api_key),
+                                    input_price,
+                                    output_price
+                                )
+                        except Exception as exc:
+                            st.error(f"预估失败：{exc}")
+                    run_plan = st.session_state.get("run_plan")
+                    if run_plan and run_plan["mode"] == eval_mode:
+                        render_run_plan(run_plan)
+                        if adaptive_sampling:
+                            st.caption("已开启自适应抽样：以上为样本预算内的上限，区间收敛后实际调用会更少。")
             with run_col2:
                 run_eval = st.button("运行评测", type="primary", width="stretch")
 
@@ -1391,36 +2469,28 @@ def main():
             elif not samples:
                 st.warning("当前没有可评测的样本。")
             else:
-                try:
-                    rag_engine = ensure_rag_engine(
-                        base_url,
-                        chat_model_name,
-                        embed_model_name,
-                        api_key,
-                        vector_store_directory,
-                        retrieval_top_k
-                    )
-                    evaluator = HallucinationEvaluator(
-                        model_name=chat_model_name or None,
-                        base_url=base_url or None,
-                        timeout=120,
-                        api_key=api_key,
-                        retrieval_top_k=retrieval_top_k,
-                        overall_prompt=st.session_state["overall_prompt"],
-                        claim_extraction_prompt=st.session_state["claim_extraction_prompt"],
-                        claim_verification_prompt=st.session_state["claim_verification_prompt"]
-                    )
-
-                    with st.spinner(f"正在评测 {len(samples)} 条样本..."):
-                        results = evaluator.run_batch_eval(dataset, rag_engine, mode=eval_mode)
-                        metrics = evaluator.calculate_classification_metrics(results)
+                job_id = get_job_runner().submit(
+                    dataset,
+                    eval_mode,
+                    {
+                        "overall_prompt": st.session_state["overall_prompt"],
+                        "claim_extraction_prompt": st.session_state["claim_extraction_prompt"],
+                        "claim_verification_prompt": st.session_state["claim_verification_prompt"]
+                    },
+                    runtime_config,
+                    sampling={
+                        "target_ci_width": target_ci_width,
+                        "max_samples": int(max_samples),
+                        "batch_size": int(sampling_batch_size)
+                    } if adaptive_sampling else None,
+                    trace=trace_eval
+                )
+                st.session_state["active_eval_job"] = job_id
+                st.success(f"评测任务已提交：{job_id}，将在后台执行。")
 
-                    st.session_state["eval_results"] = results
-                    st.session_state["eval_metrics"] = metrics
-                    st.session_state["last_eval_mode"] = eval_mode
-                    st.session_state["last_eval_dataset_name"] = dataset.get("dataset_name", "")
-                except Exception as exc:
-                    st.error(f"评测失败：{exc}")
+        render_eval_job_panel()
+        render_run_history_panel()
+        render_retrieval_benchmark_panel(samples, runtime_config, api_key)
 
         if st.session_state["eval_results"]:
             with st.container(border=True):
@@ -1429,31 +2499,47 @@ def main():
             with st.container(border=True):
                 render_section_intro(
                     "结果导出",
-                    "支持将当前批次评测结果导出为 JSON 或 CSV，便于论文留档、二次分析或展示汇报。"
+                    "支持将当前批次评测结果导出为 JSON、CSV 或 Parquet，便于论文留档、二次分析或展示汇报；大批量结果建议使用 Parquet。"
                 )
-                export_col1, export_col2 = st.columns(2)
-                json_payload = export_results_as_json(
-                    st.session_state["eval_results"],
-                    st.session_state["eval_metrics"],
-                    st.session_state["last_eval_mode"],
-                    st.session_state["last_eval_dataset_name"],
-                    runtime_config
-                )
-                csv_payload = export_results_as_csv(st.session_state["eval_results"])
+                # Payloads are only serialized when a download button is clicked, then cached
+                # for the current result set, so ordinary reruns never re-encode the results.
+                result_view = get_result_view(st.session_state["eval_results"])
+                export_metrics = st.session_state["eval_metrics"]
+                export_mode = st.session_state["last_eval_mode"]
+                export_dataset_name = st.session_state["last_eval_dataset_name"]
+                export_config = dict(runtime_config)
+                parquet_available = importlib.util.find_spec("pyarrow") is not None
+                export_col1, export_col2, export_col3 = st.columns(3)
                 export_col1.download_button(
                     "下载评测结果 JSON",
-                    data=json_payload,
+                    data=lambda: export_results_as_json(
+                        result_view,
+                        export_metrics,
+                        export_mode,
+                        export_dataset_name,
+                        export_config
+                    ),
                     file_name="evaluation_results.json",
                     mime="application/json",
                     width="stretch"
                 )
                 export_col2.download_button(
                     "下载评测结果 CSV",
-                    data=csv_payload,
+                    data=lambda: export_results_as_csv(result_view),
                     file_name="evaluation_results.csv",
                     mime="text/csv",
                     width="stretch"
                 )
+                export_col3.download_button(
+                    "下载评测结果 Parquet",
+                    data=lambda: export_results_as_parquet(result_view),
+                    file_name="evaluation_results.parquet",
+                    mime="application/vnd.apache.parquet",
+                    width="stretch",
+                    disabled=not parquet_available
+                )
+                if not parquet_available:
+                    st.caption("Parquet 导出需要安装 pyarrow。")
 
             with st.container(border=True):
                 render_eval_results(st.session_state["eval_results"], st.session_state["last_eval_mode"])
@@ -0,0 +1,134 @@
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from unittest.mock import MagicMock
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "src"))
+
+from eval_engine.adaptive_eval import AdaptiveEvaluationPlan, StratifiedSampler, bootstrap_metric_interval
+from eval_engine.hallucination_evaluator import HallucinationEvaluator
+from eval_engine.job_runner import EvaluationJobRunner
+
+
+def build_samples(count):
+    return [
+        {
+            "id": index,
+            "question": f"Question {index}",
+            "candidate_answer": f"Answer {index}",
+            "label": "positive" if index % 3 == 0 else "negative",
+            "source_model": "model_a" if index % 2 == 0 else "model_b"
+        }
+        for index in range(1, count + 1)
+    ]
+
+
+def simulate_result(sample, rng):
+    # A judge that is right about 90% of the time.
+    correct = rng.random() < 0.9
+    flipped = "negative" if sample["label"] == "positive" else "positive"
+    return {
+        "id": sample["id"],
+        "expected_label": sample["label"],
+        "predicted_label": sample["label"] if correct else flipped,
+        "is_correct": correct
+    }
+
+
+def test_adaptive_eval():
+    print("Testing adaptive sequential evaluation...")
+
+    samples = build_samples(3000)
+
+    # 1. Stratified batches keep the label / source model mix of the dataset.
+    batch = StratifiedSampler(samples, seed=7).next_batch(60)
+    positives = sum(1 for sample in batch if sample["label"] == "positive")
+    model_a = sum(1 for sample in batch if sample["source_model"] == "model_a")
+    if len(batch) == 60 and positives == 20 and model_a == 30 and len({sample["id"] for sample in batch}) == 60:
+        print("SUCCESS: Stratified batches follow the dataset mix without repeats.")
+    else:
+        print(f"FAILURE: Unexpected batch mix ({positives} positive, {model_a} model_a).")
+
+    # 2. The bootstrap interval narrows as more results are recorded.
+    rng = random.Random(1)
+    results = [simulate_result(sample, rng) for sample in samples]
+    narrow = bootstrap_metric_interval(results, seed=1)
+    wide = bootstrap_metric_interval(results[:100], seed=1)
+    if narrow[1] - narrow[0] < wide[1] - wide[0] and narrow[0] <= HallucinationEvaluator.calculate_classification_metrics(results)["f1"] <= narrow[1]:
+        print("SUCCESS: Bootstrap interval contains the F1 and narrows with more samples.")
+    else:
+        print(f"FAILURE: Unexpected intervals {narrow} / {wide}.")
+
+    # 3. The plan stops early once the interval reaches the target width.
+    started = time.time()
+    plan = AdaptiveEvaluationPlan(samples, target_ci_width=0.08, batch_size=50, seed=3)
+    rng = random.Random(2)
+    for sample in plan.iter_samples():
+        plan.record(simulate_result(sample, rng))
+    summary = plan.summary()
+    print(
+        f"Converged after {summary['samples_used']} / {summary['total_samples']} samples, "
+        f"F1 {summary['estimate']:.3f} [{summary['ci_low']:.3f}, {summary['ci_high']:.3f}] "
+        f"in {time.time() - started:.3f}s"
+    )
+    if summary["stopped_reason"] == "converged" and summary["samples_used"] < len(samples) and summary["ci_width"] <= 0.08:
+        print("SUCCESS: Adaptive plan stops once the interval converges.")
+    else:
+        print("FAILURE: Adaptive plan did not converge early.")
+
+    # 4. The sample budget caps an interval that cannot converge.
+    plan = AdaptiveEvaluationPlan(samples, target_ci_width=0.001, max_samples=120, batch_size=50, seed=3)
+    for sample in plan.iter_samples():
+        plan.record(simulate_result(sample, rng))
+    if plan.summary()["stopped_reason"] == "budget" and plan.summary()["samples_used"] == 120:
+        print("SUCCESS: Adaptive plan respects the sample budget.")
+    else:
+        print(f"FAILURE: Budget stop mismatch: {plan.summary()['stopped_reason']}.")
+
+    # 5. A judge that is perfect so far does not collapse the interval to a single point.
+    plan = AdaptiveEvaluationPlan(samples, target_ci_width=0.04, batch_size=20, seed=3)
+    for sample in plan.iter_samples():
+        plan.record({"expected_label": sample["label"], "predicted_label": sample["label"]})
+    summary = plan.summary()
+    print(f"All-correct run stopped after {summary['samples_used']} samples, CI width {summary['ci_width']:.3f}")
+    if summary["samples_used"] >= 100 and 0 < summary["ci_width"] <= 0.04 and summary["ci_low"] < 1.0:
+        print("SUCCESS: An all-correct run keeps a non-degenerate interval before converging.")
+    else:
+        print("FAILURE: All-correct run converged on a degenerate interval.")
+
+    # 6. Background jobs run adaptively when sampling options are passed.
+    evaluator = MagicMock()
+    evaluator.evaluate_sample.side_effect = lambda sample, rag_engine, mode: simulate_result(sample, rng)
+    evaluator.calculate_classification_metrics.side_effect = HallucinationEvaluator.calculate_classification_metrics
+    temp_dir = tempfile.mkdtemp(prefix="adaptive_jobs_", dir="data")
+    try:
+        runner = EvaluationJobRunner(lambda config, prompts: (evaluator, MagicMock()), job_dir=temp_dir)
+        job_id = runner.submit(
+            {"dataset_name": "adaptive_demo", "samples": samples},
+            "overall",
+            {},
+            {},
+            sampling={"target_ci_width": 0.08, "batch_size": 50, "seed": 3}
+        )
+        deadline = time.time() + 10
+        while runner.get_job(job_id)["status"] in EvaluationJobRunner.ACTIVE_STATUSES and time.time() < deadline:
+            time.sleep(0.05)
+        job = runner.get_job(job_id)
+        if (
+            job["status"] == "completed"
+            and job["sampling"]["stopped_reason"] == "converged"
+            and job["completed"] == job["sampling"]["samples_used"] < len(samples)
+            and len(runner.load_results(job_id)) == job["completed"]
+        ):
+            print("SUCCESS: Background job stops early with a sampling summary.")
+        else:
+            print(f"FAILURE: Adaptive job mismatch: {job}.")
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    test_adaptive_eval()
@@ -0,0 +1,95 @@
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+from unittest.mock import MagicMock, patch
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "src"))
+
+from langchain_core.documents import Document
+from langchain_core.language_models import FakeListChatModel
+from rag_engine.answer_cache import AnswerCache
+from rag_engine.financial_rag import FinancialRAG
+
+
+def test_answer_cache():
+    print("Testing answer cache...")
+
+    temp_dir = tempfile.mkdtemp(prefix="answer_cache_", dir="data")
+    db_path = os.path.join(temp_dir, "answer_cache.sqlite3")
+    try:
+        cache = AnswerCache(db_path, max_entries=2, memory_entries=1)
+        docs = [Document(page_content="Apple Inc. reported Q3 revenue of $81.4 billion.")]
+        key = cache.build_key("What was Apple's Q3 revenue?", docs, "prompt", "model-a")
+        same_key = cache.build_key("  what was apple's Q3 revenue？ ", docs, "prompt", "model-a")
+        changed_evidence_key = cache.build_key(
+            "What was Apple's Q3 revenue?",
+            [Document(page_content="Apple Inc. reported Q3 revenue of $91.4 billion.")],
+            "prompt",
+            "model-a"
+        )
+        changed_model_key = cache.build_key("What was Apple's Q3 revenue?", docs, "prompt", "model-b")
+
+        if key == same_key and key != changed_evidence_key and key != changed_model_key:
+            print("SUCCESS: Cache key tracks query, evidence and model.")
+        else:
+            print("FAILURE: Cache key composition mismatch.")
+
+        cache.put(key, "q1", "model-a", "answer 1", ["doc 1"])
+        cache.put("key-2", "q2", "model-a", "answer 2", ["doc 2"])
+        cache.get(key)
+        cache.put("key-3", "q3", "model-a", "answer 3", ["doc 3"])
+        stats = cache.get_stats()
+        print("Cache stats:", stats)
+        if cache.get("key-2") is None and cache.get(key) is not None and stats["evictions"] == 1:
+            print("SUCCESS: LRU eviction drops the least recently used entry.")
+        else:
+            print("FAILURE: LRU eviction mismatch.")
+
+        reopened = AnswerCache(db_path, max_entries=2)
+        cached = reopened.get("key-3")
+        if cached and cached["answer"] == "answer 3" and reopened.get_stats()["disk_hits"] == 1:
+            print("SUCCESS: Cached answers persist across instances.")
+        else:
+            print("FAILURE: Cache persistence mismatch.")
+
+        def stored_access_time():
+            with sqlite3.connect(db_path) as connection:
+                return connection.execute(
+                    "SELECT last_accessed FROM answers WHERE cache_key = ?", ("key-3",)
+                ).fetchone()[0]
+
+        before = stored_access_time()
+        for _ in range(5):
+            reopened.get("key-3")
+        unflushed = stored_access_time()
+        reopened.flush()
+        if unflushed == before and stored_access_time() > before:
+            print("SUCCESS: Cache hits batch their access-time writes until a flush.")
+        else:
+            print("FAILURE: Cache hits wrote access times eagerly or never.")
+
+        mock_vector_store = MagicMock()
+        mock_retriever = MagicMock()
+        mock_retriever.invoke.return_value = docs
+        mock_vector_store.as_retriever.return_value = mock_retriever
+        with patch("rag_engine.financial_rag.ChatOpenAI") as MockChatOpenAI:
+            MockChatOpenAI.return_value = FakeListChatModel(responses=["$81.4 billion", "unexpected"])
+            rag = FinancialRAG(mock_vector_store, model_name="model-a", answer_cache=reopened)
+            first = rag.generate_answer("What was Apple's Q3 revenue?")
+            second = rag.generate_answer("what was Apple's Q3 revenue?")
+
+        print("Responses:", first, second)
+        if not first["cached"] and second["cached"] and second["answer"] == "$81.4 billion":
+            print("SUCCESS: FinancialRAG reuses answers for identical evidence.")
+        else:
+            print("FAILURE: FinancialRAG answer cache integration mismatch.")
+        for item in [cache, reopened]:
+            item.close()
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    test_answer_cache()
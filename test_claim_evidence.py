@@ -0,0 +1,185 @@
+import os
+import shutil
+import sys
+import tempfile
+
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "src"))
+
+from config_manager import AppConfigManager
+from eval_engine.claim_evidence import rank_pool, retrieve_claim_evidence, summarize_evidence_pool
+from eval_engine.hallucination_evaluator import HallucinationEvaluator
+from knowledge_base.vector_store_manager import VectorStoreManager
+
+TOPICS = ["M2", "CPI", "GDP", "PMI"]
+
+
+class TopicEmbeddings(Embeddings):
+    """One axis per topic keyword, so similarities are known in advance."""
+
+    def __init__(self):
+        self.document_batches = 0
+        self.queries = 0
+
+    def _embed(self, text):
+        return [float(text.count(topic)) for topic in TOPICS] + [0.1]
+
+    def embed_documents(self, texts):
+        self.document_batches += 1
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text):
+        self.queries += 1
+        return self._embed(text)
+
+
+class CountingStore(VectorStoreManager):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.searches = 0
+
+    def similarity_search(self, query, top_k=3):
+        self.searches += 1
+        return super().similarity_search(query, top_k)
+
+    def search_with_embeddings(self, query, top_k=20):
+        self.searches += 1
+        return super().search_with_embeddings(query, top_k)
+
+    def search_by_vector(self, embedding, top_k=3, search_type="similarity", fetch_k=None):
+        self.searches += 1
+        return super().search_by_vector(embedding, top_k, search_type, fetch_k)
+
+
+class PoolOnlyEngine:
+    def __init__(self, vector_store):
+        self.vector_store = vector_store
+
+
+def test_claim_evidence():
+    print("Testing shared-pool claim evidence...")
+
+    # 1. Each claim keeps its nearest pool chunks; uncovered claims are flagged for a search.
+    ranked = rank_pool(
+        [[1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [0.0, 0.0, 1.0]],
+        [[0.9, 0.1, 0.0], [0.2, 0.8, 0.0], [1.0, 0.0, 0.0]],
+        top_k=2,
+        min_similarity=0.5
+    )
+    print("Ranked:", ranked)
+    if ranked == [[2, 0], [1, 0], None] and rank_pool([[1.0]], [], 3) == [None]:
+        print("SUCCESS: Pool chunks are ranked per claim with a similarity floor.")
+    else:
+        print("FAILURE: Unexpected pool ranking.")
+
+    temp_dir = tempfile.mkdtemp(prefix="claim_evidence_", dir="data")
+    try:
+        embeddings = TopicEmbeddings()
+        store = CountingStore(os.path.join(temp_dir, "chroma"), embedding_model=embeddings)
+        store.add_documents([
+            Document(page_content="M2余额为313.53万亿元。"),
+            Document(page_content="CPI同比上涨0.2%。"),
+            Document(page_content="PMI为50.1。"),
+            Document(page_content="GDP增长5%。")
+        ])
+
+        # 2. One pool search plus one claim batch; the GDP claim is outside the pool and searches alone.
+        embeddings.queries = embeddings.document_batches = store.searches = 0
+        claims = ["M2余额为313.53万亿元", "CPI同比上涨0.2%", "GDP增长5%"]
+        evidence, stats = retrieve_claim_evidence(
+            store,
+            "宏观数据如何？",
+            "M2余额为313.53万亿元，CPI同比上涨0.2%。",
+            claims,
+            top_k=1,
+            pool_size=2,
+            min_similarity=0.5
+        )
+        contents = [[doc.page_content for doc in docs] for docs in evidence]
+        print("Evidence:", contents, "Stats:", stats)
+        if (
+            contents[0] == ["M2余额为313.53万亿元。"]
+            and contents[1] == ["CPI同比上涨0.2%。"]
+            and contents[2] == ["GDP增长5%。"]
+            and stats["sources"] == ["pool", "pool", "search"]
+            and stats["fallbacks"] == 1
+            and store.searches == 2
+            and embeddings.queries == 1
+            and embeddings.document_batches == 1
+        ):
+            print("SUCCESS: Claims share one retrieval and only uncovered claims search again.")
+        else:
+            print("FAILURE: Shared-pool evidence mismatch.")
+
+        # 3. The evaluator judges each claim on its pooled evidence and reports the savings.
+        contexts = []
+
+        def fake_invoke_json(prompt, variables, fallback):
+            contexts.append(variables["context"])
+            return {"verdict": "supported", "confidence": 0.9}
+
+        evaluator = HallucinationEvaluator(
+            api_key="test",
+            model_name="gpt-4o-mini",
+            retrieval_top_k=1,
+            claim_extraction_strategy="rule",
+            claim_evidence_strategy="shared_pool",
+            evidence_pool_size=2,
+            evidence_min_similarity=0.5
+        )
+        evaluator._invoke_json = fake_invoke_json
+        store.searches = 0
+        sample = {
+            "id": 1,
+            "question": "宏观数据如何？",
+            "candidate_answer": "M2余额为313.53万亿元，CPI同比上涨0.2%。",
+            "label": "negative"
+        }
+        result = evaluator.evaluate_sample(sample, PoolOnlyEngine(store), mode="claim")
+        summary = summarize_evidence_pool([result])
+        print("Sources:", [item["evidence_source"] for item in result["claim_results"]], "Summary:", summary)
+        if (
+            result["evidence_strategy"] == "shared_pool"
+            and contexts == ["M2余额为313.53万亿元。", "CPI同比上涨0.2%。"]
+            and store.searches == 1
+            and summary["per_claim_searches"] == 2
+            and summary["pool_searches"] == 1
+            and summary["fallback_rate"] == 0.0
+        ):
+            print("SUCCESS: The evaluator reuses one pool for all claims of a sample.")
+        else:
+            print("FAILURE: Evaluator shared-pool mismatch.")
+
+        # 4. Per-claim retrieval stays the default, and engines without a pool interface keep using it.
+        contexts.clear()
+        store.searches = 0
+        default = HallucinationEvaluator(api_key="test", model_name="gpt-4o-mini", retrieval_top_k=1, claim_extraction_strategy="rule")
+        default._invoke_json = fake_invoke_json
+        per_claim = default.evaluate_sample(sample, PoolOnlyEngine(store), mode="claim")
+        if per_claim["evidence_strategy"] == "per_claim" and "evidence_pool" not in per_claim and store.searches == 2:
+            print("SUCCESS: Per-claim retrieval is unchanged by default.")
+        else:
+            print("FAILURE: Default retrieval changed.")
+
+        try:
+            HallucinationEvaluator(api_key="test", model_name="gpt-4o-mini", claim_evidence_strategy="bm25")
+            print("FAILURE: An unknown evidence strategy was accepted.")
+        except ValueError:
+            print("SUCCESS: Unknown claim evidence strategies are rejected.")
+
+        # 5. The strategy and pool parameters are part of the app config.
+        config_manager = AppConfigManager(os.path.join(temp_dir, "app_config.json"))
+        config_manager.save_config({"claim_evidence": {"strategy": "shared_pool", "pool_size": "0", "min_similarity": 3}})
+        settings = config_manager.get_claim_evidence_settings()
+        if settings == {"strategy": "shared_pool", "pool_size": 1, "min_similarity": 1.0}:
+            print("SUCCESS: Claim evidence settings are normalized from the config.")
+        else:
+            print("FAILURE: Claim evidence settings mismatch:", settings)
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    test_claim_evidence()
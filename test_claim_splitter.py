@@ -0,0 +1,147 @@
+import os
+import shutil
+import sys
+import tempfile
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "src"))
+
+from config_manager import AppConfigManager
+from eval_engine.claim_splitter import (
+    llm_extraction_share,
+    needs_llm_extraction,
+    run_claim_split_benchmark,
+    split_claims
+)
+from eval_engine.hallucination_evaluator import HallucinationEvaluator
+
+
+class StaticRetriever:
+    def retrieve_context(self, query):
+        return ["2024年末M2余额为313.53万亿元，同比增长7.3%。"]
+
+
+def test_claim_splitter():
+    print("Testing rule-based claim splitting...")
+
+    # 1. Sentences and separate numeric facts become separate claims; periods and
+    #    number-free clauses stay attached, and predicates inherit the subject.
+    cases = {
+        "2024年末M2余额为313.53万亿元，同比增长7.3%。上证指数全年上涨12.7%。": [
+            "2024年末M2余额为313.53万亿元",
+            "2024年末M2余额同比增长7.3%",
+            "上证指数全年上涨12.7%"
+        ],
+        "2024年，GDP增长5%。": ["2024年，GDP增长5%"],
+        "营收增长10%，净利润下降5%，毛利率提升至30%。": ["营收增长10%", "净利润下降5%", "毛利率提升至30%"],
+        "Revenue rose 10% to $5.2 billion, and net income fell 3%. The board approved a dividend.": [
+            "Revenue rose 10% to $5.2 billion",
+            "net income fell 3%",
+            "The board approved a dividend"
+        ],
+        "Revenue and profit grew 5%.": ["Revenue and profit grew 5%"],
+        "": []
+    }
+    mismatches = {text: split_claims(text) for text, expected in cases.items() if split_claims(text) != expected}
+    if not mismatches:
+        print("SUCCESS: Claims are split by sentence and numeric fact.")
+    else:
+        print("FAILURE: Unexpected claim splits:", mismatches)
+
+    # 2. Hybrid mode keeps short, plain answers local and sends the rest to the LLM.
+    short = "营收增长10%，净利润下降5%。"
+    conditional = "如果利率上升，债券价格会下跌。"
+    decisions = [
+        needs_llm_extraction(short, split_claims(short)),
+        needs_llm_extraction(conditional, split_claims(conditional)),
+        needs_llm_extraction("营收增长10%。" * 40, split_claims("营收增长10%。" * 40)),
+        needs_llm_extraction(short, split_claims(short), max_claims=1)
+    ]
+    if decisions == [False, True, True, True]:
+        print("SUCCESS: Hybrid mode only escalates long, complex or over-split answers.")
+    else:
+        print("FAILURE: Unexpected hybrid decisions:", decisions)
+
+    # 3. The evaluator skips the extraction call for rule and simple hybrid answers.
+    calls = []
+
+    def fake_invoke_json(prompt, variables, fallback):
+        calls.append("claims" if "claim" not in variables else "verify")
+        if "claim" not in variables:
+            return {"claims": ["LLM claim"]}
+        return {"verdict": "supported", "confidence": 0.9}
+
+    sample = {"id": 1, "question": "M2情况？", "candidate_answer": short, "label": "negative"}
+    complex_sample = {"id": 2, "question": "债券？", "candidate_answer": conditional, "label": "negative"}
+    results = {}
+    for strategy in ["llm", "rule", "hybrid"]:
+        evaluator = HallucinationEvaluator(api_key="test", model_name="gpt-4o-mini", claim_extraction_strategy=strategy)
+        evaluator._invoke_json = fake_invoke_json
+        calls.clear()
+        simple = evaluator.evaluate_sample(sample, StaticRetriever(), mode="claim")
+        hard = evaluator.evaluate_sample(complex_sample, StaticRetriever(), mode="claim")
+        results[strategy] = (simple["claim_extractor"], simple["llm_calls"], hard["claim_extractor"], calls.count("claims"))
+    print("Extractor per strategy:", results)
+    if (
+        results["llm"] == ("llm", 2, "llm", 2)
+        and results["rule"] == ("rule", 2, "rule", 0)
+        and results["hybrid"] == ("rule", 2, "llm", 1)
+    ):
+        print("SUCCESS: Rule and hybrid strategies bypass the LLM extraction call.")
+    else:
+        print("FAILURE: Claim extraction strategies did not route as expected.")
+
+    try:
+        HallucinationEvaluator(api_key="test", model_name="gpt-4o-mini", claim_extraction_strategy="regex")
+        print("FAILURE: An unknown strategy was accepted.")
+    except ValueError:
+        print("SUCCESS: Unknown claim extraction strategies are rejected.")
+
+    # 4. The benchmark scores rule claims against LLM claims and the planner counts fewer calls.
+    llm_claims = {
+        short: ["营收增长10%", "净利润下降5%"],
+        conditional: ["利率上升时债券价格会下跌"]
+    }
+    report = run_claim_split_benchmark(
+        [sample, complex_sample],
+        lambda question, answer: llm_claims[answer]
+    )
+    print("Benchmark:", report["rule"], "Hybrid share:", report["hybrid_local_share"])
+    plan = HallucinationEvaluator(api_key="test", model_name="gpt-4o-mini", claim_extraction_strategy="hybrid").plan_run(
+        [sample, complex_sample],
+        mode="claim",
+        claims_per_answer=2
+    )
+    if (
+        report["rule"]["rule_claims"] == 3
+        and report["rule"]["llm_claims"] == 3
+        and report["hybrid_local"]["precision"] == 1.0
+        and report["hybrid_local"]["recall"] == 1.0
+        and report["hybrid_local_share"] == 0.5
+        and llm_extraction_share([sample, complex_sample], "hybrid") == 0.5
+        and plan["llm_calls"] == 5
+    ):
+        print("SUCCESS: Agreement benchmark and planner reflect local claim splitting.")
+    else:
+        print("FAILURE: Benchmark or planner mismatch:", report["rule"], plan["llm_calls"])
+
+    # 5. The strategy and hybrid limits are part of the app config.
+    temp_dir = tempfile.mkdtemp(prefix="claim_splitter_", dir="data")
+    try:
+        config_manager = AppConfigManager(os.path.join(temp_dir, "app_config.json"))
+        config_manager.save_config({"claim_extraction": {"strategy": "hybrid", "hybrid_max_chars": "120", "hybrid_max_claims": 0}})
+        settings = config_manager.get_claim_extraction_settings()
+        config_manager.save_config({"claim_extraction": {"strategy": "spacy"}})
+        fallback = config_manager.get_claim_extraction_settings()
+        if (
+            settings == {"strategy": "hybrid", "hybrid_max_chars": 120, "hybrid_max_claims": 1}
+            and fallback["strategy"] == "llm"
+        ):
+            print("SUCCESS: Claim extraction settings are normalized from the config.")
+        else:
+            print("FAILURE: Claim extraction settings mismatch:", settings, fallback)
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    test_claim_splitter()
@@ -0,0 +1,125 @@
+import json
+import os
+import shutil
+import sys
+import tempfile
+from unittest.mock import MagicMock, patch
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "src"))
+
+import cli
+from eval_engine.hallucination_evaluator import HallucinationEvaluator
+from eval_engine.run_history import RunHistoryStore
+
+
+def exit_without_reporting(shard_index, *args):
+    """Shard worker stand-in that dies like an OOM-killed process, posting nothing."""
+    os._exit(3)
+
+
+def test_cli():
+    print("Testing headless CLI...")
+
+    samples = [{"id": index, "question": f"Q{index}"} for index in range(1, 8)]
+    shards = cli.shard_samples(samples, 3)
+    print("Shard sizes:", [len(shard) for shard in shards])
+    if [len(shard) for shard in shards] == [3, 3, 1] and shards[2][0] == (6, samples[6]):
+        print("SUCCESS: Samples are sharded with their original positions.")
+    else:
+        print("FAILURE: Sharding mismatch.")
+
+    temp_dir = tempfile.mkdtemp(prefix="cli_", dir="data")
+    try:
+        shard_paths = []
+        for index, shard in enumerate(reversed(shards)):
+            shard_path = os.path.join(temp_dir, f"results.shard-{index}.jsonl")
+            with open(shard_path, "w", encoding="utf-8") as file:
+                for position, sample in shard:
+                    file.write(json.dumps({"position": position, "result": {"id": sample["id"]}}) + "\n")
+            shard_paths.append(shard_path)
+        merged = cli.merge_shard_results(shard_paths)
+        if [result["id"] for result in merged] == list(range(1, 8)):
+            print("SUCCESS: Shard outputs merge back into dataset order.")
+        else:
+            print("FAILURE: Shard merge mismatch.")
+
+        config_path = os.path.join(temp_dir, "app_config.json")
+        with open(config_path, "w", encoding="utf-8") as file:
+            json.dump({"runtime": {"api_key": "secret-key", "chat_model_name": "judge"}}, file)
+        dataset_path = os.path.join(temp_dir, "dataset.json")
+        with open(dataset_path, "w", encoding="utf-8") as file:
+            json.dump(
+                {
+                    "dataset_name": "cli_demo",
+                    "samples": [
+                        {"id": 1, "question": "Q1", "candidate_answer": "A1", "label": "positive"},
+                        {"id": 2, "question": "Q2", "candidate_answer": "A2", "label": "negative"}
+                    ]
+                },
+                file
+            )
+
+        with patch("eval_engine.hallucination_evaluator.ChatOpenAI"):
+            evaluator = HallucinationEvaluator()
+        evaluator._invoke_json = MagicMock(
+            return_value={"verdict": "hallucinated", "confidence": 0.9, "reason": "Mismatch."}
+        )
+        rag_engine = MagicMock()
+        rag_engine.retrieve_context.return_value = []
+        output_path = os.path.join(temp_dir, "results.json")
+        csv_path = os.path.join(temp_dir, "results.csv")
+
+        with patch("cli.build_engines", return_value=(evaluator, rag_engine)):
+            exit_code = cli.main([
+                "--config", config_path,
+                "--progress", "none",
+                "eval",
+                "--dataset", dataset_path,
+                "--output", output_path,
+                "--csv", csv_path,
+                "--history-db", os.path.join(temp_dir, "history.sqlite3")
+            ])
+
+        with open(output_path, "r", encoding="utf-8") as file:
+            payload = json.load(file)
+        print("Payload metrics:", payload["metrics"])
+        if (
+            exit_code == 0
+            and payload["dataset_name"] == "cli_demo"
+            and len(payload["results"]) == 2
+            and payload["metrics"]["accuracy"] == 0.5
+            and payload["config"]["api_key"] == "***"
+            and os.path.exists(csv_path)
+        ):
+            print("SUCCESS: CLI eval writes the standard export payload.")
+        else:
+            print("FAILURE: CLI eval payload mismatch.")
+
+        history = RunHistoryStore(os.path.join(temp_dir, "history.sqlite3"))
+        runs = history.list_runs()
+        if len(runs) == 1 and runs[0]["sample_count"] == 2 and runs[0]["config"]["api_key"] == "***":
+            print("SUCCESS: CLI eval is recorded in the run history.")
+        else:
+            print("FAILURE: CLI run history mismatch.")
+        history._connection.close()
+
+        # A worker that dies without reporting is recorded as failed instead of hanging the parent.
+        with patch("cli.evaluate_shard", exit_without_reporting), patch("cli.SHARD_POLL_SECONDS", 0.2):
+            reporter = cli.ProgressReporter("none")
+            reporter.emit = MagicMock()
+            try:
+                cli.run_sharded_eval(samples[:2], "overall", {}, {}, 2, os.path.join(temp_dir, "dead"), reporter)
+                failed = []
+            except RuntimeError:
+                failed = [call.kwargs for call in reporter.emit.call_args_list if call.args[0] == "shard_failed"]
+        print("Failed shards:", failed)
+        if sorted(event["shard"] for event in failed) == [0, 1] and "code 3" in failed[0]["error"]:
+            print("SUCCESS: Dead shard workers are reported as failed.")
+        else:
+            print("FAILURE: Dead shard workers were not detected.")
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    test_cli()
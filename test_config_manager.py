@@ -1,7 +1,10 @@
+import json
 import os
 import shutil
 import sys
 import tempfile
+import time
+from unittest.mock import patch
 
 sys.path.append(os.path.join(os.path.dirname(__file__), "src"))
 
@@ -68,6 +71,61 @@ def test_config_manager():
             print("SUCCESS: Config reload matches saved values.")
         else:
             print("FAILURE: Reloaded config differs from saved values.")
+
+        # Cached reads and no-op saves do not touch the file.
+        mtime_before = os.stat(config_path).st_mtime_ns
+        with patch.object(manager, "_read_config", wraps=manager._read_config) as read_config:
+            for _ in range(100):
+                manager.get_runtime_config()
+                manager.get_provider_presets()
+            manager.save_config(saved)
+        if read_config.call_count == 0 and os.stat(config_path).st_mtime_ns == mtime_before:
+            print("SUCCESS: Config reads are cached and unchanged saves skip the write.")
+        else:
+            print(f"FAILURE: Config was re-read {read_config.call_count} times or rewritten.")
+
+        # Edits on disk are picked up by the watcher and reported to listeners.
+        changes = []
+        manager.add_change_listener(lambda config: changes.append(config), name="test")
+        manager.start_watching(interval=0.05)
+        try:
+            version = manager.version
+            edited = manager.load_config()
+            edited["runtime"]["retrieval_top_k"] = 8
+            with open(config_path, "w", encoding="utf-8") as file:
+                json.dump(edited, file)
+            deadline = time.time() + 5
+            while not changes and time.time() < deadline:
+                time.sleep(0.05)
+        finally:
+            manager.stop_watching()
+        if (
+            changes
+            and changes[-1]["runtime"]["retrieval_top_k"] == 8
+            and manager.version == version + 1
+            and manager.get_runtime_config()["retrieval_top_k"] == 8
+        ):
+            print("SUCCESS: Watcher hot-reloads config edits and notifies listeners.")
+        else:
+            print("FAILURE: Config edit was not hot-reloaded.")
+
+        # A broken manual edit keeps the last good config and leaves the file as written.
+        version = manager.version
+        changes.clear()
+        with open(config_path, "w", encoding="utf-8") as file:
+            file.write('{"runtime": {"api_key": ')
+        manager.check_for_changes()
+        with open(config_path, "r", encoding="utf-8") as file:
+            on_disk = file.read()
+        if (
+            not changes
+            and manager.version == version
+            and manager.get_runtime_config()["retrieval_top_k"] == 8
+            and on_disk == '{"runtime": {"api_key": '
+        ):
+            print("SUCCESS: Unparseable config edits are ignored without overwriting the file.")
+        else:
+            print("FAILURE: A broken config edit replaced the running config or the file.")
     finally:
         shutil.rmtree(temp_dir, ignore_errors=True)
 
@@ -0,0 +1,206 @@
+import os
+import shutil
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+from langchain_core.messages import AIMessage
+from langchain_core.prompts import PromptTemplate
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "src"))
+sys.path.append(os.path.join(os.path.dirname(__file__), "benchmarks"))
+
+from config_manager import AppConfigManager
+from endpoint_router import EndpointRouter, collect_served_endpoints
+from eval_engine.hallucination_evaluator import HallucinationEvaluator
+from eval_engine.result_exporter import sanitize_config_snapshot
+from fake_openai_server import FakeOpenAIServer
+
+
+class StaticRetriever:
+    def retrieve_context(self, query):
+        return ["2024年末M2余额为313.53万亿元，同比增长7.3%。"]
+
+
+class StubStatusError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+class StubChatModel:
+    """Answers instantly, or raises the queued status errors first."""
+
+    def __init__(self, name, errors=()):
+        self.name = name
+        self.errors = list(errors)
+
+    def invoke(self, input, config=None, **kwargs):
+        if self.errors:
+            raise StubStatusError(self.errors.pop(0))
+        return AIMessage(content=self.name)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_endpoint_router():
+    print("Testing multi-endpoint routing and failover...")
+
+    temp_dir = tempfile.mkdtemp(prefix="endpoint_router_", dir="data")
+    try:
+        # 1. Routing endpoints are resolved from provider presets; API keys fall back to the runtime key.
+        config_manager = AppConfigManager(os.path.join(temp_dir, "app_config.json"))
+        config = {
+            "runtime": {"provider": "Primary", "api_key": "runtime-key"},
+            "provider_presets": {
+                "Primary": {"base_url": "http://primary/v1", "chat_model_name": "judge-a"},
+                "Backup": {"base_url": "http://backup/v1", "chat_model_name": "judge-b"}
+            },
+            "routing": {
+                "enabled": True,
+                "strategy": "weighted",
+                "endpoints": [
+                    {"provider": "Primary", "weight": 2},
+                    {"provider": "Backup", "api_key": "backup-key", "chat_model_name": "judge-b2"},
+                    {"provider": "Missing"}
+                ]
+            }
+        }
+        config_manager.save_config(config)
+        endpoints = config_manager.get_routing_endpoints()
+        print("Resolved endpoints:", [(item["name"], item["model_name"], item["weight"]) for item in endpoints])
+        snapshot = sanitize_config_snapshot({"api_key": "runtime-key", "routing": {"endpoints": endpoints}})
+        if (
+            [item["name"] for item in endpoints] == ["Primary", "Backup"]
+            and endpoints[0]["api_key"] == "runtime-key"
+            and endpoints[1]["api_key"] == "backup-key"
+            and endpoints[1]["model_name"] == "judge-b2"
+            and config_manager.get_routing_settings()["strategy"] == "weighted"
+            and all(item["api_key"] == "***" for item in snapshot["routing"]["endpoints"])
+        ):
+            print("SUCCESS: Routing endpoints are resolved from presets and masked in exports.")
+        else:
+            print("FAILURE: Routing endpoints were not resolved as expected.")
+
+        config["routing"]["enabled"] = False
+        config_manager.save_config(config)
+        if config_manager.get_routing_endpoints() == []:
+            print("SUCCESS: Disabled routing resolves to no endpoints.")
+        else:
+            print("FAILURE: Disabled routing still returned endpoints.")
+
+        # 2. Weighted routing follows the configured weights.
+        router = EndpointRouter(
+            [{"name": "heavy", "weight": 3}, {"name": "light", "weight": 1}],
+            strategy="weighted",
+            chat_model_factory=lambda item: StubChatModel(item["name"]),
+            seed=7
+        )
+        answers = [router.invoke("ping").content for _ in range(800)]
+        heavy_share = answers.count("heavy") / len(answers)
+        print(f"Weighted share of the 3:1 endpoint: {heavy_share:.3f}")
+        if 0.7 <= heavy_share <= 0.8:
+            print("SUCCESS: Weighted routing follows endpoint weights.")
+        else:
+            print("FAILURE: Weighted routing ignored endpoint weights.")
+
+        # 3. Repeated server errors eject an endpoint until its ejection time has passed.
+        clock = FakeClock()
+        router = EndpointRouter(
+            [{"name": "flaky"}, {"name": "steady"}],
+            failure_threshold=2,
+            ejection_seconds=30,
+            chat_model_factory=lambda item: StubChatModel(item["name"], [500, 500] if item["name"] == "flaky" else []),
+            clock=clock,
+            seed=1
+        )
+        with collect_served_endpoints() as served:
+            answers = [router.invoke("ping").content for _ in range(6)]
+        flaky = router.stats()[0]
+        clock.now += 31
+        recovered = router.stats()[0]
+        print("Answers:", answers, "Flaky stats:", flaky)
+        if (
+            answers.count("steady") >= 4
+            and flaky["failures"] == 2
+            and flaky["ejections"] == 1
+            and flaky["ejected"]
+            and not recovered["ejected"]
+            and served == answers
+        ):
+            print("SUCCESS: Failing endpoints are ejected, failed calls fail over, and ejection expires.")
+        else:
+            print("FAILURE: Failure ejection did not behave as expected.")
+
+        # 4. Client errors are raised without failover or health penalties.
+        router = EndpointRouter(
+            [{"name": "strict"}],
+            chat_model_factory=lambda item: StubChatModel(item["name"], [400])
+        )
+        try:
+            router.invoke("ping")
+            print("FAILURE: A 400 response was swallowed.")
+        except StubStatusError:
+            stats = router.stats()[0]
+            if stats["failures"] == 0 and stats["outstanding"] == 0 and not stats["ejected"]:
+                print("SUCCESS: Client errors are raised without ejecting the endpoint.")
+            else:
+                print("FAILURE: A client error counted against endpoint health:", stats)
+
+        # 5. Against real HTTP endpoints, a throttling endpoint is ejected and every sample still
+        #    gets a judge verdict, recorded with the endpoint that served it.
+        with FakeOpenAIServer(latency_ms=20, seed=3) as first, \
+                FakeOpenAIServer(latency_ms=20, seed=4) as second, \
+                FakeOpenAIServer(error_rate=1.0, error_status=429, seed=5) as throttled:
+            router = EndpointRouter(
+                [
+                    {"name": "first", "base_url": first.base_url, "model_name": "fake-chat", "api_key": "test"},
+                    {"name": "second", "base_url": second.base_url, "model_name": "fake-chat", "api_key": "test"},
+                    {"name": "throttled", "base_url": throttled.base_url, "model_name": "fake-chat", "api_key": "test"}
+                ],
+                ejection_seconds=60,
+                seed=2
+            )
+            evaluator = HallucinationEvaluator(api_key="test", judge_model=router)
+            samples = [
+                {"id": index, "question": f"问题 {index}？", "candidate_answer": f"回答 {index}。", "label": "negative"}
+                for index in range(24)
+            ]
+            with ThreadPoolExecutor(max_workers=6) as executor:
+                results = list(executor.map(
+                    lambda sample: evaluator.evaluate_sample(sample, StaticRetriever(), mode="overall"),
+                    samples
+                ))
+            stats = {row["name"]: row for row in router.stats()}
+            served = [result.get("served_by") for result in results]
+            print("Endpoint stats:", {name: (row["requests"], row["throttled"], row["ejections"]) for name, row in stats.items()})
+            if (
+                all(result["reason"] == "Deterministic benchmark verdict." for result in results)
+                and set(served) == {"first", "second"}
+                and min(served.count("first"), served.count("second")) >= 6
+                and stats["throttled"]["throttled"] == throttled.stats["errors"] >= 1
+                and stats["throttled"]["ejections"] == 1
+                and stats["throttled"]["ejected"]
+            ):
+                print("SUCCESS: Throttled endpoints are ejected and load is shared by the healthy ones.")
+            else:
+                print("FAILURE: Routing over HTTP endpoints did not fail over or balance as expected.")
+
+            # The router is a drop-in chat model for prompt pipelines.
+            message = (PromptTemplate.from_template("Question: {question}") | router).invoke({"question": "M2?"})
+            if message.response_metadata.get("endpoint") in {"first", "second"}:
+                print("SUCCESS: Routed messages carry the serving endpoint.")
+            else:
+                print("FAILURE: The routed message does not name its endpoint.")
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    test_endpoint_router()
@@ -0,0 +1,86 @@
+import os
+import shutil
+import sys
+import tempfile
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "src"))
+sys.path.append(os.path.join(os.path.dirname(__file__), "benchmarks"))
+
+from e2e_benchmark import compare_reports
+from eval_engine.hallucination_evaluator import HallucinationEvaluator
+from fake_openai_server import FakeOpenAIServer
+from knowledge_base.vector_store_manager import VectorStoreManager
+from rag_engine.financial_rag import FinancialRAG
+
+
+def test_fake_openai_server():
+    print("Testing the fake OpenAI-compatible benchmark server...")
+
+    temp_dir = tempfile.mkdtemp(prefix="fake_openai_", dir="data")
+    try:
+        with FakeOpenAIServer(latency_ms=5, seed=1) as server:
+            # 1. Real LangChain clients embed, store, retrieve and judge through the fake server.
+            vector_store = VectorStoreManager(
+                persist_directory=os.path.join(temp_dir, "chroma"),
+                base_url=server.base_url,
+                model_name="fake-embedding",
+                api_key="test"
+            )
+            vector_store.add_documents(vector_store.text_splitter(
+                "2024年末M2余额为313.53万亿元，同比增长7.3%。\n\n上证指数全年上涨12.7%。"
+            ))
+            rag_engine = FinancialRAG(
+                vector_store,
+                model_name="fake-chat",
+                base_url=server.base_url,
+                api_key="test",
+                retrieval_top_k=1
+            )
+            evaluator = HallucinationEvaluator(model_name="fake-chat", base_url=server.base_url, api_key="test")
+            sample = {
+                "id": 1,
+                "question": "2024年末M2余额是多少？",
+                "candidate_answer": "M2余额为313.53万亿元，同比增长7.3%。",
+                "label": "negative"
+            }
+            overall = evaluator.evaluate_sample(sample, rag_engine, mode="overall")
+            repeated = evaluator.evaluate_sample(sample, rag_engine, mode="overall")
+            claim = evaluator.evaluate_sample(sample, rag_engine, mode="claim")
+            print("Overall:", overall["verdict"], "Claims:", [item["claim"] for item in claim["claim_results"]])
+            print("Server stats:", server.stats)
+            if (
+                overall["verdict"] in {"supported", "hallucinated", "uncertain"}
+                and overall["reason"] == "Deterministic benchmark verdict."
+                and repeated["verdict"] == overall["verdict"]
+                and len(claim["claim_results"]) == 2
+                and server.stats["embedding_requests"] >= 4
+                and server.stats["errors"] == 0
+            ):
+                print("SUCCESS: Judge and embedding calls get deterministic, well-formed replies.")
+            else:
+                print("FAILURE: Unexpected fake server replies.")
+
+        # 2. Injected failures surface as server errors.
+        with FakeOpenAIServer(error_rate=1.0) as server:
+            evaluator = HallucinationEvaluator(model_name="fake-chat", base_url=server.base_url, api_key="test")
+            evaluator.judge_model.max_retries = 0
+            result = evaluator.evaluate_sample(dict(sample), type("Engine", (), {"retrieve_context": lambda self, query: []})())
+            if server.stats["errors"] >= 1 and result["verdict"] == "uncertain":
+                print("SUCCESS: Error injection makes judge calls fall back.")
+            else:
+                print("FAILURE: Error injection mismatch.")
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    # 3. Reports compare throughput figures by stage, mode and concurrency.
+    previous = {"evaluation": [{"mode": "overall", "concurrency": 4, "samples_per_s": 10.0}]}
+    current = {"evaluation": [{"mode": "overall", "concurrency": 4, "samples_per_s": 15.0}], "retrieval": [{"concurrency": 1, "qps": 3.0}]}
+    comparison = compare_reports(current, previous)
+    if comparison == [{"metric": "evaluation.overall.c4.samples_per_s", "previous": 10.0, "current": 15.0, "ratio": 1.5}]:
+        print("SUCCESS: Benchmark reports compare across commits.")
+    else:
+        print(f"FAILURE: Unexpected comparison {comparison}.")
+
+
+if __name__ == "__main__":
+    test_fake_openai_server()
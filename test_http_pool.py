@@ -0,0 +1,136 @@
+import os
+import shutil
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "src"))
+sys.path.append(os.path.join(os.path.dirname(__file__), "benchmarks"))
+
+from config_manager import AppConfigManager
+from eval_engine.hallucination_evaluator import HallucinationEvaluator
+from fake_openai_server import FakeOpenAIServer
+from http_pool import get_http_clients, normalize_pool_settings, pool_statistics
+from knowledge_base.vector_store_manager import VectorStoreManager
+from rag_engine.financial_rag import FinancialRAG
+
+
+def test_http_pool():
+    print("Testing the shared pooled HTTP client...")
+
+    # 1. Pool settings from the config file are clamped and filled with defaults.
+    normalized = normalize_pool_settings({"max_connections": "4", "max_keepalive_connections": 50, "http2": "yes"})
+    print("Normalized settings:", normalized)
+    if normalized == {"max_connections": 4, "max_keepalive_connections": 4, "keepalive_expiry": 30.0, "http2": False}:
+        print("SUCCESS: Pool settings are normalized.")
+    else:
+        print("FAILURE: Pool settings were not normalized as expected.")
+
+    temp_dir = tempfile.mkdtemp(prefix="http_pool_", dir="data")
+    try:
+        config_manager = AppConfigManager(os.path.join(temp_dir, "app_config.json"))
+        config = config_manager.load_config()
+        config["http_pool"] = {"max_connections": 8, "max_keepalive_connections": 4}
+        config_manager.save_config(config)
+        config_manager.save_runtime_config(config_manager.get_runtime_config())
+        settings = config_manager.get_http_pool_settings()
+        if settings["max_connections"] == 8 and settings["max_keepalive_connections"] == 4:
+            print("SUCCESS: The http_pool config section survives runtime config saves.")
+        else:
+            print("FAILURE: The http_pool config section was lost:", settings)
+
+        with FakeOpenAIServer(latency_ms=5, seed=2) as server:
+            # 2. The pool is process-wide and keyed on base_url plus settings.
+            clients = get_http_clients(server.base_url, **settings)
+            same = get_http_clients(server.base_url, max_connections=8, max_keepalive_connections=4)
+            other = get_http_clients(server.base_url, max_connections=2)
+            if clients is same and clients is not other:
+                print("SUCCESS: Pools are shared per base_url and pool settings.")
+            else:
+                print("FAILURE: Pool lookup did not share or separate instances as expected.")
+
+            # 3. Chat, judge and embedding calls all go through the same pool and reuse connections.
+            vector_store = VectorStoreManager(
+                persist_directory=os.path.join(temp_dir, "chroma"),
+                base_url=server.base_url,
+                model_name="fake-embedding",
+                api_key="test",
+                http_clients=clients
+            )
+            vector_store.add_documents(vector_store.text_splitter(
+                "2024年末M2余额为313.53万亿元，同比增长7.3%。\n\n上证指数全年上涨12.7%。"
+            ))
+            rag_engine = FinancialRAG(
+                vector_store,
+                model_name="fake-chat",
+                base_url=server.base_url,
+                api_key="test",
+                retrieval_top_k=1,
+                http_clients=clients
+            )
+            sample = {
+                "id": 1,
+                "question": "2024年末M2余额是多少？",
+                "candidate_answer": "M2余额为313.53万亿元，同比增长7.3%。",
+                "label": "negative"
+            }
+            for _ in range(3):
+                # Evaluators rebuilt per run keep using the same pool.
+                evaluator = HallucinationEvaluator(
+                    model_name="fake-chat",
+                    base_url=server.base_url,
+                    api_key="test",
+                    http_clients=clients
+                )
+                evaluator.evaluate_sample(sample, rag_engine, mode="claim")
+            rag_engine.generate_answer("上证指数全年表现如何？")
+
+            stats = clients.stats()
+            print("Sequential pool stats:", stats)
+            server_requests = server.stats["chat_requests"] + server.stats["embedding_requests"]
+            if (
+                stats["requests"] == server_requests
+                and stats["connections_opened"] == 1
+                and stats["reuse_ratio"] > 0.9
+                and stats["in_flight"] == 0
+            ):
+                print("SUCCESS: Sequential chat, judge and embedding calls reuse one connection.")
+            else:
+                print("FAILURE: Sequential calls did not reuse the pooled connection.")
+
+            # 4. Under concurrency, too few keep-alive slots show up as connection churn.
+            def embed_concurrently(http_clients):
+                embeddings = VectorStoreManager(
+                    persist_directory=os.path.join(temp_dir, "chroma"),
+                    base_url=server.base_url,
+                    model_name="fake-embedding",
+                    api_key="test",
+                    http_clients=http_clients
+                )
+                with ThreadPoolExecutor(max_workers=12) as executor:
+                    list(executor.map(lambda index: embeddings.embed_query(f"问题 {index}"), range(48)))
+                return http_clients.stats()
+
+            small = embed_concurrently(get_http_clients(server.base_url, max_connections=12, max_keepalive_connections=2))
+            sized = embed_concurrently(get_http_clients(server.base_url, max_connections=12, max_keepalive_connections=12))
+            print("Keep-alive 2:", small["connections_opened"], "opened; keep-alive 12:", sized["connections_opened"], "opened")
+            if (
+                sized["connections_opened"] <= 12
+                and small["connections_opened"] > sized["connections_opened"]
+                and small["open_connections"] <= 2
+                and sized["peak_in_flight"] > 1
+            ):
+                print("SUCCESS: Pool statistics expose connection churn from undersized keep-alive limits.")
+            else:
+                print("FAILURE: Concurrent pool statistics are inconsistent with the pool limits.")
+
+            if any(pool["base_url"] == server.base_url for pool in pool_statistics()):
+                print("SUCCESS: Process-wide pool statistics list the shared pool.")
+            else:
+                print("FAILURE: Pool statistics are missing the shared pool.")
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    test_http_pool()
@@ -0,0 +1,135 @@
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "src"))
+
+from eval_engine.hallucination_evaluator import HallucinationEvaluator
+from eval_engine.job_runner import EvaluationJobRunner
+from eval_engine.run_history import RunHistoryStore
+
+
+def wait_for_job(runner, job_id, timeout=10.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = runner.get_job(job_id)
+        if job["status"] not in EvaluationJobRunner.ACTIVE_STATUSES:
+            return job
+        time.sleep(0.05)
+    return runner.get_job(job_id)
+
+
+def test_job_runner():
+    print("Testing background evaluation job runner...")
+
+    dataset = {
+        "dataset_name": "job_demo",
+        "samples": [
+            {
+                "id": index,
+                "question": f"Question {index}",
+                "candidate_answer": f"Answer {index}",
+                "label": "positive"
+            }
+            for index in range(1, 6)
+        ]
+    }
+    prompts = {
+        "overall_prompt": "overall",
+        "claim_extraction_prompt": "extract",
+        "claim_verification_prompt": "verify"
+    }
+    runtime_config = {"chat_model_name": "judge", "api_key": "secret-key"}
+
+    with patch("eval_engine.hallucination_evaluator.ChatOpenAI"):
+        evaluator = HallucinationEvaluator()
+    evaluator._invoke_json = MagicMock(
+        return_value={"verdict": "hallucinated", "confidence": 0.9, "reason": "Mismatch."}
+    )
+    rag_engine = MagicMock()
+    rag_engine.retrieve_context.return_value = []
+
+    temp_dir = tempfile.mkdtemp(prefix="eval_jobs_", dir="data")
+    try:
+        run_history = RunHistoryStore(os.path.join(temp_dir, "history.sqlite3"))
+        runner = EvaluationJobRunner(
+            lambda config, job_prompts: (evaluator, rag_engine),
+            job_dir=temp_dir,
+            run_history=run_history
+        )
+        job_id = runner.submit(dataset, "overall", prompts, runtime_config)
+        job = wait_for_job(runner, job_id)
+        results = runner.load_results(job_id)
+        print("Job:", job)
+        if (
+            job["status"] == "completed"
+            and job["completed"] == 5
+            and len(results) == 5
+            and job["metrics"]["accuracy"] == 1.0
+            and job["config"]["api_key"] == "***"
+        ):
+            print("SUCCESS: Background job runs and persists results.")
+        else:
+            print("FAILURE: Background job result mismatch.")
+
+        recorded_run = run_history.load_run(job_id)
+        if recorded_run is not None and len(recorded_run["results"]) == 5 and recorded_run["config"]["api_key"] == "***":
+            print("SUCCESS: Completed jobs are recorded in the run history.")
+        else:
+            print("FAILURE: Run history recording mismatch.")
+
+        reloaded = EvaluationJobRunner(lambda config, job_prompts: (evaluator, rag_engine), job_dir=temp_dir)
+        if reloaded.get_job(job_id)["status"] == "completed" and len(reloaded.load_results(job_id)) == 5:
+            print("SUCCESS: Finished jobs can be attached after a restart.")
+        else:
+            print("FAILURE: Job persistence mismatch.")
+        reloaded.shutdown()
+        runner.shutdown()
+
+        release = threading.Event()
+        running = []
+        peak = []
+        lock = threading.Lock()
+
+        def blocking_evaluate(sample, engine, mode="overall"):
+            with lock:
+                running.append(sample["id"])
+                peak.append(len(running))
+            release.wait(5)
+            with lock:
+                running.remove(sample["id"])
+            return {"id": sample["id"], "expected_label": "positive", "predicted_label": "positive", "is_correct": True}
+
+        blocking_evaluator = MagicMock()
+        blocking_evaluator.evaluate_sample.side_effect = blocking_evaluate
+        blocking_evaluator.calculate_classification_metrics.return_value = {}
+        limited = EvaluationJobRunner(
+            lambda config, job_prompts: (blocking_evaluator, rag_engine),
+            job_dir=temp_dir,
+            max_concurrent_jobs=1
+        )
+        single_sample = {"dataset_name": "single", "samples": dataset["samples"][:1]}
+        first_id = limited.submit(single_sample, "overall", prompts, runtime_config)
+        second_id = limited.submit(single_sample, "overall", prompts, runtime_config)
+        time.sleep(0.3)
+        queued_status = limited.get_job(second_id)["status"]
+        release.set()
+        wait_for_job(limited, first_id)
+        wait_for_job(limited, second_id)
+        print("Second job status while first was running:", queued_status, "peak:", max(peak))
+        if queued_status == "queued" and max(peak) == 1:
+            print("SUCCESS: Global concurrency limit queues extra jobs.")
+        else:
+            print("FAILURE: Concurrency limit mismatch.")
+        limited.shutdown()
+        run_history._connection.close()
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    test_job_runner()
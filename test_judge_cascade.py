@@ -0,0 +1,179 @@
+import json
+import os
+import shutil
+import sys
+import tempfile
+
+from langchain_core.messages import AIMessage
+from langchain_core.runnables import RunnableLambda
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "src"))
+
+from config_manager import AppConfigManager
+from eval_engine.hallucination_evaluator import HallucinationEvaluator
+from eval_engine.judge_cascade import CascadePolicy, summarize_cascade
+from eval_engine.result_exporter import flatten_results_for_csv, sanitize_config_snapshot
+
+
+class StaticRetriever:
+    def retrieve_context(self, query):
+        return ["2024年末M2余额为313.53万亿元，同比增长7.3%。"]
+
+
+def scripted_judge(reply, calls):
+    """Chat model stand-in that answers every prompt with ``reply(prompt_text)`` as JSON."""
+
+    def answer(prompt_value):
+        text = prompt_value.to_string()
+        calls.append(text)
+        content = reply(text)
+        return AIMessage(
+            content=content if isinstance(content, str) else json.dumps(content, ensure_ascii=False),
+            usage_metadata={"input_tokens": 100, "output_tokens": 20, "total_tokens": 120}
+        )
+
+    return RunnableLambda(answer)
+
+
+def cheap_reply(text):
+    if '"claims"' in text:
+        return {"claims": ["M2余额为313.53万亿元", "M2同比增长9%"]}
+    if "同比增长9%" in text:
+        return {"claim": "M2同比增长9%", "verdict": "contradicted", "confidence": 0.4, "reason": "cheap"}
+    if "乱码" in text:
+        return "not json"
+    if "困难" in text:
+        return {"verdict": "uncertain", "confidence": 0.9, "reason": "cheap"}
+    return {"verdict": "supported", "confidence": 0.95, "reason": "cheap", "claim": "M2余额为313.53万亿元"}
+
+
+def strong_reply(text):
+    if '"claims"' in text:
+        return {"claims": ["M2余额为313.53万亿元", "M2同比增长9%"]}
+    if '"claim"' in text:
+        verdict = "contradicted" if "同比增长9%" in text else "supported"
+        return {"verdict": verdict, "confidence": 0.9, "reason": "strong"}
+    if "困难" in text:
+        return {"verdict": "hallucinated", "confidence": 0.9, "reason": "strong"}
+    return {"verdict": "supported", "confidence": 0.9, "reason": "strong"}
+
+
+def test_judge_cascade():
+    print("Testing the cheap-first judge cascade...")
+
+    # 1. The policy escalates parse failures, doubtful verdicts and low confidence.
+    policy = CascadePolicy(min_confidence=0.7)
+    decisions = [
+        policy.escalation_reason({}, False, "overall"),
+        policy.escalation_reason({"verdict": "uncertain", "confidence": 0.99}, True, "overall"),
+        policy.escalation_reason({"verdict": "supported", "confidence": 0.5}, True, "claim_verification"),
+        policy.escalation_reason({"verdict": "supported", "confidence": 0.8}, True, "overall"),
+        policy.escalation_reason({"claims": []}, True, "claim_extraction"),
+        policy.escalation_reason({"claims": ["a"]}, True, "claim_extraction")
+    ]
+    print("Decisions:", decisions)
+    if decisions == ["parse_failure", "verdict", "low_confidence", None, "no_claims", None]:
+        print("SUCCESS: Escalation rules follow parse status, verdict and confidence.")
+    else:
+        print("FAILURE: Unexpected escalation decisions.")
+
+    # 2. Overall mode: easy samples stay on the cheap judge, the rest go to the strong one.
+    cheap_calls, strong_calls = [], []
+    evaluator = HallucinationEvaluator(
+        api_key="test",
+        judge_model=scripted_judge(strong_reply, strong_calls),
+        cascade_model=scripted_judge(cheap_reply, cheap_calls),
+        cascade_policy=CascadePolicy(min_confidence=0.75)
+    )
+    samples = [
+        {"id": 1, "question": "简单问题？", "candidate_answer": "M2余额为313.53万亿元。", "label": "negative"},
+        {"id": 2, "question": "简单问题二？", "candidate_answer": "M2余额为313.53万亿元。", "label": "negative"},
+        {"id": 3, "question": "困难问题？", "candidate_answer": "M2余额为400万亿元。", "label": "positive"},
+        {"id": 4, "question": "乱码问题？", "candidate_answer": "M2余额为313.53万亿元。", "label": "negative"}
+    ]
+    results = evaluator.run_batch_eval(samples, StaticRetriever(), mode="overall")
+    summary = summarize_cascade(results, cheap_price_per_1k=0.1, strong_price_per_1k=1.0)
+    print("Tiers:", [result["judge_tier"] for result in results], "Summary:", {
+        key: summary[key] for key in ("escalation_rate", "strong_tokens_saved", "cost_saved", "escalation_reasons")
+    })
+    if (
+        [result["judge_tier"] for result in results] == ["cheap", "cheap", "strong", "strong"]
+        and [result["llm_calls"] for result in results] == [1, 1, 2, 2]
+        and results[2]["verdict"] == "hallucinated"
+        and results[2]["cascade"]["escalation_reasons"] == ["verdict"]
+        and len(cheap_calls) == 4 and len(strong_calls) == 2
+        and summary["escalation_rate"] == 0.5
+        and summary["escalation_reasons"] == {"verdict": 1, "parse_failure": 1}
+        and summary["strong_tokens_saved"] == 240
+        and abs(summary["cost_saved"] - (4 * 0.12 - (4 * 0.012 + 2 * 0.12))) < 1e-9
+        and summary["latency_saved_ms"] is not None
+    ):
+        print("SUCCESS: Only doubtful judgments are escalated and savings are reported.")
+    else:
+        print("FAILURE: Overall cascade routing or summary mismatch.")
+
+    # 3. Claim mode cascades extraction and each claim independently.
+    claim_result = evaluator.evaluate_sample(samples[0], StaticRetriever(), mode="claim")
+    claim_tiers = [item["judge_tier"] for item in claim_result["claim_results"]]
+    print("Claim tiers:", claim_tiers, "Sample tier:", claim_result["judge_tier"])
+    if (
+        claim_tiers == ["cheap", "strong"]
+        and claim_result["judge_tier"] == "mixed"
+        and claim_result["cascade"]["judgments"] == 3
+        and claim_result["llm_calls"] == 4
+        and claim_result["verdict"] == "hallucinated"
+        and all("cascade" not in item for item in claim_result["claim_results"])
+    ):
+        print("SUCCESS: Claim-level judgments escalate one claim at a time.")
+    else:
+        print("FAILURE: Claim-level cascade mismatch.")
+
+    # 4. The comparison run judges the same samples with the strong model alone.
+    comparison = evaluator.run_cascade_comparison(samples, StaticRetriever(), mode="overall")
+    rows = flatten_results_for_csv(comparison["cascade"]["results"])
+    print("Agreement:", comparison["agreement"], "Strong-only F1:", comparison["strong_only"]["metrics"]["f1"])
+    if (
+        all("cascade" not in result for result in comparison["strong_only"]["results"])
+        and comparison["agreement"]["paired_samples"] == 4
+        and comparison["agreement"]["agreement"] == 1.0
+        and comparison["strong_only"]["metrics"] == comparison["cascade"]["metrics"]
+        and [row["judge_tier"] for row in rows] == ["cheap", "cheap", "strong", "strong"]
+    ):
+        print("SUCCESS: Cascade and strong-only metrics are compared on the same data.")
+    else:
+        print("FAILURE: Cascade comparison mismatch.")
+
+    # 5. The cascade is configured in the app config and its API key is masked in exports.
+    temp_dir = tempfile.mkdtemp(prefix="judge_cascade_", dir="data")
+    try:
+        config_manager = AppConfigManager(os.path.join(temp_dir, "app_config.json"))
+        config = {
+            "runtime": {"provider": "Main", "base_url": "http://main/v1", "api_key": "runtime-key"},
+            "provider_presets": {"Fast": {"base_url": "http://fast/v1", "chat_model_name": "small-judge"}},
+            "judge_cascade": {"provider": "Fast", "min_confidence": 2, "escalate_verdicts": ["Uncertain"]}
+        }
+        config_manager.save_config(config)
+        disabled = config_manager.get_judge_cascade_settings()
+        config["judge_cascade"]["enabled"] = True
+        config_manager.save_config(config)
+        settings = config_manager.get_judge_cascade_settings()
+        snapshot = sanitize_config_snapshot({"judge_cascade": settings})
+        print("Cascade settings:", {key: settings[key] for key in ("base_url", "model_name", "min_confidence")})
+        if (
+            disabled == {}
+            and settings["base_url"] == "http://fast/v1"
+            and settings["model_name"] == "small-judge"
+            and settings["api_key"] == "runtime-key"
+            and settings["min_confidence"] == 1.0
+            and settings["escalate_verdicts"] == ["uncertain"]
+            and snapshot["judge_cascade"]["api_key"] == "***"
+        ):
+            print("SUCCESS: Cascade thresholds and model are read from the app config.")
+        else:
+            print("FAILURE: Cascade config resolution mismatch.")
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    test_judge_cascade()
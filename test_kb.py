@@ -1,3 +1,4 @@
+import io
 import os
 import shutil
 import sys
@@ -72,6 +73,44 @@ def test_kb():
             except PermissionError:
                 pass
 
+    # 1.3 Test in-memory stream loading
+    print("Testing in-memory stream loading...")
+    with open(file_path, "rb") as file:
+        raw_bytes = file.read()
+
+    class NonSeekableStream(io.RawIOBase):
+        def __init__(self, data):
+            self._inner = io.BytesIO(data)
+
+        def readable(self):
+            return True
+
+        def readinto(self, buffer):
+            return self._inner.readinto(buffer)
+
+    buffer = io.BytesIO(raw_bytes)
+    buffer.read()
+    stream_contents = [
+        loader.load_stream(raw_bytes, "upload.txt"),
+        loader.load_stream(buffer, "upload.txt"),
+        loader.load_stream(NonSeekableStream(raw_bytes), "upload.txt")
+    ]
+    if all(item == content for item in stream_contents) and not buffer.closed:
+        print("SUCCESS: TXT bytes, buffers and non-seekable streams load without temp files.")
+    else:
+        print("FAILURE: Stream loading mismatch.")
+
+    from docx import Document
+
+    docx_buffer = io.BytesIO()
+    document = Document()
+    document.add_paragraph("Revenue grew 12% year over year.")
+    document.save(docx_buffer)
+    if "Revenue grew 12%" in loader.load_stream(docx_buffer, "report.docx"):
+        print("SUCCESS: DOCX parses directly from memory.")
+    else:
+        print("FAILURE: DOCX stream loading failed.")
+
     # 2. Test VectorStoreManager
     print("\nTesting VectorStoreManager...")
     # Use FakeEmbeddings to avoid API Key issues during test
@@ -0,0 +1,96 @@
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "src"))
+
+from data_manager.near_duplicates import MinHasher, choose_lsh_bands, find_near_duplicate_clusters
+from data_manager.test_set_manager import TestSetManager
+
+
+def test_near_duplicates():
+    print("Testing MinHash near-duplicate detection...")
+
+    # 1. Signature agreement estimates Jaccard similarity.
+    signatures = MinHasher().signatures([
+        "2024年末广义货币M2余额313.53万亿元，同比增长7.3%。",
+        "2024年末广义货币（M2）余额313.53万亿元，同比增长7.3%。",
+        "上证指数全年上涨12.7%，成交额创近三年新高。"
+    ])
+    similar = (signatures[0] == signatures[1]).mean()
+    different = (signatures[0] == signatures[2]).mean()
+    print(f"Similar pair: {similar:.2f}, different pair: {different:.2f}")
+    if similar > 0.5 and different < 0.1 and choose_lsh_bands(128, 0.8) == (16, 8):
+        print("SUCCESS: Signatures separate reworded and unrelated texts.")
+    else:
+        print("FAILURE: Unexpected signature similarity.")
+
+    # 2. Reworded copies cluster, differently labelled copies never do.
+    temp_dir = tempfile.mkdtemp(prefix="near_duplicates_", dir="data")
+    try:
+        manager = TestSetManager(data_path=os.path.join(temp_dir, "test_set.json"))
+        question = "2024年末我国M2余额和同比增速分别是多少？"
+        manager.add_case(question, "2024年末M2余额为313.53万亿元，同比增长7.3%。", "negative")
+        manager.add_case(question, "2024年末M2余额为313.53万亿元，同比增长了7.3%。", "negative")
+        manager.add_case(question, "2024年末M2余额为313.53万亿元，同比增长7.3%！", "negative")
+        manager.add_case(question, "2024年末M2余额为313.53万亿元，同比增长7.3%。", "positive")
+        manager.add_case("2024年全国居民人均可支配收入是多少？", "41314元，名义增长5.3%。", "negative")
+
+        clusters = manager.find_near_duplicates()
+        print("Clusters:", clusters)
+        if len(clusters) == 1 and clusters[0]["keep_id"] == 1 and clusters[0]["duplicate_ids"] == [2, 3]:
+            print("SUCCESS: Reworded samples cluster within the same label.")
+        else:
+            print("FAILURE: Unexpected clusters.")
+
+        manager.save_data()
+        deduplicated = manager.build_deduplicated_dataset(clusters)
+        removed = manager.remove_near_duplicates(clusters)
+        if (
+            [sample["id"] for sample in deduplicated["samples"]] == [1, 4, 5]
+            and deduplicated["dataset_name"].endswith("_dedup")
+            and removed == 2
+            and [sample["id"] for sample in manager.get_all_cases()] == [1, 4, 5]
+        ):
+            print("SUCCESS: Deduplicated variant and in-place removal keep one sample per cluster.")
+        else:
+            print("FAILURE: Deduplication result mismatch.")
+
+        with open(manager.data_path, "r", encoding="utf-8") as file:
+            exported = json.load(file)
+        exported["samples"][0]["notes"] = "Edited after deduplication"
+        with open(manager.data_path, "w", encoding="utf-8") as file:
+            json.dump(exported, file, ensure_ascii=False)
+        manager.sync_json()
+        if [sample["id"] for sample in manager.get_all_cases()] == [1, 4, 5] and manager.get_case(1)["notes"]:
+            print("SUCCESS: Removed duplicates stay removed when the JSON file is edited.")
+        else:
+            print("FAILURE: A JSON edit restored removed duplicates.")
+        manager.store.close()
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    # 3. Clustering stays near-linear on a larger synthetic set.
+    rng = random.Random(0)
+    words = "营业收入 净利润 同比 增长 下降 季度 年度 贷款 利率 通胀 市场 份额 指数 债券 收益率 基金".split()
+    texts = []
+    for _ in range(10000):
+        text = "".join(rng.choice(words) for _ in range(20))
+        texts.append(text)
+        texts.append(text + "。")
+    started = time.time()
+    clusters = find_near_duplicate_clusters(texts)
+    elapsed = time.time() - started
+    print(f"Clustered {len(texts)} texts into {len(clusters)} groups in {elapsed:.2f}s")
+    if len(clusters) == 10000 and all(cluster[1] == cluster[0] + 1 for cluster in clusters):
+        print("SUCCESS: Large synthetic set clusters every reworded pair.")
+    else:
+        print("FAILURE: Large synthetic clustering mismatch.")
+
+
+if __name__ == "__main__":
+    test_near_duplicates()
@@ -0,0 +1,131 @@
+import os
+import shutil
+import sys
+import tempfile
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "src"))
+
+from config_manager import AppConfigManager
+from eval_engine.hallucination_evaluator import HallucinationEvaluator
+from eval_engine.numeric_check import extract_quantities, find_numeric_mismatches, summarize_numeric_precheck
+
+EVIDENCE = "2024年末M2余额为313.53万亿元，同比增长7.3%。2024年公司实现营收81.4亿元，净利润同比下降5%。"
+
+
+class StaticRetriever:
+    def retrieve_context(self, query):
+        return [EVIDENCE]
+
+
+def test_numeric_check():
+    print("Testing the numeric consistency pre-check...")
+
+    # 1. Units, magnitudes, direction and periods are normalized.
+    quantities = extract_quantities("Revenue rose 10% to $5.2 billion in 2024, and net income fell 3%. 2024年第三季度PMI为50.1")
+    summary = [(item["metric"], item["value"], item["unit"], item["kind"], item["period"]) for item in quantities]
+    print("Quantities:", summary)
+    if summary == [
+        ("revenue", 10.0, "percent", "change", "2024"),
+        ("revenue", 5.2e9, "USD", "level", "2024"),
+        ("netincome", -3.0, "percent", "change", "2024"),
+        ("pmi", 50.1, "number", "level", "2024Q3")
+    ]:
+        print("SUCCESS: Numeric expressions are normalized with metric, unit and period.")
+    else:
+        print("FAILURE: Unexpected quantities.")
+
+    # 2. Only clear mismatches on the same metric and period are flagged.
+    cases = {
+        "公司2024年营收为91.4亿": True,
+        "M2余额同比增长9%": True,
+        "净利润同比增长5%": True,
+        "营收约81亿元": False,
+        "M2余额为313.5万亿元": False,
+        "2023年营收为91.4亿元": False,
+        "营收为91.4亿美元": False,
+        "毛利率为30%": False,
+        "M2同比增长9%": False,
+        "海外营收为91.4亿元": False
+    }
+    flagged = {
+        statement: bool(find_numeric_mismatches(statement, [EVIDENCE], "2024年情况如何？"))
+        for statement in cases
+    }
+    print("Flagged:", flagged)
+    if flagged == cases:
+        print("SUCCESS: Mismatches need an aligned evidence number outside rounding.")
+    else:
+        print("FAILURE: Unexpected mismatch decisions.")
+
+    # A bare metric is not compared with a qualified one such as 扣非净利润.
+    qualified = find_numeric_mismatches("净利润为6亿元", ["2023年扣非净利润为5亿元"], "2023年净利润是多少")
+    if not qualified:
+        print("SUCCESS: Qualified metrics are not aligned with bare ones.")
+    else:
+        print("FAILURE: 净利润 was compared with 扣非净利润:", qualified)
+
+    # 3. Shortcut claims skip the judge; everything else is judged as before.
+    calls = []
+
+    def fake_invoke_json(prompt, variables, fallback):
+        calls.append(variables.get("claim", "overall"))
+        return {"verdict": "supported", "confidence": 0.9}
+
+    evaluator = HallucinationEvaluator(
+        api_key="test",
+        model_name="gpt-4o-mini",
+        claim_extraction_strategy="rule",
+        numeric_precheck=True
+    )
+    evaluator._invoke_json = fake_invoke_json
+    samples = [
+        {"id": 1, "question": "2024年M2情况？", "candidate_answer": "M2余额为313.53万亿元，同比增长9%。", "label": "positive"},
+        {"id": 2, "question": "2024年营收？", "candidate_answer": "公司营收为91.4亿元。", "label": "negative"},
+        {"id": 3, "question": "2024年M2情况？", "candidate_answer": "M2余额为313.53万亿元。", "label": "negative"}
+    ]
+    claim_result = evaluator.evaluate_sample(samples[0], StaticRetriever(), mode="claim")
+    overall_results = evaluator.run_batch_eval(samples, StaticRetriever(), mode="overall")
+    precheck = summarize_numeric_precheck([claim_result] + overall_results)
+    print("Claim verdicts:", [item["verdict"] for item in claim_result["claim_results"]], "Judge calls:", calls)
+    print("Summary:", precheck)
+    if (
+        claim_result["verdict"] == "hallucinated"
+        and claim_result["claim_results"][1]["judged_by"] == "numeric_precheck"
+        and claim_result["llm_calls"] == 1
+        and [result["verdict"] for result in overall_results] == ["hallucinated", "hallucinated", "supported"]
+        and [result["llm_calls"] for result in overall_results] == [0, 0, 1]
+        and overall_results[1]["confidence"] == 0.95
+        and calls == ["M2余额为313.53万亿元", "overall"]
+        and precheck["shortcuts"] == 3
+        and precheck["judgments"] == 5
+        and precheck["shortcut_samples"] == 3
+        and abs(precheck["shortcut_precision"] - 2 / 3) < 1e-9
+    ):
+        print("SUCCESS: Clear numeric contradictions are settled without a judge call.")
+    else:
+        print("FAILURE: Numeric pre-check routing mismatch.")
+
+    # 4. The pre-check is off by default and configured in the app config.
+    calls.clear()
+    default = HallucinationEvaluator(api_key="test", model_name="gpt-4o-mini")
+    default._invoke_json = fake_invoke_json
+    plain = default.evaluate_sample(samples[1], StaticRetriever(), mode="overall")
+    temp_dir = tempfile.mkdtemp(prefix="numeric_check_", dir="data")
+    try:
+        config_manager = AppConfigManager(os.path.join(temp_dir, "app_config.json"))
+        config_manager.save_config({"numeric_precheck": {"enabled": True, "tolerance": "-1"}})
+        settings = config_manager.get_numeric_precheck_settings()
+        if (
+            "numeric_precheck" not in plain
+            and calls == ["overall"]
+            and settings == {"enabled": True, "tolerance": 0.0}
+        ):
+            print("SUCCESS: The pre-check is opt-in and read from the config.")
+        else:
+            print("FAILURE: Default or config mismatch:", settings)
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    test_numeric_check()
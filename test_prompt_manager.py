@@ -6,8 +6,11 @@ import tempfile
 
 sys.path.append(os.path.join(os.path.dirname(__file__), "src"))
 
+from unittest.mock import patch
+
 from data_manager.test_set_manager import TestSetManager
-from eval_engine.prompt_manager import PromptTemplateManager
+from eval_engine.hallucination_evaluator import HallucinationEvaluator
+from eval_engine.prompt_manager import PromptTemplateManager, compile_prompt, fingerprint_prompts
 
 
 def test_prompt_manager():
@@ -47,6 +50,50 @@ def test_prompt_manager():
         shutil.rmtree(temp_dir, ignore_errors=True)
 
 
+def test_prompt_fingerprints():
+    print("\nTesting prompt fingerprints and compiled template cache...")
+
+    prompts = {
+        "overall_prompt": "Judge {candidate_answer} for {question} with {context}.",
+        "claim_extraction_prompt": "Extract claims from {candidate_answer}.",
+        "claim_verification_prompt": "Verify {claim} against {context}."
+    }
+    fingerprints = fingerprint_prompts(prompts)
+    edited = fingerprint_prompts(dict(prompts, claim_extraction_prompt="List claims in {candidate_answer}."))
+    if (
+        fingerprints == fingerprint_prompts(dict(reversed(list(prompts.items()))))
+        and edited["combined"] != fingerprints["combined"]
+        and edited["overall_prompt"] == fingerprints["overall_prompt"]
+        and edited["claim_extraction_prompt"] != fingerprints["claim_extraction_prompt"]
+    ):
+        print("SUCCESS: Fingerprints identify each prompt and the whole set.")
+    else:
+        print("FAILURE: Fingerprint mismatch.")
+
+    with patch("eval_engine.hallucination_evaluator.ChatOpenAI"):
+        first = HallucinationEvaluator(**prompts)
+        second = HallucinationEvaluator(**prompts)
+    if (
+        first.overall_prompt is second.overall_prompt
+        and first.overall_prompt is compile_prompt(prompts["overall_prompt"])
+        and first.prompt_fingerprint == fingerprints["combined"]
+    ):
+        print("SUCCESS: Compiled templates are shared across evaluators.")
+    else:
+        print("FAILURE: Compiled template cache miss.")
+
+    first._invoke_json = lambda prompt, variables, fallback: {"verdict": "supported", "confidence": 0.8}
+    rag_engine = type("Retriever", (), {"retrieve_context": lambda self, query: []})()
+    result = first.evaluate_sample(
+        {"id": 1, "question": "Q", "candidate_answer": "A", "label": "negative"},
+        rag_engine
+    )
+    if result["prompt_fingerprint"] == fingerprints["combined"]:
+        print("SUCCESS: Results carry the prompt fingerprint.")
+    else:
+        print("FAILURE: Result is missing the prompt fingerprint.")
+
+
 def test_sample_dataset():
     print("\nTesting bundled sample dataset...")
     sample_path = os.path.join("data", "sample_eval_dataset.json")
@@ -72,4 +119,5 @@ def test_sample_dataset():
 
 if __name__ == "__main__":
     test_prompt_manager()
+    test_prompt_fingerprints()
     test_sample_dataset()
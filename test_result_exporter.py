@@ -1,3 +1,5 @@
+import csv
+import io
 import json
 import os
 import sys
@@ -7,8 +9,12 @@ sys.path.append(os.path.join(os.path.dirname(__file__), "src"))
 from eval_engine.result_exporter import (
     build_export_payload,
     flatten_results_for_csv,
-    summarize_error_buckets
+    summarize_error_buckets,
+    write_export_json,
+    write_results_csv,
+    write_results_parquet
 )
+from eval_engine.result_index import ResultIndex
 
 
 def test_result_exporter():
@@ -87,5 +93,110 @@ def test_result_exporter():
         print("FAILURE: Error bucket summary mismatch.")
 
 
+def test_result_index():
+    print("\nTesting precomputed result index...")
+
+    results = [
+        {
+            "id": index,
+            "question": f"Question {index} about revenue" if index % 2 else f"Question {index} about margin",
+            "candidate_answer": f"Answer {index}",
+            "expected_label": "positive" if index % 2 else "negative",
+            "predicted_label": "positive" if index % 3 else "uncertain",
+            "is_correct": index % 2 == 1 and index % 3 != 0,
+            "claim_results": [{"claim": "Net income grew" if index == 4 else "Other claim"}]
+        }
+        for index in range(1, 26)
+    ]
+    result_index = ResultIndex(results)
+    buckets = summarize_error_buckets(results)
+    counts = result_index.bucket_counts()
+    print("Bucket counts:", counts)
+    if all(counts[name] == len(buckets[name]) for name in buckets):
+        print("SUCCESS: Index buckets match summarize_error_buckets.")
+    else:
+        print("FAILURE: Index bucket mismatch.")
+
+    revenue_positions = result_index.search("REVENUE")
+    claim_positions = result_index.search("net income", result_index.get_bucket("all"))
+    if len(revenue_positions) == 13 and result_index.get_results(claim_positions)[0]["id"] == 4:
+        print("SUCCESS: Search runs over the precomputed text index.")
+    else:
+        print("FAILURE: Search mismatch.")
+
+    page_positions, total_pages = ResultIndex.paginate(revenue_positions, page=2, page_size=10)
+    if total_pages == 2 and len(page_positions) == 3:
+        print("SUCCESS: Pagination returns only the visible page.")
+    else:
+        print("FAILURE: Pagination mismatch.")
+
+
+def test_streaming_exports():
+    print("Testing streaming exports...")
+
+    results = [
+        {
+            "id": index,
+            "mode": "claim",
+            "question": f"Q{index}",
+            "expected_label": "positive",
+            "predicted_label": "positive",
+            "confidence": 1 if index % 2 else 0.75,
+            "is_correct": True,
+            "claim_results": [{"claim": f"claim {index}", "verdict": "supported"}],
+            "claim_counts": {"supported": 1}
+        }
+        for index in range(1, 8)
+    ]
+    metrics = {"accuracy": 1.0}
+
+    json_buffer = io.StringIO()
+    write_export_json(json_buffer, results, metrics, "claim", "demo", {"api_key": "***"})
+    if json.loads(json_buffer.getvalue()) == build_export_payload(results, metrics, "claim", "demo", {"api_key": "***"}):
+        print("SUCCESS: Streamed JSON matches the export payload.")
+    else:
+        print("FAILURE: Streamed JSON mismatch.")
+
+    csv_buffer = io.StringIO()
+    write_results_csv(csv_buffer, results)
+    rows = list(csv.DictReader(io.StringIO(csv_buffer.getvalue())))
+    if len(rows) == 7 and rows[0]["question"] == flatten_results_for_csv(results)[0]["question"]:
+        print("SUCCESS: Streamed CSV writes one row per result.")
+    else:
+        print("FAILURE: Streamed CSV mismatch.")
+
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        print("SKIPPED: pyarrow is not installed.")
+        return
+
+    parquet_buffer = io.BytesIO()
+    write_results_parquet(parquet_buffer, results, batch_size=3)
+    parquet_buffer.seek(0)
+    table = pq.read_table(parquet_buffer)
+    if table.num_rows == 7 and table.column("confidence").to_pylist()[1] == 0.75:
+        print("SUCCESS: Parquet export writes batched row groups with a stable schema.")
+    else:
+        print("FAILURE: Parquet export mismatch.")
+
+    # Ids of mixed types across and within batches and non-numeric confidences do not break the export.
+    mixed = [
+        {**results[0], "id": 1},
+        {**results[1], "id": "case-2", "confidence": "high"},
+        {**results[2], "id": 3}
+    ]
+    parquet_buffer = io.BytesIO()
+    write_results_parquet(parquet_buffer, mixed, batch_size=1)
+    parquet_buffer.seek(0)
+    table = pq.read_table(parquet_buffer)
+    if table.column("id").to_pylist() == ["1", "case-2", "3"] and table.column("confidence").to_pylist()[1] is None:
+        print("SUCCESS: Parquet export stores ids as strings and tolerates non-numeric confidence.")
+    else:
+        print("FAILURE: Mixed-type Parquet export mismatch.")
+
+
 if __name__ == "__main__":
     test_result_exporter()
+    test_result_index()
+    test_streaming_exports()
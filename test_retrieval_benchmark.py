@@ -0,0 +1,118 @@
+import os
+import shutil
+import sys
+import tempfile
+import zlib
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "src"))
+
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from data_manager.near_duplicates import shingle_hashes
+from eval_engine.retrieval_benchmark import match_ranks, recommend_top_k, run_retrieval_benchmark
+from knowledge_base.vector_store_manager import VectorStoreManager
+
+
+class BigramEmbeddings(Embeddings):
+    """Hashed character-bigram counts, so texts sharing wording end up close together."""
+
+    def _embed(self, text):
+        vector = [0.0] * 256
+        for index in range(len(text) - 1):
+            vector[zlib.crc32(text[index:index + 2].encode("utf-8")) % 256] += 1.0
+        norm = sum(value * value for value in vector) ** 0.5 or 1.0
+        return [value / norm for value in vector]
+
+    def embed_documents(self, texts):
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text):
+        return self._embed(text)
+
+
+FACTS = [
+    "2024年末广义货币M2余额为313.53万亿元，同比增长7.3%。",
+    "2024年全国居民人均可支配收入41314元，比上年名义增长5.3%。",
+    "2024年国内生产总值1349084亿元，按不变价格计算比上年增长5.0%。",
+    "2024年末全国城镇调查失业率为5.1%，全年平均为5.1%。",
+    "2024年全国一般公共预算收入219702亿元，比上年增长1.3%。",
+    "2024年社会消费品零售总额487895亿元，比上年增长3.5%。"
+]
+QUESTIONS = [
+    "2024年末M2余额是多少，同比增长多少？",
+    "2024年全国居民人均可支配收入是多少？",
+    "2024年国内生产总值是多少？",
+    "2024年末城镇调查失业率是多少？",
+    "2024年一般公共预算收入是多少？",
+    "2024年社会消费品零售总额是多少？"
+]
+
+
+def test_retrieval_benchmark():
+    print("Testing retrieval quality benchmark...")
+
+    # 1. A chunk matches a reference when it covers most of the reference's shingles.
+    reference = shingle_hashes(FACTS[0])
+    chunks = [shingle_hashes(FACTS[1]), shingle_hashes("前文。" + FACTS[0] + "后文。")]
+    if match_ranks([reference], chunks, 0.7) == [2] and match_ranks([reference], chunks[:1], 0.7) == [None]:
+        print("SUCCESS: Reference snippets match the chunk that contains them.")
+    else:
+        print("FAILURE: Reference matching mismatch.")
+
+    rows = [
+        {"mode": "similarity", "top_k": 1, "recall": 0.6, "mrr": 0.6, "p95_ms": 10.0},
+        {"mode": "similarity", "top_k": 3, "recall": 0.9, "mrr": 0.7, "p95_ms": 12.0},
+        {"mode": "mmr", "top_k": 3, "recall": 0.95, "mrr": 0.7, "p95_ms": 11.0},
+        {"mode": "similarity", "top_k": 5, "recall": 1.0, "mrr": 0.7, "p95_ms": 15.0}
+    ]
+    recommendation = recommend_top_k(rows, 0.8)
+    fallback = recommend_top_k(rows, 1.01)
+    if (
+        (recommendation["mode"], recommendation["top_k"], recommendation["met_target"]) == ("mmr", 3, True)
+        and (fallback["top_k"], fallback["met_target"]) == (5, False)
+    ):
+        print("SUCCESS: Recommendation picks the smallest top_k meeting the target recall.")
+    else:
+        print(f"FAILURE: Unexpected recommendation {recommendation} / {fallback}.")
+
+    # 2. End to end on a real Chroma index with a wording-sensitive embedding.
+    temp_dir = tempfile.mkdtemp(prefix="retrieval_benchmark_", dir="data")
+    try:
+        vector_store = VectorStoreManager(embedding_model=BigramEmbeddings(), persist_directory=temp_dir)
+        vector_store.add_documents([Document(page_content=fact) for fact in FACTS])
+        samples = [
+            {"id": index, "question": question, "candidate_answer": "", "label": "negative", "reference_docs": [fact]}
+            for index, (question, fact) in enumerate(zip(QUESTIONS, FACTS), start=1)
+        ]
+        samples.append({"id": 99, "question": "没有参考证据", "candidate_answer": "", "label": "negative", "reference_docs": []})
+        progress = []
+        report = run_retrieval_benchmark(
+            samples,
+            vector_store,
+            top_k_values=[1, 3, 6],
+            modes=["similarity", "mmr"],
+            target_recall=0.8,
+            progress_callback=lambda completed, total: progress.append((completed, total))
+        )
+        for row in report["rows"]:
+            print(f"{row['mode']:>10} k={row['top_k']}: recall {row['recall']:.2f}, MRR {row['mrr']:.2f}, p95 {row['p95_ms']:.1f}ms")
+        print("Recommendation:", report["recommendation"])
+        similarity = {row["top_k"]: row for row in report["rows"] if row["mode"] == "similarity"}
+        if (
+            report["evaluated_samples"] == 6
+            and report["skipped_samples"] == 1
+            and similarity[6]["recall"] == 1.0
+            and similarity[1]["recall"] <= similarity[3]["recall"] <= similarity[6]["recall"]
+            and similarity[1]["avg_context_chars"] < similarity[6]["avg_context_chars"]
+            and report["recommendation"]["met_target"]
+            and progress[-1] == (6 * 7, 6 * 7)
+        ):
+            print("SUCCESS: Benchmark sweeps top_k and modes and recommends a setting.")
+        else:
+            print("FAILURE: Retrieval benchmark mismatch.")
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    test_retrieval_benchmark()
@@ -0,0 +1,110 @@
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "src"))
+
+from eval_engine.run_history import RunHistoryStore
+
+
+def build_results(predictions):
+    return [
+        {
+            "id": index,
+            "question": f"Q{index}",
+            "expected_label": "positive" if index % 2 else "negative",
+            "predicted_label": predicted,
+            "verdict": "hallucinated" if predicted == "positive" else "supported",
+            "confidence": 0.8,
+            "is_correct": predicted == ("positive" if index % 2 else "negative")
+        }
+        for index, predicted in enumerate(predictions, start=1)
+    ]
+
+
+def test_run_history():
+    print("Testing evaluation run history store...")
+
+    temp_dir = tempfile.mkdtemp(prefix="run_history_", dir="data")
+    try:
+        store = RunHistoryStore(os.path.join(temp_dir, "history.sqlite3"))
+        prompts_a = {"overall_prompt": "prompt A", "claim_extraction_prompt": "x", "claim_verification_prompt": "y"}
+        prompts_b = dict(prompts_a, overall_prompt="prompt B")
+
+        base_results = build_results(["positive", "positive", "negative", "negative"])
+        target_results = build_results(["positive", "negative", "positive", "negative"])[:3]
+        base_id = store.save_run(
+            base_results,
+            {"accuracy": 0.5, "f1": 0.5},
+            "overall",
+            dataset_name="demo",
+            config_snapshot={"api_key": "***"},
+            prompts=prompts_a
+        )
+        target_id = store.save_run(
+            target_results,
+            {"accuracy": 1.0, "f1": 1.0},
+            "overall",
+            dataset_name="demo",
+            prompts=prompts_b
+        )
+
+        runs = store.list_runs()
+        loaded = store.load_run(base_id)
+        if (
+            [run["run_id"] for run in runs] == [target_id, base_id]
+            and loaded["results"] == base_results
+            and runs[0]["prompt_hashes"]["overall_prompt"] != runs[1]["prompt_hashes"]["overall_prompt"]
+            and runs[0]["prompt_hashes"]["claim_extraction_prompt"] == runs[1]["prompt_hashes"]["claim_extraction_prompt"]
+        ):
+            print("SUCCESS: Runs are listed newest first and reload intact.")
+        else:
+            print("FAILURE: Run listing or loading mismatch.")
+
+        comparison = store.compare_runs(base_id, target_id)
+        print("Comparison:", {key: comparison[key] for key in ["metric_deltas", "fixed", "regressed", "only_in_base"]})
+        if (
+            [item["sample_id"] for item in comparison["flipped"]] == ["2", "3"]
+            and comparison["fixed"] == 2
+            and comparison["regressed"] == 0
+            and comparison["metric_deltas"]["accuracy"] == 0.5
+            and comparison["shared_samples"] == 3
+            and comparison["only_in_base"] == ["4"]
+            and not comparison["same_prompts"]
+        ):
+            print("SUCCESS: Per-sample diff reports flipped verdicts and metric deltas.")
+        else:
+            print("FAILURE: Run comparison mismatch.")
+
+        rerun_id = store.save_run(base_results, {"accuracy": 0.5}, "overall", prompts=dict(prompts_a))
+        if store.compare_runs(base_id, rerun_id)["same_prompts"]:
+            print("SUCCESS: Runs with identical prompts share a combined fingerprint.")
+        else:
+            print("FAILURE: Identical prompts were not recognized.")
+
+        for _ in range(200):
+            store.save_run(base_results * 25, {"accuracy": 0.5}, "overall", dataset_name="bulk")
+        started = time.perf_counter()
+        store.list_runs()
+        store.compare_runs(base_id, target_id)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        print(f"List + compare with 203 runs: {elapsed_ms:.1f} ms")
+        if elapsed_ms < 200:
+            print("SUCCESS: Listing and comparison stay fast with hundreds of runs.")
+        else:
+            print("FAILURE: Run history queries are too slow.")
+
+        store.delete_run(target_id)
+        if store.load_run(target_id) is None:
+            print("SUCCESS: Runs can be deleted.")
+        else:
+            print("FAILURE: Run deletion failed.")
+        store._connection.close()
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    test_run_history()
@@ -0,0 +1,158 @@
+import os
+import shutil
+import sys
+import tempfile
+from unittest.mock import MagicMock, patch
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "src"))
+
+from eval_engine.prompt_defaults import (
+    DEFAULT_CLAIM_EXTRACTION_PROMPT,
+    DEFAULT_CLAIM_VERIFICATION_PROMPT,
+    DEFAULT_OVERALL_PROMPT
+)
+from eval_engine.run_history import RunHistoryStore
+from eval_engine.run_planner import TokenCounter, plan_evaluation_run
+
+PROMPTS = {
+    "overall_prompt": DEFAULT_OVERALL_PROMPT,
+    "claim_extraction_prompt": DEFAULT_CLAIM_EXTRACTION_PROMPT,
+    "claim_verification_prompt": DEFAULT_CLAIM_VERIFICATION_PROMPT
+}
+
+
+def build_samples(count):
+    return [
+        {
+            "id": index,
+            "question": f"2024年第{index}季度的营业收入是多少？",
+            "candidate_answer": f"第{index}季度营业收入为{index * 10}亿元，同比增长5%。",
+            "label": "negative"
+        }
+        for index in range(1, count + 1)
+    ]
+
+
+def test_run_planner():
+    print("Testing pre-run evaluation planner...")
+    samples = build_samples(40)
+
+    # 1. Token counts work with or without the tiktoken BPE files.
+    counter = TokenCounter("gpt-4o-mini")
+    counts = counter.count_many(["", "营业收入", "revenue grew five percent"])
+    print(f"Tokenizer: {counter.tokenizer}, counts: {counts}")
+    if counts[0] == 0 and counts[1] > 0 and counts[2] > 0:
+        print("SUCCESS: Token counter returns counts for mixed-language text.")
+    else:
+        print("FAILURE: Unexpected token counts.")
+
+    # 2. Claim mode issues one extraction plus one call per claim; concurrency shortens the run.
+    overall = plan_evaluation_run(samples, "overall", PROMPTS, seconds_per_call=2.0)
+    claim = plan_evaluation_run(samples, "claim", PROMPTS, claims_per_answer=4, seconds_per_call=2.0, concurrency=4)
+    print("Overall plan:", {key: overall[key] for key in ["llm_calls", "input_tokens", "estimated_seconds"]})
+    print("Claim plan:", {key: claim[key] for key in ["llm_calls", "input_tokens", "estimated_seconds"]})
+    if (
+        overall["llm_calls"] == 40
+        and claim["llm_calls"] == 200
+        and overall["estimated_seconds"] == 80.0
+        and claim["estimated_seconds"] == 100.0
+        and claim["input_tokens"] > overall["input_tokens"] > 0
+        and overall["estimated_cost"] is None
+    ):
+        print("SUCCESS: Call counts and durations follow the evaluation mode.")
+    else:
+        print("FAILURE: Plan call counts mismatch.")
+
+    priced = plan_evaluation_run(samples, "overall", PROMPTS, input_price_per_1k=0.001, output_price_per_1k=0.002)
+    expected_cost = (priced["input_tokens"] * 0.001 + priced["output_tokens"] * 0.002) / 1000
+    if abs(priced["estimated_cost"] - expected_cost) < 1e-6:
+        print("SUCCESS: Cost follows the per-1k token prices.")
+    else:
+        print("FAILURE: Cost estimate mismatch.")
+
+    cascade = plan_evaluation_run(
+        samples,
+        "overall",
+        PROMPTS,
+        input_price_per_1k=0.01,
+        output_price_per_1k=0.03,
+        cascade=True,
+        escalation_rate=0.25,
+        cheap_input_price_per_1k=0.001,
+        cheap_output_price_per_1k=0.002
+    )
+    expected_cost = (
+        priced["input_tokens"] * 0.001 + priced["output_tokens"] * 0.002
+        + 0.25 * (priced["input_tokens"] * 0.01 + priced["output_tokens"] * 0.03)
+    ) / 1000
+    if (
+        cascade["llm_calls"] == 50
+        and cascade["cascade"]["cheap_calls"] == 40
+        and cascade["cascade"]["strong_calls"] == 10
+        and abs(cascade["estimated_cost"] - expected_cost) < 1e-4
+        and plan_evaluation_run(samples, "overall", PROMPTS, cascade=True)["cascade"]["escalation_rate"] == 0.3
+    ):
+        print("SUCCESS: Cascade plans count cheap calls and escalations and price each tier.")
+    else:
+        print("FAILURE: Cascade plan mismatch.", cascade["cascade"])
+
+    # 3. Real retrieval replaces the evidence estimate.
+    rag_engine = MagicMock()
+    rag_engine.retrieve_context.return_value = [MagicMock(page_content="证据" * 300)]
+    retrieved = plan_evaluation_run(samples, "overall", PROMPTS, rag_engine=rag_engine, retrieval_sample_size=5)
+    if retrieved["evidence_source"] == "retrieval" and rag_engine.retrieve_context.call_count == 5:
+        print("SUCCESS: Evidence tokens come from sampled retrieval when an engine is given.")
+    else:
+        print("FAILURE: Retrieval sampling mismatch.")
+
+    # 4. Past runs provide claims per answer and latency per call.
+    temp_dir = tempfile.mkdtemp(prefix="run_planner_", dir="data")
+    try:
+        store = RunHistoryStore(os.path.join(temp_dir, "history.sqlite3"))
+        results = [
+            {
+                "id": index,
+                "expected_label": "negative",
+                "predicted_label": "negative",
+                "claim_results": [{}, {}],
+                "llm_calls": 3,
+                "latency_s": 1.5
+            }
+            for index in range(1, 5)
+        ]
+        store.save_run(results, {"accuracy": 1.0}, "claim", dataset_name="demo")
+        cascade_results = [
+            dict(result, cascade={"judgments": 3, "escalated_judgments": 1 if index % 2 else 0})
+            for index, result in enumerate(results)
+        ]
+        store.save_run(cascade_results, {"accuracy": 1.0}, "overall", dataset_name="demo")
+        statistics = store.get_call_statistics("claim")
+        empty = store.get_call_statistics("overall")
+        print("Statistics:", statistics)
+        if (
+            statistics == {"samples": 4, "claims_per_answer": 2.0, "seconds_per_call": 0.5, "escalation_rate": None}
+            and empty["escalation_rate"] == 2 / 12
+        ):
+            print("SUCCESS: History statistics average claims and latency per call.")
+        else:
+            print("FAILURE: History statistics mismatch.")
+        store._connection.close()
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    # 5. The evaluator plans with its own prompts and stamps calls on real results.
+    with patch("eval_engine.hallucination_evaluator.ChatOpenAI"):
+        from eval_engine.hallucination_evaluator import HallucinationEvaluator
+
+        evaluator = HallucinationEvaluator(api_key="test", base_url="http://localhost", model_name="gpt-4o-mini")
+    plan = evaluator.plan_run({"samples": samples}, mode="claim", claims_per_answer=2)
+    evaluator.evaluate_sample_claim_level = MagicMock(return_value={"claim_results": [{}, {}, {}]})
+    result = evaluator.evaluate_sample(samples[0], rag_engine, mode="claim")
+    if plan["llm_calls"] == 120 and result["llm_calls"] == 4 and "latency_s" in result:
+        print("SUCCESS: Evaluator plans runs and records calls and latency per sample.")
+    else:
+        print("FAILURE: Evaluator planning mismatch.")
+
+
+if __name__ == "__main__":
+    test_run_planner()
@@ -0,0 +1,196 @@
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "src"))
+
+from data_manager.dataset_stream import JsonStreamReader
+from data_manager.test_set_manager import TestSetManager
+
+
+def build_sample(sample_id, label="negative", source_model="manual"):
+    return {
+        "id": sample_id,
+        "question": f"Question {sample_id}",
+        "candidate_answer": f"Answer {sample_id}",
+        "label": label,
+        "source_model": source_model
+    }
+
+
+def test_sample_store():
+    print("Testing indexed sample store...")
+
+    temp_dir = tempfile.mkdtemp(prefix="sample_store_", dir="data")
+    try:
+        dataset_path = os.path.join(temp_dir, "test_set.json")
+        with open(dataset_path, "w", encoding="utf-8") as file:
+            json.dump(
+                {
+                    "dataset_name": "legacy",
+                    "samples": [build_sample(1), build_sample(2, "positive", "weak"), build_sample(2)]
+                },
+                file
+            )
+
+        manager = TestSetManager(data_path=dataset_path)
+        ids = [sample["id"] for sample in manager.get_all_cases()]
+        print("Migrated ids:", ids)
+        if manager.get_dataset()["dataset_name"] == "legacy" and ids == [1, 2, 3]:
+            print("SUCCESS: Legacy JSON is migrated and duplicate ids are reassigned.")
+        else:
+            print("FAILURE: JSON migration mismatch.")
+
+        manager.delete_case(3)
+        added = manager.add_case("New question", "New answer", label="positive", source_model="weak")
+        reopened = TestSetManager(data_path=dataset_path)
+        if added["id"] == 4 and [sample["id"] for sample in reopened.get_all_cases()] == [1, 2, 4]:
+            print("SUCCESS: Ids stay unique after deletes and survive a reopen.")
+        else:
+            print("FAILURE: Id assignment mismatch.")
+
+        if (
+            reopened.get_case(2)["label"] == "positive"
+            and [sample["id"] for sample in reopened.find_cases(label="positive", source_model="weak")] == [2, 4]
+            and reopened.count_cases(label="negative") == 1
+        ):
+            print("SUCCESS: Lookups by id, label and source_model use the store.")
+        else:
+            print("FAILURE: Lookup mismatch.")
+
+        reopened.save_data()
+        with open(dataset_path, "r", encoding="utf-8") as file:
+            exported = json.load(file)
+        if exported == reopened.get_dataset() and len(TestSetManager(data_path=dataset_path).get_all_cases()) == 3:
+            print("SUCCESS: JSON export keeps the import format.")
+        else:
+            print("FAILURE: JSON export mismatch.")
+
+        ui_case = reopened.add_case("Added in the app", "Answer", label="negative")
+        exported["samples"][0]["question"] = "Edited by hand"
+        with open(dataset_path, "w", encoding="utf-8") as file:
+            json.dump(exported, file)
+        edited = TestSetManager(data_path=dataset_path)
+        if (
+            edited.get_case(1)["question"] == "Edited by hand"
+            and edited.get_case(ui_case["id"])["question"] == "Added in the app"
+            and [sample["id"] for sample in edited.get_all_cases()] == [1, 2, 4, 5]
+        ):
+            print("SUCCESS: Editing the JSON file merges by id and keeps cases added in the app.")
+        else:
+            print("FAILURE: JSON re-migration lost or missed samples.")
+
+        edited.delete_case(2)
+        exported["samples"][0]["notes"] = "Edited after a delete"
+        with open(dataset_path, "w", encoding="utf-8") as file:
+            json.dump(exported, file)
+        after_delete = TestSetManager(data_path=dataset_path)
+        if (
+            [sample["id"] for sample in after_delete.get_all_cases()] == [1, 4, 5]
+            and after_delete.get_case(1)["notes"] == "Edited after a delete"
+        ):
+            print("SUCCESS: Deleted cases stay deleted when the JSON file is edited.")
+        else:
+            print("FAILURE: A JSON edit restored a deleted case.")
+
+        large_path = os.path.join(temp_dir, "large.json")
+        large = TestSetManager(data_path=large_path)
+        large.import_dataset({"samples": [build_sample(index) for index in range(1, 50001)]})
+        started = time.perf_counter()
+        for _ in range(20):
+            sample = large.add_case("Hand labeled", "Answer", label="positive")
+            large.delete_case(sample["id"] - 1)
+        elapsed_ms = (time.perf_counter() - started) * 1000 / 20
+        print(f"Add + delete on 50k samples: {elapsed_ms:.2f} ms")
+        if elapsed_ms < 50 and large.count_cases() == 50000 and not os.path.exists(large_path):
+            print("SUCCESS: Single-sample writes do not rewrite the dataset.")
+        else:
+            print("FAILURE: Single-sample writes are too slow.")
+        for item in [manager, reopened, edited, after_delete, large]:
+            item.store.close()
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+def test_streaming_import():
+    print("Testing streaming dataset import...")
+
+    reader = JsonStreamReader(io.StringIO('[{"id": 12345, "question": "Q"}, 67890 , "x"]'), chunk_size=7)
+    values = [value for _, value in reader.iter_array()]
+    if values == [{"id": 12345, "question": "Q"}, 67890, "x"]:
+        print("SUCCESS: Values split across chunk boundaries decode correctly.")
+    else:
+        print("FAILURE: Chunked decoding mismatch.", values)
+
+    temp_dir = tempfile.mkdtemp(prefix="stream_import_", dir="data")
+    try:
+        manager = TestSetManager(data_path=os.path.join(temp_dir, "test_set.json"))
+        dataset_text = json.dumps(
+            {"samples": [build_sample(1), build_sample(2, "positive")], "dataset_name": "trailing_meta", "kb_version": "v2"}
+        )
+        imported = manager.import_stream(dataset_text.encode("utf-8"), "upload.json")
+        dataset = manager.get_dataset()
+        if imported == 2 and dataset["dataset_name"] == "trailing_meta" and dataset["kb_version"] == "v2":
+            print("SUCCESS: JSON objects stream samples and pick up metadata after them.")
+        else:
+            print("FAILURE: JSON stream import mismatch.")
+
+        jsonl_bytes = "\n".join(json.dumps(build_sample(index)) for index in range(1, 4)).encode("utf-8")
+        if manager.import_stream(io.BytesIO(jsonl_bytes), "upload.jsonl") == 3 and manager.count_cases() == 3:
+            print("SUCCESS: JSONL datasets import line by line.")
+        else:
+            print("FAILURE: JSONL import mismatch.")
+
+        bad_samples = [build_sample(1), dict(build_sample(2), question=""), dict(build_sample(3), label="maybe"), build_sample(1)]
+        try:
+            manager.import_stream(json.dumps(bad_samples), "bad.json")
+            print("FAILURE: Invalid samples were accepted.")
+        except ValueError as exc:
+            message = str(exc)
+            print("Import error:", message)
+            if "#2" in message and "#3" in message and "#4" in message and manager.count_cases() == 3:
+                print("SUCCESS: Errors report sample positions and the previous dataset is kept.")
+            else:
+                print("FAILURE: Import error reporting mismatch.")
+
+        try:
+            manager.import_stream('{"samples": [{"id": 1}, {"id": 2,]}', "broken.json")
+            print("FAILURE: Broken JSON was accepted.")
+        except ValueError as exc:
+            if "#2" in str(exc):
+                print("SUCCESS: Broken JSON is reported at its sample:", exc)
+            else:
+                print("FAILURE: Broken JSON error mismatch:", exc)
+
+        large_path = os.path.join(temp_dir, "large.json")
+        with open(large_path, "w", encoding="utf-8") as file:
+            file.write('{"dataset_name": "large", "samples": [')
+            for index in range(1, 40001):
+                sample = dict(build_sample(index), notes="x" * 400)
+                file.write(("," if index > 1 else "") + json.dumps(sample))
+            file.write("]}")
+        file_size = os.path.getsize(large_path)
+
+        tracemalloc.start()
+        with open(large_path, "rb") as file:
+            imported = manager.import_stream(file, large_path)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"Imported {imported} samples from {file_size / 1e6:.1f} MB with a {peak / 1e6:.1f} MB peak")
+        if imported == 40000 and peak < file_size / 2:
+            print("SUCCESS: Streaming import memory stays below the dataset size.")
+        else:
+            print("FAILURE: Streaming import materialized the dataset.")
+        manager.store.close()
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    test_sample_store()
+    test_streaming_import()